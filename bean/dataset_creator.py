@@ -2,6 +2,9 @@
 #------------------------------------------------------------------------
 #	NAME:		dataset_creator.py				-
 #	HISTORY:							-
+#		2026-10-18						-
+#	  Running task kept on the bean, with a Cancel button and
+#	  cancellation when the bean or dialog is closed.
 #		2019-01-11	leerw@ornl.gov				-
 #         Fixed bugginess.
 #		2018-11-27	leerw@ornl.gov				-
@@ -15,7 +18,7 @@
 #		2015-11-14	leerw@ornl.gov				-
 #		2015-11-13	leerw@ornl.gov				-
 #------------------------------------------------------------------------
-import functools, logging, json, math, os, six, sys, time, traceback
+import functools, logging, json, math, os, six, sys, threading, time, traceback
 import numpy as np
 #import pdb  #pdb.set_trace()
 
@@ -92,6 +95,7 @@ Not being used.
   #	METHOD:		DataSetCreatorBean.__del__()                    -
   #----------------------------------------------------------------------
   def __del__( self ):
+    self.Cancel()
     if self._sourceDataSetMenu is not None:
       self._sourceDataSetMenu.Dispose()
   #end __del__
@@ -111,6 +115,7 @@ Not being used.
 
     self._axisCheckBoxes = []
     self._axisPanel = \
+    self._cancelButton = \
     self._createButton = \
     self._factorsCheckBox = \
     self._factorsField = \
@@ -123,11 +128,25 @@ Not being used.
     self._sourceDataSetMenu = \
     self._sourceMenuButton = \
     self._sourceNameField = None
+    self._task = None
 
     self._InitUI( show_create_button )
+    self.Bind( wx.EVT_WINDOW_DESTROY, self._OnDestroy )
   #end __init__
 
 
+  #----------------------------------------------------------------------
+  #	METHOD:		DataSetCreatorBean.Cancel()			-
+  #----------------------------------------------------------------------
+  def Cancel( self ):
+    """Cancels the running task, if any.  ``_OnCreateFinished()`` is still
+called when the task stops.
+"""
+    if getattr( self, '_task', None ) is not None:
+      self._task.Cancel()
+  #end Cancel
+
+
   #----------------------------------------------------------------------
   #	METHOD:		DataSetCreatorBean.ApplyPreset()                -
   #----------------------------------------------------------------------
@@ -437,7 +456,8 @@ Not being used.
     """
     Returns:
         dict: dict of controls created with keys
-            ``group_panel``, ``new_field`` and optionally ``create_button``
+            ``group_panel``, ``new_field`` and optionally ``cancel_button``
+            and ``create_button``
 """
     group_panel = wx.Panel( self, -1 )
     #group_sizer = wx.StaticBoxSizer( wx.VERTICAL, self, "Dataset Selection" )
@@ -445,7 +465,7 @@ Not being used.
     group_sizer = wx.StaticBoxSizer( group_box, wx.VERTICAL )
 
     names_panel = wx.Panel( group_box, -1 )
-    names_sizer = wx.FlexGridSizer( cols = 3, vgap = 10, hgap = 8 )
+    names_sizer = wx.FlexGridSizer( cols = 4, vgap = 10, hgap = 8 )
     names_panel.SetSizer( names_sizer )
 
 #               -- New line
@@ -473,6 +493,12 @@ Not being used.
       create_button.Enable( False )
       names_sizer.Add( create_button, 0, wx.EXPAND, 0 )
 
+      cancel_button = wx.Button( names_panel, -1, label = 'Ca&ncel' )
+      cancel_button.SetToolTipString( 'Cancel the running calculation' )
+      cancel_button.Bind( wx.EVT_BUTTON, self._OnCancel )
+      cancel_button.Enable( False )
+      names_sizer.Add( cancel_button, 0, wx.EXPAND, 0 )
+
 #               -- Layout
 #               --
     #group_sizer.Add( names_panel, 0, wx.ALIGN_LEFT | wx.ALIGN_TOP, 0 )
@@ -485,6 +511,7 @@ Not being used.
 
     items = dict( group_panel = group_panel, new_field = new_field )
     if show_create_button:
+      items[ 'cancel_button' ] = cancel_button
       items[ 'create_button' ] = create_button
     return  items
   #end _CreateNewDataSetGroup
@@ -600,6 +627,9 @@ Not being used.
         if len( derive_axis_names ) == 0:
           msg = 'Please select one or more dataset axes'
 
+    if self._task is not None:
+      msg = 'A dataset is already being created'
+
     if msg:
       wx.MessageDialog( self, msg, 'Derive Dataset' ).ShowWindowModal()
     else:
@@ -613,13 +643,15 @@ Not being used.
 
       if self._createButton:
         self._createButton.Disable()
+      if self._cancelButton:
+        self._cancelButton.Enable()
       self._progressGauge.SetRange( dm.GetStatesCount() )
 
       der_method = 'avg'
       der_method_ndx = max( self._methodChoice.GetSelection(), 0 )
       der_method = DERIVATION_METHODS[ der_method_ndx ][ 1 ]
 
-      creator = DataSetCreatorTask(
+      self._task = DataSetCreatorTask(
           dm, src_qds_name.displayName,
           avg_axis, result_ds_name,
           der_method = der_method,
@@ -628,7 +660,7 @@ Not being used.
           finished_callback = lambda x: \
             wx.CallAfter( self._OnCreateFinished, x, do_toast, after_callback )
 	  )
-      wx.CallAfter( creator.Run )
+      wx.CallAfter( self._task.Run )
     #end if-else
   #end DoCreate
 
@@ -642,7 +674,9 @@ Not being used.
     super( DataSetCreatorBean, self ).Enable( flag )
 
     if self._createButton:
-      self._createButton.Enable( flag and self._axisNames )
+      self._createButton.Enable(
+          flag and self._axisNames and self._task is None
+          )
 
     for cb in self._axisCheckBoxes:
       cb.Enable( flag )
@@ -698,6 +732,7 @@ Not being used.
     self._methodChoice = method_items.get( 'method_choice' )
 
     new_items = self._CreateNewDataSetGroup( show_create_button )
+    self._cancelButton = new_items.get( 'cancel_button' )
     self._createButton = new_items.get( 'create_button' )
     self._newNameField = new_items.get( 'new_field' )
 
@@ -728,6 +763,20 @@ Not being used.
   #end _InitUI
 
 
+  #----------------------------------------------------------------------
+  #	METHOD:		DataSetCreatorBean._OnCancel()			-
+  #----------------------------------------------------------------------
+  def _OnCancel( self, ev ):
+    """Must be called on MainThread.  Calls ``Cancel()``.
+"""
+    if ev:
+      ev.Skip()
+    if self._cancelButton:
+      self._cancelButton.Disable()
+    self.Cancel()
+  #end _OnCancel
+
+
   #----------------------------------------------------------------------
   #	METHOD:		DataSetCreatorBean._OnCreate()			-
   #----------------------------------------------------------------------
@@ -744,8 +793,15 @@ Not being used.
   #	METHOD:		DataSetCreatorBean._OnCreateFinished()          -
   #----------------------------------------------------------------------
   def _OnCreateFinished( self, ds_name, do_toast = True, callback = None ):
-    """
+    """Clears the task and restores the buttons.  Does nothing if the bean
+has been destroyed.
 """
+    if not self:
+      return
+
+    self._task = None
+    if self._cancelButton:
+      self._cancelButton.Disable()
     if self._createButton:
       self._createButton.Enable()
     self._sourceDataSetMenu.UpdateAllMenus()
@@ -754,7 +810,7 @@ Not being used.
     if callback:
       if hasattr( callback, '__call__' ):
         callback()
-    elif do_toast:
+    elif do_toast and ds_name:
       self.ToastMessage( 'Dataset "' + ds_name + '" was created' )
   #end _OnCreateFinished
 
@@ -807,6 +863,18 @@ Not being used.
   #end _OnPreset
 
 
+  #----------------------------------------------------------------------
+  #	METHOD:		DataSetCreatorBean._OnDestroy()			-
+  #----------------------------------------------------------------------
+  def _OnDestroy( self, ev ):
+    """Cancels the running task when the bean is destroyed.
+"""
+    ev.Skip()
+    if ev.GetEventObject() is self:
+      self.Cancel()
+  #end _OnDestroy
+
+
   #----------------------------------------------------------------------
   #	METHOD:		DataSetCreatorBean._OnProgress()                -
   #----------------------------------------------------------------------
@@ -945,6 +1013,8 @@ Not being used.
 
   axisPanel = property( lambda x : x._axisPanel )
 
+  cancelButton = property( lambda x : x._cancelButton )
+
   createButton = property( lambda x : x._createButton )
 
   factorsCheckBox = property( lambda x : x._factorsCheckBox )
@@ -967,6 +1037,8 @@ Not being used.
 
   state = property( lambda x : x._state )
 
+  task = property( lambda x : x._task )
+
 #end DataSetCreatorBean
 
 
@@ -1106,7 +1178,11 @@ DataModelMenu returns a ``wx.App`` instance, not a ``VeraViewApp`` instance.
   #	METHOD:		DataSetCreatorDialog.ShowModal()		-
   #----------------------------------------------------------------------
   def ShowModal( self ):
-    return  super( DataSetCreatorDialog, self ).ShowModal()
+    """Cancels any task still running when the dialog is closed.
+"""
+    result = super( DataSetCreatorDialog, self ).ShowModal()
+    self._bean.Cancel()
+    return  result
   #end ShowModal
 
 
@@ -1197,6 +1273,7 @@ class DataSetCreatorTask( object ):
     self._useFactors = use_factors
     self._progressCallback = progress_callback
     self._finishedCallback = finished_callback
+    self._cancelEvent = threading.Event()
 
     #self._dialog = None
 
@@ -1210,6 +1287,17 @@ class DataSetCreatorTask( object ):
   #end __init__
 
 
+  #----------------------------------------------------------------------
+  #	METHOD:		DataSetCreatorTask.Cancel()                     -
+  #----------------------------------------------------------------------
+  def Cancel( self ):
+    """Requests cancellation of the calculation, which stops after the
+state points in progress.  May be called from any thread.
+"""
+    self._cancelEvent.set()
+  #end Cancel
+
+
 #  #----------------------------------------------------------------------
 #  #	METHOD:		DataSetCreatorTask.DoUpdate()                   -
 #  #----------------------------------------------------------------------
@@ -1260,7 +1348,8 @@ Must be called in the UI thread.
           self._resultDsName,
           der_method = self._derMethod,
           use_factors = self._useFactors,
-          callback = self._progressCallback
+          callback = self._progressCallback,
+          cancel_event = self._cancelEvent
           )
 
     except Exception, ex:
@@ -1294,7 +1383,9 @@ Must be called in the UI thread.
     #end if
 
     if self._finishedCallback:
-      self._finishedCallback( self._resultDsName )
+      self._finishedCallback(
+          None if self._cancelEvent.is_set() else self._resultDsName
+	  )
   #end _RunEnd
 
 #end DataSetCreatorTask
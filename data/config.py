@@ -23,7 +23,7 @@
 #	  Added defaultDataSetName property.
 #		2014-12-18	leerw@ornl.gov				-
 #------------------------------------------------------------------------
-import logging, logging.config, os, platform, subprocess, sys
+import logging, logging.config, multiprocessing, os, platform, subprocess, sys
 #from distutils.spawn import find_executable
 import pdb
 
@@ -35,15 +35,18 @@ class Config( object ):
   """Global state class.
 
 Static properties (use accessors):
+  cacheDir		directory for persistent caches
   defaultDataSetName	default name for vector dataset
   resDir		resources directory
   rootDir		root directory
+  workerCount		number of worker threads for per-state computations
 """
 
 
 #		-- Class Attributes
 #		--
 
+  cacheDir_ = None
   canDragNDrop_ = None
   defaultCmapName_ = 'jet' # 'rainbow', 'viridis', 'nipy_spectral'
   defaultDataSetName_ = 'pin_powers'
@@ -52,6 +55,7 @@ Static properties (use accessors):
   osName_ = platform.system().lower()
   resDir_ = ''
   rootDir_ = ''
+  workerCount_ = None
 
   isLinux_ = osName_ == 'linux'
   isMac_ = osName_ == 'darwin'
@@ -83,6 +87,43 @@ return false in that case.
   #end CanDragNDrop
 
 
+  #----------------------------------------------------------------------
+  #	METHOD:		GetCacheDir()					-
+  #----------------------------------------------------------------------
+  @staticmethod
+  def GetCacheDir( create_flag = False ):
+    """Defaults to a "cache" folder in the platform application data
+directory.
+@param  create_flag	true to create the directory if necessary
+@return			path to the cache directory
+"""
+    if Config.cacheDir_ is None:
+      path = None
+      if Config.isMac_:
+        app_dir = os.path.join(
+            os.environ.get( 'HOME', '' ),
+	    'Library', 'Application Support'
+	    )
+        if os.path.exists( app_dir ):
+          path = os.path.join( app_dir, 'VERAView' )
+
+      elif Config.isWindows_:
+        app_dir = os.environ.get( 'APPDATA' )
+        if app_dir is not None and os.path.exists( app_dir ):
+          path = os.path.join( app_dir, 'VERAView' )
+
+      if path is None:
+        path = os.path.join( os.environ.get( 'HOME', os.getcwd() ), '.veraview' )
+      Config.cacheDir_ = os.path.join( path, 'cache' )
+    #end if
+
+    if create_flag and not os.path.exists( Config.cacheDir_ ):
+      os.makedirs( Config.cacheDir_ )
+
+    return  Config.cacheDir_
+  #end GetCacheDir
+
+
   #----------------------------------------------------------------------
   #	METHOD:		GetDefaultDataSetName()				-
   #----------------------------------------------------------------------
@@ -122,6 +163,25 @@ return false in that case.
   #end GetRootDir
 
 
+  #----------------------------------------------------------------------
+  #	METHOD:		GetWorkerCount()				-
+  #----------------------------------------------------------------------
+  @staticmethod
+  def GetWorkerCount():
+    """Defaults to the number of CPUs, at most 8.
+@return			number of worker threads, ge 1
+"""
+    if Config.workerCount_ is None:
+      try:
+        count = multiprocessing.cpu_count()
+      except NotImplementedError:
+        count = 1
+      Config.workerCount_ = max( 1, min( count, 8 ) )
+
+    return  Config.workerCount_
+  #end GetWorkerCount
+
+
   #----------------------------------------------------------------------
   #	METHOD:		HaveGifsicle()					-
   #----------------------------------------------------------------------
@@ -204,6 +264,15 @@ return false in that case.
   #end IsWindows
 
 
+  #----------------------------------------------------------------------
+  #	METHOD:		SetCacheDir()					-
+  #----------------------------------------------------------------------
+  @staticmethod
+  def SetCacheDir( value ):
+    Config.cacheDir_ = value
+  #end SetCacheDir
+
+
   #----------------------------------------------------------------------
   #	METHOD:		SetDefaultDataSetName()				-
   #----------------------------------------------------------------------
@@ -226,4 +295,17 @@ return false in that case.
     #logging.config.fileConfig( os.path.join( Config.resDir_, 'logging.conf' ) )
   #end SetRootDir
 
+
+  #----------------------------------------------------------------------
+  #	METHOD:		SetWorkerCount()				-
+  #----------------------------------------------------------------------
+  @staticmethod
+  def SetWorkerCount( value ):
+    """
+@param  value		number of worker threads, where values le 0 mean
+			the default
+"""
+    Config.workerCount_ = value if value > 0 else None
+  #end SetWorkerCount
+
 #end Config
@@ -3,6 +3,17 @@
 #------------------------------------------------------------------------
 #	NAME:		datamodel.py					-
 #	HISTORY:							-
+#		2026-10-18						-
+#	  ReadDataSetTimeValues() reads only the addressed values and
+#	  caches results.  Time-major companion store.  Fast-open mode
+#	  deferring pin weights, the derived file, and auto-derived
+#	  scalars to a background thread.  DerivedStore backends for
+#	  derived state datasets.  Persistent DerivedCache.  Thresholds
+#	  applied on read through ThresholdDataSet and fused into stats.
+#	  IndexExpression in place of eval()/exec() on index strings.
+#	  DerivedState.AddDataSet().
+#	  'ready' event fired when a fast-open read completes.
+#	  _CreateDerivedDataSet() uses averager batch methods.
 #		2019-02-06	leerw@ornl.gov				-
 #         New approach to handling vessel_mats and vessel_radii in
 #         VesselGeometry.Read().
@@ -340,7 +351,7 @@
 This module provides classes for reading and processing data in a single
 VERAOutput HDF5 file.
 """
-import bisect, copy, cStringIO, h5py, logging, json
+import bisect, collections, copy, cStringIO, h5py, logging, json
 import math, os, re, six, sys, tempfile, threading, traceback
 import numpy as np
 import pdb
@@ -351,7 +362,14 @@ import data.channel_averages as chan_avg
 #from .data_types import *
 #from .generic_averages import *
 import data.generic_averages as gen_avg
+from .dataset_stats import *
+from .derived_cache import *
+from .derived_store import *
+from .index_expr import *
 from .range_expr import *
+from .state_pool import *
+from .stats_cache import *
+from .time_store import *
 from .utils import *
 
 
@@ -2529,12 +2547,15 @@ Events:
           (*Deprecated*)
       derivableTypesByLabel (dict): cache keyed by derived label of dataset
           categories/types that can be the basis for the derived type.
-      derivedCoreGroup (h5py.Group): used to store threshold-ed
+      derivedCache (DerivedCache): persistent derived datasets, None if
+          not enabled.
+      derivedCoreGroup (h5py.Group): used to store copied
           CORE-group datasets
       derivedFile (h5py.File): used to store derived data.
       derivedLabelsByType (dict): cache by dataset category/type of available
           derived type labels.
       derivedStates (list): list of DerivedState instances.
+      derivedStore (DerivedStore): storage for derived state datasets.
       h5File (h5py.File): file for this model.
       listeners (dict): dict(str,obj) of listeners by event name.
       maxAxialValue (float): maximum axial value (cm).
@@ -2549,8 +2570,20 @@ Events:
           of ranges.
       rangesLock (threading.RLock): used for ``ranges`` and
          ``rangesByStatePt``.
+      readThread (threading.Thread): thread completing a fast-open Read(),
+          None otherwise
+      readyEvent (threading.Event): set when Read() is complete, including
+          the averagers, factors, derived file, and auto-derived scalars
       resolver (DataSetResolver): used for all dataset resolutions
       states (list): lazily-populated list of State instances.
+      statsCache (StatsCache): per-state statistics, persistent for
+          datasets in the file
+      timeStore (TimeStore): time-major companion store used by
+          ReadDataSetTimeValues() when present, otherwise None
+      timeValuesCache (collections.OrderedDict): ReadDataSetTimeValues()
+          results keyed by dataset name, location, and pin or node address,
+          least recently used first
+      timeValuesLock (threading.RLock): used for ``timeValuesCache``
 """
 
 
@@ -2559,12 +2592,16 @@ Events:
 
   DEFAULT_range = ( -sys.float_info.max, sys.float_info.max )
 
+  TIME_VALUES_CACHE_SIZE = 1024
+
 
 #		-- Class Attributes
 #		--
 
   #dataSetNamesVersion_ = 0
 
+  fastOpen_ = False
+
 
 #		-- Object Methods
 #		--
@@ -2666,6 +2703,9 @@ passed, :func:`Read` must be called.
       self.dataSetNamesVersion += 1
       self._FireEvent( 'newDataSet', ds_name )
     #end if ds_name is new
+
+    self._ClearStatsCache( ds_name )
+    self._ClearTimeValuesCache( ds_name )
   #end AddDataSetName
 
 
@@ -2675,9 +2715,10 @@ passed, :func:`Read` must be called.
   def AddListener( self, event_name, listener ):
     """Adds an event listener.
 
-  :param event_name:  event name ('newDataSet' is all we have for now)
+  :param event_name:  event name, 'newDataSet' or 'ready'
   :type event_name:  str
-  :param listener:  callable or object with OnNewDataSet() method 
+  :param listener:  callable or object with OnNewDataSet() or OnReady()
+      method
   :type listener:  object
 """
     if event_name in self.listeners:
@@ -2724,28 +2765,88 @@ passed, :func:`Read` must be called.
     self.dataSetNamesVersion = 0
 #d    self.derivableFuncsAndTypesByLabel = {}
     self.derivableTypesByLabel = {}
+    self.derivedCache = None
     self.derivedCoreGroup = None
     self.derivedFile = None
     self.derivedLabelsByType = {}
     self.derivedStates = None
+    self.derivedStore = None
     self.h5File = None
-    self.listeners = { 'newDataSet': [] }
+    self.listeners = { 'newDataSet': [], 'ready': [] }
     self.name = ''
     self.ranges = {}
     self.rangesByStatePt = []
+    self.readThread = None
+    self.readyEvent = threading.Event()
+    self.readyEvent.set()
     self.resolver = None
     self.states = []
+    self.statsCache = None
+    self.timeStore = None
+    self.timeValuesCache = collections.OrderedDict()
+    self.timeValuesLock = threading.RLock()
 
     #DataModel.dataSetNamesVersion_ += 1
   #end Clear
 
 
+  #----------------------------------------------------------------------
+  #	METHOD:		DataModel._ClearStatsCache()			-
+  #----------------------------------------------------------------------
+  def _ClearStatsCache( self, ds_name ):
+    """Removes ``statsCache`` entries for a dataset created in this
+session, whose statistics are invalid once it is recreated, removed, or
+its threshold changes.
+    Args:
+	ds_name (str): dataset name
+"""
+    if self.statsCache is not None and ds_name:
+      self.statsCache.Remove( ds_name )
+  #end _ClearStatsCache
+
+
+  #----------------------------------------------------------------------
+  #	METHOD:		DataModel._ClearTimeValuesCache()		-
+  #----------------------------------------------------------------------
+  def _ClearTimeValuesCache( self, ds_name = None ):
+    """Removes cached ReadDataSetTimeValues() results.
+    Args:
+	ds_name (str): optional dataset name whose results to remove, with
+	    or without a '*' prefix, where None means all
+"""
+    with self.timeValuesLock:
+      if ds_name is None:
+	self.timeValuesCache.clear()
+      else:
+	for key in list( self.timeValuesCache.keys() ):
+	  if key[ 0 ] == ds_name or key[ 0 ] == '*' + ds_name:
+	    del self.timeValuesCache[ key ]
+  #end _ClearTimeValuesCache
+
+
   #----------------------------------------------------------------------
   #	METHOD:		DataModel.Close()				-
   #----------------------------------------------------------------------
   def Close( self ):
     """Closes this.
 """
+    if getattr( self, 'readyEvent', None ) is not None:
+      self.WaitReady()
+
+    if getattr( self, 'statsCache', None ) is not None:
+      self.statsCache.Close()
+
+    time_store = getattr( self, 'timeStore', None )
+    self.timeStore = None
+    if time_store is not None:
+      time_store.Close()
+
+    if getattr( self, 'derivedCache', None ) is not None:
+      self.derivedCache.Close()
+
+    if getattr( self, 'derivedStore', None ) is not None:
+      self.derivedStore.Close()
+
     if hasattr( self, 'derivedFile' ):
       der_file = getattr( self, 'derivedFile' )
       if der_file:
@@ -2909,36 +3010,72 @@ passed, :func:`Read` must be called.
 #			-- Second, get averager and find method name
 #			--
       avg_method_name = None
-      averager = self.averagers.get( ds_category )
+      averager = self.GetAverager( ds_category )
       if ddef and averager and \
           'avg_method' in ddef and ds_category in ddef[ 'avg_method' ]:
         avg_method_name = ddef[ 'avg_method' ][ ds_category ]
 	if agg_name != 'avg':
 	  avg_method_name = avg_method_name.replace( '_avg', '_' + agg_name )
 
-#			-- Third, get average method reference
+#			-- Third, get average method reference, preferring a
+#			-- batch method
 #			--
-      if avg_method_name and hasattr( averager, avg_method_name ):
+      batch_method = None
+      if avg_method_name:
+        batch_method = getattr( averager, avg_method_name + '_batch', None )
+
+      if avg_method_name and \
+          ( batch_method is not None or hasattr( averager, avg_method_name ) ):
 	derived_name = der_names[ 1 ]
 
 	try:
-	  avg_method = getattr( averager, avg_method_name )
+	  avg_method = getattr( averager, avg_method_name, None )
 
-#xxxxx will need to make this a separate thread with per-state progress feedback
-#x especially for node averages!
+#			-- Resolve datasets on this thread
+	  dsets = []
           for state_ndx in xrange( len( self.states ) ):
-	    st = self.GetState( state_ndx )
-	    derived_st = self.GetDerivedState( state_ndx )
-
-	    dset = st.GetDataSet( ds_name )
+	    dset = self.GetState( state_ndx ).GetDataSet( ds_name )
 	    if dset is None:
-	      dset = derived_st.GetDataSet( ds_name )
+	      dset = self.GetDerivedState( state_ndx ).GetDataSet( ds_name )
+	    dsets.append( dset )
+	  state_ndxs = [
+	      i for i in xrange( len( dsets ) ) if dsets[ i ] is not None
+	      ]
+	  pool = StatePool()
+
+#			-- Batch averagers get stacks of states, with weights
+#			-- resolved once
+	  weights = None
+	  state_bytes = 1
+	  if batch_method is not None and state_ndxs:
+	    weights = np.asarray(
+	        averager.resolve_dset_weights( dsets[ state_ndxs[ 0 ] ] )
+		)
+	    state_bytes = weights.size * 8
+	  batches = self._CreateStateBatches( state_ndxs, state_bytes, pool )
+
+#			-- Averages on workers, writes here
+	  def compute( batch_ndx ):
+	    batch = batches[ batch_ndx ]
+	    if weights is not None:
+	      data = np.empty(
+	          ( len( batch ), ) + dsets[ batch[ 0 ] ].shape,
+		  dtype = np.float64
+		  )
+	      for i in xrange( len( batch ) ):
+	        data[ i ] = dsets[ batch[ i ] ][ () ]
+	      results = list( batch_method( data, weights ) )
+	    else:
+	      results = [ avg_method( dsets[ state_ndx ] ) for state_ndx in batch ]
+	    return  results
+
+	  def write( batch_ndx, results ):
+	    for state_ndx, avg_data in zip( batches[ batch_ndx ], results ):
+	      if avg_data is not None:
+	        self.GetDerivedState( state_ndx ).\
+	            CreateDataSet( derived_name, avg_data )
 
-	    if dset is not None:
-	      avg_data = avg_method( dset )
-	      derived_st.CreateDataSet( derived_name, avg_data )
-	    #end if data
-	  #end for each state
+	  pool.Run( xrange( len( batches ) ), compute, write )
 
 	  self.AddDataSetName( der_names[ 0 ], derived_name )
 
@@ -2964,9 +3101,12 @@ format( os.linesep, derived_label, ds_name, str( ex ) )
   def CreateDerivedDataSet2( self,
       src_ds_name, avg_axis, der_ds_name,
       der_method = 'avg', use_factors = True,
-      callback = None
+      callback = None, cancel_event = None
       ):
     """Calculates and adds the specified dataset, firing a 'newDataSet' event.
+State point derivations are calculated on a ``StatePool``, with all writes to
+the derived file made on the calling thread.  Averagers with batch methods
+(e.g., ``calc_avg_batch()``) are given stacks of state points.
     Args:
         src_ds_name (str): name of source dataset
 	avg_axis (int or tuple): axis over which data are derived
@@ -2977,8 +3117,11 @@ format( os.linesep, derived_label, ds_name, str( ex ) )
         user_factors (bool): True to apply factors/weights
         callback (callable): single argument is 0-based state index, called
             on derived data calculation for each state
+        cancel_event (threading.Event): optional event which, when set,
+            cancels the derivation, removing any state point datasets already
+            created
     Returns:
-        str: newly added ds_name
+        str: newly added ds_name or None if cancelled
 """
 
     ddef = self.GetDataSetDefByDsName( src_ds_name )
@@ -2987,8 +3130,28 @@ format( os.linesep, derived_label, ds_name, str( ex ) )
         if not hasattr( avg_axis, '__iter__' ):
          avg_axis = ( avg_axis, )
 
-        if not der_method in ( 'avg', 'rms', 'stddev' ):
-          der_method = 'avg'
+	if not der_method in ( 'avg', 'rms', 'stddev' ):
+	  der_method = 'avg'
+
+#                       -- 0: Persistent cache, where a stale entry
+#                       -- for the name is dropped
+#                       --
+	cache_key = None
+	if self.derivedCache is not None:
+	  cache_key = DerivedCache.CreateKey(
+	      'derive', src_ds_name, tuple( avg_axis ), der_method,
+	      bool( use_factors ),
+	      self.dataSetThresholds.get( src_ds_name ),
+	      self.dataSetThresholds.get( 'pin_powers' )
+	      )
+	  if self.derivedCache.FindName( cache_key ) == der_ds_name and \
+	      der_ds_name in self.dataSetDefsByName:
+	    return  der_ds_name
+	  elif self.derivedCache.Remove( der_ds_name ):
+	    self._RemoveDataSetName(
+		self.GetDataSetType( der_ds_name ), der_ds_name
+		)
+	#end if self.derivedCache is not None
 
 #                       -- 1: Resolve averager
 #                       --
@@ -3002,7 +3165,9 @@ format( os.linesep, derived_label, ds_name, str( ex ) )
             pp_shape = \
 	     ( self.core.npiny, self.core.npinx, self.core.nax, self.core.nass )
             pin_powers = np.ones( pp_shape )
-          averager = gen_avg.Averages( self.core, pin_powers, self.pinFactors )
+          averager = gen_avg.Averages(
+	      self.core, pin_powers, self.GetPinFactors()
+	      )
 
 #			-- 2: Derive copy shape
 #			--
@@ -3013,23 +3178,71 @@ format( os.linesep, derived_label, ds_name, str( ex ) )
 
 #			-- 3: Add datasets to each statepoint
 #			--
-        copy_dset0 = None
-        exec_str = 'averager.calc_{0}( dset, avg_axis, use_factors )'.\
-            format( der_method )
-        for state_ndx in range( len( self.states ) ):
-          if callback:
-            callback( state_ndx )
-          dset = self.GetStateDataSet( state_ndx, src_ds_name )
-	  if dset is not None:
+        calc_method = getattr( averager, 'calc_' + der_method )
+        batch_method = \
+            getattr( averager, 'calc_{0}_batch'.format( der_method ), None )
+        src_dsets = [
+            self.GetStateDataSet( state_ndx, src_ds_name )
+	    for state_ndx in xrange( len( self.states ) )
+	    ]
+        state_ndxs = [
+	    i for i in xrange( len( src_dsets ) ) if src_dsets[ i ] is not None
+	    ]
+        pool = StatePool()
+
+#				-- Batch averagers get stacks of states,
+#				-- with weights resolved once
+        weights = None
+        state_bytes = 1
+        if batch_method is not None and state_ndxs:
+          weights = averager.\
+	      resolve_dset_weights( src_dsets[ state_ndxs[ 0 ] ], use_factors )
+          weights = np.asarray( weights )
+          state_bytes = weights.size * 8
+        batches = self._CreateStateBatches( state_ndxs, state_bytes, pool )
+        copy_dsets = {}
+
+        def compute( batch_ndx ):
+          batch = batches[ batch_ndx ]
+	  if weights is not None:
+	    data = np.empty(
+	        ( len( batch ), ) + src_dsets[ batch[ 0 ] ].shape,
+		dtype = np.float64
+		)
+	    for i in xrange( len( batch ) ):
+	      data[ i ] = src_dsets[ batch[ i ] ][ () ]
+	    avg_data = batch_method( data, weights, avg_axis )
+	    results = [
+	        avg_data[ i ].reshape( copy_shape )
+		for i in xrange( len( batch ) )
+		]
+	  else:
+	    results = [
+	        calc_method( src_dsets[ state_ndx ], avg_axis, use_factors ).
+		    reshape( copy_shape )
+		for state_ndx in batch
+		]
+          return  results
+        #end compute
+
+        def write( batch_ndx, results ):
+          for state_ndx, copy_data in zip( batches[ batch_ndx ], results ):
 	    derived_st = self.GetDerivedState( state_ndx )
-	    #avg_data = averager.calc_avg( dset, avg_axis, use_factors )
-	    avg_data = eval( exec_str )
-            copy_data = avg_data.reshape( copy_shape )
-
-	    copy_dset = derived_st.CreateDataSet( der_ds_name, copy_data )
-            if state_ndx == 0:
-              copy_dset0 = copy_dset
-        #end for state_ndx in xrange( len( self.states ) )
+	    copy_dsets[ state_ndx ] = \
+	        derived_st.CreateDataSet( der_ds_name, copy_data )
+	    if callback:
+	      callback( state_ndx )
+        #end write
+
+        completed = pool.Run(
+            xrange( len( batches ) ), compute, write,
+	    cancel_event = cancel_event
+	    )
+        if not completed:
+          for state_ndx in copy_dsets:
+	    self.GetDerivedState( state_ndx ).RemoveDataSet( der_ds_name )
+          return  None
+        copy_dset0 = copy_dsets.get( 0 )
 
 #			-- 4: Categorize
 #			--
@@ -3046,8 +3259,16 @@ format( os.linesep, derived_label, ds_name, str( ex ) )
               axial_mesh = axial_mesh,
               axial_mesh_centers = axial_mesh_centers
               )
+	  if cache_key is not None:
+	    self.derivedCache.Put(
+		cache_key, der_ds_name, copy_dsets,
+		axial_mesh = axial_mesh,
+		axial_mesh_centers = axial_mesh_centers
+		)
         #end if copy_dset0 is not None
 
+        self._ClearStatsCache( der_ds_name )
+        self._ClearTimeValuesCache( der_ds_name )
         self._FireEvent( 'newDataSet', der_ds_name )
         return  der_ds_name
 
@@ -3075,7 +3296,8 @@ and the derived CORE group are initialized.
         states (list[State]): list of states for which derived datasets will
 	    be created
     Returns:
-        tuple: h5py.File, core group (h5py.Group), list(DerivedState)
+        tuple: h5py.File, core group (h5py.Group), list(DerivedState),
+	    DerivedStore
 """
 #		-- Create temp fle
 #		--
@@ -3085,6 +3307,7 @@ and the derived CORE group are initialized.
     derived_file = h5py.File( name, 'w' )
     derived_core = derived_file.create_group( 'CORE' )
     derived_states = []
+    derived_store = DerivedStore( name )
 
     if states and len( states ) > 0:
       n = 0
@@ -3105,7 +3328,9 @@ and the derived CORE group are initialized.
 	      exp_ds = der_group.create_dataset( t, data = exp_value )
 	  #end for t
 
-	  derived_states.append( DerivedState( n, der_name, der_group ) )
+	  derived_states.append(
+	      DerivedState( n, der_name, der_group, derived_store )
+	      )
 	#end if state h5py group exists
 
 	n += 1
@@ -3114,7 +3339,7 @@ and the derived CORE group are initialized.
 
     derived_file.flush()
 
-    return  derived_file, derived_core, derived_states
+    return  derived_file, derived_core, derived_states, derived_store
   #end _CreateDerivedH5File
 
 
@@ -3267,6 +3492,41 @@ format( os.linesep, ds_name, str( ex ) )
   #end CreateDetectorAddrFromIndex
 
 
+  #----------------------------------------------------------------------
+  #	METHOD:		DataModel._CreateRange()			-
+  #----------------------------------------------------------------------
+  def _CreateRange( self, vmin, vmax ):
+    """Converts scanned min and max values into a displayable range,
+substituting defaults for missing values and widening a zero-width range.
+    Args:
+        vmin (float): minimum value found or NaN if none
+        vmax (float): maximum value found or NaN if none
+    Returns:
+        tuple: ( min_value, max_value )
+"""
+    vmin_nan = math.isnan( vmin )
+    vmax_nan = math.isnan( vmax )
+    if vmin_nan and vmax_nan:
+      range_min = -10.0
+      range_max = 10.0
+    elif vmin_nan:
+      range_min = range_max = vmax
+    elif vmax_nan:
+      range_min = range_max = vmin
+    else:
+      range_min = vmin
+      range_max = vmax
+
+    if range_min == range_max:
+      range_max = \
+          1.0  if range_min == 0.0 else \
+	  range_min - (range_min / 10.0)  if range_min < 0.0 else \
+	  range_min + (range_min / 10.0)
+
+    return  ( range_min, range_max )
+  #end _CreateRange
+
+
   #----------------------------------------------------------------------
   #	METHOD:		DataModel.CreateRangeExpression()		-
   #----------------------------------------------------------------------
@@ -3318,6 +3578,161 @@ format( os.linesep, ds_name, str( ex ) )
   #end CreateRangeExpression
 
 
+  #----------------------------------------------------------------------
+  #	METHOD:		DataModel._CreateRangeKey()			-
+  #----------------------------------------------------------------------
+  def _CreateRangeKey( self, ds_name, ds_expr = None, use_factors = False ):
+    """Creates the key for ``ranges`` and ``rangesByStatePt`` dicts.
+    Args:
+        ds_name (str): dataset name
+	ds_expr (str): optional numpy array index expression
+	use_factors (bool): True if factors are applied
+    Returns:
+        str: key
+"""
+    ds_name_key = ds_name + ds_expr  if ds_expr else  ds_name
+    return  ds_name_key + '_' + str( use_factors )
+  #end _CreateRangeKey
+
+
+  #----------------------------------------------------------------------
+  #	METHOD:		DataModel._CreateStateBatches()			-
+  #----------------------------------------------------------------------
+  def _CreateStateBatches( self, state_ndxs, state_bytes, pool ):
+    """Groups state indexes into batches for a ``StatePool`` run, with
+several batches per worker for progress and cancel.
+    Args:
+        state_ndxs (list): 0-based state indexes
+	state_bytes (int): bytes of one state in a batch, where 1 or less
+	    means one state per batch
+	pool (StatePool): pool on which the batches will run
+    Returns:
+        list: lists of state indexes
+"""
+    batch_size = 1
+    if state_bytes > 1:
+      batch_size = max( 1, min(
+          DataSetStats.CHUNK_BYTES // state_bytes,
+	  -(-len( state_ndxs ) // (pool.workerCount * 4))
+	  ) )
+    return  [
+        state_ndxs[ i : i + batch_size ]
+	for i in xrange( 0, len( state_ndxs ), batch_size )
+	]
+  #end _CreateStateBatches
+
+
+  #----------------------------------------------------------------------
+  #	METHOD:		DataModel._CreateStatsCacheKey()		-
+  #----------------------------------------------------------------------
+  def _CreateStatsCacheKey( self, ds_name, ds_expr = None, use_factors = False ):
+    """Creates the ``statsCache`` key for a dataset.
+    Args:
+        ds_name (str): dataset name
+	ds_expr (str): optional numpy array index expression
+	use_factors (bool): True if factors are applied
+    Returns:
+        str: key or None if there is no cache
+"""
+    key = None
+    if self.statsCache is not None and ds_name:
+      key = StatsCache.CreateKey(
+          ds_name, ds_expr, use_factors,
+	  self.GetDataSetScaleType( ds_name ),
+	  self.dataSetThresholds.get( ds_name )
+	  )
+    return  key
+  #end _CreateStatsCacheKey
+
+
+  #----------------------------------------------------------------------
+  #	METHOD:		DataModel._CreateTimeValuesKeys()		-
+  #----------------------------------------------------------------------
+  def _CreateTimeValuesKeys( self, spec, ds_def ):
+    """Creates the ``timeValuesCache`` keys for a ReadDataSetTimeValues()
+spec, one per pin or node address for datasets whose result is keyed by
+address, and one for the spec otherwise.  Addresses are clamped to the
+dataset shape as in ReadDataSetTimeValues().
+    Args:
+	spec (dict): dataset specification
+	ds_def (dict): dataset definition
+    Returns:
+	list: ( addr, key ) pairs, where addr is the sub_addr or node addr
+	    pair, or None for datasets whose result is a single np.ndarray,
+	    and key is ( ds_name, location, addr )
+"""
+    ds_name = spec[ 'ds_name' ]
+    ds_type = ds_def[ 'type' ]
+
+    fluence_addr = spec.get( 'fluence_addr' )
+    location = (
+	spec.get( 'assembly_index', 0 ), spec.get( 'axial_cm', 0.0 ),
+	spec.get( 'detector_index', 0 ),
+	None  if fluence_addr is None else
+	( fluence_addr.thetaIndex, fluence_addr.radiusIndex )
+	)
+
+    node_addrs = spec.get( 'node_addrs' )
+    if node_addrs is not None and not hasattr( node_addrs, '__iter__' ):
+      node_addrs = [ node_addrs ]
+    sub_addrs = spec.get( 'sub_addrs' )
+    if sub_addrs is not None and not hasattr( sub_addrs, '__iter__' ):
+      sub_addrs = [ sub_addrs ]
+
+    addrs = []
+    if ds_type in (
+        'detector', 'fixed_detector', 'fluence', 'radial_detector', 'scalar'
+	):
+      addrs = [ None ]
+
+#		-- Clamped by the shapes at the first state point
+#		--
+    elif ds_type == 'intrapin_edits' or ds_type == 'subpin_cc':
+      lookup_ds_name = ds_name[ 1 : ] if ds_name[ 0 ] == '*' else ds_name
+      dset = self.GetStateDataSet( 0, lookup_ds_name )
+      if dset is not None and sub_addrs is not None:
+	if ds_type == 'subpin_cc':
+	  pin_shape = dset.shape[ 2 : 4 ]
+	  if pin_shape[ 0 ] <= 1 or pin_shape[ 1 ] <= 1:
+	    sub_addrs = [ ( 0, 0 ) ]
+	else:
+	  count_name = DataUtils.ToString( dset.attrs[ 'PinNumRegionsArray' ] )
+	  pin_shape = self.GetStateDataSet( 0, count_name ).shape[ 0 : 2 ]
+	addrs = [
+	    ( min( a[ 0 ], pin_shape[ 1 ] - 1 ),
+	      min( a[ 1 ], pin_shape[ 0 ] - 1 ) )
+	    for a in sub_addrs
+	    ]
+
+    elif self.IsNodalType( ds_type ):
+      if 'copy_shape' in ds_def:
+	addrs = \
+	    [ ( 0, -1 ) ]  if node_addrs is None else \
+	    [ ( self.NormalizeNodeAddr( n ), -1 ) for n in node_addrs ]
+
+    elif sub_addrs is not None:
+      ds_shape = \
+          ds_def[ 'copy_shape' ]  if 'copy_shape' in ds_def else \
+	  ds_def[ 'shape' ]
+      if ds_shape[ 0 ] > 1 and ds_shape[ 1 ] > 1:
+	addrs = [
+	    ( min( a[ 0 ], ds_shape[ 1 ] - 1 ),
+	      min( a[ 1 ], ds_shape[ 0 ] - 1 ) )
+	    for a in sub_addrs
+	    ]
+      else:
+	addrs = [ None ]
+    #end if-elif ds_type
+
+    result = []
+    for addr in addrs:
+      key = ( ds_name, location, addr )
+      if key not in result:
+	result.append( key )
+    return  [ ( key[ 2 ], key ) for key in result ]
+  #end _CreateTimeValuesKeys
+
+
   #----------------------------------------------------------------------
   #	METHOD:		DataModel.ExtractSymmetryExtent()		-
   #----------------------------------------------------------------------
@@ -3365,7 +3780,7 @@ returned.  Calls FindMinMaxValueAddr().
 
     addr, state_ndx, value = self.FindMinMaxValueAddr(
         mode, ds_name, state_ndx, assy_ndx,
-        self.GetFactors( ds_name ) if use_factors else None
+	use_factors = use_factors
 	)
 
     if addr is not None:
@@ -3492,7 +3907,9 @@ occurrence of the min/max value of the dataset, which is assumed to be a
       self, mode, fluence_addr, state_ndx,
       ds_expr = None, radius_start_ndx = 0
       ):
-    """Finds the first address of the min/max value.
+    """Finds the first address of the min/max value.  As with
+``FindMinMaxValueAddr()``, each state point is reduced in a single pass,
+with per-state results shared through ``statsCache``.
     Args:
         mode (str): 'min' or 'max', defaulting to the latter
         fluence_addr (FluenceAddress): instance from which dataSetName is
@@ -3504,14 +3921,9 @@ occurrence of the min/max value of the dataset, which is assumed to be a
     Returns:
         tuple: ( z_ndx, theta_ndx, radius_ndx, state_ndx, minmax_value )
 """
-    def is_new( value, minmax, max_flag ):
-      return \
-          False  if math.isnan( value ) or math.isinf( value ) else \
-          value > minmax  if max_flag else \
-          value < minmax
-    #end is_new
-
     max_flag = mode != 'min'
+    stat_name = 'max' if max_flag else 'min'
+    arg_name = 'argmax' if max_flag else 'argmin'
     z_ndx = theta_ndx = radius_ndx = -1
     addr = minmax_value = None
 
@@ -3524,51 +3936,49 @@ occurrence of the min/max value of the dataset, which is assumed to be a
 
     if ds_name:
       if ds_expr is None:
-        ds_expr = '[ :, :, radius_start_ndx : ]'
+        ds_expr = '[:,:,{0:d}:]'.format( radius_start_ndx )
       scale_type = self.GetDataSetScaleType( ds_name )
+      cache_key = self._CreateStatsCacheKey( ds_name, ds_expr )
+      search_range = \
+          xrange( self.GetStatesCount() )  if state_ndx < 0 else \
+	  xrange( state_ndx, state_ndx + 1 )
 
-#			-- Single state point
-#			--
-      if state_ndx >= 0:
-        dset = self.GetStateDataSet( state_ndx, ds_name )
-        if dset:
-	  dset_array = eval( 'np.array( dset' + ds_expr + ' )' )
-	  if scale_type == 'log':
-	    dset_array[ dset_array <= 0.0 ] = np.nan
-          x = \
-	      np.nanargmax( dset_array ) if max_flag else \
-	      np.nanargmin( dset_array )
-	  addr = np.unravel_index( x, dset_array.shape )
-	  minmax_value = dset_array[ addr ]
-
-#		-- Multiple state points
-#		--
-      else:
-        minmax_value = -sys.float_info.max if max_flag else sys.float_info.max
-        for st in xrange( len( self.states ) ):
-          dset = self.GetStateDataSet( st, ds_name )
-	  if dset:
-	    dset_array = eval( 'np.array( dset' + ds_expr + ' )' )
-	    if scale_type == 'log':
-	      dset_array[ dset_array <= 0.0 ] = np.nan
-            x = \
-	        np.nanargmax( dset_array ) if max_flag else \
-	        np.nanargmin( dset_array )
-	    #cur_addr = np.unravel_index( x, dset.shape )[ : -2 ]
-	    cur_addr = np.unravel_index( x, dset_array.shape )
-	    cur_minmax = dset_array[ cur_addr ]
-	    if is_new( cur_minmax, minmax_value, max_flag ):
-	      addr = cur_addr
-	      state_ndx = st
-	      minmax_value = cur_minmax
-        #end for
-      #end else all states
-    #end if tally_addr.name
+      for st in search_range:
+        dset = self.GetStateDataSet( st, ds_name )
+	if dset is None:
+	  continue
+
+	stats = None
+	if cache_key:
+	  stats = self.statsCache.GetStats( cache_key, st )
+	if stats is None:
+	  stats = self._ReadStateStats(
+	      st, ds_name, ds_expr, None, scale_type, cache_key
+	      )
+
+	flat_ndx = stats[ arg_name ]
+	cur_value = stats[ stat_name ]
+	if flat_ndx >= 0:
+	  new_flag = \
+	      True  if minmax_value is None else \
+	      cur_value > minmax_value  if max_flag else \
+	      cur_value < minmax_value
+	  if new_flag:
+#					-- Shape of the expression, no data
+	    shape = IndexExpression.Compile( ds_expr ).GetShape( dset.shape )
+	    addr = np.unravel_index( flat_ndx, shape )
+	    state_ndx = st
+	    minmax_value = cur_value
+      #end for st
+
+      if cache_key:
+        self.statsCache.Flush()
+    #end if ds_name
 
 #		-- Convert from np.int64 to int
 #		--
     if addr:
-      z_ndx, theta_ndx, radius_ndx = addr
+      z_ndx, theta_ndx, radius_ndx = [ int( i ) for i in addr ]
       radius_ndx += radius_start_ndx
 
     return  z_ndx, theta_ndx, radius_ndx, state_ndx, minmax_value
@@ -3642,134 +4052,134 @@ descending.  Note bisect only does ascending.
   def FindMinMaxValueAddr(
       self, mode, ds_name,
       state_ndx = -1, assy_ndx = -1,
-      factors = None
+      factors = None, use_factors = False
       ):
-    """Finds the first address of the min/max value.
+    """Finds the first address of the min/max value.  Each state point is
+reduced to a ( value, flat index ) pair in a single streaming pass with
+``DataSetStats.ReduceStats()``, and the per-state results are merged, with
+ties going to the first state point.  Without an assembly restriction or
+explicit ``factors``, per-state results come from and are stored in
+``statsCache`` and shared with ``rangesByStatePt``.
 @param  mode		'min' or 'max', defaulting to the latter
 @param  ds_name		name of dataset to search
 @param  state_ndx	0-based state point index, or -1 for all states
 @param  assy_ndx	0-based assembly index, or -1 for all assemblies
 @param  factors		optional factors to apply to the data, where zero
 			values indicate places in the data to be ignored
+@param  use_factors	True to apply the dataset factors from GetFactors()
+			if factors is None
 @return			( dataset addr indices or None, state_ndx,
 			  minmax_value or None )
 """
-    def find_minmax( dset, ds_def, factors, assy_ndx, scale_type ):
-      dset_value = np.array( dset )
-      if scale_type == 'log':
-        dset_value[ dset_value <= 0.0 ] = np.nan
-
-      if factors is not None:
-        dset_value[ factors == 0.0 ] = \
-	    -sys.float_info.max if max_flag else sys.float_info.max
-
-      if assy_ndx >= 0 and ds_def.get( 'assy_axis', -1 ) >= 0:
-        assy_axis = ds_def[ 'assy_axis' ]
-	ds_expr = 'dset_value' + \
-	  DataUtils.CreateDataSetExpr( dset.shape, ( assy_axis, assy_ndx ) )
-	eval_str = 'np.{0:s}( {1:s} )'.\
-	    format( 'nanargmax' if max_flag else 'nanargmin', ds_expr )
-	x = eval( eval_str )
-
-	eval_str = 'np.unravel_index( x, {0:s}.shape )'.format( ds_expr )
-	temp_addr = list( eval( eval_str ) )
-	temp_addr.insert( assy_axis, assy_ndx )
-	addr = tuple( temp_addr )
-      else:
-        x = \
-	    np.nanargmax( dset_value ) if max_flag else \
-	    np.nanargmin( dset_value )
-        addr = np.unravel_index( x, dset.shape )
-
-      return  addr, dset_value[ addr ]
-    #end find_minmax
-
     max_flag = mode != 'min'
-    addr = None
+    stat_name = 'max' if max_flag else 'min'
+    arg_name = 'argmax' if max_flag else 'argmin'
+    addr = minmax_value = None
+    result_state_ndx = state_ndx
+
     ds_def = None
-    minmax_value = None
-    scale_type = 'linear'
+    ds_type = self.GetDataSetType( ds_name ) if ds_name else None
+    if ds_type:
+      ds_def = self.GetDataSetDef( ds_type )
+
+#		-- Restrict to a single assembly?
+#		--
+    assy_axis = -1
+    if assy_ndx >= 0 and ds_def:
+      assy_axis = ds_def.get( 'assy_axis', -1 )
 
 #		-- Resolve factors to dataset if necessary
 #		--
-    if ds_name and factors is not None:
-      scale_type = self.GetDataSetScaleType( ds_name )
-      if isinstance( factors, h5py.Dataset ):
-        factors = np.array( factors )
-      ds_shape = ds_def = None
-      ds_type = self.GetDataSetType( ds_name )
-      if ds_type:
-        ds_def = self.GetDataSetDef( ds_type )
-	if ds_def:
-          ds_shape = \
-              ds_def[ 'copy_shape' ] if 'copy_shape' in ds_def else \
-              ds_def[ 'shape' ]
-
-      if ds_shape is None:
+    cache_key = range_key = None
+    if factors is not None:
+      factors = self._FitFactorsToDataSet( factors, ds_def )
+      if factors is None:
         ds_name = None
+    else:
+      use_factors = bool( use_factors )
+      if assy_axis < 0:
+        cache_key = self._CreateStatsCacheKey( ds_name, None, use_factors )
+        range_key = self._CreateRangeKey( ds_name, None, use_factors )
 
-      elif factors.shape != ds_shape:
-        if 'copy_expr' not in ds_def:
-	  factors = None
-        else:
-	  sum_axis = []
-	  for i in xrange( len( ds_shape ) ):
-	    if ds_shape[ i ] != factors.shape[ i ] and ds_shape[ i ] == 1:
-	      sum_axis.append( i )
-	  #end for i
-
-          sum_factors = np.sum( factors, axis = tuple( sum_axis ) )
-	  new_factors = np.ndarray( ds_shape, dtype = np.float64 )
-	  exec_str = 'new_factors' + ds_def[ 'copy_expr' ] + ' = sum_factors'
-	  exec(
-	      exec_str, {},
-	      { 'new_factors': new_factors, 'sum_factors': sum_factors }
-	      )
-	  factors = new_factors
-        #end if-else copy_expr defined
-      #end if-else factors.shape != ds_shape:
-    #end if ds_name and factors
-
-#		-- Must have data
-#		--
-    if not (ds_name or ds_def):
-      pass
+    if ds_name:
+      scale_type = self.GetDataSetScaleType( ds_name )
+      search_range = \
+          xrange( self.GetStatesCount() )  if state_ndx < 0 else \
+	  xrange( state_ndx, state_ndx + 1 )
 
-#		-- Single state point
-#		--
-    elif state_ndx >= 0:
-      dset = self.GetStateDataSet( state_ndx, ds_name )
-      if dset:
-        addr, minmax_value = \
-            find_minmax( dset, ds_def, factors, assy_ndx, scale_type )
+      self.rangesLock.acquire()
+      try:
+        for st in search_range:
+	  dset = self.GetStateDataSet( st, ds_name )
+	  if dset is None:
+	    continue
+
+	  stats = None
+	  if cache_key:
+	    stats = self.statsCache.GetStats( cache_key, st )
+
+	  if stats is not None:
+	    shape = dset.shape
+
+	  elif assy_axis >= 0:
+	    shape = dset.shape
+	    if assy_ndx >= shape[ assy_axis ]:
+	      continue
+	    if use_factors and factors is None:
+	      factors = self._ResolveStatsFactors( ds_name )
+	    ndx = [ slice( None ) ] * len( shape )
+	    ndx[ assy_axis ] = assy_ndx
+	    ndx = tuple( ndx )
+#					-- h5py reads only the assembly
+	    src_dset, threshold = self._SplitThreshold( dset )
+	    view = src_dset[ ndx ]
+	    stats = DataSetStats.ReduceStats(
+	        view,
+		factors[ ndx ] if factors is not None else None,
+		scale_type, threshold = threshold
+		)
+	    shape = view.shape
 
-#		-- Multiple state points
-#		--
-    else:
-      minmax_value = -sys.float_info.max if max_flag else sys.float_info.max
-      for st in xrange( len( self.states ) ):
-        dset = self.GetStateDataSet( st, ds_name )
-	if dset:
-	  cur_addr, cur_minmax = \
-              find_minmax( dset, ds_def, factors, assy_ndx, scale_type )
-	  new_flag = \
-	      cur_minmax > minmax_value if max_flag else \
-	      cur_minmax < minmax_value
-	  if new_flag:
-	    addr = cur_addr
-	    state_ndx = st
-	    minmax_value = cur_minmax
-	#end if dset
-      #end for
-    #end else all states
+	  else:
+	    if use_factors and factors is None:
+	      factors = self._ResolveStatsFactors( ds_name )
+	    stats = self._ReadStateStats(
+	        st, ds_name, None, factors, scale_type, cache_key
+		)
+	    shape = dset.shape
+	  #end if-elif-else
+
+	  if range_key:
+	    self._StoreStateRange( st, range_key, stats[ 'min' ], stats[ 'max' ] )
+
+	  flat_ndx = stats[ arg_name ]
+	  cur_value = stats[ stat_name ]
+	  if flat_ndx >= 0:
+	    new_flag = \
+	        True  if minmax_value is None else \
+	        cur_value > minmax_value  if max_flag else \
+	        cur_value < minmax_value
+	    if new_flag:
+	      addr = list( np.unravel_index( flat_ndx, shape ) )
+	      if assy_axis >= 0:
+	        addr.insert( assy_axis, assy_ndx )
+	      result_state_ndx = st
+	      minmax_value = cur_value
+	  #end if flat_ndx >= 0
+        #end for st
+
+        if cache_key:
+          self.statsCache.Flush()
+      finally:
+        self.rangesLock.release()
+    #end if ds_name
 
 #		-- Convert from np.int64 to int
 #		--
     if addr:
-      temp_addr = [ int( i ) for i in addr ]
-      addr = tuple( temp_addr )
+      addr = tuple( [ int( i ) for i in addr ] )
 
-    return  addr, state_ndx, minmax_value
+    return  addr, result_state_ndx, minmax_value
   #end FindMinMaxValueAddr
 
 
@@ -3965,10 +4375,10 @@ Calls FindMinMaxValueAddr().
 """
     results = {}
 
-    factors = self.GetFactors( ds_name ) if use_factors  else None
-
-    addr, state_ndx, value = self.\
-        FindMinMaxValueAddr( mode, ds_name, state_ndx, assy_ndx, factors )
+    addr, state_ndx, value = self.FindMinMaxValueAddr(
+        mode, ds_name, state_ndx, assy_ndx,
+	use_factors = use_factors
+	)
 
     if addr is not None:
       skip = cur_obj is not None and \
@@ -4005,12 +4415,59 @@ Calls FindMinMaxValueAddr().
   #end FindPinMinMaxValue
 
 
+  #----------------------------------------------------------------------
+  #	METHOD:		DataModel._FitFactorsToDataSet()		-
+  #----------------------------------------------------------------------
+  def _FitFactorsToDataSet( self, factors, ds_def ):
+    """Resolves factors to the shape of the dataset if necessary, summing
+over axes of length 1 in the dataset shape and applying the definition
+'copy_expr'.
+    Args:
+        factors (np.ndarray or h5py.Dataset): factors to fit
+	ds_def (dict): dataset definition
+    Returns:
+        np.ndarray: factors with the dataset shape or None if they
+	    cannot be fit
+"""
+    ds_shape = None
+    if ds_def:
+      ds_shape = \
+          ds_def[ 'copy_shape' ] if 'copy_shape' in ds_def else \
+          ds_def[ 'shape' ]
+
+    if ds_shape is None:
+      factors = None
+    else:
+      factors = np.asarray( factors )
+      if factors.shape != ds_shape:
+        if 'copy_expr' not in ds_def:
+	  factors = None
+        else:
+	  sum_axis = []
+	  for i in xrange( len( ds_shape ) ):
+	    if ds_shape[ i ] != factors.shape[ i ] and ds_shape[ i ] == 1:
+	      sum_axis.append( i )
+	  #end for i
+
+          sum_factors = np.sum( factors, axis = tuple( sum_axis ) )
+	  new_factors = np.ndarray( ds_shape, dtype = np.float64 )
+	  IndexExpression.Compile( ds_def[ 'copy_expr' ] ).\
+	      Assign( new_factors, sum_factors )
+	  factors = new_factors
+        #end if-else copy_expr defined
+      #end if factors.shape != ds_shape
+    #end if-else ds_shape
+
+    return  factors
+  #end _FitFactorsToDataSet
+
+
   #----------------------------------------------------------------------
   #	METHOD:		DataModel._FireEvent()				-
   #----------------------------------------------------------------------
   def _FireEvent( self, event_name, *params ):
     """Calls event_name listeners passing self, and the list of params.
-@param  event_name	'newDataSet'
+@param  event_name	'newDataSet' or 'ready'
 @param  params		event params
 """
     if event_name in self.listeners:
@@ -4114,16 +4571,64 @@ axial mesh centers.
 			if ds_type is None, dict of averager objects by
 			ds_type
 """
+    self.WaitReady()
     return \
 	self.averagers.get( ds_type ) if ds_type else \
         self.averagers
   #end GetAverager
 
 
+  #----------------------------------------------------------------------
+  #	METHOD:		DataModel._GetCachedTimeValues()		-
+  #----------------------------------------------------------------------
+  def _GetCachedTimeValues( self, spec, ds_def, result ):
+    """Adds cached ReadDataSetTimeValues() values for the addresses in a
+spec to the result.
+    Args:
+	spec (dict): dataset specification
+	ds_def (dict): dataset definition
+	result (dict): ReadDataSetTimeValues() result to update
+    Returns:
+	dict: copy of the spec with only the addresses not cached, or None
+	    if none need be read
+"""
+    ds_name = spec[ 'ds_name' ]
+    missing = []
+    with self.timeValuesLock:
+      for addr, key in self._CreateTimeValuesKeys( spec, ds_def ):
+	cached = self.timeValuesCache.pop( key, None )
+	if cached is None:
+	  missing.append( addr )
+	else:
+	  self.timeValuesCache[ key ] = cached
+	  if addr is None:
+	    result[ ds_name ] = cached.copy()
+	  elif isinstance( cached, dict ):
+	    result.setdefault( ds_name, {} ).update(
+		( k, v.copy() ) for k, v in six.iteritems( cached )
+		)
+	  else:
+	    result.setdefault( ds_name, {} )[ addr ] = cached.copy()
+      #end for addr, key
+    #end with
+
+    read_spec = None
+    if missing:
+      read_spec = dict( spec )
+      if missing[ 0 ] is not None:
+	if self.IsNodalType( ds_def[ 'type' ] ):
+	  read_spec[ 'node_addrs' ] = [ addr[ 0 ] for addr in missing ]
+	else:
+	  read_spec[ 'sub_addrs' ] = missing
+    return  read_spec
+  #end _GetCachedTimeValues
+
+
   #----------------------------------------------------------------------
   #	METHOD:		DataModel.GetChannelFactors()			-
   #----------------------------------------------------------------------
   def GetChannelFactors( self ):
+    self.WaitReady()
     return  self.channelFactors
   #end GetChannelFactors
 
@@ -4458,6 +4963,18 @@ the derived dataset can be created.  Lazily created and cached.
   #end GetDerivableTypes
 
 
+  #----------------------------------------------------------------------
+  #	METHOD:		DataModel.GetDerivedCache()			-
+  #----------------------------------------------------------------------
+  def GetDerivedCache( self ):
+    """Accessor for the 'derivedCache' property.
+    Returns:
+        DerivedCache: self.derivedCache, None if not enabled
+"""
+    return  self.derivedCache
+  #end GetDerivedCache
+
+
   #----------------------------------------------------------------------
   #	METHOD:		DataModel.GetDerivedCoreGroup()			-
   #----------------------------------------------------------------------
@@ -4466,6 +4983,7 @@ the derived dataset can be created.  Lazily created and cached.
     Returns:
         h5py.Group: self.derivedCoreGroup
 """
+    self.WaitReady()
     return  self.derivedCoreGroup
   #end GetDerivedCoreGroup
 
@@ -4507,6 +5025,7 @@ Shouldn't be used any more.
 @return			DerivedState object or None if derivedStates not
 			defined or ndx out of range
 """
+    self.WaitReady()
     return  \
 	self.derivedStates[ ndx ]  \
 	if self.derivedStates is not None and ndx >= 0 and \
@@ -4522,6 +5041,7 @@ Shouldn't be used any more.
     """Accessor for the 'derivedStates' property.
 @return			list of DerivedState instances or None
 """
+    self.WaitReady()
     return  self.derivedStates
   #end GetDerivedStates
 
@@ -4534,6 +5054,7 @@ Shouldn't be used any more.
 @param  dset		dataset to match
 @return			factors np.ndarray or None
 """
+    self.WaitReady()
     result = None
 
     dset = None
@@ -4565,11 +5086,8 @@ Shouldn't be used any more.
         result = np.ndarray( ddef[ 'copy_shape' ], dtype = np.float64 )
         result.fill( 0.0 )
   	factors_sum = np.sum( self.channelFactors, axis = 2 )
-  	exec_str = 'result' + ddef[ 'copy_expr' ] + ' = factors_sum'
-  	exec(
-	    exec_str, {},
-  	    { 'factors_sum': factors_sum, 'result': result }
-  	    )
+	IndexExpression.Compile( ddef[ 'copy_expr' ] ).\
+	    Assign( result, factors_sum )
   
       elif 'factors' in ddef and 'copy_shape' in ddef and \
           'pin' in self.averagers:
@@ -4580,14 +5098,7 @@ Shouldn't be used any more.
 #	    exec_str, {},
 #  	    { 'averager': self.averagers[ 'pin' ], 'result': result }
 #  	    )
-  	exec_str = 'result[ : ] = averager.resolve_dset_weights( dset )'
-        exec(
-            exec_str, {},
-            {
-            'averager': self.averagers[ 'pin' ],
-            'dset': dset,
-            'result': result
-            })
+	result[ : ] = self.averagers[ 'pin' ].resolve_dset_weights( dset )
       #end if dset is not None
     #end if result is None
 
@@ -4642,6 +5153,49 @@ Shouldn't be used any more.
   #end GetH5File
 
 
+  #----------------------------------------------------------------------
+  #	METHOD:		DataModel.GetHistogram()			-
+  #----------------------------------------------------------------------
+  def GetHistogram( self, ds_name, state_ndx, bins = 64, use_factors = False ):
+    """Gets the histogram of dataset values for a state point with bins
+spanning the global range, served from ``statsCache`` when possible.
+    Args:
+        ds_name (str): dataset name
+	state_ndx (int): 0-based statept index
+	bins (int): number of bins
+	use_factors (bool): True to apply factors
+    Returns:
+        tuple: ( np.ndarray counts, np.ndarray bin edges ) or None if the
+	    dataset does not exist in the state point
+"""
+    result = None
+    ds_range = self.GetRange( ds_name, -1, None, use_factors )
+    cache_key = self._CreateStatsCacheKey( ds_name, None, use_factors )
+    if cache_key:
+      result = self.statsCache.GetHistogram( cache_key, state_ndx, bins )
+
+    if result is None:
+      dset = self.GetStateDataSet( state_ndx, ds_name )
+      if dset is not None:
+        factors = \
+	    self._ResolveStatsFactors( ds_name )  if use_factors else  None
+        dset, threshold = self._SplitThreshold( dset )
+        result = DataSetStats.ReduceHistogram(
+	    dset, bins, ds_range, factors,
+	    self.GetDataSetScaleType( ds_name ), threshold = threshold
+	    )
+	if cache_key:
+	  self.statsCache.PutHistogram(
+	      cache_key, state_ndx, self.GetStatesCount(),
+	      result[ 0 ], result[ 1 ], self._IsStatsPersistent( ds_name )
+	      )
+	  self.statsCache.Flush()
+    #end if result is None
+
+    return  result
+  #end GetHistogram
+
+
   #----------------------------------------------------------------------
   #	METHOD:		DataModel.GetNodeAddr()				-
   #----------------------------------------------------------------------
@@ -4690,6 +5244,7 @@ Shouldn't be used any more.
   #	METHOD:		DataModel.GetNodeFactors()			-
   #----------------------------------------------------------------------
   def GetNodeFactors( self ):
+    self.WaitReady()
     return  self.nodeFactors
   #end GetNodeFactors
 
@@ -4698,6 +5253,7 @@ Shouldn't be used any more.
   #	METHOD:		DataModel.GetPinFactors()			-
   #----------------------------------------------------------------------
   def GetPinFactors( self ):
+    self.WaitReady()
     return  self.pinFactors
   #end GetPinFactors
 
@@ -4763,8 +5319,7 @@ the properties construct for this class soon.
           tndx = core.fluenceMesh.FindThetaStopIndex( core.coreSym )
           ds_expr = '[:,:{0:d},{1:d}:]'.format( tndx, rndx )
 
-      ds_name_key = ds_name + ds_expr  if ds_expr else  ds_name
-      ds_name_key += '_' + str( use_factors )
+      ds_name_key = self._CreateRangeKey( ds_name, ds_expr, use_factors )
       ds_range = range_dict.get( ds_name_key )
       if ds_range is None:
         ds_range = \
@@ -4845,26 +5400,37 @@ copying a derived dataset into a 4D array if necessary.
         state_ndx (int): 0-based state point index
 	ds_name (str): dataset name, normal or derived
     Returns:
-        h5py.Dataset: object if found or None
+        h5py.Dataset: object if found or None, wrapped in a
+	    ThresholdDataSet if ``ds_name`` has a threshold
 """
     derived_st = dset = st = None
 
     if ds_name:
       st = self.GetState( state_ndx )
-      derived_st = self.GetDerivedState( state_ndx )
 
     #if st and derived_st:
     if st is not None:
       self.dataSetDefsLock.acquire()
       try:
 	core_flag = False
-        if self.IsCoreGroupDataSet( ds_name ):
+	if self.IsCoreGroupDataSet( ds_name ):
 	  core_flag = True
 	  dset = self.core.group[ ds_name ]
 	else:
 	  dset = st.GetDataSet( ds_name )
+
+#				-- Derived state only when needed, so reads
+#				-- of file datasets need not wait on Read()
+	ds_def = self.dataSetDefsByName.get( ds_name )
+	if dset is None or \
+	    (ds_def is not None and 'type_object' in ds_def) or \
+	    (len( dset.shape ) < 4 and dset.shape != ( 1, ) and \
+	     dset.shape != ()):
+	  derived_st = self.GetDerivedState( state_ndx )
 	if dset is None and derived_st is not None:
 	  dset = derived_st.GetDataSet( ds_name )
+	if dset is None and self.derivedCache is not None:
+	  dset = self.derivedCache.GetDataSet( ds_name, state_ndx )
 
 #				-- Special cases
 #				--
@@ -4903,39 +5469,30 @@ copying a derived dataset into a 4D array if necessary.
 	      dset = copy_dset
 	    elif ds_def is not None and 'copy_expr' in ds_def:
 	      copy_data = np.zeros( ds_def[ 'copy_shape' ], dtype = np.float64 )
-	      exec_str = 'copy_data' + ds_def[ 'copy_expr' ] + ' = dset'
+	      copy_expr = IndexExpression.Compile( ds_def[ 'copy_expr' ] )
 
 	      if len( dset.shape ) == 0 or dset.shape == ( 1, ):
 	        copy_data[ 0, 0, 0, 0 ] = \
                     dset[ 0 ] if len( dset.shape ) > 0  else dset[ () ]
 	      else:
-	        globals_env = {}
-	        locals_env = { 'copy_data': copy_data, 'dset': dset }
-	        exec( exec_str, globals_env, locals_env )
+	        copy_expr.Assign( copy_data, dset )
 		if core_flag:
 		  dset = self.derivedCoreGroup.create_dataset(
-		      copy_name, data = locals_env[ 'copy_data' ]
+		      copy_name, data = copy_data
 		      )
 		else:
 	          dset = derived_st.\
-		      CreateDataSet( copy_name, locals_env[ 'copy_data' ] )
+		      CreateDataSet( copy_name, copy_data )
 	      #end else not: len( dset.shape ) == 0 or ...
 	    #end elif ds_def is not None and 'copy_expr' in ds_def
           #end elif len( dset.shape ) < 4 and dset.shape != ( 1, )...
 	#end if dset
 
-#				-- Threshold for ds_name?
+#				-- Threshold for ds_name, applied on read
 #				--
 	range_expr = self.dataSetThresholds.get( ds_name )
-	if range_expr and dset is not None and derived_st is not None:
-	  thold_ds_name = 'threshold:' + ds_name
-	  thold_dset = derived_st.GetDataSet( thold_ds_name )
-	  if thold_dset is not None:
-	    dset = thold_dset
-	  else:
-	    thold_arr = range_expr.ApplyThreshold( np.array( dset ) )
-	    dset = derived_st.CreateDataSet( thold_ds_name, thold_arr )
-	#end if dset
+	if range_expr and dset is not None:
+	  dset = ThresholdDataSet( dset, range_expr )
 
       finally:
         self.dataSetDefsLock.release()
@@ -4956,7 +5513,8 @@ copying a derived dataset into a 4D array if necessary.
         state_ndx (int): 0-based state point index
 	ds_name (str): dataset name, normal or derived
     Returns:
-        h5py.Dataset: object if found or None
+        h5py.Dataset: object if found or None, wrapped in a
+	    ThresholdDataSet if ``ds_name`` has a threshold
 """
     derived_st = dset = st = None
 
@@ -5004,7 +5562,7 @@ copying a derived dataset into a 4D array if necessary.
 	      copy_data = \
 	          np.ndarray( ds_def[ 'copy_shape' ], dtype = np.float64 )
 	      copy_data.fill( 0.0 )
-	      exec_str = 'copy_data' + ds_def[ 'copy_expr' ] + ' = dset'
+	      copy_expr = IndexExpression.Compile( ds_def[ 'copy_expr' ] )
 
 	      #if copy_data.size == 1:  This picks up non-scalars of size 1
 	      if len( dset.shape ) == 0 or dset.shape == ( 1, ):
@@ -5012,33 +5570,24 @@ copying a derived dataset into a 4D array if necessary.
 		    dset[ 0 ] if len( dset.shape ) > 0 else dset[ () ]
 	        #copy_data[ 0, 0, 0, 0 ] = np.array( dset ).item()
 	      else:
-	        globals_env = {}
-	        locals_env = { 'copy_data': copy_data, 'dset': dset }
-	        exec( exec_str, globals_env, locals_env )
+	        copy_expr.Assign( copy_data, dset )
 		if core_flag:
 		  dset = self.derivedCoreGroup.create_dataset(
-		      copy_name, data = locals_env[ 'copy_data' ]
+		      copy_name, data = copy_data
 		      )
 		else:
 	          dset = derived_st.\
-		      CreateDataSet( copy_name, locals_env[ 'copy_data' ] )
+		      CreateDataSet( copy_name, copy_data )
 	      #end if-else copy_data.size
 	    #end if ds_def is not None
 	  #end if-else copy_dset
         #end if must copy
 
-#				-- Threshold for ds_name?
+#				-- Threshold for ds_name, applied on read
 #				--
 	range_expr = self.dataSetThresholds.get( ds_name )
-	if range_expr and dset is not None and derived_st is not None:
-	  thold_ds_name = 'threshold:' + ds_name
-	  thold_dset = derived_st.GetDataSet( thold_ds_name )
-	  if thold_dset is not None:
-	    dset = thold_dset
-	  else:
-	    thold_arr = range_expr.ApplyThreshold( np.array( dset ) )
-	    dset = derived_st.CreateDataSet( thold_ds_name, thold_arr )
-	#end if dset
+	if range_expr and dset is not None:
+	  dset = ThresholdDataSet( dset, range_expr )
 
       finally:
         self.dataSetDefsLock.release()
@@ -5103,6 +5652,46 @@ copying a derived dataset into a 4D array if necessary.
   #end GetSubAddrFromNode
 
 
+  #----------------------------------------------------------------------
+  #	METHOD:		DataModel._GetTimeStoreDataSet()		-
+  #----------------------------------------------------------------------
+  def _GetTimeStoreDataSet( self, time_store, ds_name, ds_def ):
+    """Finds the time-major store dataset for a state dataset that
+GetStateDataSet() would return unmodified, i.e., not a core dataset, not
+resolved or copied into another shape, and without a threshold.  These are
+4D datasets, scalars, and detector and fluence datasets, which are read
+by index.  Single value pin datasets are read whole and so are not served
+from the store.
+    Args:
+	time_store (TimeStore): store
+	ds_name (str): dataset name, not '*'-prefixed
+	ds_def (dict): dataset definition
+    Returns:
+	tuple: ( h5py.Dataset first state dataset, h5py.Dataset store
+	    dataset ) or None if not in the store
+"""
+    result = None
+    if time_store is not None and ds_def is not None and \
+	'type_object' not in ds_def and \
+	ds_def.get( 'type' ) != 'intrapin_edits' and \
+	ds_name not in self.dataSetThresholds and \
+	not self.IsCoreGroupDataSet( ds_name ):
+      dset = self.states[ 0 ].GetDataSet( ds_name )
+      if dset is not None and (
+	  (len( dset.shape ) >= 4 and dset.size > 1) or
+	  (ds_def[ 'type' ] == 'scalar' and dset.shape in ( (), ( 1, ) )) or
+	  ds_def[ 'type' ] in
+	      ( 'detector', 'fixed_detector', 'fluence', 'radial_detector' )
+	  ):
+	store_dset = time_store.GetDataSet( dset.name.split( '/' )[ -1 ] )
+	if store_dset is not None and \
+	    store_dset.shape == dset.shape + ( len( self.states ), ):
+	  result = ( dset, store_dset )
+
+    return  result
+  #end _GetTimeStoreDataSet
+
+
   #----------------------------------------------------------------------
   #	METHOD:		DataModel.GetTimeValue()			-
   #----------------------------------------------------------------------
@@ -5348,6 +5937,40 @@ for NaN.  For now, we just assume 0.0 is "no data".
   #end IsNodalType
 
 
+  #----------------------------------------------------------------------
+  #	METHOD:		DataModel._IsStatsPersistent()			-
+  #----------------------------------------------------------------------
+  def _IsStatsPersistent( self, ds_name ):
+    """Determines if ``statsCache`` entries for the dataset may be written
+to disk, meaning the dataset is read from the file rather than created in
+this session.
+    Args:
+        ds_name (str): dataset name
+    Returns:
+        bool: True if persistent
+"""
+    result = False
+    if ds_name and self.states:
+      st_group = self.states[ 0 ].GetGroup()
+      result = self.IsCoreGroupDataSet( ds_name ) or \
+          (st_group is not None and ds_name in st_group)
+    return  result
+  #end _IsStatsPersistent
+
+
+  #----------------------------------------------------------------------
+  #	METHOD:		DataModel.IsReady()				-
+  #----------------------------------------------------------------------
+  def IsReady( self ):
+    """
+    Returns:
+	bool: True if Read() is complete, False if still completing in the
+	    background
+"""
+    return  self.readyEvent.is_set()
+  #end IsReady
+
+
   #----------------------------------------------------------------------
   #	METHOD:		DataModel.IsValid()				-
   #----------------------------------------------------------------------
@@ -5566,16 +6189,71 @@ being one greater in each dimension.
         maxx += 1
         maxy += 1
 
-    result = []
-    for addr in addr_list:
-      result.append( (
-          max( 0, min( addr[ 0 ], maxx ) ),
-          max( 0, min( addr[ 1 ], maxy ) )
-	  ) )
+    result = []
+    for addr in addr_list:
+      result.append( (
+          max( 0, min( addr[ 0 ], maxx ) ),
+          max( 0, min( addr[ 1 ], maxy ) )
+	  ) )
+
+    #return  result
+    return  list( set( result ) )
+  #end NormalizeSubAddrs
+
+
+  #----------------------------------------------------------------------
+  #	METHOD:		DataModel._OnTimeStoreBuilt()			-
+  #----------------------------------------------------------------------
+  def _OnTimeStoreBuilt( self, store_path ):
+    """Called on the TimeStore.BuildAsync() thread when the store for
+this file is complete.
+"""
+    if self.h5File is not None and self.timeStore is None:
+      try:
+	self.timeStore = \
+	    TimeStore.Open( self.h5File.filename, len( self.states ) )
+      except Exception, ex:
+	self.logger.warning( 'Time store not used: %s', str( ex ) )
+  #end _OnTimeStoreBuilt
+
+
+  #----------------------------------------------------------------------
+  #	METHOD:		DataModel._PutTimeValues()			-
+  #----------------------------------------------------------------------
+  def _PutTimeValues( self, spec, ds_def, result ):
+    """Caches the ReadDataSetTimeValues() values for each address in a
+spec, dropping the least recently used beyond ``TIME_VALUES_CACHE_SIZE``
+entries.
+    Args:
+	spec (dict): dataset specification whose values were read
+	ds_def (dict): dataset definition
+	result (dict): ReadDataSetTimeValues() result
+"""
+    values = result.get( spec[ 'ds_name' ] )
+    if values is not None:
+      with self.timeValuesLock:
+	for addr, key in self._CreateTimeValuesKeys( spec, ds_def ):
+	  if addr is None:
+	    value = values.copy()
+	  elif ds_def[ 'type' ] in ( 'intrapin_edits', 'subpin_cc' ):
+	    value = dict(
+		( k, v.copy() ) for k, v in six.iteritems( values )
+		if k[ 0 : 2 ] == addr
+		)
+	  else:
+	    value = values.get( addr )
+	    if value is not None:
+	      value = value.copy()
+
+	  if value is not None:
+	    self.timeValuesCache.pop( key, None )
+	    self.timeValuesCache[ key ] = value
+	#end for addr, key
 
-    #return  result
-    return  list( set( result ) )
-  #end NormalizeSubAddrs
+	while len( self.timeValuesCache ) > DataModel.TIME_VALUES_CACHE_SIZE:
+	  self.timeValuesCache.popitem( last = False )
+      #end with
+  #end _PutTimeValues
 
 
   #----------------------------------------------------------------------
@@ -5591,9 +6269,20 @@ being one greater in each dimension.
     if isinstance( h5f_param, h5py.File ):
       self.h5File = h5f_param
     else:
-      self.h5File = h5py.File( str( h5f_param ) )
+#			-- Read-only so the file mtime, part of the
+#			-- StatsCache identity, is not touched
+      self.h5File = h5py.File( str( h5f_param ), 'r' )
     self.name = os.path.splitext( os.path.basename( self.h5File.filename ))[ 0 ]
 
+    try:
+      self.statsCache = StatsCache(
+          self.h5File.filename, persistent = StatsCache.IsEnabled()
+	  )
+    except Exception, ex:
+      self.logger.warning( 'Stats cache not persistent: %s', str( ex ) )
+      self.statsCache = \
+          StatsCache( self.h5File.filename, persistent = False )
+
     self.core = Core( self.h5File )
     self.states = State.ReadAll( self.h5File )
 
@@ -5604,6 +6293,16 @@ being one greater in each dimension.
     assert self.states is not None and len( self.states ) > 0, \
         'No state points could be read'
 
+#		-- Time-major store, built in the background if enabled
+#		--
+    try:
+      self.timeStore = \
+	  TimeStore.Open( self.h5File.filename, len( self.states ) )
+      if self.timeStore is None and TimeStore.IsAutoBuild():
+	TimeStore.BuildAsync( self.h5File.filename, self._OnTimeStoreBuilt )
+    except Exception, ex:
+      self.logger.warning( 'Time store not used: %s', str( ex ) )
+
     st_group = self.states[ 0 ].GetGroup()
 
 #		-- Resolve axial meshes
@@ -5691,82 +6390,50 @@ format( str( pin_powers_shape ), str( ( core_shape ) ) )
     self.ranges = {}
     self.rangesByStatePt = [ dict() for i in xrange( len( self.states ) ) ]
 
-#		-- Create derived file and states
-#		--
-    self.derivedFile, self.derivedCoreGroup, self.derivedStates = \
-        self._CreateDerivedH5File( self.states )
-
-#		-- Special check for pin_factors and node_factors
+#		-- Persistent derived datasets, with names added now and
+#		-- data read on access
 #		--
-    node_factors = pin_factors = None
-    pin_factors_shape = \
-        ( self.core.npiny, self.core.npinx, self.core.nax, self.core.nass )
-    for name, group in (
-	( 'pin_factors', self.core.GetGroup() ),
-	#( 'core.pin_factors', self.h5File )
-        ):
-      if name in group:
-        #darray = group[ name ].value
-        darray = np.array( group[ name ] )
-	if darray.shape == pin_factors_shape:
-	  pin_factors = darray
-	  break
-    #end for
-
-#		-- Set up the pin averager
+    if DerivedCache.IsEnabled():
+      try:
+	self.derivedCache = DerivedCache( self.h5File.filename )
+	for ds_name, entry, dset in self.derivedCache.GetEntries():
+	  if ds_name in self.dataSetDefsByName:
+	    pass
+	  elif entry[ 'dsType' ]:
+	    self.AddDataSetName( entry[ 'dsType' ], ds_name )
+	  else:
+	    self.resolver.ResolveDataSet(
+		dset, ds_name,
+		axial_mesh = entry[ 'axialMesh' ],
+		axial_mesh_centers = entry[ 'axialMeshCenters' ]
+		)
+	#end for ds_name, entry, dset
+      except Exception, ex:
+	self.logger.warning( 'Derived cache not used: %s', str( ex ) )
+	self.derivedCache = None
+    #end if DerivedCache.IsEnabled()
+
+#		-- Complete now or in the background.  Auto-derived scalar
+#		-- names are added now, before there are any listeners, using
+#		-- the averagers from __init__(), which have the same classes
 #		--
-#    if 'pin' in self.averagers:
-#      avg = self.averagers[ 'pin' ]
-    pin_powers_ds = self.GetStateDataSet( len( self.states ) >> 1, 'pin_powers' )
-    if pin_powers_ds is not None:
-      ref_pin_powers = np.array( pin_powers_ds )
-    else:
-      ref_pin_powers = np.ones( pin_factors_shape )
-
-    avg = gen_avg.Averages( self.core, ref_pin_powers, pin_factors )
-    self.averagers[ 'pin' ] = avg
-#    avg.load( self.core, ref_pin_powers, pin_factors )
-    if pin_factors is None:
-      #pin_factors = avg.get_weights( pin_factors_shape )
-      pin_factors = avg.resolve_dset_weights( ref_pin_powers )
-    #xxx node_factors = avg.resolve_dset_node_weights( ref_pin_powers )
-
-    if node_factors is None:
-      self.nodeFactors = \
-          np.ones( ( 1, 4, self.core.nax, self.core.nass ), dtype = np.int )
-    else:
-      self.nodeFactors = np.ndarray(
-          ( 1, 4, self.core.nax, self.core.nass ),
-	  dtype = np.float64
+    if DataModel.IsFastOpen():
+      self.readyEvent.clear()
+      for name, ddef in six.iteritems( AUTO_DERIVED_SCALAR_DEFS ):
+	ds_names = ddef.get( 'datasets' )
+	if not hasattr( ds_names, '__iter__' ):
+	  ds_names = [ ds_names ]
+	if hasattr( self.averagers.get( ddef[ 'averager' ] ), ddef[ 'method' ] ) \
+	    and all( st_group.get( n ) is not None for n in ds_names ):
+	  self.AddDataSetName( 'scalar', name )
+
+      self.readThread = threading.Thread(
+	  target = self._ReadDeferred, name = 'DataModel.Read'
 	  )
-      self.nodeFactors[ 0, :, :, : ] = node_factors
-
-    self.pinFactors = \
-        pin_factors if pin_factors is not None else \
-        np.ones( pin_factors_shape, dtype = np.int )
-
-#		-- Set up the channel averager
-#		--
-#    if 'channel' in self.averagers:
-#      avg = self.averagers[ 'channel' ]
-#      avg.load( self.core )
-    avg = chan_avg.Averages( self.core )
-    self.averagers[ 'channel' ] = avg
-    self.channelFactors = np.ones(
-        ( self.core.npiny + 1, self.core.npinx + 1,
-	  self.core.nax, self.core.nass ),
-        dtype = np.int
-	)
-
-#		-- Automatically derive scalars
-#		--
-    for name, ddef in six.iteritems( AUTO_DERIVED_SCALAR_DEFS ):
-      try:
-        self.logger.info( 'auto deriving ' + name )
-        self._CreateDerivedScalarDataSet( name, **ddef )
-      except Exception as ex:
-        #self.logger.exception( ex )
-        self.logger.warning( str( ex ) )
+      self.readThread.daemon = True
+      self.readThread.start()
+    else:
+      self._ReadDeferred()
   #end Read
 
 
@@ -6004,7 +6671,10 @@ format( str( pin_powers_shape ), str( ( core_shape ) ) )
       ds_expr = None,
       use_factors = False
       ):
-    """Scans the data for the range.  Could be very time consuming.
+    """Scans the data for the range, one chunk at a time, computing min and
+max values in a single pass per state point.  When scanning all state points,
+each state point range is stored in ``rangesByStatePt`` so subsequent
+per-state requests need not re-scan.  Caller must hold ``rangesLock``.
     Args:
         ds_name (str): dataset name
 	state_ndx (int): 0-based statept index or -1 for all states
@@ -6020,85 +6690,44 @@ format( str( pin_powers_shape ), str( ( core_shape ) ) )
       search_range = \
           xrange( self.GetStatesCount() )  if state_ndx < 0 else \
 	  xrange( state_ndx, state_ndx + 1 )
+      ds_name_key = self._CreateRangeKey( ds_name, ds_expr, use_factors )
+      scale_type = self.GetDataSetScaleType( ds_name )
+      cache_key = self._CreateStatsCacheKey( ds_name, ds_expr, use_factors )
+      factors = None
 
 #		-- For each state point
 #		--
-      factors = self.GetFactors( ds_name )  if use_factors else  None
-      if isinstance( factors, h5py.Dataset ):
-        factors = np.array( factors )
-
       for i in search_range:
-	dset = self.GetStateDataSet( i, ds_name )
-
-        if dset is not None:
-	  if ds_expr:
-	    dset_array = eval( 'dset' + ds_expr )
-	    if factors is not None:
-	      factors = eval( 'factors' + ds_expr )
-	  else:
-	    dset_array = np.array( dset )
-
-	  if factors is not None:
-#	    dset_array = dset_array[ factors[:] > 0 ]
-	    dset_array = dset_array[ factors > 0 ]
-	  scale_type = self.GetDataSetScaleType( ds_name )
+	stats = None
+	if cache_key:
+	  stats = self.statsCache.GetStats( cache_key, i )
+
+	if stats is None:
+	  if use_factors and factors is None:
+	    factors = self._ResolveStatsFactors( ds_name, ds_expr )
+	  stats = self._ReadStateStats(
+	      i, ds_name, ds_expr, factors, scale_type, cache_key
+	      )
 
-#			-- Find max and min values
-#			--
-	  #if len( dset_array.shape ) > 0:
-	  if dset_array.size > 1:
-	    if scale_type == 'log':
-	      dset_array[ dset_array <= 0.0 ] = np.nan
-	    cur_max = np.nanmax( dset_array )
-	    if not (math.isnan( cur_max ) or math.isinf( cur_max )):
-	      if math.isnan( vmax ) or cur_max > vmax:
-	        vmax = cur_max
-
-#	    cur_nz = dset_array[ np.nonzero( dset_array ) ]
-#	    if len( cur_nz ) > 0:
-#	      cur_min = np.nanmin( cur_nz )
-#	      if not (math.isnan( cur_min ) or math.isinf( cur_min )):
-#	        if math.isnan( vmin ) or cur_min < vmin:
-#	          vmin = cur_min
-	    cur_min = np.nanmin( dset_array )
-	    if not (math.isnan( cur_min ) or math.isinf( cur_min )):
-	      if math.isnan( vmin ) or cur_min < vmin:
-	        vmin = cur_min
-          elif dset_array.size > 0:
-            #cur_value = dset_array[ () ]
-	    cur_value = dset_array.item()
-	    if not (scale_type == 'log' and cur_value <= 0.0) and \
-	        not (math.isnan( cur_value ) or math.isinf( cur_value )):
-	      if math.isnan( vmax ) or cur_value > vmax:
-	        vmax = cur_value
-	      if math.isnan( vmin ) or cur_value < vmin:
-	        vmin = cur_value
-	  #end else not len( dset_array.shape ) > 0
-	#end if dset
+	cur_min = stats[ 'min' ]  if stats else  NAN
+	cur_max = stats[ 'max' ]  if stats else  NAN
+	if not math.isnan( cur_max ):
+	  if math.isnan( vmax ) or cur_max > vmax:
+	    vmax = cur_max
+	if not math.isnan( cur_min ):
+	  if math.isnan( vmin ) or cur_min < vmin:
+	    vmin = cur_min
+
+#			-- Share with per-state requests
+	if state_ndx < 0:
+	  self._StoreStateRange( i, ds_name_key, cur_min, cur_max )
       #end for states
-    #end if ds_name
-
-    vmin_nan = math.isnan( vmin )
-    vmax_nan = math.isnan( vmax )
-    if vmin_nan and vmax_nan:
-      range_min = -10.0
-      range_max = 10.0
-    elif vmin_nan:
-      range_min = range_max = vmax
-    elif vmax_nan:
-      range_min = range_max = vmin
-    else:
-      range_min = vmin
-      range_max = vmax
 
-    if range_min == range_max:
-      #range_max = 1.0  if range_min == 0.0 else  range_min + (range_min / 10.0)
-      range_max = \
-          1.0  if range_min == 0.0 else \
-	  range_min - (range_min / 10.0)  if range_min < 0.0 else \
-	  range_min + (range_min / 10.0)
+      if cache_key:
+        self.statsCache.Flush()
+    #end if ds_name
 
-    return  ( range_min, range_max )
+    return  self._CreateRange( vmin, vmax )
   #end _ReadDataSetRange
 
 
@@ -6131,7 +6760,7 @@ format( str( pin_powers_shape ), str( ( core_shape ) ) )
 
         if dset:
 	  if ds_expr:
-	    dset_array = eval( 'dset' + ds_expr )
+	    dset_array = IndexExpression.Compile( ds_expr ).Apply( dset )
 	  else:
 	    dset_array = np.array( dset )
 
@@ -6176,8 +6805,12 @@ format( str( pin_powers_shape ), str( ( core_shape ) ) )
   #----------------------------------------------------------------------
   def ReadDataSetTimeValues( self, *ds_specs_in ):
     """Reads values for a dataset across all state points, one state point
-at a time for better performance.
-required.
+at a time for better performance.  Only the addressed values are read from
+each state point dataset, and reads repeated across specs for the same
+state point are shared.  Results are cached per pin or node address in
+``timeValuesCache``, so only addresses not already cached are read.
+Datasets in ``timeStore`` are read as one time series per selection rather
+than once per state point.
     Args:
 	ds_specs_in (list): list of dataset specifications with the following
 	    keys:
@@ -6199,7 +6832,7 @@ required.
     result = {}
 
 #		-- Loop on specs to get valid dataset definitions,
-#		--   process 'state'
+#		--   process 'state', and check the cache
 #		--
     ds_defs = {}
     ds_specs = []
@@ -6216,20 +6849,64 @@ required.
 	  if ds_def is None:
 	    ds_def = DATASET_DEFS[ 'scalar' ]
 	  ds_defs[ ds_name ] = ds_def
-	  ds_specs.append( spec )
+	  read_spec = self._GetCachedTimeValues( spec, ds_def, result )
+	  if read_spec is not None:
+	    ds_specs.append( read_spec )
 	#end if-else ds_name
       #end if spec
     #end for
 
+#		-- Find datasets in the time-major store
+#		--
+    store_dsets = {}
+    time_store = self.timeStore
+    if time_store is not None:
+      for spec in ds_specs:
+	ds_name = spec[ 'ds_name' ]
+	lookup_ds_name = ds_name[ 1 : ] if ds_name[ 0 ] == '*' else ds_name
+	if lookup_ds_name not in store_dsets:
+	  pair = self._GetTimeStoreDataSet(
+	      time_store, lookup_ds_name, ds_defs.get( ds_name )
+	      )
+	  if pair is not None:
+	    store_dsets[ lookup_ds_name ] = pair
+
 #		-- Process by looping on state points
 #		--
+    state_reads = {}
+    store_reads = {}
+    def read( lookup_ds_name, dset, ndxs ):
+      """Reads the selection, sharing reads across specs.  Selections from
+the time-major store are read for all state points on first use.
+"""
+      key = ( lookup_ds_name, str( ndxs ) )
+      if lookup_ds_name in store_dsets:
+	if key not in store_reads:
+	  store_ndxs = \
+	      ndxs + ( Ellipsis, slice( None ) ) \
+	      if isinstance( ndxs, tuple ) else \
+	      ( ndxs, Ellipsis, slice( None ) )
+	  store_reads[ key ] = np.rollaxis(
+	      store_dsets[ lookup_ds_name ][ 1 ][ store_ndxs ], -1
+	      )
+	value = store_reads[ key ][ state_ndx ]
+      else:
+	if key not in state_reads:
+	  state_reads[ key ] = dset[ ndxs ]
+	value = state_reads[ key ]
+      return  value
+    #end read
+
     for state_ndx in xrange( len( self.states ) ):
+      state_reads.clear()
       for spec in ds_specs:
         ds_name = spec[ 'ds_name' ]
 	lookup_ds_name = ds_name[ 1 : ] if ds_name[ 0 ] == '*' else ds_name
 	ds_def = ds_defs.get( ds_name )
-        dset = self.GetStateDataSet( state_ndx, lookup_ds_name )
-	dset_value = np.array( dset )
+	dset = \
+	    store_dsets[ lookup_ds_name ][ 0 ] \
+	    if lookup_ds_name in store_dsets else \
+	    self.GetStateDataSet( state_ndx, lookup_ds_name )
 	ds_type = ds_def[ 'type' ]
 
 	node_addrs = spec.get( 'node_addrs' )
@@ -6250,8 +6927,8 @@ required.
 	  #value = 0.0  if dset is None else  dset_value.item()
 	  value = \
 	      0.0 if dset is None else \
-	      dset_value[ 0 ] if len( dset_value.shape ) > 0 else \
-	      dset_value[ () ]
+	      read( lookup_ds_name, dset, 0 ) if len( dset.shape ) > 0 else \
+	      read( lookup_ds_name, dset, () )
 	  result[ ds_name ].append( value )
 
 #			-- detector, fixed_detector
@@ -6273,8 +6950,7 @@ required.
 	    detector_ndx = spec.get( 'detector_index', 0 )
             det_ndx = max( 0, min( detector_ndx, ds_shape[ 1 ] - 1 ) )
 
-	    #dset_value = np.array( dset )
-	    value = dset_value[ axial_ndx, det_ndx ]
+	    value = read( lookup_ds_name, dset, ( axial_ndx, det_ndx ) )
 	  result[ ds_name ].append( value )
 
 #			-- radial_detector
@@ -6287,7 +6963,7 @@ required.
 	  else:
 	    detector_ndx = spec.get( 'detector_index', 0 )
             det_ndx = max( 0, min( detector_ndx, dset.shape[ 0 ] - 1 ) )
-            value = dset[ det_ndx ]
+	    value = read( lookup_ds_name, dset, det_ndx )
 	  result[ ds_name ].append( value )
 
 #			-- intrapin_edits
@@ -6316,24 +6992,24 @@ required.
 	      result[ ds_name ] = ds_result
             sub_addr_set = set()
             for sub_addr in sub_addrs:
-              sub_addr = ( 
-	            min( sub_addr[ 0 ], count_dset.shape[ 1 ] - 1 ),
-	            min( sub_addr[ 1 ], count_dset.shape[ 0 ] - 1 )
-                    )
+	      sub_addr = (
+		  min( sub_addr[ 0 ], count_dset.shape[ 1 ] - 1 ),
+		  min( sub_addr[ 1 ], count_dset.shape[ 0 ] - 1 )
+		  )
 	      if sub_addr not in sub_addr_set:
                 sub_addr_set.add( sub_addr )
-                start_ndx = start_dset[
-                    sub_addr[ 1 ], sub_addr[ 0 ], axial_ndx, assy_ndx
-                    ]
-                count = count_dset[
-                    sub_addr[ 1 ], sub_addr[ 0 ], axial_ndx, assy_ndx
-                    ]
+		pin_ndxs = ( sub_addr[ 1 ], sub_addr[ 0 ], axial_ndx, assy_ndx )
+		start_ndx = int( read( start_name, start_dset, pin_ndxs ) )
+		count = int( read( count_name, count_dset, pin_ndxs ) )
                 end_ndx = min( start_ndx + count, dset.shape[ 0 ] )
-                for ndx in range( start_ndx, end_ndx ):
-                  addr = ( sub_addr[ 0 ], sub_addr[ 1 ], ndx - start_ndx )
+		values = \
+		    read( lookup_ds_name, dset, slice( start_ndx, end_ndx ) ) \
+		    if end_ndx > start_ndx else []
+		for ndx in range( len( values ) ):
+		  addr = ( sub_addr[ 0 ], sub_addr[ 1 ], ndx )
 		  if addr not in ds_result:
 		    ds_result[ addr ] = []
-                  ds_result[ addr ].append( dset[ ndx ] )
+		  ds_result[ addr ].append( values[ ndx ] )
 	      #end if sub_addr not in sub_addr_set
             #end for sub_addr in sub_addrs
           #end if sub_addrs is not None
@@ -6368,11 +7044,12 @@ required.
 	          )
 	      if sub_addr not in sub_addr_set:
                 sub_addr_set.add( sub_addr )
-                values = dset_value[
-                    :, theta_ndx,
-                    sub_addr[ 1 ], sub_addr[ 0 ],
-                    axial_ndx, assy_ndx
-                    ]
+		values = read(
+		    lookup_ds_name, dset,
+		    ( slice( None ), theta_ndx,
+		      sub_addr[ 1 ], sub_addr[ 0 ],
+		      axial_ndx, assy_ndx )
+		    )
                 for r in range( values.shape[ 0 ] ):
                   addr = ( sub_addr[ 0 ], sub_addr[ 1 ], r )
 		  if addr not in ds_result:
@@ -6399,7 +7076,9 @@ required.
 	      radius_ndx = min( fluence_addr.radiusIndex, ds_shape[ 2 ] - 1 )
 	    else:
 	      theta_ndx = radius_ndx = 0
-	    value = dset_value[ axial_ndx, theta_ndx, radius_ndx ]
+	    value = read(
+		lookup_ds_name, dset, ( axial_ndx, theta_ndx, radius_ndx )
+		)
 	  result[ ds_name ].append( value )
 
 #			-- :node
@@ -6422,6 +7101,12 @@ required.
               ax_value = self.CreateAxialValue( cm = axial_cm )
               axial_ndx = max( 0, min( ax_value[ 1 ], ds_shape[ 2 ] - 1 ) )
 
+#					-- All nodes in one read
+	      node_values = read(
+		  lookup_ds_name, dset,
+		  ( 0, slice( None ), axial_ndx, assy_ndx )
+		  )
+
 	    node_addr_set = set()
 	    if node_addrs is None:
 	      node_addr_set.add( ( 0, -1 ) )
@@ -6435,8 +7120,7 @@ required.
 	        ds_result[ node_addr ] = []
               value = 0.0
               if dset is not None:
-	        dset_value = np.array( dset )
-	        value = dset_value[ 0, node_addr[ 0 ], axial_ndx, assy_ndx ]
+		value = node_values[ node_addr[ 0 ] ]
               ds_result[ node_addr ].append( value )
 	    #end if-else node_addrs
 	  #end if copy_shape
@@ -6468,21 +7152,35 @@ required.
 	        ds_result = {}
 	        result[ ds_name ] = ds_result
 
-              sub_addr_set = set()
+	      sub_addr_list = []
               for sub_addr in sub_addrs:
 	        sub_addr = (
 	            min( sub_addr[ 0 ], ds_shape[ 1 ] - 1 ),
 	            min( sub_addr[ 1 ], ds_shape[ 0 ] - 1 )
 	            )
-		if sub_addr not in sub_addr_set:
-	          sub_addr_set.add( sub_addr )
-		  if sub_addr not in ds_result:
-		    ds_result[ sub_addr ] = []
-		  value = 0.0
-		  if dset is not None:
-	            value = dset.\
-		      value[ sub_addr[ 1 ], sub_addr[ 0 ], axial_ndx, assy_ndx ]
-		  ds_result[ sub_addr ].append( value )
+		if sub_addr not in sub_addr_list:
+		  sub_addr_list.append( sub_addr )
+
+#					-- One hyperslab bounding the pins
+	      if dset is not None and sub_addr_list:
+		cols = [ a[ 0 ] for a in sub_addr_list ]
+		rows = [ a[ 1 ] for a in sub_addr_list ]
+		col0 = min( cols )
+		row0 = min( rows )
+		block = read(
+		    lookup_ds_name, dset,
+		    ( slice( row0, max( rows ) + 1 ),
+		      slice( col0, max( cols ) + 1 ),
+		      axial_ndx, assy_ndx )
+		    )
+
+	      for sub_addr in sub_addr_list:
+		if sub_addr not in ds_result:
+		  ds_result[ sub_addr ] = []
+		value = 0.0
+		if dset is not None:
+		  value = block[ sub_addr[ 1 ] - row0, sub_addr[ 0 ] - col0 ]
+		ds_result[ sub_addr ].append( value )
 	      #end for sub_addr
 
 	    else:
@@ -6491,11 +7189,12 @@ required.
 
 	      value = 0.0
 	      if dset is not None:
-		#dset_value = np.array( dset )
-		if dset_value.size == 1:
-		  value = dset_value.item()
+		if dset.size == 1:
+		  value = np.array( dset ).item()
 		else:
-	          value = dset_value[ 0, 0, axial_ndx, assy_ndx ]
+		  value = read(
+		      lookup_ds_name, dset, ( 0, 0, axial_ndx, assy_ndx )
+		      )
 	      result[ ds_name ].append( value )
             #end if-else ds_shape
 	  #end if sub_addrs specified
@@ -6519,16 +7218,186 @@ required.
 	result[ k ] = np.array( data_list, dtype = np.float64 )
     #end for k, item
 
+    for spec in ds_specs:
+      self._PutTimeValues( spec, ds_defs[ spec[ 'ds_name' ] ], result )
+
     return  result
   #end ReadDataSetTimeValues
 
 
+  #----------------------------------------------------------------------
+  #	METHOD:		DataModel._ReadDeferred()			-
+  #----------------------------------------------------------------------
+  def _ReadDeferred( self ):
+    """Completes Read() with the steps that touch every state point or the
+full pin_powers dataset, setting ``readyEvent`` and firing a 'ready' event
+when done.  In fast-open mode this runs on ``readThread``, where errors are
+logged rather than raised, and 'ready' listeners are called on that thread.
+"""
+    try:
+#		-- Create derived file and states
+#		--
+      self.derivedFile, self.derivedCoreGroup, self.derivedStates, \
+	  self.derivedStore = self._CreateDerivedH5File( self.states )
+
+#		-- Special check for pin_factors and node_factors
+#		--
+      node_factors = pin_factors = None
+      pin_factors_shape = \
+	  ( self.core.npiny, self.core.npinx, self.core.nax, self.core.nass )
+      for name, group in (
+	  ( 'pin_factors', self.core.GetGroup() ),
+	  #( 'core.pin_factors', self.h5File )
+	  ):
+	if name in group:
+	  #darray = group[ name ].value
+	  darray = np.array( group[ name ] )
+	  if darray.shape == pin_factors_shape:
+	    pin_factors = darray
+	    break
+      #end for
+
+#		-- Set up the pin averager
+#		--
+#    if 'pin' in self.averagers:
+#      avg = self.averagers[ 'pin' ]
+      pin_powers_ds = \
+	  self.states[ len( self.states ) >> 1 ].GetDataSet( 'pin_powers' )
+      if pin_powers_ds is not None:
+	ref_pin_powers = np.array( pin_powers_ds )
+      else:
+	ref_pin_powers = np.ones( pin_factors_shape )
+
+      avg = gen_avg.Averages( self.core, ref_pin_powers, pin_factors )
+      self.averagers[ 'pin' ] = avg
+#    avg.load( self.core, ref_pin_powers, pin_factors )
+      if pin_factors is None:
+	#pin_factors = avg.get_weights( pin_factors_shape )
+	pin_factors = avg.resolve_dset_weights( ref_pin_powers )
+      #xxx node_factors = avg.resolve_dset_node_weights( ref_pin_powers )
+
+      if node_factors is None:
+	self.nodeFactors = \
+	    np.ones( ( 1, 4, self.core.nax, self.core.nass ), dtype = np.int )
+      else:
+	self.nodeFactors = np.ndarray(
+	    ( 1, 4, self.core.nax, self.core.nass ),
+	    dtype = np.float64
+	    )
+	self.nodeFactors[ 0, :, :, : ] = node_factors
+
+      self.pinFactors = \
+	  pin_factors if pin_factors is not None else \
+	  np.ones( pin_factors_shape, dtype = np.int )
+
+#		-- Set up the channel averager
+#		--
+#    if 'channel' in self.averagers:
+#      avg = self.averagers[ 'channel' ]
+#      avg.load( self.core )
+      avg = chan_avg.Averages( self.core )
+      self.averagers[ 'channel' ] = avg
+      self.channelFactors = np.ones(
+	  ( self.core.npiny + 1, self.core.npinx + 1,
+	    self.core.nax, self.core.nass ),
+	  dtype = np.int
+	  )
+
+#		-- Automatically derive scalars
+#		--
+      for name, ddef in six.iteritems( AUTO_DERIVED_SCALAR_DEFS ):
+	try:
+	  self.logger.info( 'auto deriving ' + name )
+	  self._CreateDerivedScalarDataSet( name, **ddef )
+	except Exception as ex:
+	  #self.logger.exception( ex )
+	  self.logger.warning( str( ex ) )
+	  self._RemoveDataSetName( 'scalar', name )
+
+    except Exception, ex:
+      if threading.current_thread() is not self.readThread:
+        raise
+      self.logger.exception( 'Error completing read: %s', str( ex ) )
+
+    finally:
+      self.readyEvent.set()
+      self._FireEvent( 'ready' )
+  #end _ReadDeferred
+
+
+  #----------------------------------------------------------------------
+  #	METHOD:		DataModel._ReadStateStats()			-
+  #----------------------------------------------------------------------
+  def _ReadStateStats(
+      self, state_ndx, ds_name,
+      ds_expr = None, factors = None, scale_type = 'linear',
+      cache_key = None
+      ):
+    """Scans one state point dataset with ``DataSetStats.ReduceStats()``,
+storing the result in ``statsCache`` if ``cache_key`` is specified.
+    Args:
+        state_ndx (int): 0-based statept index
+        ds_name (str): dataset name
+	ds_expr (str): optional numpy array index expression to apply to
+	    the dataset
+	factors (np.ndarray): optional factors with ``ds_expr`` applied
+	scale_type (str): 'linear' or 'log'
+	cache_key (str): optional StatsCache key
+    Returns:
+        dict: stats as returned by ``DataSetStats.ReduceStats()`` or None
+	    if the dataset does not exist in the state point
+"""
+    stats = None
+    dset = self.GetStateDataSet( state_ndx, ds_name )
+
+    if dset is not None:
+      dset, threshold = self._SplitThreshold( dset )
+#		-- h5py reads only the selected hyperslab
+      dset_array = \
+          IndexExpression.Compile( ds_expr ).Apply( dset ) if ds_expr else \
+	  dset
+      stats = DataSetStats.ReduceStats(
+	  dset_array, factors, scale_type, threshold = threshold
+	  )
+      if cache_key:
+        self.statsCache.PutStats(
+	    cache_key, state_ndx, self.GetStatesCount(), stats,
+	    self._IsStatsPersistent( ds_name )
+	    )
+
+    return  stats
+  #end _ReadStateStats
+
+
+  #----------------------------------------------------------------------
+  #	METHOD:		DataModel._RemoveDataSetName()			-
+  #----------------------------------------------------------------------
+  def _RemoveDataSetName( self, ds_type, ds_name ):
+    """Reverses AddDataSetName() for a fast-open auto-derived scalar that
+could not be calculated or a derived dataset whose cached data are stale.
+No event is fired.
+    Args:
+	ds_type (str): dataset category or type
+	ds_name (str): dataset name
+"""
+    type_list = self.dataSetNames.get( ds_type )
+    if type_list is not None and ds_name in type_list:
+      type_list.remove( ds_name )
+      if ds_name in self.dataSetNames[ 'axials' ]:
+	self.dataSetNames[ 'axials' ].remove( ds_name )
+      self.dataSetDefsByName.pop( ds_name, None )
+      self.dataSetNamesVersion += 1
+    self._ClearStatsCache( ds_name )
+    self._ClearTimeValuesCache( ds_name )
+  #end _RemoveDataSetName
+
+
   #----------------------------------------------------------------------
   #	METHOD:		DataModel.RemoveListener()			-
   #----------------------------------------------------------------------
   def RemoveListener( self, event_name, listener ):
     """
-@param  event_name	'newDataSet'
+@param  event_name	'newDataSet' or 'ready'
 @param  listener	listener with OnXxx() method or callable
 """
     if event_name in self.listeners:
@@ -6611,6 +7480,27 @@ replacing the values in ``range_expr`` in the returned value expression string.
   #end _ResolveRangeExpression
 
 
+  #----------------------------------------------------------------------
+  #	METHOD:		DataModel._ResolveStatsFactors()		-
+  #----------------------------------------------------------------------
+  def _ResolveStatsFactors( self, ds_name, ds_expr = None ):
+    """Retrieves factors for the dataset as an np.ndarray with any
+``ds_expr`` applied.
+    Args:
+        ds_name (str): dataset name
+	ds_expr (str): optional numpy array index expression
+    Returns:
+        np.ndarray: factors or None
+"""
+    factors = self.GetFactors( ds_name )
+    if factors is not None:
+      factors = np.asarray( factors )
+      if ds_expr:
+        factors = IndexExpression.Compile( ds_expr ).Apply( factors )
+    return  factors
+  #end _ResolveStatsFactors
+
+
   #----------------------------------------------------------------------
   #	METHOD:		DataModel.RevertIfDerivedDataSet()		-
   #----------------------------------------------------------------------
@@ -6689,6 +7579,8 @@ dataset.
 
       elif ds_name in self.dataSetThresholds:
         del self.dataSetThresholds[ ds_name ]
+      self._ClearStatsCache( ds_name )
+      self._ClearTimeValuesCache( ds_name )
 
 #		-- Clear any calculated ranges
 #		--
@@ -6708,21 +7600,6 @@ dataset.
         for key in key_list:
           del range_dict[ key ]
       #end for i
-
-#		-- Clear any threshold datasets
-#		--
-      threshold_name = 'threshold:' + ds_name
-      if self.derivedCoreGroup is not None and \
-          threshold_name in self.derivedCoreGroup:
-        del self.derivedCoreGroup[ threshold_name ]
-
-      elif self.derivedStates:
-        for ndx in xrange( len( self.derivedStates ) ):
-          derived_st = self.derivedStates[ ndx ]
-	  if derived_st.HasDataSet( threshold_name ):
-	    derived_st.RemoveDataSet( threshold_name )
-        #end for ndx
-      #end if self.derivedStates
     #end if ds_name
   #end SetDataSetThreshold
 
@@ -6802,6 +7679,47 @@ dataset.
 #  #end StoreExtraDataSet
 
 
+  #----------------------------------------------------------------------
+  #	METHOD:		DataModel._SplitThreshold()			-
+  #----------------------------------------------------------------------
+  def _SplitThreshold( self, dset ):
+    """Separates a ThresholdDataSet from GetStateDataSet() into the source
+dataset and threshold so stats reductions can mask in the same pass instead
+of reading thresholded copies.
+    Args:
+        dset (h5py.Dataset, DerivedDataSet, or ThresholdDataSet): dataset
+    Returns:
+        tuple: ( source dataset, RangeExpression or None )
+"""
+    return \
+        ( dset.dataSet, dset.rangeExpr ) \
+	if isinstance( dset, ThresholdDataSet ) else \
+	( dset, None )
+  #end _SplitThreshold
+
+
+  #----------------------------------------------------------------------
+  #	METHOD:		DataModel._StoreStateRange()			-
+  #----------------------------------------------------------------------
+  def _StoreStateRange( self, state_ndx, range_key, vmin, vmax ):
+    """Stores a state point range in ``rangesByStatePt`` if not already
+present.  Caller must hold ``rangesLock``.
+    Args:
+        state_ndx (int): 0-based statept index
+	range_key (str): key from ``_CreateRangeKey()``
+	vmin (float): min value, possibly NaN
+	vmax (float): max value, possibly NaN
+"""
+    if 0 <= state_ndx < len( self.rangesByStatePt ):
+      range_dict = self.rangesByStatePt[ state_ndx ]
+      if range_dict is None:
+        range_dict = {}
+        self.rangesByStatePt[ state_ndx ] = range_dict
+      if range_key not in range_dict:
+        range_dict[ range_key ] = self._CreateRange( vmin, vmax )
+  #end _StoreStateRange
+
+
   #----------------------------------------------------------------------
   #	METHOD:		DataModel.ToJson()				-
   #----------------------------------------------------------------------
@@ -6819,6 +7737,26 @@ dataset.
   #end ToJson
 
 
+  #----------------------------------------------------------------------
+  #	METHOD:		DataModel.WaitReady()				-
+  #----------------------------------------------------------------------
+  def WaitReady( self, timeout = None ):
+    """Waits for a fast-open Read() to complete.  Returns immediately when
+called on ``readThread``.
+    Args:
+	timeout (float): optional timeout in seconds, where None means wait
+	    indefinitely
+    Returns:
+	bool: True if Read() is complete
+"""
+    if not self.readyEvent.is_set() and \
+	threading.current_thread() is not self.readThread:
+      self.readyEvent.wait( timeout )
+    return  self.readyEvent.is_set() or \
+	threading.current_thread() is self.readThread
+  #end WaitReady
+
+
 #		-- Properties
 #		--
 
@@ -6948,6 +7886,15 @@ dataset.
 #  #end IsExtra
 
 
+  #----------------------------------------------------------------------
+  #	METHOD:		DataModel.IsFastOpen()				-
+  #----------------------------------------------------------------------
+  @staticmethod
+  def IsFastOpen():
+    return  DataModel.fastOpen_
+  #end IsFastOpen
+
+
   #----------------------------------------------------------------------
   #	METHOD:		DataModel.IsValidObj()				-
   #----------------------------------------------------------------------
@@ -6959,6 +7906,22 @@ dataset.
   #end IsValidObj
 
 
+  #----------------------------------------------------------------------
+  #	METHOD:		DataModel.SetFastOpen()				-
+  #----------------------------------------------------------------------
+  @staticmethod
+  def SetFastOpen( value ):
+    """
+    Args:
+	value (bool): True for Read() to return after reading the CORE and
+	    resolving state point datasets, completing the averagers,
+	    factors, derived file, and auto-derived scalars in the
+	    background
+"""
+    DataModel.fastOpen_ = bool( value )
+  #end SetFastOpen
+
+
   #----------------------------------------------------------------------
   #	METHOD:		DataModel.ToCSV()				-
   #----------------------------------------------------------------------
@@ -8219,7 +9182,8 @@ DataModelMgr.ResolveAvailableTimeDataSets().
 #	CLASS:		DerivedState					-
 #------------------------------------------------------------------------
 class DerivedState( State ):
-  """Special State for derived datasets.
+  """Special State for derived datasets, which are kept in the model's
+DerivedStore when one is provided.
 """
 
 #		-- Object Methods
@@ -8229,19 +9193,38 @@ class DerivedState( State ):
   #----------------------------------------------------------------------
   #	METHOD:		DerivedState.__init__()				-
   #----------------------------------------------------------------------
-  def __init__( self, index, name, state_group ):
+  def __init__( self, index, name, state_group, store = None ):
     """
 @param  index		0-based state point index
 @param  name		name, which can clean from the group
 @param  state_group	HDF5 group for this state
+@param  store		optional DerivedStore for datasets
 """
     #super( DerivedState, self ).__init__( index, name, state_group )
     self.index = index
     self.name = name
     self.group = state_group
+    self.store = store
   #end __init__
 
 
+  #----------------------------------------------------------------------
+  #	METHOD:		DerivedState.AddDataSet()			-
+  #----------------------------------------------------------------------
+  def AddDataSet( self, ds_name, dset ):
+    """Adds a dataset object computing its values on access.
+@param  ds_name		dataset name
+@param  dset		object with the h5py.Dataset interface
+@return			dset
+@exception		if there is no DerivedStore or ds_name exists
+"""
+    if self.store is None:
+      raise ValueError( 'No derived store for dataset: ' + ds_name )
+    ds_name = DS_NAME_ALIASES_REVERSE.get( ds_name, ds_name )
+    return  self.store.AddDataSet( self.group, ds_name, dset )
+  #end AddDataSet
+
+
   #----------------------------------------------------------------------
   #	METHOD:		DerivedState.Check()				-
   #----------------------------------------------------------------------
@@ -8252,6 +9235,71 @@ class DerivedState( State ):
     return  []
   #end Check
 
+
+  #----------------------------------------------------------------------
+  #	METHOD:		DerivedState.CreateDataSet()			-
+  #----------------------------------------------------------------------
+  def CreateDataSet( self, ds_name, data_in ):
+    """
+@param  ds_name		dataset name
+@param  data_in		numpy.ndarray
+@return			h5py.Dataset or DerivedDataSet object
+"""
+    if self.store is None:
+      return  super( DerivedState, self ).CreateDataSet( ds_name, data_in )
+    ds_name = DS_NAME_ALIASES_REVERSE.get( ds_name, ds_name )
+    return  self.store.CreateDataSet( self.group, ds_name, data_in )
+  #end CreateDataSet
+
+
+  #----------------------------------------------------------------------
+  #	METHOD:		DerivedState.GetDataSet()			-
+  #----------------------------------------------------------------------
+  def GetDataSet( self, ds_name ):
+    """
+@param  ds_name		dataset name
+@return			h5py.Dataset or DerivedDataSet object or None if
+			not found
+"""
+    if self.store is None:
+      return  super( DerivedState, self ).GetDataSet( ds_name )
+    ds_name = DS_NAME_ALIASES_REVERSE.get( ds_name, ds_name )
+    return \
+	self.store.GetDataSet( self.group, ds_name ) \
+	if ds_name is not None else \
+	None
+  #end GetDataSet
+
+
+  #----------------------------------------------------------------------
+  #	METHOD:		DerivedState.HasDataSet()			-
+  #----------------------------------------------------------------------
+  def HasDataSet( self, ds_name ):
+    """
+"""
+    if self.store is None:
+      return  super( DerivedState, self ).HasDataSet( ds_name )
+    ds_name = DS_NAME_ALIASES_REVERSE.get( ds_name, ds_name )
+    return \
+	ds_name is not None and self.store.HasDataSet( self.group, ds_name )
+  #end HasDataSet
+
+
+  #----------------------------------------------------------------------
+  #	METHOD:		DerivedState.RemoveDataSet()			-
+  #----------------------------------------------------------------------
+  def RemoveDataSet( self, ds_name ):
+    """
+@return			True if removed, False if ds_name not in this
+"""
+    if self.store is None:
+      return  super( DerivedState, self ).RemoveDataSet( ds_name )
+    ds_name = DS_NAME_ALIASES_REVERSE.get( ds_name, ds_name )
+    return \
+	ds_name is not None and \
+	self.store.RemoveDataSet( self.group, ds_name )
+  #end RemoveDataSet
+
 #end DerivedState
 
 
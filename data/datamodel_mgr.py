@@ -3,6 +3,11 @@
 #------------------------------------------------------------------------
 #	NAME:		datamodel_mgr.py				-
 #	HISTORY:							-
+#		2026-10-18						-
+#	  Added OpenModels() for reading files concurrently.
+#	  Added {Acquire,Get,Release}StateArray() with a shared SliceCache.
+#	  Added IsReady() and the 'modelReady' event for fast-open models.
+#	  Closing models read but not added when OpenModels() is cancelled.
 #		2019-01-28	leerw@ornl.gov				-
 #         Rounding "exposure.." time values to 3 decimal places in
 #         _UpdateTimeValues().
@@ -91,6 +96,8 @@ import pdb
 
 from .datamodel import *
 from .differences import *
+from .slice_cache import *
+from .state_pool import *
 from .utils import *
 from event.event import *
 
@@ -168,7 +175,10 @@ Properties:
     #self.dataSetNamesVersion = 0
     self.detectorMap = None
     self.listeners = \
-        { 'dataSetAdded': [], 'modelAdded': [], 'modelRemoved': [] }
+        {
+        'dataSetAdded': [], 'modelAdded': [], 'modelReady': [],
+	'modelRemoved': []
+	}
     self.logger = logging.getLogger( 'data' )
     self.maxAxialValue = 0.0
     self.timeDataSet = 'state'
@@ -255,6 +265,7 @@ Properties:
     self.normalize_sub_addr = self.NormalizeSubAddr
     self.normalize_sub_addrs = self.NormalizeSubAddrs
     self.open_file = self.OpenModel
+    self.open_files = self.OpenModels
     self.read_dataset = self.GetH5DataSet
     self.read_dataset_axial_values = self.ReadDataSetAxialValues
     self.read_dataset_time_values = self.ReadDataSetTimeValues
@@ -270,12 +281,27 @@ Properties:
   #end __init__
 
 
+  #----------------------------------------------------------------------
+  #	METHOD:		DataModelMgr.AcquireStateArray()		-
+  #----------------------------------------------------------------------
+  def AcquireStateArray( self, qds_name, time_value ):
+    """Retrieves the shared array as with GetStateArray(), which is held in
+the cache until passed to ReleaseStateArray().
+@param  qds_name	name of dataset, DataSetName instance
+@param  time_value	value for current timeDataSet
+@return			read-only np.ndarray or None if not found
+"""
+    return  self._GetStateArray( qds_name, time_value, True )
+  #end AcquireStateArray
+
+
   #----------------------------------------------------------------------
   #	METHOD:		DataModelMgr.AddListener()			-
   #----------------------------------------------------------------------
   def AddListener( self, event_name, listener ):
     """
-@param  event_name	'dataSetAdded', 'modelAdded', or 'modelRemoved'
+@param  event_name	'dataSetAdded', 'modelAdded', 'modelReady', or
+			'modelRemoved'
 @param  listener	listener with OnXxx() method or callable
 """
     if event_name in self.listeners:
@@ -285,6 +311,42 @@ Properties:
   #end AddListener
 
 
+  #----------------------------------------------------------------------
+  #	METHOD:		DataModelMgr._AddModel()			-
+  #----------------------------------------------------------------------
+  def _AddModel( self, dm, h5f_param, update_flag = True ):
+    """Adds a DataModel that has been read and checked for compatibility.
+@param  dm		DataModel to add
+@param  h5f_param	h5py.File or filename from which dm was read
+@param  update_flag	True to update meshes and time values and fire the
+			'modelAdded' event, False to leave those to the caller
+@throws			IOError on error
+"""
+    try:
+      #xxxxx check for duplicate path, dm.GetH5File().filename
+      model_name = self._ResolveDataModelName( dm )
+      dm.AddListener( 'newDataSet', self._OnNewDataSet )
+      dm.AddListener( 'ready', self._OnModelReady )
+      self.dataModelNames.append( model_name )
+      self.dataModels[ model_name ] = dm
+
+      if len( self.dataModelNames ) == 1:
+	#self.core = dm.GetCore()
+	self.core = dm.GetCore().Clone()
+
+      if update_flag:
+	self._UpdateMeshValues()
+	self._UpdateTimeValues()
+	#self.dataSetNamesVersion += 1
+	self._FireEvent( 'modelAdded', dm.GetName() )
+
+    except Exception, ex:
+      msg = 'Error processing "%s": %s' % ( h5f_param, ex.message )
+      self.logger.error( msg )
+      raise  IOError( msg )
+  #end _AddModel
+
+
   #----------------------------------------------------------------------
   #	METHOD:		DataModelMgr.CalcRadialMesh()			-
   #----------------------------------------------------------------------
@@ -422,6 +484,7 @@ Properties:
       #model_name = dm.GetName()
       dm.RemoveListener( 'newDataSet', self )
       dm.Close()
+      SliceCache.Clear( model_name )
 
       del self.dataModels[ model_name ]
       del self.timeValuesById[ model_name ]
@@ -812,7 +875,8 @@ returned.
   #----------------------------------------------------------------------
   def _FireEvent( self, event_name, *params ):
     """Calls event_name listeners passing self and the params list.
-@param  event_name	'dataSetAdded', 'modelAdded', or 'modelRemoved'
+@param  event_name	'dataSetAdded', 'modelAdded', 'modelReady', or
+			'modelRemoved'
 @param  params		event params
 """
     if event_name in self.listeners:
@@ -1487,6 +1551,8 @@ cross-model mesh is used.
         use_pin_factors (bool): True to return pinFactors
     Returns:
         np.naddarray: factors array or None
+Waits for a model read in fast-open mode to complete, so UI code should
+check IsReady() first.
 """
     qds_name = DataSetName.Resolve( qds_name )
     dm = self.GetDataModel( qds_name )
@@ -1494,7 +1560,7 @@ cross-model mesh is used.
     result = None
     if dm is not None:
       result = \
-          dm.pinFactors  if use_pin_factors else \
+          dm.GetPinFactors()  if use_pin_factors else \
           dm.GetFactors( qds_name.displayName )
 
     return  result
@@ -1856,6 +1922,57 @@ Note all requests for multiple ranges should flow through this method.
   #end GetRangeAll
 
 
+  #----------------------------------------------------------------------
+  #	METHOD:		DataModelMgr.GetStateArray()			-
+  #----------------------------------------------------------------------
+  def GetStateArray( self, qds_name, time_value ):
+    """Retrieves the dataset values for a state point from the SliceCache
+shared by all widgets, reading them with GetH5DataSet() on a miss.  This
+replaces np.array( GetH5DataSet( qds_name, time_value ) ) where the values
+are only read.
+@param  qds_name	name of dataset, DataSetName instance
+@param  time_value	value for current timeDataSet
+@return			read-only np.ndarray or None if not found
+"""
+    return  self._GetStateArray( qds_name, time_value, False )
+  #end GetStateArray
+
+
+  #----------------------------------------------------------------------
+  #	METHOD:		DataModelMgr._GetStateArray()			-
+  #----------------------------------------------------------------------
+  def _GetStateArray( self, qds_name, time_value, acquire ):
+    """Implements AcquireStateArray() and GetStateArray().  Entries are
+keyed by ( model, dataset, state index, threshold ), with the identity of
+the dataset read checked on each hit.
+"""
+    result = None
+    dset = self.GetH5DataSet( qds_name, time_value )
+    if dset is not None:
+      qds_name = DataSetName.Resolve( qds_name )
+      range_expr = getattr( dset, 'rangeExpr', None )
+      key = (
+	  qds_name.modelName, qds_name.displayName,
+	  self.GetTimeValueIndex( time_value, qds_name.modelName ),
+	  str( range_expr )  if range_expr is not None else  ''
+	  )
+      try:
+	ident = ( dset.file.filename, dset.name, hash( dset.id ), dset.shape )
+      except Exception:
+	ident = None
+
+      if ident is None:
+	result = np.array( dset )
+      elif acquire:
+	result = SliceCache.Acquire( key, ident, lambda: dset )
+      else:
+	result = SliceCache.Get( key, ident, lambda: dset )
+    #end if dset is not None
+
+    return  result
+  #end _GetStateArray
+
+
   #----------------------------------------------------------------------
   #	METHOD:		DataModelMgr.GetSubAddrFromNode()		-
   #----------------------------------------------------------------------
@@ -2157,6 +2274,29 @@ report inoperability for the result to be False.
   #end IsNodalType
 
 
+  #----------------------------------------------------------------------
+  #	METHOD:		DataModelMgr.IsReady()				-
+  #----------------------------------------------------------------------
+  def IsReady( self, qds_name = None ):
+    """Checks for a model read in fast-open mode still completing in the
+background, whose factors and derived datasets cannot be retrieved without
+waiting.  A 'modelReady' event is fired when a model is complete.
+    Args:
+        qds_name (DataSetName): optional dataset name whose model to check,
+            where None means all models
+    Returns:
+        bool: True if the model or all models are ready
+"""
+    if qds_name is None:
+      models = self.dataModels.values()
+    else:
+      dm = self.GetDataModel( DataSetName.Resolve( qds_name ) )
+      models = [ dm ]  if dm is not None else  []
+
+    return  all( dm.IsReady() for dm in models )
+  #end IsReady
+
+
   #----------------------------------------------------------------------
   #	METHOD:		DataModelMgr.IsValid()				-
   #----------------------------------------------------------------------
@@ -2334,6 +2474,17 @@ being one greater in each dimension.
   #end NormalizeSubAddrs
 
 
+  #----------------------------------------------------------------------
+  #	METHOD:		DataModelMgr._OnModelReady()			-
+  #----------------------------------------------------------------------
+  def _OnModelReady( self, model ):
+    """Callback for model 'ready' events, which are fired on the model's
+read thread.
+"""
+    self._FireEvent( 'modelReady', model.GetName() )
+  #end _OnModelReady
+
+
   #----------------------------------------------------------------------
   #	METHOD:		DataModelMgr._OnNewDataSet()			-
   #----------------------------------------------------------------------
@@ -2357,22 +2508,7 @@ being one greater in each dimension.
 """
 #		-- Assert on file read
 #		--
-    dm = None
-    try:
-      #id = str( uuid.uuid4() )
-      #dm = DataModel( h5f_param, id )
-      dm = DataModel( h5f_param )
-    except Exception, ex:
-      #msg = 'Error reading "%s": %s' % ( h5f_param, ex.message )
-      msg = 'Error reading "{0}":\n{1}'.format( h5f_param, ex.message )
-      output = cStringIO.StringIO()
-      try:
-        print >> output, msg
-        traceback.print_exc( 10, output )
-        self.logger.error( output.getvalue() )
-      finally:
-        output.close()
-      raise  IOError( msg )
+    dm = self._ReadModel( h5f_param )
 
 #		-- Assert on compatibility
 #		--
@@ -2380,29 +2516,82 @@ being one greater in each dimension.
 
 #		-- Process
 #		--
-    try:
-      #xxxxx check for duplicate path, dm.GetH5File().filename
-      model_name = self._ResolveDataModelName( dm )
-      dm.AddListener( 'newDataSet', self._OnNewDataSet )
-      self.dataModelNames.append( model_name )
-      self.dataModels[ model_name ] = dm
+    self._AddModel( dm, h5f_param )
+    return  dm
+  #end OpenModel
 
-      if len( self.dataModelNames ) == 1:
-        #self.core = dm.GetCore()
-	self.core = dm.GetCore().Clone()
 
-      self._UpdateMeshValues()
-      self._UpdateTimeValues()
-      #self.dataSetNamesVersion += 1
-      self._FireEvent( 'modelAdded', dm.GetName() )
+  #----------------------------------------------------------------------
+  #	METHOD:		DataModelMgr.OpenModels()			-
+  #----------------------------------------------------------------------
+  def OpenModels( self, h5f_params, callback = None, cancel_event = None ):
+    """Opens several HDF5 files, reading them concurrently on a
+``StatePool``.  Models are checked and added on the calling thread in the
+order of ``h5f_params``, so names resolve as with successive OpenModel()
+calls, and meshes and time values are updated once at the end, after
+which 'modelAdded' events are fired.
+@param  h5f_params	list of h5py.File instances or HDF5 filenames
+@param  callback	optional progress callback, prototype
+			func( h5f_param, dm_or_ex, cur_step, step_count )
+@param  cancel_event	optional threading.Event which, when set, stops
+			adding models, files already read being closed
+@return			list with, for each param, the new DataModel or the
+			exception raised in reading, checking, or adding it
+"""
+    h5f_params = list( h5f_params )
+    results = [ None ] * len( h5f_params )
+    added = []
 
+    def compute( ndx ):
+      try:
+	dm = self._ReadModel( h5f_params[ ndx ] )
+      except Exception, ex:
+	dm = ex
       return  dm
+    #end compute
+
+    def discard( ndx, dm ):
+      if not isinstance( dm, Exception ):
+	dm.Close()
+    #end discard
+
+    def write( ndx, dm ):
+      if not isinstance( dm, Exception ):
+	try:
+	  self.CheckDataModelIsCompatible( dm )
+	  self._AddModel( dm, h5f_params[ ndx ], False )
+	  added.append( dm )
+	except Exception, ex:
+	  dm.Close()
+	  dm = ex
+      results[ ndx ] = dm
+      if callback:
+	callback( h5f_params[ ndx ], dm, ndx, len( h5f_params ) )
+    #end write
+
+    try:
+      StatePool().Run(
+	  range( len( h5f_params ) ), compute, write,
+	  cancel_event = cancel_event, discard_func = discard
+	  )
+
+    finally:
+#			-- Files not reached when cancelled
+      for ndx, dm in enumerate( results ):
+	if dm is None:
+	  results[ ndx ] = IOError( 'Cancelled: %s' % str( h5f_params[ ndx ] ) )
+
+      if added:
+	self._UpdateMeshValues()
+	self._UpdateTimeValues()
+	for dm in added:
+	  self._FireEvent( 'modelAdded', dm.GetName() )
+    #end try-finally
+
+    return  results
+  #end OpenModels
+
 
-    except Exception, ex:
-      msg = 'Error processing "%s": %s' % ( h5f_param, ex.message )
-      self.logger.error( msg )
-      raise  IOError( msg )
-  #end OpenModel
 
 
   #----------------------------------------------------------------------
@@ -2522,12 +2711,24 @@ Calls ReadDataSetAxialValues() on the matching DataModel if found.
   #end ReadDataSetTimeValues
 
 
+  #----------------------------------------------------------------------
+  #	METHOD:		DataModelMgr.ReleaseStateArray()		-
+  #----------------------------------------------------------------------
+  def ReleaseStateArray( self, array ):
+    """Releases a hold from AcquireStateArray().
+@param  array		array returned by AcquireStateArray(), None ignored
+"""
+    SliceCache.Release( array )
+  #end ReleaseStateArray
+
+
   #----------------------------------------------------------------------
   #	METHOD:		DataModelMgr.RemoveListener()			-
   #----------------------------------------------------------------------
   def RemoveListener( self, event_name, listener ):
     """
-@param  event_name	'dataSetAdded', 'modelAdded', or 'modelRemoved'
+@param  event_name	'dataSetAdded', 'modelAdded', 'modelReady', or
+			'modelRemoved'
 @param  listener	listener with OnXxx() method or callable
 """
     if event_name in self.listeners:
@@ -2564,6 +2765,37 @@ The fallback is 'state', meaning state point index.
   #end ResolveAvailableTimeDataSets
 
 
+  #----------------------------------------------------------------------
+  #	METHOD:		DataModelMgr._ReadModel()			-
+  #----------------------------------------------------------------------
+  def _ReadModel( self, h5f_param ):
+    """Reads a DataModel without adding it.  Safe to call on any thread.
+@param  h5f_param	either an h5py.File instance or the name of an
+			HDF5 file (.h5)
+@return			new DataModel object
+@throws			IOError with error message
+"""
+    dm = None
+    try:
+      #id = str( uuid.uuid4() )
+      #dm = DataModel( h5f_param, id )
+      dm = DataModel( h5f_param )
+    except Exception, ex:
+      #msg = 'Error reading "%s": %s' % ( h5f_param, ex.message )
+      msg = 'Error reading "{0}":\n{1}'.format( h5f_param, ex.message )
+      output = cStringIO.StringIO()
+      try:
+	print >> output, msg
+	traceback.print_exc( 10, output )
+	self.logger.error( output.getvalue() )
+      finally:
+	output.close()
+      raise  IOError( msg )
+
+    return  dm
+  #end _ReadModel
+
+
   #----------------------------------------------------------------------
   #	METHOD:		DataModelMgr._ResolveDataModelName()		-
   #----------------------------------------------------------------------
@@ -0,0 +1,336 @@
+#!/usr/bin/env python
+# $Id$
+#------------------------------------------------------------------------
+#	NAME:		dataset_stats.py				-
+#	HISTORY:							-
+#		2026-10-18						-
+#	  Added ReduceStats() and ReduceHistogram() for StatsCache.
+#	  Threshold masks applied in the same pass.
+#		2026-10-18						-
+#	  Streaming, chunked min/max reduction for DataModel.GetRange().
+#------------------------------------------------------------------------
+"""Streaming statistics over HDF5 datasets and numpy arrays.
+
+Datasets are read in blocks along the first (slowest varying) axis so
+that only a bounded amount of data is in memory at once, and all
+statistics for a block are computed while it is in memory.  A threshold
+(RangeExpression) is evaluated on each block as part of the same mask, so
+thresholded statistics need no NaN-filled copy of the dataset.
+"""
+import math, sys
+import h5py
+import numpy as np
+import pdb
+
+
+NAN = float( 'nan' )
+
+
+#------------------------------------------------------------------------
+#	CLASS:		DataSetStats					-
+#------------------------------------------------------------------------
+class DataSetStats( object ):
+  """Static methods for block-wise reductions over datasets.
+"""
+
+
+#		-- Class Attributes
+#		--
+
+  CHUNK_BYTES = 1 << 24
+  """int: Default maximum number of bytes read per block."""
+
+
+#		-- Static Methods
+#		--
+
+
+  #----------------------------------------------------------------------
+  #	METHOD:		CreateMask()					-
+  #----------------------------------------------------------------------
+  @staticmethod
+  def CreateMask(
+      block, factors_block = None, scale_type = 'linear',
+      threshold_mask = None
+      ):
+    """Creates the mask of values in ``block`` that participate in
+statistics: finite values where factors are positive, within any threshold,
+and, for a 'log' scale, values that are positive.
+    Args:
+        block (np.ndarray): data values
+        factors_block (np.ndarray): optional factors with the same shape as
+            ``block``
+        scale_type (str): 'linear' or 'log'
+        threshold_mask (np.ndarray): optional boolean mask of values within
+            a threshold, from ``RangeExpression.CreateMask()``
+    Returns:
+        np.ndarray: boolean mask or None if all values are valid
+"""
+    mask = threshold_mask
+    if factors_block is not None:
+      mask = factors_block > 0.0  if mask is None else \
+          mask & (factors_block > 0.0)
+    if scale_type == 'log':
+      mask = block > 0.0  if mask is None else  mask & (block > 0.0)
+
+    if mask is None:
+      if block.dtype.kind == 'f':
+        finite = np.isfinite( block )
+        if not finite.all():
+          mask = finite
+    elif block.dtype.kind == 'f':
+      mask &= np.isfinite( block )
+
+    return  mask
+  #end CreateMask
+
+
+  #----------------------------------------------------------------------
+  #	METHOD:		IterBlocks()					-
+  #----------------------------------------------------------------------
+  @staticmethod
+  def IterBlocks( data, chunk_bytes = 0 ):
+    """Iterates over ``data`` in blocks along the first axis.  For
+h5py.Dataset objects each block is read into a reused buffer, so callers
+must not retain references to yielded blocks across iterations.
+    Args:
+        data (h5py.Dataset or np.ndarray): data to traverse
+        chunk_bytes (int): maximum bytes per block, where values le 0
+            mean ``CHUNK_BYTES``
+    Yields:
+        tuple: ( block_slice, np.ndarray block ), where ``block_slice``
+            is the index applied to ``data`` to obtain the block
+"""
+    shape = data.shape
+    if len( shape ) == 0:
+      yield  (), np.asarray( data[ () ] )
+
+    elif shape[ 0 ] > 0:
+      if chunk_bytes <= 0:
+        chunk_bytes = DataSetStats.CHUNK_BYTES
+      row_size = 1
+      for n in shape[ 1 : ]:
+        row_size *= n
+      row_bytes = max( 1, row_size * data.dtype.itemsize )
+      nrows = max( 1, chunk_bytes // row_bytes )
+
+#			-- Align with HDF5 chunking
+      h5_chunks = getattr( data, 'chunks', None )
+      if h5_chunks and nrows > h5_chunks[ 0 ]:
+        nrows -= nrows % h5_chunks[ 0 ]
+      nrows = min( nrows, shape[ 0 ] )
+
+      if isinstance( data, h5py.Dataset ) and nrows < shape[ 0 ]:
+        buf = np.empty( ( nrows, ) + tuple( shape[ 1 : ] ), dtype = data.dtype )
+        for i in xrange( 0, shape[ 0 ], nrows ):
+          j = min( i + nrows, shape[ 0 ] )
+          data.read_direct( buf, np.s_[ i : j ], np.s_[ 0 : j - i ] )
+          yield  slice( i, j ), buf[ 0 : j - i ]
+      else:
+        for i in xrange( 0, shape[ 0 ], nrows ):
+          block_slice = slice( i, min( i + nrows, shape[ 0 ] ) )
+          yield  block_slice, np.asarray( data[ block_slice ] )
+    #end elif shape[ 0 ] > 0
+  #end IterBlocks
+
+
+  #----------------------------------------------------------------------
+  #	METHOD:		ReduceHistogram()				-
+  #----------------------------------------------------------------------
+  @staticmethod
+  def ReduceHistogram(
+      data, bins, value_range,
+      factors = None, scale_type = 'linear', chunk_bytes = 0,
+      threshold = None
+      ):
+    """Computes a histogram of valid values in ``data`` in a single
+streaming pass.  Bins are spaced logarithmically for a 'log' ``scale_type``.
+    Args:
+        data (h5py.Dataset or np.ndarray): data to scan
+        bins (int): number of bins
+        value_range (tuple): ( min_value, max_value ) histogram range
+        factors (np.ndarray): optional factors with the same shape as
+            ``data``
+        scale_type (str): 'linear' or 'log'
+        chunk_bytes (int): maximum bytes per block read
+        threshold (RangeExpression): optional threshold outside of which
+            values are ignored
+    Returns:
+        tuple: ( np.ndarray counts, np.ndarray bin edges )
+"""
+    vmin, vmax = value_range
+    if scale_type == 'log' and vmin > 0.0 and vmax > vmin:
+      edges = np.logspace( math.log10( vmin ), math.log10( vmax ), bins + 1 )
+    else:
+      edges = np.linspace( vmin, vmax, bins + 1 )
+    counts = np.zeros( bins, dtype = np.int64 )
+
+    if data is not None:
+      if factors is not None:
+        factors = np.asarray( factors )
+        if factors.shape != data.shape:
+          factors = None
+
+      for block_slice, block in DataSetStats.IterBlocks( data, chunk_bytes ):
+        mask = DataSetStats.CreateMask(
+            block,
+            factors[ block_slice ] if factors is not None else None,
+            scale_type,
+            threshold.CreateMask( block ) if threshold is not None else None
+            )
+        values = block  if mask is None else  block[ mask ]
+        if values.size > 0:
+          counts += np.histogram( values, edges )[ 0 ]
+      #end for block_slice, block
+    #end if data
+
+    return  counts, edges
+  #end ReduceHistogram
+
+
+  #----------------------------------------------------------------------
+  #	METHOD:		ReduceRange()					-
+  #----------------------------------------------------------------------
+  @staticmethod
+  def ReduceRange(
+      data, factors = None, scale_type = 'linear', chunk_bytes = 0,
+      threshold = None
+      ):
+    """Computes the min and max of ``data`` in a single streaming pass.
+Values are ignored where ``factors`` is le 0, where they are NaN or infinite,
+where they are outside ``threshold``, and, for a 'log' ``scale_type``, where
+they are le 0.
+    Args:
+        data (h5py.Dataset or np.ndarray): data to scan
+        factors (np.ndarray): optional factors with the same shape as
+            ``data``
+        scale_type (str): 'linear' or 'log'
+        chunk_bytes (int): maximum bytes per block read
+        threshold (RangeExpression): optional threshold outside of which
+            values are ignored
+    Returns:
+        tuple: ( min_value, max_value ), with NaN values if there are no
+            valid values
+"""
+    vmin = vmax = NAN
+
+    if data is not None:
+      if factors is not None:
+        factors = np.asarray( factors )
+        if factors.shape != data.shape:
+          factors = None
+
+      for block_slice, block in DataSetStats.IterBlocks( data, chunk_bytes ):
+        if block.size == 0:
+          continue
+        mask = DataSetStats.CreateMask(
+            block,
+            factors[ block_slice ] if factors is not None else None,
+            scale_type,
+            threshold.CreateMask( block ) if threshold is not None else None
+            )
+        if mask is not None:
+          if not mask.any():
+            continue
+          block = block[ mask ]
+
+        cur_min = block.min().item()
+        cur_max = block.max().item()
+        if math.isnan( vmin ) or cur_min < vmin:
+          vmin = cur_min
+        if math.isnan( vmax ) or cur_max > vmax:
+          vmax = cur_max
+      #end for block_slice, block
+    #end if data
+
+    return  vmin, vmax
+  #end ReduceRange
+
+  #----------------------------------------------------------------------
+  #	METHOD:		ReduceStats()					-
+  #----------------------------------------------------------------------
+  @staticmethod
+  def ReduceStats(
+      data, factors = None, scale_type = 'linear', chunk_bytes = 0,
+      threshold = None
+      ):
+    """Computes min, max, their first flat (C-order) indexes, and value
+counts in a single streaming pass.  Valid values are determined as for
+``ReduceRange()``.
+    Args:
+        data (h5py.Dataset or np.ndarray): data to scan
+        factors (np.ndarray): optional factors with the same shape as
+            ``data``
+        scale_type (str): 'linear' or 'log'
+        chunk_bytes (int): maximum bytes per block read
+        threshold (RangeExpression): optional threshold outside of which
+            values are ignored and counted as NaN
+    Returns:
+        dict: keys 'min', 'max' (NaN if no valid values), 'argmin',
+            'argmax' (-1 if no valid values), 'count' (number of valid
+            values), 'nan_count' (number of NaN or thresholded values)
+"""
+    result = dict(
+        min = NAN, max = NAN, argmin = -1, argmax = -1,
+        count = 0, nan_count = 0
+        )
+
+    if data is not None:
+      if factors is not None:
+        factors = np.asarray( factors )
+        if factors.shape != data.shape:
+          factors = None
+
+      row_size = 1
+      for n in data.shape[ 1 : ]:
+        row_size *= n
+
+      for block_slice, block in DataSetStats.IterBlocks( data, chunk_bytes ):
+        if block.size == 0:
+          continue
+        offset = block_slice.start * row_size \
+            if isinstance( block_slice, slice ) else 0
+
+        threshold_mask = \
+            threshold.CreateMask( block ) if threshold is not None else None
+        mask = DataSetStats.CreateMask(
+            block,
+            factors[ block_slice ] if factors is not None else None,
+            scale_type, threshold_mask
+            )
+        if mask is None:
+          min_ndx = int( block.argmin() )
+          max_ndx = int( block.argmax() )
+          cur_count = block.size
+        else:
+          nan_mask = np.isnan( block )  if block.dtype.kind == 'f' else  None
+          if threshold_mask is not None:
+            nan_mask = ~threshold_mask  if nan_mask is None else \
+                nan_mask | ~threshold_mask
+          if nan_mask is not None:
+            result[ 'nan_count' ] += int( np.count_nonzero( nan_mask ) )
+          cur_count = int( np.count_nonzero( mask ) )
+          if cur_count == 0:
+            continue
+          valid = block[ mask ]
+          flat_ndxs = np.flatnonzero( mask )
+          min_ndx = int( flat_ndxs[ valid.argmin() ] )
+          max_ndx = int( flat_ndxs[ valid.argmax() ] )
+
+        result[ 'count' ] += cur_count
+        cur_min = block.flat[ min_ndx ].item()
+        cur_max = block.flat[ max_ndx ].item()
+        if result[ 'argmin' ] < 0 or cur_min < result[ 'min' ]:
+          result[ 'min' ] = cur_min
+          result[ 'argmin' ] = offset + min_ndx
+        if result[ 'argmax' ] < 0 or cur_max > result[ 'max' ]:
+          result[ 'max' ] = cur_max
+          result[ 'argmax' ] = offset + max_ndx
+      #end for block_slice, block
+    #end if data
+
+    return  result
+  #end ReduceStats
+
+
+#end DataSetStats
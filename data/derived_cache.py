@@ -0,0 +1,426 @@
+#!/usr/bin/env python
+# $Id$
+#------------------------------------------------------------------------
+#	NAME:		derived_cache.py				-
+#	HISTORY:							-
+#		2026-10-18						-
+#	  Persistent derived datasets.  Opened once for append, or
+#	  read-only when it cannot be written, and kept open so returned
+#	  datasets stay valid.  Skipped when locked by another process.
+#------------------------------------------------------------------------
+"""Persistent cache of derived datasets for a VERA output file.
+
+Derived datasets (averages from ``DataModel.CreateDerivedDataSet2()`` and
+differences from ``Differences.calc()``) otherwise live only as long as the
+session.  When enabled with ``SetEnabled()``, each one is also written to
+an HDF5 file beside the source file, as ``name.derived.h5`` for
+``name.h5``, or in the cache directory if the source directory is not
+writable.
+
+Entries are keyed by a string built with ``CreateKey()`` from everything
+that went into the derivation, so a request with the same provenance is
+answered from the cache.  On open only the entry index is read.  Dataset
+names are registered immediately and the data are read when first
+accessed.  The cache is discarded when the source file path, modification
+time, or size change.
+
+The file is opened once for append and stays open until ``Close()``, so
+datasets returned by ``GetDataSet()`` remain valid across later stores.
+When it cannot be opened for append, e.g., because another session is
+reading it, it is opened read-only and stores are skipped for the session.
+When it cannot be opened at all, the cache is skipped.
+"""
+import hashlib, h5py, logging, os, sys, threading, traceback
+import numpy as np
+import pdb
+
+from .config import Config
+from .stats_cache import StatsCache
+
+
+#------------------------------------------------------------------------
+#	CLASS:		DerivedCache					-
+#------------------------------------------------------------------------
+class DerivedCache( object ):
+  """Per-file persistent derived datasets, one group per dataset name with
+one dataset per state point.
+
+Properties:
+  cachePath		path to the cache HDF5 file
+  entries		dict by dataset name of entry dicts with keys
+			'axialMesh', 'axialMeshCenters', 'dsType', 'group',
+			and 'key'
+  h5File		h5py.File open for append, or read-only if it cannot be
+			written, None until needed
+  lock			threading.RLock
+  sourceId		( path, mtime, size ) of the source file
+"""
+
+
+#		-- Constants
+#		--
+
+  VERSION = 1
+
+
+#		-- Class Attributes
+#		--
+
+  enabled_ = False
+
+
+#		-- Object Methods
+#		--
+
+
+  #----------------------------------------------------------------------
+  #	METHOD:		DerivedCache.__init__()				-
+  #----------------------------------------------------------------------
+  def __init__( self, source_path, cache_path = None ):
+    """Reads the entry index of any current cache file.
+    Args:
+        source_path (str): path to the VERA output HDF5 file
+        cache_path (str): optional cache file path, defaulting to the
+            result of ``CreateCachePath()``
+"""
+    self.logger = logging.getLogger( 'data' )
+    self.lock = threading.RLock()
+
+    self.cachePath = cache_path or DerivedCache.CreateCachePath( source_path )
+    self.entries = {}
+    self.h5File = None
+    self.sourceId = StatsCache.GetSourceId( source_path )
+
+    if os.path.exists( self.cachePath ):
+      self._Load()
+  #end __init__
+
+
+  #----------------------------------------------------------------------
+  #	METHOD:		DerivedCache.Close()				-
+  #----------------------------------------------------------------------
+  def Close( self ):
+    with self.lock:
+      self.entries.clear()
+      if self.h5File is not None:
+        self.h5File.close()
+        self.h5File = None
+  #end Close
+
+
+  #----------------------------------------------------------------------
+  #	METHOD:		DerivedCache.FindName()				-
+  #----------------------------------------------------------------------
+  def FindName( self, key ):
+    """
+    Args:
+        key (str): key from ``CreateKey()``
+    Returns:
+        str: name of the dataset cached for the key or None
+"""
+    result = None
+    with self.lock:
+      for ds_name, entry in self.entries.iteritems():
+        if entry[ 'key' ] == key:
+          result = ds_name
+          break
+    return  result
+  #end FindName
+
+
+  #----------------------------------------------------------------------
+  #	METHOD:		DerivedCache.GetDataSet()			-
+  #----------------------------------------------------------------------
+  def GetDataSet( self, ds_name, state_ndx ):
+    """
+    Args:
+        ds_name (str): derived dataset name
+        state_ndx (int): 0-based state point index
+    Returns:
+        h5py.Dataset: cached dataset, read on access, or None if not
+            cached
+"""
+    dset = None
+    entry = self.entries.get( ds_name )
+    if entry is not None:
+      with self.lock:
+        try:
+          group = self._GetFile()[ entry[ 'group' ] ]
+          dset = group.get( str( state_ndx ) )
+        except IOError, ex:
+          self.logger.warning(
+              'Derived cache "%s" skipped: %s', self.cachePath, str( ex )
+              )
+    return  dset
+  #end GetDataSet
+
+
+  #----------------------------------------------------------------------
+  #	METHOD:		DerivedCache.GetEntries()			-
+  #----------------------------------------------------------------------
+  def GetEntries( self ):
+    """
+    Returns:
+        list: ( ds_name, entry dict, h5py.Dataset for the first cached
+            state point ) tuples sorted by name, for registering names
+"""
+    result = []
+    with self.lock:
+      for ds_name in sorted( self.entries.keys() ):
+        entry = self.entries[ ds_name ]
+        group = self._GetFile()[ entry[ 'group' ] ]
+        state_names = [ n for n in group if n.isdigit() ]
+        if state_names:
+          first_name = min( state_names, key = int )
+          result.append( ( ds_name, entry, group[ first_name ] ) )
+    return  result
+  #end GetEntries
+
+
+  #----------------------------------------------------------------------
+  #	METHOD:		DerivedCache._GetFile()				-
+  #----------------------------------------------------------------------
+  def _GetFile( self, writable = False ):
+    """Opens the cache file for append if not already open, falling back
+to read-only if an existing file cannot be written.  The file is never
+reopened, so datasets returned from it stay valid until ``Close()``.  When
+opened for append, a new file is started if it is not current.  Caller must
+hold ``lock``.
+    Args:
+        writable (bool): True if the caller will write
+    Returns:
+        h5py.File: open cache file
+    Raises:
+        IOError: if the file cannot be opened, e.g., when locked by
+            another process, or if ``writable`` is True and the file is
+            open read-only
+"""
+    if self.h5File is None:
+      try:
+        h5f = h5py.File( self.cachePath, 'a' )
+      except IOError:
+        if not os.path.exists( self.cachePath ):
+          raise
+        h5f = h5py.File( self.cachePath, 'r' )
+
+      if h5f.mode != 'r' and not self._IsCurrent( h5f ):
+        for name in list( h5f.keys() ):
+          del h5f[ name ]
+        h5f.attrs[ 'version' ] = DerivedCache.VERSION
+        h5f.attrs[ 'source_path' ] = self.sourceId[ 0 ]
+        h5f.attrs[ 'source_mtime' ] = self.sourceId[ 1 ]
+        h5f.attrs[ 'source_size' ] = self.sourceId[ 2 ]
+        self.entries.clear()
+      self.h5File = h5f
+    #end if self.h5File is None
+
+    if writable and self.h5File.mode == 'r':
+      raise IOError( 'opened read-only' )
+    return  self.h5File
+  #end _GetFile
+
+
+  #----------------------------------------------------------------------
+  #	METHOD:		DerivedCache._IsCurrent()			-
+  #----------------------------------------------------------------------
+  def _IsCurrent( self, h5f ):
+    """
+    Args:
+        h5f (h5py.File): open cache file
+    Returns:
+        bool: True if the cache file matches this version and source file
+"""
+    attrs = h5f.attrs
+    return \
+        attrs.get( 'version' ) == DerivedCache.VERSION and \
+        attrs.get( 'source_path' ) == self.sourceId[ 0 ] and \
+        attrs.get( 'source_mtime' ) == self.sourceId[ 1 ] and \
+        attrs.get( 'source_size' ) == self.sourceId[ 2 ]
+  #end _IsCurrent
+
+
+  #----------------------------------------------------------------------
+  #	METHOD:		DerivedCache._Load()				-
+  #----------------------------------------------------------------------
+  def _Load( self ):
+    """Reads the entry index from a current cache file.  Errors are logged
+and the cache is then started over on the first ``Put()``.
+"""
+    try:
+      with self.lock:
+        h5f = self._GetFile()
+        if self._IsCurrent( h5f ) and 'entries' in h5f:
+          for group in h5f[ 'entries' ].values():
+            ds_name = group.attrs.get( 'ds_name' )
+            if ds_name is not None:
+              ds_type = group.attrs.get( 'ds_type', '' )
+              self.entries[ str( ds_name ) ] = \
+                {
+                'axialMesh': np.array( group[ 'axial_mesh' ] )
+                    if 'axial_mesh' in group else None,
+                'axialMeshCenters': np.array( group[ 'axial_mesh_centers' ] )
+                    if 'axial_mesh_centers' in group else None,
+                'dsType': str( ds_type ) if ds_type else None,
+                'group': group.name,
+                'key': str( group.attrs.get( 'key', '' ) )
+                }
+          #end for group
+    except Exception, ex:
+      self.logger.warning(
+          'Error reading derived cache "%s": %s', self.cachePath, str( ex )
+          )
+      self.entries.clear()
+  #end _Load
+
+
+  #----------------------------------------------------------------------
+  #	METHOD:		DerivedCache.Put()				-
+  #----------------------------------------------------------------------
+  def Put(
+      self, key, ds_name, dsets,
+      ds_type = None, axial_mesh = None, axial_mesh_centers = None
+      ):
+    """Writes a derived dataset, replacing any entry with the same name.
+Errors are logged and otherwise ignored, since the cache is an optimization
+only.
+    Args:
+        key (str): key from ``CreateKey()``
+        ds_name (str): derived dataset name
+        dsets (dict): datasets or arrays by 0-based state point index
+        ds_type (str): optional dataset category/type under which the name
+            is registered, None to resolve from the shape
+        axial_mesh (np.ndarray): optional axial mesh for the dataset
+        axial_mesh_centers (np.ndarray): optional axial mesh centers
+"""
+    with self.lock:
+      try:
+        self.Remove( ds_name )
+        group = self._GetFile( True ).require_group( 'entries' ).create_group(
+            hashlib.sha1( ds_name.encode( 'utf-8' ) ).hexdigest()
+            )
+        group.attrs[ 'ds_name' ] = ds_name
+        group.attrs[ 'ds_type' ] = ds_type or ''
+        group.attrs[ 'key' ] = key
+        if axial_mesh is not None:
+          group.create_dataset( 'axial_mesh', data = axial_mesh )
+        if axial_mesh_centers is not None:
+          group.create_dataset(
+              'axial_mesh_centers', data = axial_mesh_centers
+              )
+        for state_ndx, dset in dsets.iteritems():
+          if dset is not None:
+            group.create_dataset( str( state_ndx ), data = np.array( dset ) )
+        self.h5File.flush()
+
+        self.entries[ ds_name ] = \
+          {
+          'axialMesh': axial_mesh,
+          'axialMeshCenters': axial_mesh_centers,
+          'dsType': ds_type,
+          'group': group.name,
+          'key': key
+          }
+
+      except IOError, ex:
+        self.logger.warning(
+            'Derived cache "%s" skipped: %s', self.cachePath, str( ex )
+            )
+      except Exception, ex:
+        self.logger.warning(
+            'Error writing derived cache "%s": %s', self.cachePath, str( ex )
+            )
+  #end Put
+
+
+  #----------------------------------------------------------------------
+  #	METHOD:		DerivedCache.Remove()				-
+  #----------------------------------------------------------------------
+  def Remove( self, ds_name ):
+    """
+    Args:
+        ds_name (str): derived dataset name
+    Returns:
+        bool: True if removed, False if not cached
+"""
+    with self.lock:
+      entry = self.entries.pop( ds_name, None )
+      if entry is not None:
+        try:
+          h5f = self._GetFile( True )
+          if entry[ 'group' ] in h5f:
+            del h5f[ entry[ 'group' ] ]
+        except IOError, ex:
+          self.logger.warning(
+              'Derived cache "%s" skipped: %s', self.cachePath, str( ex )
+              )
+    return  entry is not None
+  #end Remove
+
+
+#		-- Static Methods
+#		--
+
+
+  #----------------------------------------------------------------------
+  #	METHOD:		DerivedCache.CreateCachePath()			-
+  #----------------------------------------------------------------------
+  @staticmethod
+  def CreateCachePath( source_path ):
+    """
+    Args:
+        source_path (str): path to the VERA output HDF5 file
+    Returns:
+        str: ``name.derived.h5`` beside ``source_path`` if its directory
+            is writable, otherwise a path in ``Config.GetCacheDir()``
+"""
+    abs_path = os.path.abspath( source_path )
+    if os.access( os.path.dirname( abs_path ), os.W_OK ):
+      result = os.path.splitext( abs_path )[ 0 ] + '.derived.h5'
+    else:
+      result = os.path.join(
+          Config.GetCacheDir( True ),
+          hashlib.sha1( abs_path.encode( 'utf-8' ) ).hexdigest() +
+              '.derived.h5'
+          )
+    return  result
+  #end CreateCachePath
+
+
+  #----------------------------------------------------------------------
+  #	METHOD:		DerivedCache.CreateKey()			-
+  #----------------------------------------------------------------------
+  @staticmethod
+  def CreateKey( method, *items ):
+    """
+    Args:
+        method (str): derivation, e.g., 'derive', 'difference'
+        *items: everything else affecting the values, e.g., source dataset
+            name, axes, averaging method, factors flag, thresholds, and
+            reference file identity, each converted with ``str()``
+    Returns:
+        str: key
+"""
+    return  '|'.join(
+        [ method ] + [ '' if item is None else str( item ) for item in items ]
+        )
+  #end CreateKey
+
+
+  #----------------------------------------------------------------------
+  #	METHOD:		DerivedCache.IsEnabled()			-
+  #----------------------------------------------------------------------
+  @staticmethod
+  def IsEnabled():
+    return  DerivedCache.enabled_
+  #end IsEnabled
+
+
+  #----------------------------------------------------------------------
+  #	METHOD:		DerivedCache.SetEnabled()			-
+  #----------------------------------------------------------------------
+  @staticmethod
+  def SetEnabled( value ):
+    DerivedCache.enabled_ = bool( value )
+  #end SetEnabled
+
+#end DerivedCache
@@ -0,0 +1,534 @@
+#!/usr/bin/env python
+# $Id$
+#------------------------------------------------------------------------
+#	NAME:		derived_store.py				-
+#	HISTORY:							-
+#		2026-10-18						-
+#	  Pluggable storage for derived datasets.  ThresholdDataSet in
+#	  place of stored threshold copies.  AddDataSet() for datasets
+#	  computed on access.
+#------------------------------------------------------------------------
+"""Storage for the derived datasets of a DataModel.
+
+Derived datasets (reshaped copies, thresholds, averages, differences) have
+always been written to a temporary HDF5 file.  A DerivedStore puts them in
+one of three backends:
+
+  'memory'	NumPy arrays held in memory, up to the byte budget, beyond
+		which datasets spill to memory-mapped .npy files
+  'npy'		memory-mapped .npy files in a temporary directory
+  'hdf5'	the temporary HDF5 file, as before
+
+Arrays in the 'memory' and 'npy' backends are served through
+``DerivedDataSet``, which provides the subset of the h5py.Dataset interface
+used on derived datasets.  Reads are slices of the stored array, so a
+memory-mapped dataset reads only the pages addressed.
+
+The backend and budget for new stores are set with ``SetBackend()`` and
+``SetBudget()``.
+
+Thresholds are not stored.  A ``ThresholdDataSet`` wraps the source dataset
+and applies its RangeExpression to the values read, so only the slices
+addressed are read and masked.
+"""
+import os, shutil, tempfile, threading
+import numpy as np
+import pdb
+
+
+#------------------------------------------------------------------------
+#	CLASS:		DerivedDataSet					-
+#------------------------------------------------------------------------
+class DerivedDataSet( object ):
+  """Array-backed stand-in for an h5py.Dataset.  The array is read-only and
+indexing returns copies, as with h5py.
+
+Properties:
+  attrs			dict of attributes
+  data			np.ndarray or np.memmap, not to be modified
+  dtype			array dtype
+  file			DerivedStore owning this, with a ``filename``
+  id			this, hashable for cache identity
+  name			"/group/dataset" path
+  ndim			number of dimensions
+  shape			array shape
+  size			number of elements
+  value			the array, as the deprecated h5py property
+"""
+
+
+#		-- Object Methods
+#		--
+
+
+  #----------------------------------------------------------------------
+  #	METHOD:		DerivedDataSet.__array__()			-
+  #----------------------------------------------------------------------
+  def __array__( self, dtype = None ):
+    return  self.data if dtype is None else self.data.astype( dtype )
+  #end __array__
+
+
+  #----------------------------------------------------------------------
+  #	METHOD:		DerivedDataSet.__getitem__()			-
+  #----------------------------------------------------------------------
+  def __getitem__( self, key ):
+    value = self.data[ key ]
+    return  np.array( value ) if isinstance( value, np.ndarray ) else value
+  #end __getitem__
+
+
+  #----------------------------------------------------------------------
+  #	METHOD:		DerivedDataSet.__init__()			-
+  #----------------------------------------------------------------------
+  def __init__( self, store, name, data ):
+    """
+    Args:
+        store (DerivedStore): owning store
+        name (str): "/group/dataset" path
+        data (np.ndarray): read-only array
+"""
+    self.attrs = {}
+    self.data = data
+    self.file = store
+    self.name = name
+  #end __init__
+
+
+  #----------------------------------------------------------------------
+  #	METHOD:		DerivedDataSet.__iter__()			-
+  #----------------------------------------------------------------------
+  def __iter__( self ):
+    for i in xrange( len( self ) ):
+      yield  self[ i ]
+  #end __iter__
+
+
+  #----------------------------------------------------------------------
+  #	METHOD:		DerivedDataSet.__len__()			-
+  #----------------------------------------------------------------------
+  def __len__( self ):
+    return  self.data.shape[ 0 ]
+  #end __len__
+
+
+  #----------------------------------------------------------------------
+  #	METHOD:		DerivedDataSet.__repr__()			-
+  #----------------------------------------------------------------------
+  def __repr__( self ):
+    return  '<DerivedDataSet "%s": shape %s, type "%s">' % \
+        ( self.name, self.shape, self.dtype.str )
+  #end __repr__
+
+
+#		-- Properties
+#		--
+
+  dtype = property( lambda x : x.data.dtype )
+
+  id = property( lambda x : x )
+
+  ndim = property( lambda x : x.data.ndim )
+
+  shape = property( lambda x : x.data.shape )
+
+  size = property( lambda x : x.data.size )
+
+  value = property( lambda x : x.data )
+
+#end DerivedDataSet
+
+
+#------------------------------------------------------------------------
+#	CLASS:		DerivedStore					-
+#------------------------------------------------------------------------
+class DerivedStore( object ):
+  """Derived dataset storage for one DataModel, keyed by HDF5 group and
+dataset name.  The group is the derived HDF5 group of the state point,
+which is also where lookups fall back for datasets written there directly
+(time datasets and ``type_object`` copies).
+
+Properties:
+  backend		'hdf5', 'memory', or 'npy'
+  budget		byte budget for in-memory arrays
+  bytes			bytes currently held in memory
+  dataSets		dict of DerivedDataSet by ( group name, dataset name )
+  filename		name used to identify the store, the HDF5 file name
+  lock			threading.RLock
+  spillCount		number of .npy files written
+  spillDir		temporary directory for .npy files, created on demand
+"""
+
+
+#		-- Constants
+#		--
+
+  BACKENDS = ( 'hdf5', 'memory', 'npy' )
+
+
+#		-- Class Attributes
+#		--
+
+  backend_ = 'memory'
+
+  budget_ = 256 << 20
+
+
+#		-- Object Methods
+#		--
+
+
+  #----------------------------------------------------------------------
+  #	METHOD:		DerivedStore.__init__()				-
+  #----------------------------------------------------------------------
+  def __init__( self, filename, backend = None, budget = None ):
+    """
+    Args:
+        filename (str): derived HDF5 file name
+        backend (str): optional backend, defaulting to ``GetBackend()``
+        budget (int): optional byte budget, defaulting to ``GetBudget()``
+"""
+    self.backend = backend or DerivedStore.backend_
+    if self.backend not in DerivedStore.BACKENDS:
+      raise ValueError( 'Unknown derived store backend: ' + str( backend ) )
+
+    self.budget = DerivedStore.budget_ if budget is None else budget
+    self.bytes = 0
+    self.dataSets = {}
+    self.filename = filename
+    self.lock = threading.RLock()
+    self.spillCount = 0
+    self.spillDir = None
+  #end __init__
+
+
+  #----------------------------------------------------------------------
+  #	METHOD:		DerivedStore.AddDataSet()			-
+  #----------------------------------------------------------------------
+  def AddDataSet( self, group, ds_name, dset ):
+    """Adds a dataset object, such as one computing values on access,
+with any backend.  Its memory is not counted against the budget.
+    Args:
+        group (h5py.Group): derived HDF5 group
+        ds_name (str): dataset name
+        dset: object with the h5py.Dataset interface used on derived
+            datasets
+    Returns:
+        object: ``dset``
+"""
+    key = ( group.name, ds_name )
+    with self.lock:
+      if key in self.dataSets or ds_name in group:
+        raise ValueError( 'Dataset already exists: ' + ds_name )
+      self.dataSets[ key ] = dset
+    return  dset
+  #end AddDataSet
+
+
+  #----------------------------------------------------------------------
+  #	METHOD:		DerivedStore.Close()				-
+  #----------------------------------------------------------------------
+  def Close( self ):
+    """Releases all arrays and removes any .npy files.
+"""
+    with self.lock:
+      self.dataSets.clear()
+      self.bytes = 0
+      if self.spillDir is not None:
+        shutil.rmtree( self.spillDir, True )
+        self.spillDir = None
+  #end Close
+
+
+  #----------------------------------------------------------------------
+  #	METHOD:		DerivedStore.CreateDataSet()			-
+  #----------------------------------------------------------------------
+  def CreateDataSet( self, group, ds_name, data_in ):
+    """Stores a new dataset.
+    Args:
+        group (h5py.Group): derived HDF5 group
+        ds_name (str): dataset name
+        data_in (np.ndarray): data, which is copied
+    Returns:
+        h5py.Dataset or DerivedDataSet: new dataset
+"""
+    if self.backend == 'hdf5':
+      return  group.create_dataset( ds_name, data = data_in )
+
+    key = ( group.name, ds_name )
+    data = np.array( data_in )
+    with self.lock:
+      if key in self.dataSets or ds_name in group:
+        raise ValueError( 'Dataset already exists: ' + ds_name )
+
+      if data.nbytes == 0 or (self.backend == 'memory' and
+          self.bytes + data.nbytes <= self.budget):
+        self.bytes += data.nbytes
+      else:
+        data = self._Spill( data )
+      data.flags.writeable = False
+
+      dset = DerivedDataSet(
+          self, group.name.rstrip( '/' ) + '/' + ds_name, data
+          )
+      self.dataSets[ key ] = dset
+    #end with self.lock
+
+    return  dset
+  #end CreateDataSet
+
+
+  #----------------------------------------------------------------------
+  #	METHOD:		DerivedStore.GetDataSet()			-
+  #----------------------------------------------------------------------
+  def GetDataSet( self, group, ds_name ):
+    """
+    Args:
+        group (h5py.Group): derived HDF5 group
+        ds_name (str): dataset name
+    Returns:
+        h5py.Dataset or DerivedDataSet: dataset or None if not found
+"""
+    dset = self.dataSets.get( ( group.name, ds_name ) )
+    if dset is None and ds_name in group:
+      dset = group[ ds_name ]
+    return  dset
+  #end GetDataSet
+
+
+  #----------------------------------------------------------------------
+  #	METHOD:		DerivedStore.HasDataSet()			-
+  #----------------------------------------------------------------------
+  def HasDataSet( self, group, ds_name ):
+    """
+    Args:
+        group (h5py.Group): derived HDF5 group
+        ds_name (str): dataset name
+    Returns:
+        bool: True if found
+"""
+    return  ( group.name, ds_name ) in self.dataSets or ds_name in group
+  #end HasDataSet
+
+
+  #----------------------------------------------------------------------
+  #	METHOD:		DerivedStore.RemoveDataSet()			-
+  #----------------------------------------------------------------------
+  def RemoveDataSet( self, group, ds_name ):
+    """Removes a dataset.  Memory-mapped files are left for ``Close()``,
+since arrays read earlier may still reference them.
+    Args:
+        group (h5py.Group): derived HDF5 group
+        ds_name (str): dataset name
+    Returns:
+        bool: True if removed, False if not found
+"""
+    with self.lock:
+      dset = self.dataSets.pop( ( group.name, ds_name ), None )
+      removed = dset is not None
+      if removed:
+        if isinstance( dset, DerivedDataSet ) and \
+            not isinstance( dset.data, np.memmap ):
+          self.bytes -= dset.data.nbytes
+      elif ds_name in group:
+        del group[ ds_name ]
+        removed = True
+
+    return  removed
+  #end RemoveDataSet
+
+
+  #----------------------------------------------------------------------
+  #	METHOD:		DerivedStore._Spill()				-
+  #----------------------------------------------------------------------
+  def _Spill( self, data ):
+    """Writes the array to a new .npy file.  Caller must hold ``lock``.
+    Args:
+        data (np.ndarray): array to write
+    Returns:
+        np.memmap: read-only map of the file
+"""
+    if self.spillDir is None:
+      self.spillDir = tempfile.mkdtemp( '.derived' )
+
+    path = os.path.join( self.spillDir, '%d.npy' % self.spillCount )
+    self.spillCount += 1
+
+    np.save( path, data )
+    return  np.load( path, mmap_mode = 'r' )
+  #end _Spill
+
+
+#		-- Static Methods
+#		--
+
+
+  #----------------------------------------------------------------------
+  #	METHOD:		GetBackend()					-
+  #----------------------------------------------------------------------
+  @staticmethod
+  def GetBackend():
+    """
+    Returns:
+        str: backend for new stores
+"""
+    return  DerivedStore.backend_
+  #end GetBackend
+
+
+  #----------------------------------------------------------------------
+  #	METHOD:		GetBudget()					-
+  #----------------------------------------------------------------------
+  @staticmethod
+  def GetBudget():
+    """
+    Returns:
+        int: byte budget for new stores
+"""
+    return  DerivedStore.budget_
+  #end GetBudget
+
+
+  #----------------------------------------------------------------------
+  #	METHOD:		SetBackend()					-
+  #----------------------------------------------------------------------
+  @staticmethod
+  def SetBackend( value ):
+    """
+    Args:
+        value (str): 'hdf5', 'memory', or 'npy'
+"""
+    if value not in DerivedStore.BACKENDS:
+      raise ValueError( 'Unknown derived store backend: ' + str( value ) )
+    DerivedStore.backend_ = value
+  #end SetBackend
+
+
+  #----------------------------------------------------------------------
+  #	METHOD:		SetBudget()					-
+  #----------------------------------------------------------------------
+  @staticmethod
+  def SetBudget( value ):
+    """
+    Args:
+        value (int): byte budget for in-memory arrays, beyond which
+            datasets spill to .npy files
+"""
+    DerivedStore.budget_ = max( 0, int( value ) )
+  #end SetBudget
+
+#end DerivedStore
+
+
+#------------------------------------------------------------------------
+#	CLASS:		ThresholdDataSet				-
+#------------------------------------------------------------------------
+class ThresholdDataSet( object ):
+  """Read-through view of a dataset with a threshold applied to the values
+read, filling those outside the range with NaN.  Nothing is copied until
+indexed, and stats reductions can use ``dataSet`` and ``rangeExpr``
+directly to mask in the same pass.
+
+Properties:
+  attrs			attributes of the source dataset
+  dataSet		source h5py.Dataset or DerivedDataSet
+  dtype			source dtype
+  file			source file
+  id			( source id, expression ), hashable for cache identity
+  name			source "/group/dataset" path
+  ndim			number of dimensions
+  rangeExpr		RangeExpression applied
+  shape			source shape
+  size			number of elements
+  value			the thresholded array, as the deprecated h5py property
+"""
+
+
+#		-- Object Methods
+#		--
+
+
+  #----------------------------------------------------------------------
+  #	METHOD:		ThresholdDataSet.__array__()			-
+  #----------------------------------------------------------------------
+  def __array__( self, dtype = None ):
+    result = self.rangeExpr.ApplyThreshold( np.array( self.dataSet ) )
+    return  result if dtype is None else result.astype( dtype )
+  #end __array__
+
+
+  #----------------------------------------------------------------------
+  #	METHOD:		ThresholdDataSet.__getitem__()			-
+  #----------------------------------------------------------------------
+  def __getitem__( self, key ):
+    value = self.dataSet[ key ]
+    if isinstance( value, np.ndarray ):
+      value = self.rangeExpr.ApplyThreshold( value )
+    else:
+      value = self.rangeExpr.ApplyThreshold( np.array( value ) )[ () ]
+    return  value
+  #end __getitem__
+
+
+  #----------------------------------------------------------------------
+  #	METHOD:		ThresholdDataSet.__init__()			-
+  #----------------------------------------------------------------------
+  def __init__( self, dset, range_expr ):
+    """
+    Args:
+        dset (h5py.Dataset or DerivedDataSet): source dataset
+        range_expr (RangeExpression): threshold to apply
+"""
+    self.dataSet = dset
+    self.rangeExpr = range_expr
+  #end __init__
+
+
+  #----------------------------------------------------------------------
+  #	METHOD:		ThresholdDataSet.__iter__()			-
+  #----------------------------------------------------------------------
+  def __iter__( self ):
+    for i in xrange( len( self ) ):
+      yield  self[ i ]
+  #end __iter__
+
+
+  #----------------------------------------------------------------------
+  #	METHOD:		ThresholdDataSet.__len__()			-
+  #----------------------------------------------------------------------
+  def __len__( self ):
+    return  self.dataSet.shape[ 0 ]
+  #end __len__
+
+
+  #----------------------------------------------------------------------
+  #	METHOD:		ThresholdDataSet.__repr__()			-
+  #----------------------------------------------------------------------
+  def __repr__( self ):
+    return  '<ThresholdDataSet "%s": shape %s, threshold "%s">' % \
+        ( self.name, self.shape, str( self.rangeExpr ) )
+  #end __repr__
+
+
+#		-- Properties
+#		--
+
+  attrs = property( lambda x : x.dataSet.attrs )
+
+  dtype = property( lambda x : x.dataSet.dtype )
+
+  file = property( lambda x : x.dataSet.file )
+
+  id = property( lambda x : ( x.dataSet.id, str( x.rangeExpr ) ) )
+
+  name = property( lambda x : x.dataSet.name )
+
+  ndim = property( lambda x : len( x.dataSet.shape ) )
+
+  shape = property( lambda x : x.dataSet.shape )
+
+  size = property( lambda x : x.dataSet.size )
+
+  value = property( lambda x : x.__array__() )
+
+#end ThresholdDataSet
@@ -1,6 +1,10 @@
 #------------------------------------------------------------------------
 #	NAME:		differences.py					-
 #	HISTORY:							-
+#		2026-10-18						-
+#	  Using and filling the comparison model's DerivedCache.
+#	  States calculated on a StatePool.  Virtual differences with
+#	  DifferenceDataSet.
 #		2017-02-24	leerw@ornl.gov				-
 #		2017-02-16	leerw@ornl.gov				-
 #	  Added diff_mode and interp_mode params.
@@ -14,7 +18,10 @@ import numpy as np
 import pdb
 
 from .datamodel import DataSetName
+from .derived_cache import DerivedCache
 from .interpolator import *
+from .state_pool import StatePool
+from .stats_cache import StatsCache
 from .utils import DataUtils
 
 
@@ -22,6 +29,18 @@ from .utils import DataUtils
 #	CLASS:		Differences					-
 #------------------------------------------------------------------------
 class Differences( object ):
+  """Difference dataset calculator.  State points are calculated on a
+``StatePool``, which reads and computes upcoming states on worker threads
+while results are written in order on the calling thread.  In virtual mode
+nothing is calculated up front, and each state point gets a
+``DifferenceDataSet`` that computes the values indexed.
+"""
+
+
+#		-- Class Attributes
+#		--
+
+  virtual_ = False
 
 
   #----------------------------------------------------------------------
@@ -48,7 +67,7 @@ class Differences( object ):
   def calc(
       self, ref_qds_name, comp_qds_name, diff_ds_name,
       diff_mode = 'delta', interp_mode = 'linear',
-      listener = None
+      listener = None, virtual = None
       ):
     """Create new difference dataset to be stored as a derived dataset in
 the comp_qds_name model.  Thus, the axial mesh and time
@@ -61,6 +80,8 @@ be the same.
 @param  diff_mode	difference mode, must start with one of 'delta', 'pct'
 @param  interp_mode	interpolation mode, one of 'linear', 'quad', 'cubic'
 @param  listener	optional callable( message, cur_step, step_count )
+@param  virtual		True to compute values as they are read, False to
+			store them for all state points, None for is_virtual()
 @return			difference DataSetName
 @exception		if diff_ds_name not created in comp_qds_name.modelName
 """
@@ -82,6 +103,28 @@ be the same.
     assert ref_type and comp_type and ref_type == comp_type, \
         'Dataset types mismatch: %s ne %s' % ( ref_type, comp_type )
 
+    if virtual is None:
+      virtual = Differences.virtual_
+
+#		-- Persistent cache in the comparison model
+#		--
+    derived_cache = comp_dm.GetDerivedCache()
+    cache_key = None
+    if derived_cache is not None:
+      cache_key = DerivedCache.CreateKey(
+	  'difference',
+	  StatsCache.GetSourceId( ref_dm.GetH5File().filename ),
+	  ref_qds_name.displayName, comp_qds_name.displayName,
+	  diff_mode, interp_mode, self.dmgr.GetTimeDataSet(),
+	  ref_dm.GetDataSetThreshold( ref_qds_name.displayName ),
+	  comp_dm.GetDataSetThreshold( comp_qds_name.displayName )
+	  )
+      if derived_cache.FindName( cache_key ) == diff_ds_name and \
+	  comp_dm.GetDataSetType( diff_ds_name ) == comp_type:
+	return  DataSetName( comp_qds_name.modelName, diff_ds_name )
+      derived_cache.Remove( diff_ds_name )
+    #end if derived_cache is not None
+
     try:
 #      print >> sys.stderr, '[calc] diff_mode=%s, interp_mode=%s' % \
 #          ( diff_mode, interp_mode )
@@ -123,21 +166,35 @@ be the same.
       else:
         must_interpolate = False
 
+#			-- One interpolation operator for all states, with
+#			-- weights created before any workers start
+#			--
+      interp_func = None
+      if must_interpolate:
+	interp_method = \
+	    interp.interpolate_on_spline  if mesh_type == 'detector' else \
+	    interp.interpolate_integral_over_spline
+	interp.get_weights(
+	    'spline'  if mesh_type == 'detector' else  'integral',
+	    interp_mode
+	    )
+	def interp_func( src_data ):
+	  return  interp_method(
+	      src_data, mode = interp_mode, skip_assertions = True
+	      )
+
 #			-- Retrieve times
 #			--
       ref_time_values = self.dmgr.GetTimeValues( ref_qds_name )
       comp_time_values = self.dmgr.GetTimeValues( comp_qds_name )
       equal_times = ref_time_values == comp_time_values
 
-#			-- Statept by statept
+#			-- Datasets for each statept, resolved here since
+#			-- GetStateDataSet() may write copies
 #			--
       step_count = len( comp_time_values )
-      cur_step = 0
-
+      state_dsets = {}
       for comp_state_ndx in xrange( len( comp_time_values ) ):
-	if listener:
-          listener( 'Calculating differences', cur_step, step_count )
-
         cur_time = comp_time_values[ comp_state_ndx ]
 	if equal_times:
 	  ref_state_ndx = comp_state_ndx
@@ -149,43 +206,58 @@ be the same.
 	    GetStateDataSet( ref_state_ndx, ref_qds_name.displayName )
         comp_dset = comp_dm.\
 	    GetStateDataSet( comp_state_ndx, comp_qds_name.displayName )
-	comp_derived_st = comp_dm.GetDerivedState( comp_state_ndx )
-
-        if comp_derived_st is not None and \
+	if comp_dm.GetDerivedState( comp_state_ndx ) is not None and \
 	    ref_dset is not None and comp_dset is not None:
+	  state_dsets[ comp_state_ndx ] = ( ref_dset, comp_dset )
+      #end for comp_state_ndx
 
-	  if must_interpolate:
-	    if mesh_type == 'detector':
-	      ref_data = interp.interpolate_on_spline(
-	          ref_dset,
-		  mode = interp_mode, skip_assertions = True
-		  )
-	    else:
-	      ref_data = interp.interpolate_integral_over_spline(
-	          ref_dset,
-		  mode = interp_mode, skip_assertions = True
+#			-- Virtual, computed on read
+#			--
+      if virtual:
+	for comp_state_ndx in sorted( state_dsets.keys() ):
+	  ref_dset, comp_dset = state_dsets[ comp_state_ndx ]
+	  comp_derived_st = comp_dm.GetDerivedState( comp_state_ndx )
+	  comp_derived_st.AddDataSet(
+	      diff_ds_name,
+	      DifferenceDataSet(
+		  comp_derived_st.group.name.rstrip( '/' ) + '/' +
+		      diff_ds_name,
+		  ref_dset, comp_dset, diff_mode, interp_func
 		  )
-	  else:
-	    ref_data = np.array( ref_dset )
-
-	  if diff_mode.startswith( 'pct' ):
-            errors_save = np.seterr( divide = 'ignore', invalid = 'ignore' )
-            try:
-	      diff_data = (comp_dset - ref_data) / ref_data
-	      diff_data = np.nan_to_num( diff_data )
-	      diff_data *= 100.0
-            finally:
-	      np.seterr( **errors_save )
-	  else:
-	    diff_data = comp_dset - ref_data
-
-          comp_derived_st.CreateDataSet( diff_ds_name, diff_data )
-        #end if comp_derived_st
-
-	cur_step += 1
-      #end for comp_state_ndx
+	      )
+	#end for comp_state_ndx
+	comp_dm.AddDataSetName( comp_type, diff_ds_name )
+	return  DataSetName( comp_qds_name.modelName, diff_ds_name )
+      #end if virtual
+
+#			-- Statept by statept on the pool, written in order
+#			--
+      diff_dsets = {}
+
+      def compute( comp_state_ndx ):
+	ref_dset, comp_dset = state_dsets[ comp_state_ndx ]
+	return  Differences.calc_data(
+	    ref_dset, comp_dset, diff_mode, interp_func
+	    )
+
+      def write( comp_state_ndx, diff_data ):
+	diff_dsets[ comp_state_ndx ] = comp_dm.\
+	    GetDerivedState( comp_state_ndx ).\
+	    CreateDataSet( diff_ds_name, diff_data )
+
+      def progress( comp_state_ndx ):
+	if listener:
+	  listener( 'Calculating differences', len( diff_dsets ), step_count )
+
+      if listener:
+	listener( 'Calculating differences', 0, step_count )
+      StatePool().Run( sorted( state_dsets.keys() ), compute, write, progress )
 
       comp_dm.AddDataSetName( comp_type, diff_ds_name )
+      if cache_key is not None:
+	derived_cache.Put(
+	    cache_key, diff_ds_name, diff_dsets, ds_type = comp_type
+	    )
       return  DataSetName( comp_qds_name.modelName, diff_ds_name )
 
     except Exception, ex:
@@ -196,6 +268,39 @@ be the same.
   #end calc
 
 
+  #----------------------------------------------------------------------
+  #	METHOD:		calc_data()					-
+  #----------------------------------------------------------------------
+  @staticmethod
+  def calc_data( ref_data, comp_data, diff_mode, interp_func = None ):
+    """Calculates differences for one state point or any part of it.
+@param  ref_data	reference values, y in x - y
+@param  comp_data	comparison values, x in x - y
+@param  diff_mode	difference mode, must start with one of 'delta', 'pct'
+@param  interp_func	optional callable( ref_data ) returning reference
+			values interpolated to the comparison mesh
+@return			np.ndarray differences
+"""
+    ref_data = \
+	interp_func( ref_data )  if interp_func is not None else \
+	np.array( ref_data )
+    comp_data = np.asarray( comp_data )
+
+    if diff_mode.startswith( 'pct' ):
+      errors_save = np.seterr( divide = 'ignore', invalid = 'ignore' )
+      try:
+	diff_data = (comp_data - ref_data) / ref_data
+	diff_data = np.nan_to_num( diff_data )
+	diff_data *= 100.0
+      finally:
+	np.seterr( **errors_save )
+    else:
+      diff_data = comp_data - ref_data
+
+    return  diff_data
+  #end calc_data
+
+
   #----------------------------------------------------------------------
   #	METHOD:		equal_meshes()					-
   #----------------------------------------------------------------------
@@ -218,4 +323,216 @@ be the same.
     return  equal
   #end equal_meshes
 
+
+#		-- Static Methods
+#		--
+
+
+  #----------------------------------------------------------------------
+  #	METHOD:		is_virtual()					-
+  #----------------------------------------------------------------------
+  @staticmethod
+  def is_virtual():
+    """
+@return			True if calc() creates virtual differences by default
+"""
+    return  Differences.virtual_
+  #end is_virtual
+
+
+  #----------------------------------------------------------------------
+  #	METHOD:		set_virtual()					-
+  #----------------------------------------------------------------------
+  @staticmethod
+  def set_virtual( value ):
+    """
+@param  value		True for calc() to create virtual differences by
+			default
+"""
+    Differences.virtual_ = bool( value )
+  #end set_virtual
+
 #end Differences
+
+
+#------------------------------------------------------------------------
+#	CLASS:		DifferenceDataSet				-
+#------------------------------------------------------------------------
+class DifferenceDataSet( object ):
+  """Stand-in for an h5py.Dataset whose values are the differences for one
+state point, calculated for the part indexed when read and never stored.
+Integer and slice indexes read only the corresponding part of the source
+datasets, with just the axial axis read in full when interpolating.  Other
+indexes calculate the whole state point.
+
+Properties:
+  attrs			empty dict
+  compDataSet		comparison dataset
+  diffMode		difference mode
+  dtype			result dtype
+  file			comparison dataset file
+  id			this, hashable for cache identity
+  interpFunc		optional reference interpolation callable
+  name			"/group/dataset" path
+  ndim			number of dimensions
+  refDataSet		reference dataset
+  shape			comparison dataset shape
+  size			number of elements
+  value			all the differences
+"""
+
+
+#		-- Constants
+#		--
+
+  AXIAL_AXIS = 2
+
+
+#		-- Object Methods
+#		--
+
+
+  #----------------------------------------------------------------------
+  #	METHOD:		DifferenceDataSet.__array__()			-
+  #----------------------------------------------------------------------
+  def __array__( self, dtype = None ):
+    result = Differences.calc_data(
+	self.refDataSet, self.compDataSet, self.diffMode, self.interpFunc
+	)
+    return  result if dtype is None else result.astype( dtype )
+  #end __array__
+
+
+  #----------------------------------------------------------------------
+  #	METHOD:		DifferenceDataSet.__getitem__()			-
+  #----------------------------------------------------------------------
+  def __getitem__( self, key ):
+    if self.interpFunc is None:
+      result = Differences.calc_data(
+	  self.refDataSet[ key ], self.compDataSet[ key ], self.diffMode
+	  )
+    else:
+      ref_key = self._create_ref_keys( key )
+      if ref_key is None:
+	result = self.__array__()[ key ]
+      else:
+	ref_data = self.interpFunc( self.refDataSet[ ref_key[ 0 ] ] )
+	result = Differences.calc_data(
+	    ref_data[ ref_key[ 1 ] ], self.compDataSet[ key ], self.diffMode
+	    )
+
+    return  result[ () ]  if np.ndim( result ) == 0 else  result
+  #end __getitem__
+
+
+  #----------------------------------------------------------------------
+  #	METHOD:		DifferenceDataSet.__init__()			-
+  #----------------------------------------------------------------------
+  def __init__( self, name, ref_dset, comp_dset, diff_mode, interp_func ):
+    """
+@param  name		"/group/dataset" path
+@param  ref_dset	reference dataset, y in x - y
+@param  comp_dset	comparison dataset, x in x - y
+@param  diff_mode	difference mode, must start with one of 'delta', 'pct'
+@param  interp_func	optional callable( ref_data ) returning reference
+			values interpolated to the comparison mesh
+"""
+    self.attrs = {}
+    self.compDataSet = comp_dset
+    self.diffMode = diff_mode
+    self.dtype = np.result_type(
+	comp_dset.dtype,
+	np.float64  if interp_func is not None else  ref_dset.dtype
+	)
+    self.interpFunc = interp_func
+    self.name = name
+    self.refDataSet = ref_dset
+  #end __init__
+
+
+  #----------------------------------------------------------------------
+  #	METHOD:		DifferenceDataSet.__iter__()			-
+  #----------------------------------------------------------------------
+  def __iter__( self ):
+    for i in xrange( len( self ) ):
+      yield  self[ i ]
+  #end __iter__
+
+
+  #----------------------------------------------------------------------
+  #	METHOD:		DifferenceDataSet.__len__()			-
+  #----------------------------------------------------------------------
+  def __len__( self ):
+    return  self.shape[ 0 ]
+  #end __len__
+
+
+  #----------------------------------------------------------------------
+  #	METHOD:		DifferenceDataSet.__repr__()			-
+  #----------------------------------------------------------------------
+  def __repr__( self ):
+    return  '<DifferenceDataSet "%s": shape %s, mode "%s">' % \
+	( self.name, self.shape, self.diffMode )
+  #end __repr__
+
+
+  #----------------------------------------------------------------------
+  #	METHOD:		DifferenceDataSet._create_ref_keys()		-
+  #----------------------------------------------------------------------
+  def _create_ref_keys( self, key ):
+    """Splits a 4D index into the read from the reference dataset, keeping
+all dimensions and the full axial axis for interpolation, and the index
+applied to the interpolated result.
+@param  key		index
+@return			( read index, result index ) or None if ``key`` is
+			not made of integers and slices
+"""
+    key_items = key  if isinstance( key, tuple ) else  ( key, )
+    shape = self.shape
+    if len( shape ) != 4 or len( key_items ) > 4:
+      return  None
+
+    read_key = []
+    result_key = []
+    for axis in xrange( 4 ):
+      item = key_items[ axis ]  if axis < len( key_items ) else  slice( None )
+      if isinstance( item, slice ):
+	read_item = item
+	result_item = slice( None )
+      elif isinstance( item, ( int, long, np.integer ) ):
+	ndx = item + shape[ axis ]  if item < 0 else  item
+	if ndx < 0 or ndx >= shape[ axis ]:
+	  raise IndexError( 'Index out of range: %d' % item )
+	read_item = slice( ndx, ndx + 1 )
+	result_item = 0
+      else:
+	return  None
+
+      if axis == DifferenceDataSet.AXIAL_AXIS:
+	read_key.append( slice( None ) )
+	result_key.append( item )
+      else:
+	read_key.append( read_item )
+	result_key.append( result_item )
+    #end for axis
+
+    return  tuple( read_key ), tuple( result_key )
+  #end _create_ref_keys
+
+
+#		-- Properties
+#		--
+
+  file = property( lambda x : x.compDataSet.file )
+
+  id = property( lambda x : x )
+
+  ndim = property( lambda x : len( x.compDataSet.shape ) )
+
+  shape = property( lambda x : x.compDataSet.shape )
+
+  size = property( lambda x : x.compDataSet.size )
+
+  value = property( lambda x : x.__array__() )
+
+#end DifferenceDataSet
@@ -1,6 +1,9 @@
 #------------------------------------------------------------------------
 #	NAME:		generic_averages.py				-
 #	HISTORY:							-
+#		2026-10-18						-
+#	  Added calc_{avg,node_avg,rms,stddev}_batch() for state stacks.
+#	  calc_pin_node_avg_batch() for DataModel._CreateDerivedDataSet().
 #               2019-01-24      leerw@ornl.gov                          -
 #         Added calc_{rms,stddev}().
 #		2018-12-05	leerw@ornl.gov				-
@@ -89,6 +92,32 @@ must be called with good parameters before this object can be used.
   #end calc_avg
 
 
+  #----------------------------------------------------------------------
+  #	METHOD:		calc_avg_batch()				-
+  #----------------------------------------------------------------------
+  def calc_avg_batch( self, data, weights, avg_axis ):
+    """Batch form of ``calc_avg()`` over a stack of state points.
+    Args:
+        data (np.ndarray): stacked datasets with shape ( N, ) + dset.shape
+	weights (np.ndarray): weights with shape dset.shape, typically
+	    resolved once with ``resolve_dset_weights()``
+	avg_axis (int or tuple): dataset (not stack) axis for averaging
+    Returns:
+        np.ndarray: calculated averages with the stack axis first
+"""
+    axis = self._shift_axis( avg_axis )
+    errors_save = np.seterr( divide = 'ignore', invalid = 'ignore' )
+    try:
+      avg = \
+          np.sum( np.nan_to_num( data ) * weights, axis = axis ) / \
+          np.sum( weights, axis = self._shift_axis( avg_axis, 0 ) )
+    finally:
+      np.seterr( **errors_save )
+
+    return  avg
+  #end calc_avg_batch
+
+
   #----------------------------------------------------------------------
   #	METHOD:		calc_node_avg()					-
   #----------------------------------------------------------------------
@@ -149,6 +178,53 @@ must be called with good parameters before this object can be used.
   #end calc_node_avg
 
 
+  #----------------------------------------------------------------------
+  #	METHOD:		calc_node_avg_batch()				-
+  #----------------------------------------------------------------------
+  def calc_node_avg_batch( self, data, weights, avg_axis = None ):
+    """Batch form of ``calc_node_avg()`` over a stack of state points.
+Node sums for all states, levels, and assemblies are a single tensor
+contraction with the node assembly weights.
+    Args:
+        data (np.ndarray): stacked datasets with shape
+	    ( N, npiny, npinx, nax, nass )
+	weights (np.ndarray): pin weights with shape
+	    ( npiny, npinx, nax, nass ), typically resolved once with
+	    ``resolve_dset_weights()``
+        avg_axis (tuple or int): optional additional dataset axes, 2 and/or
+	    3, over which to average with node weights
+    Returns:
+        np.ndarray: calculated averages with shape
+	    ( N, 1, 4, nax or 1, nass or 1 )
+"""
+    node_assy_wts = self.get_node_assembly_weights( *data.shape[ 1 : 3 ] )
+    node_wts = self._calc_node_weights( node_assy_wts, weights )
+
+    errors_save = np.seterr( divide = 'ignore', invalid = 'ignore' )
+    try:
+      sums = np.einsum( 'nyxkl,qyx->nqkl', data * weights, node_assy_wts )
+      avg = self._fix_node_factors( sums[ :, np.newaxis, ... ] )
+      avg /= node_wts
+      avg[ avg == np.inf ] = 0.0
+      avg = np.nan_to_num( avg )
+
+      if avg_axis:
+        axis = tuple([
+	    i + 1 for i in self._shift_axis( avg_axis, 0 ) if i in ( 2, 3 )
+	    ])
+        if axis:
+          avg = \
+	      np.sum( avg * node_wts, axis = axis, keepdims = True ) / \
+	      np.sum( node_wts, axis = tuple([ i - 1 for i in axis ]),
+	          keepdims = True )
+          avg = np.nan_to_num( avg )
+    finally:
+      np.seterr( **errors_save )
+
+    return  avg
+  #end calc_node_avg_batch
+
+
   #----------------------------------------------------------------------
   #	METHOD:		_calc_node_sum()				-
   #----------------------------------------------------------------------
@@ -189,13 +265,9 @@ must be called with good parameters before this object can be used.
     node_factors_shape = ( 1, 4 ) + fshape[ 2 : ]
     node_factors = np.zeros( node_factors_shape, dtype = np.float64 )
         #np.zeros( ( 1, 4, fshape[ 2 ], fshape[ 3 ] ), dtype = np.float64 )
-    for l in xrange( node_factors.shape[ 2 ] ):
-      for k in xrange( node_factors.shape[ 1 ] ):
-        node_factors[ 0, :, k, l ] = self._calc_node_sum(
-            fshape[ 0 ], fshape[ 1 ],
-            node_assy_weights,
-	    pin_weights[ :, :, k, l ]
-	    )
+    node_factors[ 0 ] = np.einsum(
+        'yxkl,qyx->qkl', np.asarray( pin_weights ), node_assy_weights
+	)
   
     #if quarter symmetry and odd assem
         #fshape[ 3 ] == self.core.nass
@@ -278,6 +350,25 @@ must be called with good parameters before this object can be used.
   #end _calc_node_weights_1
 
 
+  #----------------------------------------------------------------------
+  #	METHOD:		calc_pin_node_avg_batch()			-
+  #----------------------------------------------------------------------
+  def calc_pin_node_avg_batch( self, data, weights ):
+    """Batch method for the ``calc_pin_node_avg`` method named in the
+DataModel ':node' dataset definition, used by
+``DataModel._CreateDerivedDataSet()``.
+    Args:
+        data (np.ndarray): stacked datasets with shape
+	    ( N, npiny, npinx, nax, nass )
+	weights (np.ndarray): pin weights with shape
+	    ( npiny, npinx, nax, nass )
+    Returns:
+        np.ndarray: calculated averages with shape ( N, 1, 4, nax, nass )
+"""
+    return  self.calc_node_avg_batch( data, weights )
+  #end calc_pin_node_avg_batch
+
+
   #----------------------------------------------------------------------
   #	METHOD:		calc_rms()					-
   #----------------------------------------------------------------------
@@ -310,6 +401,33 @@ must be called with good parameters before this object can be used.
   #end calc_rms
 
 
+  #----------------------------------------------------------------------
+  #	METHOD:		calc_rms_batch()				-
+  #----------------------------------------------------------------------
+  def calc_rms_batch( self, data, weights, avg_axis ):
+    """Batch form of ``calc_rms()`` over a stack of state points.
+    Args:
+        data (np.ndarray): stacked datasets with shape ( N, ) + dset.shape
+	weights (np.ndarray): weights with shape dset.shape
+	avg_axis (int or tuple): dataset (not stack) axis for averaging
+    Returns:
+        np.ndarray: calculated RMS values with the stack axis first
+"""
+    axis = self._shift_axis( avg_axis )
+    errors_save = np.seterr( divide = 'ignore', invalid = 'ignore' )
+    try:
+      data = np.nan_to_num( data )
+      rms = np.sqrt(
+          np.sum( (data ** 2) * weights, axis = axis ) /
+          np.sum( weights, axis = self._shift_axis( avg_axis, 0 ) )
+          )
+    finally:
+      np.seterr( **errors_save )
+
+    return  rms
+  #end calc_rms_batch
+
+
   #----------------------------------------------------------------------
   #	METHOD:		calc_stddev()					-
   #----------------------------------------------------------------------
@@ -342,6 +460,37 @@ must be called with good parameters before this object can be used.
   #end calc_stddev
 
 
+  #----------------------------------------------------------------------
+  #	METHOD:		calc_stddev_batch()				-
+  #----------------------------------------------------------------------
+  def calc_stddev_batch( self, data, weights, avg_axis ):
+    """Batch form of ``calc_stddev()`` over a stack of state points, where
+each state has its own weighted mean.
+    Args:
+        data (np.ndarray): stacked datasets with shape ( N, ) + dset.shape
+	weights (np.ndarray): weights with shape dset.shape
+	avg_axis (int or tuple): dataset (not stack) axis for averaging
+    Returns:
+        np.ndarray: calculated standard deviations with the stack axis first
+"""
+    axis = self._shift_axis( avg_axis )
+    errors_save = np.seterr( divide = 'ignore', invalid = 'ignore' )
+    try:
+      data = np.nan_to_num( data )
+      state_axes = tuple( range( 1, data.ndim ) )
+      mean = \
+          np.sum( data * weights, axis = state_axes, keepdims = True ) / \
+          np.sum( weights )
+      a = np.sum( ((data - mean) ** 2) * weights, axis = axis )
+      b = np.sum( weights, axis = self._shift_axis( avg_axis, 0 ) )
+      stddev = np.sqrt( a / b )
+    finally:
+      np.seterr( **errors_save )
+
+    return  stddev
+  #end calc_stddev_batch
+
+
   #----------------------------------------------------------------------
   #	METHOD:		_calc_weights()					-
   #----------------------------------------------------------------------
@@ -477,29 +626,31 @@ must be called with good parameters before this object can be used.
   def _fix_node_factors( self, avg ):
     """Applies Andrew's quarter symmetry, odd assemblies node averaging fix.
     Args:
-        avg (np.ndarray): input factors
+        avg (np.ndarray): input factors with shape ( 1, 4, nax, nass ),
+	    optionally preceded by a state stack axis
     Returns:
         np.ndarray: updated factors
 """
+    core = self.core
     # if quarter symmetry and odd assem
-    if self.core.coreSym == 4 and \
-        avg.shape[ 3 ] == self.core.nass and \
+    if core.coreSym == 4 and \
+        avg.shape[ -1 ] == core.nass and \
         core.nassx % 2 == 1 and core.nassy == core.nassx:
-      mid_ass = self.core.nassy >> 1
-      for j in range( mid_ass, self.core.nassx ):
-        l = self.core.coreMap[ mid_ass, j ] - 1
+      mid_ass = core.nassy >> 1
+      for j in range( mid_ass, core.nassx ):
+        l = core.coreMap[ mid_ass, j ] - 1
         if l >= 0:
-          avg[ 0, 2, :, l ] += avg[ 0, 0, :, l ]
-          avg[ 0, 3, :, l ] += avg[ 0, 1, :, l ]
-          avg[ 0, 0, :, l ] = 0
-          avg[ 0, 1, :, l ] = 0
+          avg[ ..., 0, 2, :, l ] += avg[ ..., 0, 0, :, l ]
+          avg[ ..., 0, 3, :, l ] += avg[ ..., 0, 1, :, l ]
+          avg[ ..., 0, 0, :, l ] = 0
+          avg[ ..., 0, 1, :, l ] = 0
 
-        l = self.core.coreMap[ j, mid_ass ] - 1
+        l = core.coreMap[ j, mid_ass ] - 1
         if l >= 0:
-          avg[ 0, 1, :, l ] += avg[ 0, 0, :, l ]
-          avg[ 0, 3, :, l ] += avg[ 0, 2, :, l ]
-          avg[ 0, 0, :, l ] = 0
-          avg[ 0, 2, :, l ] = 0
+          avg[ ..., 0, 1, :, l ] += avg[ ..., 0, 0, :, l ]
+          avg[ ..., 0, 3, :, l ] += avg[ ..., 0, 2, :, l ]
+          avg[ ..., 0, 0, :, l ] = 0
+          avg[ ..., 0, 2, :, l ] = 0
 
     return  avg
   #end _fix_node_factors
@@ -737,6 +888,23 @@ must be called with good parameters before this object can be used.
   #end resolve_dset_weights
 
 
+  #----------------------------------------------------------------------
+  #	METHOD:		_shift_axis()					-
+  #----------------------------------------------------------------------
+  def _shift_axis( self, avg_axis, offset = 1 ):
+    """Converts dataset axes to stack axes for the batch methods.
+    Args:
+        avg_axis (int or tuple): dataset axis or axes
+	offset (int): amount to add to each axis
+    Returns:
+        tuple: shifted axes
+"""
+    if not hasattr( avg_axis, '__iter__' ):
+      avg_axis = ( avg_axis, )
+    return  tuple([ i + offset for i in avg_axis ])
+  #end _shift_axis
+
+
 #               -- Properties
 #               --
 
@@ -0,0 +1,191 @@
+#!/usr/bin/env python
+# $Id$
+#------------------------------------------------------------------------
+#	NAME:		index_expr.py					-
+#	HISTORY:							-
+#		2026-10-18						-
+#	  Compiled dataset index expressions.
+#------------------------------------------------------------------------
+"""Dataset index expressions such as ``'[ 0, 0, :, : ]'`` or
+``'[:,:,3:]'``, as used in dataset definitions ('copy_expr') and passed
+as ``ds_expr`` to DataModel range and stats methods.
+
+An expression is parsed once into a tuple of ints, slices, and Ellipsis,
+which is then applied with plain indexing in place of ``eval()`` or
+``exec()`` on a concatenated string.  Indexing an h5py.Dataset with the
+tuple reads only the selected hyperslab.  Compiled expressions are cached
+by string with ``Compile()``.
+"""
+import threading
+import numpy as np
+import pdb
+
+
+#------------------------------------------------------------------------
+#	CLASS:		IndexExpression					-
+#------------------------------------------------------------------------
+class IndexExpression( object ):
+  """Index expression parsed into a tuple usable as a numpy or h5py index.
+
+Properties:
+  expr			source expression string
+  index			tuple of ints, slices, and Ellipsis
+"""
+
+
+#		-- Class Attributes
+#		--
+
+  CACHE_SIZE = 256
+  """int: Maximum number of compiled expressions cached."""
+
+  cache_ = {}
+
+  lock_ = threading.RLock()
+
+
+#		-- Object Methods
+#		--
+
+
+  #----------------------------------------------------------------------
+  #	METHOD:		IndexExpression.__init__()			-
+  #----------------------------------------------------------------------
+  def __init__( self, expr ):
+    """
+    Args:
+        expr (str): expression in brackets, where None or an empty string
+            selects everything
+    Raises:
+        ValueError: if ``expr`` is not a valid index expression
+"""
+    self.expr = expr
+    self.index = IndexExpression.Parse( expr )
+  #end __init__
+
+
+  #----------------------------------------------------------------------
+  #	METHOD:		IndexExpression.__repr__()			-
+  #----------------------------------------------------------------------
+  def __repr__( self ):
+    return  'IndexExpression(%r)' % self.expr
+  #end __repr__
+
+
+  #----------------------------------------------------------------------
+  #	METHOD:		IndexExpression.Apply()				-
+  #----------------------------------------------------------------------
+  def Apply( self, data ):
+    """Same as ``eval( 'data' + expr )``.
+    Args:
+        data (h5py.Dataset or np.ndarray): data to index
+    Returns:
+        np.ndarray: selected values, read as a hyperslab from an
+            h5py.Dataset
+"""
+    return  data[ self.index ]
+  #end Apply
+
+
+  #----------------------------------------------------------------------
+  #	METHOD:		IndexExpression.Assign()			-
+  #----------------------------------------------------------------------
+  def Assign( self, target, value ):
+    """Same as ``exec( 'target' + expr + ' = value' )``.
+    Args:
+        target (np.ndarray): array to update
+        value: values to assign, broadcast to the selection
+"""
+    target[ self.index ] = value
+  #end Assign
+
+
+  #----------------------------------------------------------------------
+  #	METHOD:		IndexExpression.GetShape()			-
+  #----------------------------------------------------------------------
+  def GetShape( self, shape ):
+    """Determines the shape of the selection without any data.
+    Args:
+        shape (tuple): shape of the data to be indexed
+    Returns:
+        tuple: shape of the result of ``Apply()``
+"""
+    return  np.broadcast_to( 0, shape )[ self.index ].shape
+  #end GetShape
+
+
+#		-- Static Methods
+#		--
+
+
+  #----------------------------------------------------------------------
+  #	METHOD:		IndexExpression.Compile()			-
+  #----------------------------------------------------------------------
+  @staticmethod
+  def Compile( expr ):
+    """Retrieves the cached instance for the expression, parsing it on
+first use.
+    Args:
+        expr (str): expression
+    Returns:
+        IndexExpression: compiled expression
+    Raises:
+        ValueError: if ``expr`` is not a valid index expression
+"""
+    key = expr or ''
+    result = IndexExpression.cache_.get( key )
+    if result is None:
+      result = IndexExpression( key )
+      with IndexExpression.lock_:
+        if len( IndexExpression.cache_ ) >= IndexExpression.CACHE_SIZE:
+          IndexExpression.cache_.clear()
+        IndexExpression.cache_[ key ] = result
+    return  result
+  #end Compile
+
+
+  #----------------------------------------------------------------------
+  #	METHOD:		IndexExpression.Parse()				-
+  #----------------------------------------------------------------------
+  @staticmethod
+  def Parse( expr ):
+    """Parses an expression.  Items are integers, slices with optional
+integer start, stop, and step, or '...'.
+    Args:
+        expr (str): expression in brackets, where None or an empty string
+            selects everything
+    Returns:
+        tuple: index
+    Raises:
+        ValueError: if ``expr`` is not a valid index expression
+"""
+    text = expr.strip()  if expr else  ''
+    if not text:
+      return  ()
+
+    if not (text.startswith( '[' ) and text.endswith( ']' )):
+      raise ValueError( 'Invalid index expression: ' + str( expr ) )
+
+    items = []
+    try:
+      for item in text[ 1 : -1 ].split( ',' ):
+        item = item.strip()
+        if item == '...':
+          items.append( Ellipsis )
+        elif ':' in item:
+          parts = [ p.strip() for p in item.split( ':' ) ]
+          if len( parts ) > 3:
+            raise ValueError( item )
+          items.append(
+              slice( *[ int( p ) if p else None for p in parts ] )
+              )
+        else:
+          items.append( int( item ) )
+      #end for item
+    except ValueError:
+      raise ValueError( 'Invalid index expression: ' + str( expr ) )
+
+    return  tuple( items )
+  #end Parse
+
+#end IndexExpression
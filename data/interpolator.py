@@ -1,6 +1,9 @@
 #------------------------------------------------------------------------
 #	NAME:		interpolator.py					-
 #	HISTORY:							-
+#		2026-10-18						-
+#	  Interpolating with weight matrices computed once per mode.
+#	  Accepting DerivedDataSet and ThresholdDataSet sources.
 #		2017-02-24	leerw@ornl.gov				-
 #		2017-02-16	leerw@ornl.gov				-
 #	  Added mode param.
@@ -18,6 +21,8 @@ import numpy as np
 from scipy import interpolate
 import pdb
 
+from .derived_store import DerivedDataSet, ThresholdDataSet
+
 
 #------------------------------------------------------------------------
 #	CLASS:		Interpolator					-
@@ -75,6 +80,7 @@ class Interpolator( object ):
     self.srcMeshCenters = src_mesh_centers
     self.dstMesh = dst_mesh
     self.dstMeshCenters = dst_mesh_centers
+    self.weights = {}
   #end __init__
 
 
@@ -95,13 +101,47 @@ parameters ( cur_step, total_steps ).
   #end add_listeners
 
 
+  #----------------------------------------------------------------------
+  #	METHOD:		_apply_weights()				-
+  #----------------------------------------------------------------------
+  def _apply_weights( self, src_data, weights ):
+    """Applies a weight matrix along the axial axis.  Source levels with
+zero weight do not contribute, so non-finite values only affect the
+destination levels whose weights include them.
+@param  src_data	source dataset (h5py.Dataset or np.ndarray instance)
+@param  weights		( dst levels, src levels ) weight matrix
+@return			np.ndarray with weights.shape[ 0 ] axial levels
+"""
+    src_data = np.asarray( src_data )
+
+    if np.isfinite( src_data ).all():
+      dst_data = np.tensordot( src_data, weights, axes = ( [ 2 ], [ 1 ] ) )
+      dst_data = np.ascontiguousarray( np.rollaxis( dst_data, 3, 2 ) )
+
+    else:
+      dst_shape = list( src_data.shape )
+      dst_shape[ 2 ] = weights.shape[ 0 ]
+      dst_data = np.zeros( dst_shape, dtype = np.float64 )
+      for k in xrange( weights.shape[ 0 ] ):
+	ndxs = np.flatnonzero( weights[ k ] )
+	dst_data[ :, :, k, : ] = np.tensordot(
+	    src_data[ :, :, ndxs, : ], weights[ k, ndxs ],
+	    axes = ( [ 2 ], [ 0 ] )
+	    )
+    #end else not np.isfinite( src_data ).all()
+
+    return  dst_data
+  #end _apply_weights
+
+
   #----------------------------------------------------------------------
   #	METHOD:		_create_inner_interpolator()			-
   #----------------------------------------------------------------------
   def _create_inner_interpolator(
-      self, src_data, src_mesh_centers, mode = 'linear'
+      self, src_data, src_mesh_centers, mode = 'linear', axis = 2
       ):
     """
+@param  axis		axial axis in src_data
 @return		interpolator function
 """
     #print >> sys.stderr, '[create_inner_interpolator] mode=', mode
@@ -110,7 +150,7 @@ parameters ( cur_step, total_steps ).
       #print >> sys.stderr, '[create_interpolator] CUBIC'
       f = interpolate.interp1d(
           src_mesh_centers, src_data,
-	  assume_sorted = True, axis = 2,
+	  assume_sorted = True, axis = axis,
 	  bounds_error = False,
 	  kind = 'cubic'
 	  )
@@ -119,7 +159,7 @@ parameters ( cur_step, total_steps ).
       #print >> sys.stderr, '[create_inner_interpolator] QUAD'
       f = interpolate.interp1d(
           src_mesh_centers, src_data,
-	  assume_sorted = True, axis = 2,
+	  assume_sorted = True, axis = axis,
 	  bounds_error = False,
 	  kind = 'quadratic'
 	  )
@@ -127,7 +167,7 @@ parameters ( cur_step, total_steps ).
     elif mode.startswith( 'nearest' ):
       f = interpolate.interp1d(
           src_mesh_centers, src_data,
-	  assume_sorted = True, axis = 2,
+	  assume_sorted = True, axis = axis,
 	  bounds_error = False,
 	  kind = 'nearest'
 	  )
@@ -136,7 +176,7 @@ parameters ( cur_step, total_steps ).
       #print >> sys.stderr, '[create_inner_interpolator] LINEAR'
       f = interpolate.interp1d(
           src_mesh_centers, src_data,
-	  assume_sorted = True, axis = 2
+	  assume_sorted = True, axis = axis
 	  )
 
     return  f
@@ -174,6 +214,78 @@ parameters ( cur_step, total_steps ).
   #end create_interpolator
 
 
+  #----------------------------------------------------------------------
+  #	METHOD:		create_weights()				-
+  #----------------------------------------------------------------------
+  def create_weights( self, x_values, mode = 'linear' ):
+    """Creates the matrix of weights on the source levels giving the
+interpolated values at x_values.  Interpolation is linear in the source
+values for all modes, so the weights are the interpolation of the identity
+matrix.  Beyond the source mesh centers values are linearly extrapolated
+from the two end levels, as with create_interpolator().
+@param  x_values	axial positions at which to interpolate
+@param  mode		'linear', 'quad', 'cubic', or 'nearest'
+@return			( len( x_values ), src levels ) np.ndarray
+"""
+    src_centers = np.asarray( self.srcMeshCenters, dtype = np.float64 )
+    x_values = np.asarray( x_values, dtype = np.float64 )
+    src_count = len( src_centers )
+    weights = np.zeros( ( len( x_values ), src_count ), dtype = np.float64 )
+
+    if src_count == 1:
+      weights[ :, 0 ] = 1.0
+
+    else:
+      below = x_values < src_centers[ 0 ]
+      above = x_values > src_centers[ -1 ]
+      inside = ~(below | above)
+      if inside.any():
+	f = self._create_inner_interpolator(
+	    np.identity( src_count ), src_centers, mode, axis = 0
+	    )
+	weights[ inside ] = f( x_values[ inside ] )
+
+      t = (x_values[ below ] - src_centers[ 0 ]) / \
+	  (src_centers[ 1 ] - src_centers[ 0 ])
+      weights[ below, 0 ] = 1.0 - t
+      weights[ below, 1 ] = t
+
+      t = (x_values[ above ] - src_centers[ -2 ]) / \
+	  (src_centers[ -1 ] - src_centers[ -2 ])
+      weights[ above, -2 ] = 1.0 - t
+      weights[ above, -1 ] = t
+    #end else src_count > 1
+
+    return  weights
+  #end create_weights
+
+
+  #----------------------------------------------------------------------
+  #	METHOD:		get_weights()					-
+  #----------------------------------------------------------------------
+  def get_weights( self, method, mode = 'linear' ):
+    """Retrieves the weight matrix for an interpolation method, creating
+it on first use.  Since the weights depend only on the meshes, they are
+reused for every state point interpolated by this instance.
+@param  method		'integral' for interpolate_integral_over_spline()
+			or 'spline' for interpolate_on_spline()
+@param  mode		'linear', 'quad', 'cubic', or 'nearest'
+@return			( dst levels, src levels ) np.ndarray
+"""
+    key = ( method, mode )
+    weights = self.weights.get( key )
+    if weights is None:
+      if method == 'integral':
+	mesh_weights = self.create_weights( self.dstMesh, mode )
+	weights = (mesh_weights[ : -1 ] + mesh_weights[ 1 : ]) / 2.0
+      else:
+	weights = self.create_weights( self.dstMeshCenters, mode )
+      self.weights[ key ] = weights
+
+    return  weights
+  #end get_weights
+
+
   #----------------------------------------------------------------------
   #	METHOD:		interpolate_integral_over_spline()		-
   #----------------------------------------------------------------------
@@ -186,7 +298,9 @@ parameters ( cur_step, total_steps ).
       ):
     """Interpolates by integrating over the interpolation function.
 @param  src_data	source dataset (h5py.Dataset or np.ndarray instance)
-@param  f		interpolator function, will be created if None
+@param  f		optional interpolator function, where None means
+			applying the weights from get_weights()
+@param  mode		'linear', 'quad', 'cubic', or 'nearest'
 @return			interpolated np.ndarray with len( self.dstMeshCenters )
 			axial levels
 """
@@ -199,10 +313,12 @@ parameters ( cur_step, total_steps ).
 #      assert isinstance( src_data, h5py.Dataset ) or \
 #          isinstance( src_data, np.ndarray ), \
 #          'src_data must be a Dataset or ndarray'
-      if isinstance( src_data, h5py.Dataset ):
+      if isinstance(
+          src_data, ( h5py.Dataset, DerivedDataSet, ThresholdDataSet )
+	  ):
         src_data = np.array( src_data )
       else:
-        assert isintance( src_data, np.ndarray ), \
+        assert isinstance( src_data, np.ndarray ), \
           'src_data must be a Dataset or ndarray'
 
       assert \
@@ -210,24 +326,24 @@ parameters ( cur_step, total_steps ).
           'src_data has incompatible shape'
     #end if not skip_assertions:
 
-    dst_shape = list( src_data.shape )
-    dst_shape[ 2 ] = len( self.dstMeshCenters )
-
-    dst_data = np.zeros( dst_shape, dtype = np.float64 )
+    if f is None:
+      dst_data = self._apply_weights(
+	  src_data, self.get_weights( 'integral', mode )
+	  )
 
-    #step_count = reduce( (lambda x, y : x * y), dst_shape )
-    #step_count = dst_shape[ 3 ]
-    #step = 1
+    else:
+      dst_shape = list( src_data.shape )
+      dst_shape[ 2 ] = len( self.dstMeshCenters )
 
-    if f is None:
-      f = self.create_interpolator( src_data, self.srcMeshCenters, mode )
+      dst_data = np.zeros( dst_shape, dtype = np.float64 )
 
-    for k in xrange( dst_shape[ 2 ] ):
-      a = self.dstMesh[ k ]
-      b = self.dstMesh[ k + 1 ]
-      dst_data[ :, :, k, : ] = (f( a ) + f( b )) / 2.0
-      #dst_data[ :, :, k, : ] = (f( a ) + f( b )) * (b - a) / (2.0 * (b - a))
-    #end for k
+      for k in xrange( dst_shape[ 2 ] ):
+	a = self.dstMesh[ k ]
+	b = self.dstMesh[ k + 1 ]
+	dst_data[ :, :, k, : ] = (f( a ) + f( b )) / 2.0
+	#dst_data[ :, :, k, : ] = (f( a ) + f( b )) * (b - a) / (2.0 * (b - a))
+      #end for k
+    #end else f is not None
 
     return  dst_data
   #end interpolate_integral_over_spline
@@ -245,7 +361,9 @@ parameters ( cur_step, total_steps ).
       ):
     """Interpolates by finding the value on the interpolation function.
 @param  src_data	source dataset (h5py.Dataset or np.ndarray instance)
-@param  f		interpolator function, will be created if None
+@param  f		optional interpolator function, where None means
+			applying the weights from get_weights()
+@param  mode		'linear', 'quad', 'cubic', or 'nearest'
 @return			interpolated np.ndarray with len( self.dstMeshCenters )
 			axial levels
 """
@@ -258,10 +376,12 @@ parameters ( cur_step, total_steps ).
 #      assert isinstance( src_data, h5py.Dataset ) or \
 #          isinstance( src_data, np.ndarray ), \
 #          'src_data must be a Dataset or ndarray'
-      if isinstance( src_data, h5py.Dataset ):
+      if isinstance(
+          src_data, ( h5py.Dataset, DerivedDataSet, ThresholdDataSet )
+	  ):
         src_data = np.array( src_data )
       else:
-        assert isintance( src_data, np.ndarray ), \
+        assert isinstance( src_data, np.ndarray ), \
           'src_data must be a Dataset or ndarray'
 
       assert \
@@ -269,20 +389,20 @@ parameters ( cur_step, total_steps ).
           'src_data has incompatible shape'
     #end if not skip_assertions:
 
-    dst_shape = list( src_data.shape )
-    dst_shape[ 2 ] = len( self.dstMeshCenters )
-
-    dst_data = np.zeros( dst_shape, dtype = np.float64 )
+    if f is None:
+      dst_data = self._apply_weights(
+	  src_data, self.get_weights( 'spline', mode )
+	  )
 
-    #step_count = reduce( (lambda x, y : x * y), dst_shape )
-    #step_count = dst_shape[ 3 ]
-    #step = 1
+    else:
+      dst_shape = list( src_data.shape )
+      dst_shape[ 2 ] = len( self.dstMeshCenters )
 
-    if f is None:
-      f = self.create_interpolator( src_data, self.srcMeshCenters, mode )
+      dst_data = np.zeros( dst_shape, dtype = np.float64 )
 
-    for k in xrange( dst_shape[ 2 ] ):
-      dst_data[ :, :, k, : ] = f( self.dstMeshCenters[ k ] )
+      for k in xrange( dst_shape[ 2 ] ):
+	dst_data[ :, :, k, : ] = f( self.dstMeshCenters[ k ] )
+    #end else f is not None
 
     return  dst_data
   #end interpolate_on_spline
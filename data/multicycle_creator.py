@@ -2,9 +2,12 @@
 #------------------------------------------------------------------------
 #	NAME:		multicycle_creator.py				-
 #	HISTORY:							-
+#		2026-10-18						-
+#	  State points processed on a StatePool, chunked and compressed
+#	  output datasets, and a checkpoint for resuming with --resume.
 #		2018-04-02	leerw@ornl.gov				-
 #------------------------------------------------------------------------
-import argparse, h5py, logging, math, os, sys, traceback
+import argparse, h5py, json, logging, math, os, sys, traceback
 import numpy as np
 from scipy import interpolate
 import pdb
@@ -13,18 +16,36 @@ sys.path.insert( 0, os.path.join( os.path.dirname( __file__ ), os.pardir ) )
 #sys.path.insert( 0, VVDIR )
 
 #from data.utils import *
+from data.config import Config
 from data.datamodel import *
 from data.pin_averages import *
+from data.state_pool import StatePool
 
 
 #------------------------------------------------------------------------
 #	CLASS:		MultiCycleCreator				-
 #------------------------------------------------------------------------
 class MultiCycleCreator( object ):
-  """
+  """Combines the MPACT and Shift files for consecutive cycles.  Within a
+cycle, state point datasets are interpolated onto the common axial mesh and
+LHR is calculated on a ``StatePool``, while the cumulative exposure
+bookkeeping and all writes happen in state order on the calling thread.
+After each state point is written, a checkpoint is stored in the MPACT
+output file, so a run with ``resume = True`` continues after the last
+state point completed.
 """
 
 
+#		-- Constants
+#		--
+
+  CHECKPOINT_ATTR = 'multicycle_checkpoint'
+
+  COMPRESSION = 'gzip'
+
+  COMPRESSION_LEVEL = 4
+
+
 #		-- Object Methods
 #		--
 
@@ -47,6 +68,105 @@ class MultiCycleCreator( object ):
   #end __init__
 
 
+  #----------------------------------------------------------------------
+  #	METHOD:		_computeMpactState()				-
+  #----------------------------------------------------------------------
+  def _computeMpactState( self, axial_mesh, mpact_model, state, pin_factors ):
+    """Calculates the state point datasets that are not copied, safe to
+call on worker threads.
+    Args:
+	axial_mesh (np.ndarray): common axial mesh
+	mpact_model (data.datamodel.DataModel): datamodel instance
+	state (data.datamodel.State): current state
+	pin_factors (np.ndarray): factors
+    Returns:
+	dict: np.ndarray by dataset name, including 'pin_lhr'
+"""
+    state_data = {}
+    equal_axial_mesh = np.array_equal( mpact_model.core.axialMesh, axial_mesh )
+
+    if not equal_axial_mesh:
+      for ds_name in state.group:
+	if ds_name not in ( 'exposure', 'exposure_efpd', 'exposure_efpy' ):
+	  ds_def = mpact_model.GetDataSetDefByDsName( ds_name )
+	  if ds_def is not None and \
+	      ds_def.get( 'type', '' ).find( 'detector' ) < 0 and \
+	      ds_def.get( 'axial_axis', -1 ) >= 0:
+	    state_data[ ds_name ] = self._resolveAxialDataSet(
+		axial_mesh, state.group.get( ds_name ),
+		ds_def[ 'axial_axis' ], mpact_model.core.axialMesh
+		)
+      #end for ds_name
+    #end if not equal_axial_mesh
+
+    lhr_array = self._createLHR( mpact_model, state, pin_factors )
+    if not equal_axial_mesh:
+      lhr_array = self._resolveAxialDataSet(
+	  axial_mesh, lhr_array, 2, mpact_model.core.axialMesh
+	  )
+    state_data[ 'pin_lhr' ] = lhr_array
+
+    return  state_data
+  #end _computeMpactState
+
+
+  #----------------------------------------------------------------------
+  #	METHOD:		_copyItem()					-
+  #----------------------------------------------------------------------
+  def _copyItem( self, from_group, name, to_group, to_name = None ):
+    """Copies a dataset or group, rewriting numeric array datasets chunked
+and compressed with their attributes.
+    Args:
+	from_group (h5py.Group): source group
+	name (str): name of the item in ``from_group``
+	to_group (h5py.Group): destination group
+	to_name (str): optional destination name, defaulting to ``name``
+"""
+    to_name = to_name or name
+    item = from_group.get( name )
+    if isinstance( item, h5py.Group ):
+      to_item = to_group.create_group( to_name )
+      for key, value in item.attrs.items():
+	to_item.attrs[ key ] = value
+      for child_name in item:
+	self._copyItem( item, child_name, to_item )
+
+    elif isinstance( item, h5py.Dataset ) and item.compression is None and \
+	item.size > 1 and item.dtype.kind in 'biuf':
+      to_item = self._createDataSet( to_group, to_name, item[ () ] )
+      for key, value in item.attrs.items():
+	to_item.attrs[ key ] = value
+
+    else:
+      from_group.copy( name, to_group, to_name )
+  #end _copyItem
+
+
+  #----------------------------------------------------------------------
+  #	METHOD:		_createDataSet()				-
+  #----------------------------------------------------------------------
+  def _createDataSet( self, group, name, data ):
+    """Creates a dataset, chunked and compressed if it is a numeric array.
+    Args:
+	group (h5py.Group): destination group
+	name (str): dataset name
+	data: values
+    Returns:
+	h5py.Dataset: new dataset
+"""
+    data = np.asarray( data )
+    if data.ndim > 0 and data.size > 1 and data.dtype.kind in 'biuf':
+      dset = group.create_dataset(
+	  name, data = data, chunks = True,
+	  compression = MultiCycleCreator.COMPRESSION,
+	  compression_opts = MultiCycleCreator.COMPRESSION_LEVEL
+	  )
+    else:
+      dset = group.create_dataset( name, data = data )
+    return  dset
+  #end _createDataSet
+
+
   #----------------------------------------------------------------------
   #	METHOD:		_createInterpolator()				-
   #----------------------------------------------------------------------
@@ -131,9 +251,21 @@ class MultiCycleCreator( object ):
   #	METHOD:		_processCycle()					-
   #----------------------------------------------------------------------
   def _processCycle( self,
-      results, mpact_out_fp, shift_out_fp, base_path, first_flag = False
+      results, mpact_out_fp, shift_out_fp, base_path, first_flag = False,
+      state_ndx_start = -1, checkpoint = None
       ):
     """
+    Args:
+	results (dict): run state, updated here
+	mpact_out_fp (h5py.File): MPACT output file
+	shift_out_fp (h5py.File): Shift output file
+	base_path (str): cycle path without the .h5 or .shift.h5 extension
+	first_flag (bool): True if this is the first cycle, whose first
+	    state point is included
+	state_ndx_start (int): 0-based index of the first state point to
+	    process, where values lt 0 mean starting at the beginning
+	checkpoint (callable): optional, prototype func( next_state_ndx ),
+	    called after each state point is written
 """
     print '[multicycle_creator]', base_path
     mpact_path = base_path + '.h5'
@@ -206,23 +338,36 @@ class MultiCycleCreator( object ):
 	averages = Averages( mpact_model.core, pin_powers, None )
 	pin_factors = averages.pinWeights
 
-#		-- Process each statepoint
+#		-- Process each statepoint, computing on the pool and
+#		-- writing in order here
 #		--
-      #for st in mpact_model.states:
-      state_ndx_start = 0  if first_flag else  1
+      if state_ndx_start < 0:
+	state_ndx_start = 0  if first_flag else  1
+      state_ndxs = []
       for state_ndx in xrange( state_ndx_start, len( mpact_model.states ) ):
-        st = mpact_model.states[ state_ndx ]
 #			-- Break if statepoint not in Shift file
-	if st.group.name not in shift_in_fp: break
+	if mpact_model.states[ state_ndx ].group.name not in shift_in_fp:
+	  break
+	state_ndxs.append( state_ndx )
+
+      def compute( state_ndx ):
+	return  self._computeMpactState(
+	    results[ 'axial_mesh' ], mpact_model,
+	    mpact_model.states[ state_ndx ], pin_factors
+	    )
 
+      def write( state_ndx, state_data ):
+	st = mpact_model.states[ state_ndx ]
 	to_state_name = 'STATE_%04d' % results[ 'state' ]
 	self._processMpactState(
-	    results, mpact_out_fp, to_state_name, mpact_model, st, pin_factors
+	    results, mpact_out_fp, to_state_name, mpact_model, st, state_data
 	    )
-
-	shift_in_fp.copy( st.group.name, shift_out_fp, to_state_name )
+	self._copyItem( shift_in_fp, st.group.name, shift_out_fp, to_state_name )
 	results[ 'state' ] += 1
-      #end for st in mpact_model.states
+	if checkpoint:
+	  checkpoint( state_ndx + 1 )
+
+      StatePool().Run( state_ndxs, compute, write )
 
       if len( results[ 'history_exposure' ] ) > 0:
         results[ 'base_exposure' ] = results[ 'history_exposure' ][ -1 ]
@@ -242,9 +387,16 @@ class MultiCycleCreator( object ):
   #----------------------------------------------------------------------
   def _processMpactState(
       self, results, to_fp, to_state_name,
-      mpact_model, state, pin_factors
+      mpact_model, state, state_data
       ):
-    """
+    """Updates exposures in ``results`` and writes the state point.
+    Args:
+	results (dict): run state, updated here
+	to_fp (h5py.File): MPACT output file
+	to_state_name (str): output state point group name
+	mpact_model (data.datamodel.DataModel): datamodel instance
+	state (data.datamodel.State): current state
+	state_data (dict): result of ``_computeMpactState()``
 """
     print '[multicycle_creator] MPACT %s to /%s' % \
         ( state.group.name, to_state_name )
@@ -289,14 +441,14 @@ class MultiCycleCreator( object ):
 ##	data = np.array( [ results[ 'exposure_efpy' ] ], dtype = np.float64 )
 ##	)
 #xx
-    st_exposure = self._readStateValue( state, 'exposure' )
+    st_exposure = float( self._readStateValue( state, 'exposure' ) )
     cur_exposure = st_exposure + results[ 'base_exposure' ]
     results[ 'history_exposure' ].append( cur_exposure )
     to_state_grp.create_dataset( 'exposure', data = cur_exposure )
 	#data = np.array( [ cur_exposure ], dtype = np.float64 )
     to_state_grp.create_dataset( 'cycle_exposure', data = st_exposure )
 
-    st_efpd = self._readStateValue( state, 'exposure_efpd' )
+    st_efpd = float( self._readStateValue( state, 'exposure_efpd' ) )
     cur_efpd = st_efpd + results[ 'base_exposure_efpd' ]
     results[ 'history_exposure_efpd' ].append( cur_efpd )
     to_state_grp.create_dataset( 'exposure_efpd', data = cur_efpd )
@@ -313,39 +465,44 @@ class MultiCycleCreator( object ):
     mw = power * rated_power / 100.0
     to_state_grp.create_dataset( 'MW', data = mw )
 
-    axial_mesh = results[ 'axial_mesh' ]
-    equal_axial_mesh = np.array_equal( mpact_model.core.axialMesh, axial_mesh )
-
     for ds_name in state.group:
       if ds_name not in ( 'exposure', 'exposure_efpd', 'exposure_efpy' ):
-        ds_def = mpact_model.GetDataSetDefByDsName( ds_name )
-	if ds_def is not None:
-	  ds_type = ds_def.get( 'type', '' )
-	  axial_axis = ds_def.get( 'axial_axis', -1 )
-	  if ds_type.find( 'detector' ) >= 0 or axial_axis < 0 or \
-	      equal_axial_mesh:
-	    state.group.copy( ds_name, to_state_grp )
-	  else:
-	    dset = state.group.get( ds_name )
-	    to_data = self._resolveAxialDataSet(
-	        axial_mesh, dset,
-	        axial_axis, mpact_model.core.axialMesh
-	        )
-	    to_state_grp.create_dataset( ds_name, data = to_data )
-	  #end else axial_axis >= 0 and not equal_axial_mesh:
-	#end if ds_def is not None
-      #end if ds_name not in
+	if ds_name in state_data:
+	  self._createDataSet( to_state_grp, ds_name, state_data[ ds_name ] )
+	elif mpact_model.GetDataSetDefByDsName( ds_name ) is not None:
+	  self._copyItem( state.group, ds_name, to_state_grp )
     #end for ds_name in cur_state_grp
 
-    lhr_array = self._createLHR( mpact_model, state, pin_factors )
-    if not equal_axial_mesh:
-      lhr_array = self._resolveAxialDataSet(
-	  axial_mesh, lhr_array, 2, mpact_model.core.axialMesh
-          )
-    to_state_grp.create_dataset( 'pin_lhr', data = lhr_array )
+    self._createDataSet( to_state_grp, 'pin_lhr', state_data[ 'pin_lhr' ] )
   #end _processMpactState
 
 
+  #----------------------------------------------------------------------
+  #	METHOD:		_readCheckpoint()				-
+  #----------------------------------------------------------------------
+  def _readCheckpoint( self, mpact_out_fp, cycle_input_paths ):
+    """
+    Args:
+	mpact_out_fp (h5py.File): MPACT output file
+	cycle_input_paths (list): cycle paths for this run
+    Returns:
+	dict: checkpoint written by ``_writeCheckpoint()`` for the same
+	    cycle paths, or None
+"""
+    checkpoint = None
+    if MultiCycleCreator.CHECKPOINT_ATTR in mpact_out_fp.attrs:
+      try:
+	checkpoint = json.loads(
+	    mpact_out_fp.attrs[ MultiCycleCreator.CHECKPOINT_ATTR ]
+	    )
+	if checkpoint.get( 'paths' ) != list( cycle_input_paths ):
+	  checkpoint = None
+      except ValueError:
+	checkpoint = None
+    return  checkpoint
+  #end _readCheckpoint
+
+
   #----------------------------------------------------------------------
   #	METHOD:		_readDataSet()					-
   #----------------------------------------------------------------------
@@ -394,6 +551,23 @@ class MultiCycleCreator( object ):
   #end _readValue
 
 
+  #----------------------------------------------------------------------
+  #	METHOD:		_removeIncompleteStates()			-
+  #----------------------------------------------------------------------
+  def _removeIncompleteStates( self, next_state, *out_fps ):
+    """Removes state point groups written after the last checkpoint.
+    Args:
+	next_state (int): 1-based number of the next state point to write
+	*out_fps: output h5py.File objects
+"""
+    for fp in out_fps:
+      for name in list( fp.keys() ):
+	if name.startswith( 'STATE_' ) and name[ 6 : ].isdigit() and \
+	    int( name[ 6 : ] ) >= next_state:
+	  del fp[ name ]
+  #end _removeIncompleteStates
+
+
   #----------------------------------------------------------------------
   #	METHOD:		_resolveAxialDataSet()				-
   #----------------------------------------------------------------------
@@ -411,17 +585,11 @@ class MultiCycleCreator( object ):
 
     from_array = dset  if isinstance( dset, np.ndarray ) else  np.array( dset )
 
-    expr_items = [ ':' ] * len( to_shape )
-    #expr_items[ axial_axis ] = '%d'
-    #expr_fmt = '[' + ','.join( expr_items ) + ']'
-    expr_items[ axial_axis ] = 'k'
-    exec_str = 'X[' + ','.join( expr_items ) + '] = F( Y[ k ] )'
-
+    to_ndx = [ slice( None ) ] * len( to_shape )
     f = self._createInterpolator( from_array, from_centers, axial_axis, mode )
-    locals_env = { 'F': f, 'X': to_array, 'Y': to_centers, 'k': 0 }
     for k in xrange( to_shape[ axial_axis ] ):
-      locals_env[ 'k' ] = k
-      exec( exec_str, {}, locals_env )
+      to_ndx[ axial_axis ] = k
+      to_array[ tuple( to_ndx ) ] = f( to_centers[ k ] )
     #end for k in xrange( to_shape[ axial_axis ] )
 
     return  to_array
@@ -531,49 +699,93 @@ class MultiCycleCreator( object ):
   #----------------------------------------------------------------------
   #	METHOD:		run()						-
   #----------------------------------------------------------------------
-  def run( self, output_path, *cycle_input_paths ):
+  def run( self, output_path, *cycle_input_paths, **kwargs ):
     """Assume all ``cycle_input_paths`` are valid with MPACT and Shift files,
 and there are at least two of them.
+    Args:
+	output_path (str): MPACT output path, with the Shift output path
+	    ending in .shift.h5
+	*cycle_input_paths: cycle paths without the .h5 or .shift.h5
+	    extension
+	**kwargs: 'resume' (bool) True to continue from the checkpoint in
+	    existing output files for the same cycle paths
 """
 #	-- Resolve axial_mesh
 #	--
     mpact_paths = [ f + '.h5' for f in cycle_input_paths ]
     axial_mesh = self._resolveAxialMesh( *mpact_paths )
 
-#	-- Create output
+#	-- Create or reopen output
 #	--
     if not output_path.endswith( '.h5' ):
       output_path += '.h5'
     shift_output_path = output_path[ : -3 ] + '.shift.h5'
-    mpact_out_fp = h5py.File( output_path, 'w' )
-    shift_out_fp = h5py.File( shift_output_path, 'w' )
+
+    checkpoint = None
+    if kwargs.get( 'resume', False ) and \
+	os.path.exists( output_path ) and os.path.exists( shift_output_path ):
+      mpact_out_fp = h5py.File( output_path, 'a' )
+      shift_out_fp = h5py.File( shift_output_path, 'a' )
+      checkpoint = self._readCheckpoint( mpact_out_fp, cycle_input_paths )
+      if checkpoint is None:
+	mpact_out_fp.close()
+	shift_out_fp.close()
+    #end if resume
+
+    if checkpoint is None:
+      mpact_out_fp = h5py.File( output_path, 'w' )
+      shift_out_fp = h5py.File( shift_output_path, 'w' )
 
     try:
-      results = \
-        {
-	'axial_mesh': axial_mesh,
-	'base_exposure': 0.0,
-	'base_exposure_efpd': 0.0,
-	#'exposure': 0.0,
-	#'exposure_efpd': 0.0,
-	'history_exposure_efpd': [],
-	#'exposure_efpy': 0.0,
-	'history_exposure': [],
-	'state': 1
-	}
-      first_flag = True
-      for base_path in cycle_input_paths:
+      if checkpoint is not None:
+	results = checkpoint[ 'results' ]
+	results[ 'axial_mesh' ] = axial_mesh
+	self._removeIncompleteStates(
+	    results[ 'state' ], mpact_out_fp, shift_out_fp
+	    )
+	cycle_start = checkpoint[ 'cycle' ]
+	first_flag = checkpoint[ 'firstFlag' ]
+	state_ndx_start = checkpoint[ 'nextState' ]
+	print '[multicycle_creator] resuming at cycle %d, state %d' % \
+	    ( cycle_start + 1, results[ 'state' ] )
+      else:
+	results = \
+	  {
+	  'axial_mesh': axial_mesh,
+	  'base_exposure': 0.0,
+	  'base_exposure_efpd': 0.0,
+	  'history_exposure_efpd': [],
+	  'history_exposure': [],
+	  'state': 1
+	  }
+	cycle_start = 0
+	first_flag = True
+	state_ndx_start = -1
+      #end if-else checkpoint
+
+      for cycle_ndx in xrange( cycle_start, len( cycle_input_paths ) ):
+	base_path = cycle_input_paths[ cycle_ndx ]
+	def checkpoint_func( next_state_ndx ):
+	  self._writeCheckpoint(
+	      mpact_out_fp, shift_out_fp, cycle_input_paths, results,
+	      cycle_ndx, next_state_ndx, first_flag
+	      )
 	try:
 	  self._processCycle(
 	      results, mpact_out_fp, shift_out_fp, base_path,
-	      first_flag
+	      first_flag, state_ndx_start, checkpoint_func
 	      )
 	  first_flag = False
+	  self._writeCheckpoint(
+	      mpact_out_fp, shift_out_fp, cycle_input_paths, results,
+	      cycle_ndx + 1, -1, first_flag
+	      )
 	except Exception, ex:
           print >> sys.stderr, \
               '[multicycle_creator] {0:s}{1:s}:{2:s}'.\
 	      format( base_path, os.linesep, str( ex ) )
-      #end for path in mpact_paths:
+	state_ndx_start = -1
+      #end for cycle_ndx
 
     finally:
       mpact_out_fp.close()
@@ -581,6 +793,41 @@ and there are at least two of them.
   #end run
 
 
+  #----------------------------------------------------------------------
+  #	METHOD:		_writeCheckpoint()				-
+  #----------------------------------------------------------------------
+  def _writeCheckpoint(
+      self, mpact_out_fp, shift_out_fp, cycle_input_paths, results,
+      cycle_ndx, next_state_ndx, first_flag
+      ):
+    """Stores the point at which to resume after flushing both outputs.
+    Args:
+	mpact_out_fp (h5py.File): MPACT output file
+	shift_out_fp (h5py.File): Shift output file
+	cycle_input_paths (list): cycle paths for this run
+	results (dict): run state
+	cycle_ndx (int): 0-based index of the cycle to resume
+	next_state_ndx (int): 0-based index of the state point to resume
+	    in the cycle, lt 0 for the beginning
+	first_flag (bool): value for the cycle to resume
+"""
+    checkpoint = \
+      {
+      'cycle': cycle_ndx,
+      'firstFlag': first_flag,
+      'nextState': next_state_ndx,
+      'paths': list( cycle_input_paths ),
+      'results': dict(
+	  ( k, v ) for k, v in results.iteritems() if k != 'axial_mesh'
+	  )
+      }
+    shift_out_fp.flush()
+    mpact_out_fp.attrs[ MultiCycleCreator.CHECKPOINT_ATTR ] = \
+	json.dumps( checkpoint )
+    mpact_out_fp.flush()
+  #end _writeCheckpoint
+
+
 #		-- Static Methods
 #		--
 
@@ -664,6 +911,19 @@ and there are at least two of them.
 	  default = 'multicycle.h5',
 	  help = 'path to MPACT output file'
           )
+      parser.add_argument(
+	  '--resume',
+	  action = 'store_true',
+	  help = 'continue an interrupted run with the same files from ' +
+	      'its last completed state point'
+          )
+      parser.add_argument(
+	  '--workers',
+	  default = 0,
+	  help = 'number of worker threads for state points, ' +
+	      'defaulting to the number of CPUs (at most 8)',
+	  type = int
+          )
       parser.add_argument(
 	  'file_path',
 	  default = [],
@@ -674,10 +934,15 @@ and there are at least two of them.
           )
       args = parser.parse_args()
 
+      if args.workers > 0:
+        Config.SetWorkerCount( args.workers )
+
       if len( args.file_path ) < 2:
         parser.print_usage()
       else:
-        MultiCycleCreator()( args.output_file, *args.file_path )
+        MultiCycleCreator()(
+            args.output_file, *args.file_path, resume = args.resume
+            )
         print '[multicycle_creator] finished'
 
     except Exception, ex:
@@ -1,6 +1,9 @@
 #------------------------------------------------------------------------
 #	NAME:		range_expr.py					-
 #	HISTORY:							-
+#		2026-10-18						-
+#	  Terms compiled to numpy ufuncs once at parse time, with
+#	  CreateMask() in place of eval() in ApplyThreshold().
 #		2017-07-18	godfreyat@ornl.gov			-
 #------------------------------------------------------------------------
 import math, os, sys, threading
@@ -11,6 +14,15 @@ import pdb
 
 NAN = float( 'nan' )
 
+OP_UFUNCS = \
+  {
+  '!=': np.not_equal,
+  '<': np.less,
+  '<=': np.less_equal,
+  '>': np.greater,
+  '>=': np.greater_equal
+  }
+
 
 #------------------------------------------------------------------------
 #	CLASS:		RangeExpression					-
@@ -51,6 +63,7 @@ class RangeExpression( object ):
 @exception		on error parsing expr
 """
     self.fDisplayExpr = ''
+    self.fMaskTerms = []
     self.fNumpyExpr = ''
     self.fTerms = {}
 
@@ -90,21 +103,41 @@ class RangeExpression( object ):
             outside the range filled with ``invalid_value``
 """
     result = arr
-    if self.fNumpyExpr:
+    if self.fMaskTerms:
       x = np.copy( arr )
-      #mask_str = self.fNumpyExpr.replace( 'x', 'arr' )
-      eval_str = \
-          'np.logical_not( np.logical_or( np.isnan( x ), {0:s} ) )'.\
-	  format( self.fNumpyExpr )
-      mask = eval( eval_str )
+      mask = np.logical_not(
+          np.logical_or( np.isnan( x ), self.CreateMask( x ) )
+	  )
       np.place( x, mask, invalid_value )
       result = x
-    #end if self.fNumpyExpr
+    #end if self.fMaskTerms
 
     return  result
   #end ApplyThreshold
 
 
+  #----------------------------------------------------------------------
+  #	METHOD:		CreateMask()					-
+  #----------------------------------------------------------------------
+  def CreateMask( self, arr ):
+    """Evaluates this expression over an array with the terms compiled at
+parse time.
+    Args:
+        arr (np.ndarray): values to test
+    Returns:
+        np.ndarray: boolean mask, True where values satisfy the expression,
+            or None if there are no terms
+"""
+    mask = None
+    for ufunc, value in self.fMaskTerms:
+      if mask is None:
+        mask = ufunc( arr, value )
+      else:
+        mask &= ufunc( arr, value )
+    return  mask
+  #end CreateMask
+
+
   #----------------------------------------------------------------------
   #	METHOD:		_DoParse()					-
   #----------------------------------------------------------------------
@@ -120,6 +153,7 @@ class RangeExpression( object ):
 
       self.fTerms.clear()
       self.fDisplayExpr = ''
+      self.fMaskTerms = []
       self.fNumpyExpr = ''
 
       for i in xrange( 0, len( result ) - 1, 2 ):
@@ -134,6 +168,10 @@ class RangeExpression( object ):
 	  self.fTerms[ 'belowvalue' ] = value
 
 	term = 'x {0:s} {1:.6g}'.format( op, value )
+#			-- Same rounding as the expression text
+	self.fMaskTerms.append(
+	    ( OP_UFUNCS[ op ], float( '{0:.6g}'.format( value ) ) )
+	    )
 
         if self.fDisplayExpr:
 	  self.fDisplayExpr += ' and '
@@ -0,0 +1,270 @@
+#!/usr/bin/env python
+# $Id$
+#------------------------------------------------------------------------
+#	NAME:		slice_cache.py					-
+#	HISTORY:							-
+#		2026-10-18						-
+#	  Process-wide cache of state point dataset arrays.  Read-only
+#	  arrays are cached without a copy.
+#------------------------------------------------------------------------
+"""Process-wide cache of materialized state point datasets.
+
+Widgets showing the same dataset at the same state point each used to read
+the whole dataset with ``np.array( dset )``.  ``DataModelMgr.GetStateArray()``
+reads it once through this cache, and every widget shares the one array.
+Cached arrays are read-only, and a loader returning a read-only array has it
+cached as is rather than copied.
+
+Entries are keyed by ( model name, dataset name, state index, threshold )
+and carry the identity of the dataset read, so an entry is replaced when the
+dataset behind a key changes.  Concurrent requests for the same key wait on
+a single read.  Entries are evicted least recently used first to stay
+within a byte budget, except for entries held with ``Acquire()``, which stay
+until each holder calls ``Release()``.
+
+No wx dependency here.
+"""
+import collections, threading
+import numpy as np
+import pdb
+
+
+#------------------------------------------------------------------------
+#	CLASS:		SliceCache					-
+#------------------------------------------------------------------------
+class SliceCache( object ):
+  """Static methods for the shared cache of read-only dataset arrays.
+Entries are [ ident, array, reference count ] lists.
+"""
+
+
+#		-- Class Attributes
+#		--
+
+  cache_ = collections.OrderedDict()
+
+  cacheBudget_ = 512 << 20
+
+  cacheBytes_ = 0
+
+  cacheLock_ = threading.RLock()
+
+  loading_ = {}
+
+
+#		-- Static Methods
+#		--
+
+
+  #----------------------------------------------------------------------
+  #	METHOD:		Acquire()					-
+  #----------------------------------------------------------------------
+  @staticmethod
+  def Acquire( key, ident, loader ):
+    """Retrieves the array as with ``Get()`` and holds it in the cache until
+``Release()`` is called for it.
+    Args:
+        key (tuple): cache key
+        ident (object): hashable identity of the source dataset
+        loader (callable): returns the array-like to cache, or None
+    Returns:
+        np.ndarray: read-only array, or None if ``loader`` returned None
+"""
+    return  SliceCache._Get( key, ident, loader, True )
+  #end Acquire
+
+
+  #----------------------------------------------------------------------
+  #	METHOD:		Clear()						-
+  #----------------------------------------------------------------------
+  @staticmethod
+  def Clear( model_name = None ):
+    """Removes cached arrays, including held ones.
+    Args:
+        model_name (str): optional model whose arrays to remove, where None
+            means all
+"""
+    with SliceCache.cacheLock_:
+      for key in list( SliceCache.cache_.keys() ):
+        if model_name is None or key[ 0 ] == model_name:
+          SliceCache._RemoveEntry( key )
+  #end Clear
+
+
+  #----------------------------------------------------------------------
+  #	METHOD:		Get()						-
+  #----------------------------------------------------------------------
+  @staticmethod
+  def Get( key, ident, loader ):
+    """Retrieves the cached array for the key, calling ``loader`` if not
+cached or if the cached array came from a different dataset.
+    Args:
+        key (tuple): cache key
+        ident (object): hashable identity of the source dataset
+        loader (callable): returns the array-like to cache, or None
+    Returns:
+        np.ndarray: read-only array, or None if ``loader`` returned None
+"""
+    return  SliceCache._Get( key, ident, loader, False )
+  #end Get
+
+
+  #----------------------------------------------------------------------
+  #	METHOD:		_Get()						-
+  #----------------------------------------------------------------------
+  @staticmethod
+  def _Get( key, ident, loader, acquire ):
+    """Implements ``Acquire()`` and ``Get()``.
+"""
+    result = None
+    while result is None:
+      with SliceCache.cacheLock_:
+        entry = SliceCache.cache_.get( key )
+        if entry is not None and entry[ 0 ] == ident:
+          del SliceCache.cache_[ key ]
+          SliceCache.cache_[ key ] = entry
+          if acquire:
+            entry[ 2 ] += 1
+          result = entry[ 1 ]
+          break
+
+        event = SliceCache.loading_.get( key )
+        if event is None:
+          event = threading.Event()
+          SliceCache.loading_[ key ] = event
+          load_flag = True
+        else:
+          load_flag = False
+      #end with
+
+      if not load_flag:
+        event.wait()
+      else:
+        try:
+          value = loader()
+          if isinstance( value, np.ndarray ) and not value.flags.writeable:
+            result = np.asarray( value )
+          elif value is not None:
+            result = np.array( value )
+            result.flags.writeable = False
+          if result is not None:
+            SliceCache._PutEntry( key, ident, result, 1  if acquire else  0 )
+        finally:
+          with SliceCache.cacheLock_:
+            del SliceCache.loading_[ key ]
+          event.set()
+        break
+    #end while
+
+    return  result
+  #end _Get
+
+
+  #----------------------------------------------------------------------
+  #	METHOD:		GetBudget()					-
+  #----------------------------------------------------------------------
+  @staticmethod
+  def GetBudget():
+    """
+    Returns:
+        int: byte budget for cached arrays
+"""
+    return  SliceCache.cacheBudget_
+  #end GetBudget
+
+
+  #----------------------------------------------------------------------
+  #	METHOD:		GetBytes()					-
+  #----------------------------------------------------------------------
+  @staticmethod
+  def GetBytes():
+    """
+    Returns:
+        int: bytes currently cached
+"""
+    return  SliceCache.cacheBytes_
+  #end GetBytes
+
+
+  #----------------------------------------------------------------------
+  #	METHOD:		_PutEntry()					-
+  #----------------------------------------------------------------------
+  @staticmethod
+  def _PutEntry( key, ident, array, ref_count ):
+    """Adds an array, replacing any entry for the key, and evicts to stay
+within the budget.  Holds on a replaced entry's array are dropped with it.
+"""
+    with SliceCache.cacheLock_:
+      if key in SliceCache.cache_:
+        SliceCache._RemoveEntry( key )
+      SliceCache.cache_[ key ] = [ ident, array, ref_count ]
+      SliceCache.cacheBytes_ += array.nbytes
+      SliceCache._Trim()
+  #end _PutEntry
+
+
+  #----------------------------------------------------------------------
+  #	METHOD:		Release()					-
+  #----------------------------------------------------------------------
+  @staticmethod
+  def Release( array ):
+    """Releases a hold from ``Acquire()``.
+    Args:
+        array (np.ndarray): array returned by ``Acquire()``, where None is
+            ignored
+"""
+    if array is not None:
+      with SliceCache.cacheLock_:
+        for entry in SliceCache.cache_.itervalues():
+          if entry[ 1 ] is array:
+            entry[ 2 ] = max( 0, entry[ 2 ] - 1 )
+            break
+        SliceCache._Trim()
+  #end Release
+
+
+  #----------------------------------------------------------------------
+  #	METHOD:		_RemoveEntry()					-
+  #----------------------------------------------------------------------
+  @staticmethod
+  def _RemoveEntry( key ):
+    """Caller must hold ``cacheLock_``.
+"""
+    entry = SliceCache.cache_.pop( key )
+    SliceCache.cacheBytes_ -= entry[ 1 ].nbytes
+  #end _RemoveEntry
+
+
+  #----------------------------------------------------------------------
+  #	METHOD:		SetBudget()					-
+  #----------------------------------------------------------------------
+  @staticmethod
+  def SetBudget( value ):
+    """
+    Args:
+        value (int): byte budget for cached arrays, where 0 caches only
+            held arrays
+"""
+    with SliceCache.cacheLock_:
+      SliceCache.cacheBudget_ = max( 0, int( value ) )
+      SliceCache._Trim()
+  #end SetBudget
+
+
+  #----------------------------------------------------------------------
+  #	METHOD:		_Trim()						-
+  #----------------------------------------------------------------------
+  @staticmethod
+  def _Trim():
+    """Evicts unheld entries, least recently used first, until within the
+budget.  Caller must hold ``cacheLock_``.
+"""
+    if SliceCache.cacheBytes_ > SliceCache.cacheBudget_:
+      for key in list( SliceCache.cache_.keys() ):
+        if SliceCache.cache_[ key ][ 2 ] == 0:
+          SliceCache._RemoveEntry( key )
+          if SliceCache.cacheBytes_ <= SliceCache.cacheBudget_:
+            break
+  #end _Trim
+
+#end SliceCache
@@ -0,0 +1,213 @@
+#!/usr/bin/env python
+# $Id$
+#------------------------------------------------------------------------
+#	NAME:		state_pool.py					-
+#	HISTORY:							-
+#		2026-10-18						-
+#	  Worker threads for per-state derived dataset calculations.
+#	  Results computed but not written are passed to discard_func.
+#------------------------------------------------------------------------
+"""Per-state-point work spread over a pool of worker threads.
+
+Results are computed on worker threads and handed back to the calling
+thread in state order, so anything that must not run concurrently, such as
+writes to an h5py file, happens on a single thread.  numpy releases the GIL
+in most array operations, and h5py serializes its own calls, so workers may
+read from HDF5 datasets.
+"""
+import logging, six, sys, threading, traceback
+import pdb
+
+from .config import Config
+
+
+#------------------------------------------------------------------------
+#	CLASS:		StatePool					-
+#------------------------------------------------------------------------
+class StatePool( object ):
+  """Runs a computation for each state point on worker threads, consuming
+results on the calling thread.
+
+Properties:
+    workerCount (int): number of worker threads
+"""
+
+
+#		-- Object Methods
+#		--
+
+
+  #----------------------------------------------------------------------
+  #	METHOD:		StatePool.__init__()				-
+  #----------------------------------------------------------------------
+  def __init__( self, worker_count = 0 ):
+    """
+    Args:
+        worker_count (int): number of worker threads, where values le 0
+	    mean ``Config.GetWorkerCount()``
+"""
+    self.logger = logging.getLogger( 'data' )
+    self.workerCount = \
+        worker_count  if worker_count > 0 else  Config.GetWorkerCount()
+  #end __init__
+
+
+  #----------------------------------------------------------------------
+  #	METHOD:		StatePool.Run()					-
+  #----------------------------------------------------------------------
+  def Run(
+      self, state_indexes, compute_func,
+      write_func = None, callback = None, cancel_event = None,
+      discard_func = None
+      ):
+    """Calls ``compute_func`` for each state index on the worker threads.
+On the calling thread, ``write_func`` and then ``callback`` are called for
+each state in the order of ``state_indexes``.  With a single worker or state,
+everything runs on the calling thread.  When cancelled or on an error,
+results already computed but not written are passed to ``discard_func``,
+also on the calling thread, so resources they hold can be released.
+    Args:
+        state_indexes (iterable): 0-based state point indexes
+	compute_func (callable): prototype func( state_ndx ), returning the
+	    result for the state
+	write_func (callable): optional, prototype func( state_ndx, result )
+	callback (callable): optional progress callback, prototype
+	    func( state_ndx )
+	cancel_event (threading.Event): optional event which, when set,
+	    stops processing
+	discard_func (callable): optional, prototype
+	    func( state_ndx, result ), errors from which are logged
+    Returns:
+        bool: True if all states were processed, False if cancelled
+    Raises:
+        Exception: the first exception raised by ``compute_func`` or
+	    ``write_func``
+"""
+    state_indexes = list( state_indexes )
+    thread_count = min( self.workerCount, len( state_indexes ) )
+
+    if thread_count <= 1:
+      completed = True
+      for state_ndx in state_indexes:
+        if cancel_event is not None and cancel_event.is_set():
+	  completed = False
+	  break
+        result = compute_func( state_ndx )
+        if write_func:
+	  write_func( state_ndx, result )
+	if callback:
+	  callback( state_ndx )
+      #end for state_ndx
+    else:
+      completed = \
+          self._RunThreads( state_indexes, thread_count, compute_func,
+	  write_func, callback, cancel_event, discard_func )
+
+    return  completed
+  #end Run
+
+
+  #----------------------------------------------------------------------
+  #	METHOD:		StatePool._RunThreads()				-
+  #----------------------------------------------------------------------
+  def _RunThreads(
+      self, state_indexes, thread_count, compute_func,
+      write_func, callback, cancel_event, discard_func
+      ):
+    """Implementation of ``Run()`` with worker threads.  Results are
+queued with a bound, so workers wait rather than run far ahead of the
+calling thread.  Results a worker cannot queue once stopped are kept in
+``dropped`` for ``discard_func``.
+"""
+    in_queue = six.moves.queue.Queue()
+    for state_ndx in state_indexes:
+      in_queue.put( state_ndx )
+    out_queue = six.moves.queue.Queue( thread_count * 2 )
+    stop_event = threading.Event()
+    dropped = []
+
+    def worker():
+      while not stop_event.is_set():
+        try:
+	  state_ndx = in_queue.get_nowait()
+	except six.moves.queue.Empty:
+	  break
+
+        try:
+	  item = ( state_ndx, compute_func( state_ndx ), None )
+	except Exception:
+	  item = ( state_ndx, None, sys.exc_info() )
+
+	while True:
+	  if stop_event.is_set():
+	    dropped.append( item )
+	    break
+	  try:
+	    out_queue.put( item, timeout = 0.1 )
+	    break
+	  except six.moves.queue.Full:
+	    pass
+      #end while
+    #end worker
+
+    threads = []
+    for i in xrange( thread_count ):
+      th = threading.Thread( target = worker, name = 'StatePool-%d' % i )
+      th.daemon = True
+      th.start()
+      threads.append( th )
+
+    completed = True
+    pending = {}
+    next_pos = 0
+    try:
+      while next_pos < len( state_indexes ):
+        if cancel_event is not None and cancel_event.is_set():
+	  completed = False
+	  break
+
+        try:
+	  state_ndx, result, exc_info = out_queue.get( timeout = 0.1 )
+	except six.moves.queue.Empty:
+	  continue
+	if exc_info is not None:
+	  six.reraise( *exc_info )
+	pending[ state_ndx ] = result
+
+#			-- Consume in state order
+	while next_pos < len( state_indexes ) and \
+	    state_indexes[ next_pos ] in pending and \
+	    not (cancel_event is not None and cancel_event.is_set()):
+	  state_ndx = state_indexes[ next_pos ]
+	  result = pending.pop( state_ndx )
+	  if write_func:
+	    write_func( state_ndx, result )
+	  if callback:
+	    callback( state_ndx )
+	  next_pos += 1
+      #end while next_pos
+    finally:
+      stop_event.set()
+      for th in threads:
+        th.join()
+
+#			-- Results computed but not written
+      if discard_func:
+	while True:
+	  try:
+	    dropped.append( out_queue.get_nowait() )
+	  except six.moves.queue.Empty:
+	    break
+	items = sorted( pending.items() ) + \
+	    sorted( ( d[ 0 ], d[ 1 ] ) for d in dropped if d[ 2 ] is None )
+	for state_ndx, result in items:
+	  try:
+	    discard_func( state_ndx, result )
+	  except Exception:
+	    self.logger.warning( traceback.format_exc() )
+    #end try-finally
+
+    return  completed
+  #end _RunThreads
+
+#end StatePool
@@ -0,0 +1,459 @@
+#!/usr/bin/env python
+# $Id$
+#------------------------------------------------------------------------
+#	NAME:		stats_cache.py					-
+#	HISTORY:							-
+#		2026-10-18						-
+#------------------------------------------------------------------------
+"""Persistent cache of per-state dataset statistics.
+
+Statistics computed by :class:`data.dataset_stats.DataSetStats` are stored
+in an HDF5 file in the user cache directory, one file per VERA output file.
+The cache is discarded when the output file path, modification time, or size
+change.  Entries for datasets that exist only for the session are held in
+memory and never written.  Writes are batched, at most one every
+``FLUSH_INTERVAL`` seconds, with any remainder written on ``Close()``.
+"""
+import hashlib, h5py, logging, os, sys, threading, time, traceback
+import numpy as np
+import pdb
+
+from .config import Config
+
+
+#------------------------------------------------------------------------
+#	CLASS:		StatsCache					-
+#------------------------------------------------------------------------
+class StatsCache( object ):
+  """Per-file persistent cache of per-state dataset statistics.  Entries are
+keyed by a string built with ``CreateKey()`` from everything that affects
+the values: dataset name, index expression, factors, scale type, and
+threshold.  All entries are held in memory and persistent entries are
+written back on ``Flush()``, no more often than ``FLUSH_INTERVAL`` unless
+forced.
+
+Properties:
+  cachePath		path to the cache HDF5 file, None if not persistent
+  entries		dict by key of dicts by stat name of np.ndarray
+			values indexed by state
+  memoryKeys		set of keys for entries stored with persist False
+  sourceId		( path, mtime, size ) of the source file
+"""
+
+
+#		-- Constants
+#		--
+
+  FLUSH_INTERVAL = 10.0
+  """float: Minimum seconds between unforced writes of the cache file."""
+
+  STATE_FIELDS = \
+    (
+    ( 'min', np.float64, np.nan ),
+    ( 'max', np.float64, np.nan ),
+    ( 'argmin', np.int64, -1 ),
+    ( 'argmax', np.int64, -1 ),
+    ( 'count', np.int64, 0 ),
+    ( 'nan_count', np.int64, 0 )
+    )
+  """tuple: ( name, dtype, fill value ) for each per-state statistic."""
+
+  VERSION = 1
+
+
+#		-- Class Attributes
+#		--
+
+  enabled_ = True
+
+
+#		-- Object Methods
+#		--
+
+
+  #----------------------------------------------------------------------
+  #	METHOD:		StatsCache.__init__()				-
+  #----------------------------------------------------------------------
+  def __init__( self, source_path, cache_path = None, persistent = True ):
+    """Loads any existing entries for ``source_path``.
+    Args:
+        source_path (str): path to the VERA output HDF5 file
+        cache_path (str): optional cache file path, defaulting to the
+            result of ``CreateCachePath()``
+        persistent (bool): False to keep all entries in memory only
+"""
+    self.logger = logging.getLogger( 'data' )
+    self.lock = threading.RLock()
+
+    self.dirtyKeys = set()
+    self.entries = {}
+    self.lastFlushTime = time.time()
+    self.memoryKeys = set()
+    self.sourceId = StatsCache.GetSourceId( source_path )
+    self.cachePath = \
+        None  if not persistent else \
+        cache_path  if cache_path else \
+        StatsCache.CreateCachePath( source_path )
+
+    if self.cachePath:
+      self._Load()
+  #end __init__
+
+
+  #----------------------------------------------------------------------
+  #	METHOD:		StatsCache.Close()				-
+  #----------------------------------------------------------------------
+  def Close( self ):
+    """Writes all pending changes.
+"""
+    self.Flush( True )
+  #end Close
+
+
+  #----------------------------------------------------------------------
+  #	METHOD:		StatsCache.Flush()				-
+  #----------------------------------------------------------------------
+  def Flush( self, force = False ):
+    """Writes modified entries to the cache file if ``FLUSH_INTERVAL`` has
+passed since the last write.  Errors are logged and otherwise ignored,
+since the cache is an optimization only.
+    Args:
+        force (bool): True to write regardless of the interval
+"""
+    self.lock.acquire()
+    try:
+      if self.dirtyKeys and self.cachePath and (force or
+          time.time() - self.lastFlushTime >= StatsCache.FLUSH_INTERVAL):
+        self.lastFlushTime = time.time()
+        h5f = h5py.File( self.cachePath, 'a' )
+        try:
+          if not self._IsCurrent( h5f ):
+            for name in list( h5f.keys() ):
+              del h5f[ name ]
+            h5f.attrs[ 'version' ] = StatsCache.VERSION
+            h5f.attrs[ 'source_path' ] = self.sourceId[ 0 ]
+            h5f.attrs[ 'source_mtime' ] = self.sourceId[ 1 ]
+            h5f.attrs[ 'source_size' ] = self.sourceId[ 2 ]
+          #end if not self._IsCurrent( h5f )
+
+          entries_group = h5f.require_group( 'entries' )
+          for key in self.dirtyKeys:
+            group_name = hashlib.sha1( key.encode( 'utf-8' ) ).hexdigest()
+            if group_name in entries_group:
+              del entries_group[ group_name ]
+            group = entries_group.create_group( group_name )
+            group.attrs[ 'key' ] = key
+            for name, value in self.entries[ key ].items():
+              group.create_dataset( name, data = value )
+          #end for key
+
+        finally:
+          h5f.close()
+        self.dirtyKeys.clear()
+      #end if self.dirtyKeys
+
+    except Exception, ex:
+      self.logger.warning(
+          'Error writing stats cache "%s": %s', self.cachePath, str( ex )
+          )
+      self.dirtyKeys.clear()
+
+    finally:
+      self.lock.release()
+  #end Flush
+
+
+  #----------------------------------------------------------------------
+  #	METHOD:		StatsCache.GetHistogram()			-
+  #----------------------------------------------------------------------
+  def GetHistogram( self, key, state_ndx, bins ):
+    """Retrieves a cached histogram.
+    Args:
+        key (str): key from ``CreateKey()``
+        state_ndx (int): 0-based state point index
+        bins (int): number of bins
+    Returns:
+        tuple: ( np.ndarray counts, np.ndarray edges ) or None if not
+            cached
+"""
+    result = None
+    self.lock.acquire()
+    try:
+      entry = self.entries.get( '{0:s}#hist{1:d}'.format( key, bins ) )
+      if entry is not None and state_ndx < len( entry[ 'valid' ] ) and \
+          entry[ 'valid' ][ state_ndx ]:
+        result = \
+            np.array( entry[ 'counts' ][ state_ndx ] ), \
+            np.array( entry[ 'edges' ][ state_ndx ] )
+    finally:
+      self.lock.release()
+
+    return  result
+  #end GetHistogram
+
+
+  #----------------------------------------------------------------------
+  #	METHOD:		StatsCache.GetStats()				-
+  #----------------------------------------------------------------------
+  def GetStats( self, key, state_ndx ):
+    """Retrieves cached statistics for a state point.
+    Args:
+        key (str): key from ``CreateKey()``
+        state_ndx (int): 0-based state point index
+    Returns:
+        dict: stats by name (see ``STATE_FIELDS``) or None if not cached
+"""
+    result = None
+    self.lock.acquire()
+    try:
+      entry = self.entries.get( key )
+      if entry is not None and state_ndx < len( entry[ 'valid' ] ) and \
+          entry[ 'valid' ][ state_ndx ]:
+        result = {}
+        for name, dtype, fill in StatsCache.STATE_FIELDS:
+          result[ name ] = entry[ name ][ state_ndx ].item()
+    finally:
+      self.lock.release()
+
+    return  result
+  #end GetStats
+
+
+  #----------------------------------------------------------------------
+  #	METHOD:		StatsCache._IsCurrent()				-
+  #----------------------------------------------------------------------
+  def _IsCurrent( self, h5f ):
+    """
+    Args:
+        h5f (h5py.File): open cache file
+    Returns:
+        bool: True if the cache file matches this version and source file
+"""
+    attrs = h5f.attrs
+    return \
+        attrs.get( 'version' ) == StatsCache.VERSION and \
+        attrs.get( 'source_path' ) == self.sourceId[ 0 ] and \
+        attrs.get( 'source_mtime' ) == self.sourceId[ 1 ] and \
+        attrs.get( 'source_size' ) == self.sourceId[ 2 ]
+  #end _IsCurrent
+
+
+  #----------------------------------------------------------------------
+  #	METHOD:		StatsCache._Load()				-
+  #----------------------------------------------------------------------
+  def _Load( self ):
+    """Reads entries from the cache file if it exists and is current.
+"""
+    if os.path.exists( self.cachePath ):
+      try:
+        h5f = h5py.File( self.cachePath, 'r' )
+        try:
+          if self._IsCurrent( h5f ) and 'entries' in h5f:
+            for group in h5f[ 'entries' ].values():
+              key = group.attrs.get( 'key' )
+              if key is not None:
+                entry = {}
+                for name, dset in group.items():
+                  entry[ name ] = np.array( dset )
+                self.entries[ str( key ) ] = entry
+            #end for group
+        finally:
+          h5f.close()
+
+      except Exception, ex:
+        self.logger.warning(
+            'Error reading stats cache "%s": %s', self.cachePath, str( ex )
+            )
+        self.entries.clear()
+    #end if os.path.exists( self.cachePath )
+  #end _Load
+
+
+  #----------------------------------------------------------------------
+  #	METHOD:		StatsCache.PutHistogram()			-
+  #----------------------------------------------------------------------
+  def PutHistogram(
+      self, key, state_ndx, nstates, counts, edges, persist = True
+      ):
+    """Stores a histogram for a state point.
+    Args:
+        key (str): key from ``CreateKey()``
+        state_ndx (int): 0-based state point index
+        nstates (int): number of state points
+        counts (np.ndarray): bin counts
+        edges (np.ndarray): bin edges
+        persist (bool): False to keep the entry in memory only
+"""
+    bins = len( counts )
+    hist_key = '{0:s}#hist{1:d}'.format( key, bins )
+    self.lock.acquire()
+    try:
+      entry = self.entries.get( hist_key )
+      if entry is None or len( entry[ 'valid' ] ) != nstates:
+        entry = \
+          {
+          'counts': np.zeros( ( nstates, bins ), dtype = np.int64 ),
+          'edges': np.zeros( ( nstates, bins + 1 ), dtype = np.float64 ),
+          'valid': np.zeros( nstates, dtype = np.bool_ )
+          }
+        self.entries[ hist_key ] = entry
+
+      entry[ 'counts' ][ state_ndx ] = counts
+      entry[ 'edges' ][ state_ndx ] = edges
+      entry[ 'valid' ][ state_ndx ] = True
+      if persist:
+        self.dirtyKeys.add( hist_key )
+      else:
+        self.memoryKeys.add( hist_key )
+    finally:
+      self.lock.release()
+  #end PutHistogram
+
+
+  #----------------------------------------------------------------------
+  #	METHOD:		StatsCache.PutStats()				-
+  #----------------------------------------------------------------------
+  def PutStats( self, key, state_ndx, nstates, stats, persist = True ):
+    """Stores statistics for a state point.
+    Args:
+        key (str): key from ``CreateKey()``
+        state_ndx (int): 0-based state point index
+        nstates (int): number of state points
+        stats (dict): stats by name as returned by
+            ``DataSetStats.ReduceStats()``
+        persist (bool): False to keep the entry in memory only
+"""
+    self.lock.acquire()
+    try:
+      entry = self.entries.get( key )
+      if entry is None or len( entry[ 'valid' ] ) != nstates:
+        entry = { 'valid': np.zeros( nstates, dtype = np.bool_ ) }
+        for name, dtype, fill in StatsCache.STATE_FIELDS:
+          entry[ name ] = np.empty( nstates, dtype = dtype )
+          entry[ name ].fill( fill )
+        self.entries[ key ] = entry
+
+      for name, dtype, fill in StatsCache.STATE_FIELDS:
+        entry[ name ][ state_ndx ] = stats.get( name, fill )
+      entry[ 'valid' ][ state_ndx ] = True
+      if persist:
+        self.dirtyKeys.add( key )
+      else:
+        self.memoryKeys.add( key )
+    finally:
+      self.lock.release()
+  #end PutStats
+
+
+  #----------------------------------------------------------------------
+  #	METHOD:		StatsCache.Remove()				-
+  #----------------------------------------------------------------------
+  def Remove( self, ds_name ):
+    """Removes memory-only entries for a dataset, which must be called when
+a session dataset is recreated or removed.  Persistent entries describe
+datasets in the source file and are kept.
+    Args:
+        ds_name (str): dataset name as passed to ``CreateKey()``
+    Returns:
+        int: number of entries removed
+"""
+    prefix = ds_name + '|'
+    self.lock.acquire()
+    try:
+      keys = [ k for k in self.memoryKeys if k.startswith( prefix ) ]
+      for key in keys:
+        self.entries.pop( key, None )
+        self.memoryKeys.discard( key )
+    finally:
+      self.lock.release()
+
+    return  len( keys )
+  #end Remove
+
+
+#		-- Static Methods
+#		--
+
+
+  #----------------------------------------------------------------------
+  #	METHOD:		StatsCache.CreateCachePath()			-
+  #----------------------------------------------------------------------
+  @staticmethod
+  def CreateCachePath( source_path ):
+    """
+    Args:
+        source_path (str): path to the VERA output HDF5 file
+    Returns:
+        str: path to the cache file in ``Config.GetCacheDir()``
+"""
+    abs_path = os.path.abspath( source_path )
+    return  os.path.join(
+        Config.GetCacheDir( True ),
+        hashlib.sha1( abs_path.encode( 'utf-8' ) ).hexdigest() + '.stats.h5'
+        )
+  #end CreateCachePath
+
+
+  #----------------------------------------------------------------------
+  #	METHOD:		StatsCache.CreateKey()				-
+  #----------------------------------------------------------------------
+  @staticmethod
+  def CreateKey(
+      ds_name, ds_expr = None, use_factors = False,
+      scale_type = 'linear', threshold = None
+      ):
+    """
+    Args:
+        ds_name (str): dataset name
+        ds_expr (str): optional numpy array index expression
+        use_factors (bool): True if factors are applied
+        scale_type (str): 'linear' or 'log'
+        threshold (data.range_expr.RangeExpression): optional threshold
+    Returns:
+        str: key
+"""
+    return  '{0:s}|{1:s}|{2:s}|{3:s}|{4:s}'.format(
+        ds_name,
+        ds_expr.replace( ' ', '' ) if ds_expr else '',
+        str( bool( use_factors ) ),
+        scale_type or 'linear',
+        str( threshold ) if threshold else ''
+        )
+  #end CreateKey
+
+
+  #----------------------------------------------------------------------
+  #	METHOD:		StatsCache.GetSourceId()			-
+  #----------------------------------------------------------------------
+  @staticmethod
+  def GetSourceId( source_path ):
+    """
+    Args:
+        source_path (str): path to the VERA output HDF5 file
+    Returns:
+        tuple: ( absolute path, mtime, size )
+"""
+    abs_path = os.path.abspath( source_path )
+    st = os.stat( abs_path )
+    return  ( abs_path, float( st.st_mtime ), int( st.st_size ) )
+  #end GetSourceId
+
+
+  #----------------------------------------------------------------------
+  #	METHOD:		StatsCache.IsEnabled()				-
+  #----------------------------------------------------------------------
+  @staticmethod
+  def IsEnabled():
+    return  StatsCache.enabled_
+  #end IsEnabled
+
+
+  #----------------------------------------------------------------------
+  #	METHOD:		StatsCache.SetEnabled()				-
+  #----------------------------------------------------------------------
+  @staticmethod
+  def SetEnabled( value ):
+    StatsCache.enabled_ = bool( value )
+  #end SetEnabled
+
+#end StatsCache
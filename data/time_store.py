@@ -0,0 +1,509 @@
+#!/usr/bin/env python
+# $Id$
+#------------------------------------------------------------------------
+#	NAME:		time_store.py					-
+#	HISTORY:							-
+#		2026-10-18						-
+#	  Time-major companion store for history queries.
+#------------------------------------------------------------------------
+"""Time-major companion store for a VERA output file.
+
+VERA output files hold one group per state point, so the history of a
+single cell touches every state group.  A time store holds each state
+dataset transposed to ``shape + ( nstates, )``, chunked so a chunk holds
+the full history of a block of neighboring cells, and a cell's history is
+a single chunk read.
+
+Stores are built with ``TimeStore.Build()``, either from the command line,
+
+    python data/time_store.py [-o store.h5] file.h5
+
+or in the background on first open when enabled with ``SetAutoBuild()``.
+A store is used only while the source file path, modification time, and
+size match those recorded when it was built.
+"""
+import argparse, h5py, logging, os, sys, threading, traceback
+import numpy as np
+import pdb
+
+if __name__ == '__main__':
+  sys.path.insert( 0, os.path.join( os.path.dirname( __file__ ), os.pardir ) )
+
+from data.config import Config
+from data.stats_cache import StatsCache
+
+
+#------------------------------------------------------------------------
+#	CLASS:		TimeStore					-
+#------------------------------------------------------------------------
+class TimeStore( object ):
+  """Read access to a time-major companion file.
+
+Properties:
+  h5File		h5py.File opened read-only
+  stateCount		number of state points
+  storePath		path to the store file
+"""
+
+
+#		-- Constants
+#		--
+
+  CHUNK_BYTES = 1 << 20
+  """int: target chunk size."""
+
+  SLAB_BYTES = 256 << 20
+  """int: memory used to transpose a slab of cells while building."""
+
+  VERSION = 1
+
+
+#		-- Class Attributes
+#		--
+
+  autoBuild_ = False
+
+  building_ = set()
+
+  buildingLock_ = threading.Lock()
+
+
+#		-- Object Methods
+#		--
+
+
+  #----------------------------------------------------------------------
+  #	METHOD:		TimeStore.__init__()				-
+  #----------------------------------------------------------------------
+  def __init__( self, store_path ):
+    """
+    Args:
+        store_path (str): path to an existing store file
+"""
+    self.storePath = store_path
+    self.h5File = h5py.File( store_path, 'r' )
+    self.stateCount = int( self.h5File.attrs.get( 'state_count', 0 ) )
+  #end __init__
+
+
+  #----------------------------------------------------------------------
+  #	METHOD:		TimeStore.Close()				-
+  #----------------------------------------------------------------------
+  def Close( self ):
+    if self.h5File is not None:
+      self.h5File.close()
+      self.h5File = None
+  #end Close
+
+
+  #----------------------------------------------------------------------
+  #	METHOD:		TimeStore.GetDataSet()				-
+  #----------------------------------------------------------------------
+  def GetDataSet( self, ds_name ):
+    """
+    Args:
+        ds_name (str): state dataset name
+    Returns:
+        h5py.Dataset: time-major dataset with shape
+            ``state shape + ( stateCount, )`` or None if not stored
+"""
+    return \
+        self.h5File[ ds_name ] \
+        if self.h5File is not None and ds_name in self.h5File else \
+        None
+  #end GetDataSet
+
+
+  #----------------------------------------------------------------------
+  #	METHOD:		TimeStore.HasDataSet()				-
+  #----------------------------------------------------------------------
+  def HasDataSet( self, ds_name ):
+    return  self.h5File is not None and ds_name in self.h5File
+  #end HasDataSet
+
+
+#		-- Static Methods
+#		--
+
+
+  #----------------------------------------------------------------------
+  #	METHOD:		TimeStore.Build()				-
+  #----------------------------------------------------------------------
+  @staticmethod
+  def Build(
+      source_path, store_path = None, ds_names = None,
+      callback = None, cancel_event = None
+      ):
+    """Writes the store for a VERA output file.  The store is written to a
+temporary file which is renamed when complete, so a partial store is
+never used.  Numeric datasets present with the same shape in every state
+point are stored.
+    Args:
+        source_path (str): path to the VERA output HDF5 file
+        store_path (str): optional output path, defaulting to
+            ``CreateStorePath( source_path )``
+        ds_names (list): optional names of the datasets to store, where
+            None means all
+        callback (callable): optional progress callback, prototype
+            func( message, cur_step, step_count )
+        cancel_event (threading.Event): optional event which, when set,
+            stops the build
+    Returns:
+        str: path to the store, or None if cancelled
+"""
+    logger = logging.getLogger( 'data' )
+    if not store_path:
+      store_path = TimeStore.CreateStorePath( source_path )
+    temp_path = store_path + '.tmp'
+    source_id = StatsCache.GetSourceId( source_path )
+
+    src_file = h5py.File( source_path, 'r' )
+    try:
+      groups = TimeStore._FindStateGroups( src_file )
+      assert len( groups ) > 0, 'No state points in ' + source_path
+
+      names = []
+      for name, item in sorted( groups[ 0 ].items() ):
+        if isinstance( item, h5py.Dataset ) and \
+            item.dtype.kind in 'biuf' and \
+            (ds_names is None or name in ds_names) and \
+            all( name in g and g[ name ].shape == item.shape for g in groups ):
+          names.append( name )
+
+      out_file = h5py.File( temp_path, 'w' )
+      try:
+        out_file.attrs[ 'version' ] = TimeStore.VERSION
+        out_file.attrs[ 'source_path' ] = source_id[ 0 ]
+        out_file.attrs[ 'source_mtime' ] = source_id[ 1 ]
+        out_file.attrs[ 'source_size' ] = source_id[ 2 ]
+        out_file.attrs[ 'state_count' ] = len( groups )
+
+        for i, name in enumerate( names ):
+          if cancel_event is not None and cancel_event.is_set():
+            break
+          if callback:
+            callback( 'Transposing ' + name, i, len( names ) )
+          TimeStore._BuildDataSet( out_file, groups, name, cancel_event )
+      finally:
+        out_file.close()
+    finally:
+      src_file.close()
+
+    if cancel_event is not None and cancel_event.is_set():
+      os.remove( temp_path )
+      store_path = None
+    else:
+      if os.path.exists( store_path ):
+        os.remove( store_path )
+      os.rename( temp_path, store_path )
+      logger.info( 'time store written: %s', store_path )
+
+    return  store_path
+  #end Build
+
+
+  #----------------------------------------------------------------------
+  #	METHOD:		TimeStore.BuildAsync()				-
+  #----------------------------------------------------------------------
+  @staticmethod
+  def BuildAsync( source_path, callback = None ):
+    """Builds the store for a source file on a daemon thread, unless a
+build for the file is already running.  Errors are logged.
+    Args:
+        source_path (str): path to the VERA output HDF5 file
+        callback (callable): optional callable invoked on the build thread
+            when the store is complete, prototype func( store_path )
+    Returns:
+        threading.Thread: thread started or None
+"""
+    abs_path = os.path.abspath( source_path )
+    with TimeStore.buildingLock_:
+      if abs_path in TimeStore.building_:
+        return  None
+      TimeStore.building_.add( abs_path )
+
+    def run():
+      try:
+        store_path = TimeStore.Build( abs_path )
+        if callback and store_path:
+          callback( store_path )
+      except Exception, ex:
+        logging.getLogger( 'data' ).warning(
+            'Error building time store for "%s": %s', abs_path, str( ex )
+            )
+      finally:
+        with TimeStore.buildingLock_:
+          TimeStore.building_.discard( abs_path )
+    #end run
+
+    th = threading.Thread( target = run, name = 'TimeStore' )
+    th.daemon = True
+    th.start()
+    return  th
+  #end BuildAsync
+
+
+  #----------------------------------------------------------------------
+  #	METHOD:		TimeStore._BuildDataSet()			-
+  #----------------------------------------------------------------------
+  @staticmethod
+  def _BuildDataSet( out_file, groups, name, cancel_event = None ):
+    """Transposes one dataset, reading slabs along the last axis that fit
+in ``SLAB_BYTES`` from every state point, so each chunk is written once.
+"""
+    first = groups[ 0 ][ name ]
+    shape = first.shape
+    dtype = first.dtype
+    nstates = len( groups )
+    chunks = TimeStore.CreateChunks( shape, nstates, dtype.itemsize )
+    out_dset = out_file.create_dataset(
+        name, shape + ( nstates, ), dtype = dtype, chunks = chunks
+        )
+
+    if len( shape ) == 0:
+      out_dset[ : ] = [ g[ name ][ () ] for g in groups ]
+
+    else:
+      unit_bytes = \
+          int( np.prod( shape[ : -1 ] ) ) * nstates * dtype.itemsize
+      chunk_wd = chunks[ -2 ]
+      slab_wd = max( 1, TimeStore.SLAB_BYTES // max( 1, unit_bytes ) )
+      slab_wd = max( chunk_wd, slab_wd // chunk_wd * chunk_wd )
+
+      for a0 in xrange( 0, shape[ -1 ], slab_wd ):
+        if cancel_event is not None and cancel_event.is_set():
+          break
+        a1 = min( a0 + slab_wd, shape[ -1 ] )
+        slab = np.empty( shape[ : -1 ] + ( a1 - a0, nstates ), dtype = dtype )
+        for t, g in enumerate( groups ):
+          slab[ ..., t ] = g[ name ][ ..., a0 : a1 ]
+        out_dset[ ..., a0 : a1, : ] = slab
+      #end for a0
+    #end else len( shape ) > 0
+  #end _BuildDataSet
+
+
+  #----------------------------------------------------------------------
+  #	METHOD:		TimeStore.CreateChunks()			-
+  #----------------------------------------------------------------------
+  @staticmethod
+  def CreateChunks( shape, nstates, itemsize ):
+    """Creates a chunk shape holding the full time axis for as many
+leading-axis cells as fit in ``CHUNK_BYTES``.
+    Args:
+        shape (tuple): state dataset shape
+        nstates (int): number of state points
+        itemsize (int): bytes per value
+    Returns:
+        tuple: chunk shape for ``shape + ( nstates, )``
+"""
+    time_chunk = max( 1, min( nstates, TimeStore.CHUNK_BYTES // itemsize ) )
+    chunk_bytes = time_chunk * itemsize
+    chunks = [ 1 ] * len( shape )
+    for i, size in enumerate( shape ):
+      count = max( 1, min( size, TimeStore.CHUNK_BYTES // chunk_bytes ) )
+      chunks[ i ] = count
+      chunk_bytes *= count
+      if count < size:
+        break
+
+    return  tuple( chunks ) + ( time_chunk, )
+  #end CreateChunks
+
+
+  #----------------------------------------------------------------------
+  #	METHOD:		TimeStore.CreateStorePath()			-
+  #----------------------------------------------------------------------
+  @staticmethod
+  def CreateStorePath( source_path ):
+    """
+    Args:
+        source_path (str): path to the VERA output HDF5 file
+    Returns:
+        str: default store path in ``Config.GetCacheDir()``
+"""
+    cache_path = StatsCache.CreateCachePath( source_path )
+    return  cache_path[ : -len( '.stats.h5' ) ] + '.time.h5'
+  #end CreateStorePath
+
+
+  #----------------------------------------------------------------------
+  #	METHOD:		TimeStore._FindStateGroups()			-
+  #----------------------------------------------------------------------
+  @staticmethod
+  def _FindStateGroups( h5f ):
+    """Finds state groups the way ``State.ReadAll()`` does, tolerating
+gaps of up to five missing state numbers.
+    Returns:
+        list: h5py.Group instances in state order
+"""
+    groups = []
+    missing_count = 0
+    n = 1
+    while missing_count <= 5:
+      name = 'STATE_%04d' % n
+      if name in h5f:
+        missing_count = 0
+        groups.append( h5f[ name ] )
+      else:
+        missing_count += 1
+      n += 1
+
+    return  groups
+  #end _FindStateGroups
+
+
+  #----------------------------------------------------------------------
+  #	METHOD:		TimeStore.FindStorePath()			-
+  #----------------------------------------------------------------------
+  @staticmethod
+  def FindStorePath( source_path ):
+    """Looks for a current store beside the source file, as
+``name.time.h5`` for ``name.h5``, and then in the cache directory.
+    Args:
+        source_path (str): path to the VERA output HDF5 file
+    Returns:
+        str: path to a current store or None
+"""
+    result = None
+    source_id = StatsCache.GetSourceId( source_path )
+    for path in (
+        os.path.splitext( source_path )[ 0 ] + '.time.h5',
+        TimeStore.CreateStorePath( source_path )
+        ):
+      if os.path.exists( path ) and TimeStore.IsCurrent( path, source_id ):
+        result = path
+        break
+
+    return  result
+  #end FindStorePath
+
+
+  #----------------------------------------------------------------------
+  #	METHOD:		TimeStore.IsAutoBuild()				-
+  #----------------------------------------------------------------------
+  @staticmethod
+  def IsAutoBuild():
+    return  TimeStore.autoBuild_
+  #end IsAutoBuild
+
+
+  #----------------------------------------------------------------------
+  #	METHOD:		TimeStore.IsCurrent()				-
+  #----------------------------------------------------------------------
+  @staticmethod
+  def IsCurrent( store_path, source_id ):
+    """
+    Args:
+        store_path (str): path to a store file
+        source_id (tuple): ``StatsCache.GetSourceId()`` result
+    Returns:
+        bool: True if the store was built from the source as it is now
+"""
+    try:
+      h5f = h5py.File( store_path, 'r' )
+      try:
+        attrs = h5f.attrs
+        current = \
+            attrs.get( 'version' ) == TimeStore.VERSION and \
+            attrs.get( 'source_mtime' ) == source_id[ 1 ] and \
+            attrs.get( 'source_size' ) == source_id[ 2 ]
+      finally:
+        h5f.close()
+    except Exception:
+      current = False
+
+    return  current
+  #end IsCurrent
+
+
+  #----------------------------------------------------------------------
+  #	METHOD:		TimeStore.main()				-
+  #----------------------------------------------------------------------
+  @staticmethod
+  def main():
+    """Command line entry point.
+"""
+    parser = argparse.ArgumentParser(
+        description = 'Builds the time-major companion store for a ' +
+            'VERA output file'
+        )
+    parser.add_argument(
+        '-d', '--dataset',
+        action = 'append',
+        help = 'name of a dataset to store, may be repeated, ' +
+            'defaulting to all'
+        )
+    parser.add_argument(
+        '-o', '--output-file',
+        help = 'path to the store, defaulting to the VERAView cache ' +
+            'directory, where FILE.time.h5 beside FILE.h5 is also found'
+        )
+    parser.add_argument(
+        'file_path',
+        help = 'path to the VERA output HDF5 file'
+        )
+    args = parser.parse_args()
+
+    def progress( message, cur_step, step_count ):
+      print '[time_store] %d/%d %s' % ( cur_step + 1, step_count, message )
+
+    try:
+      path = TimeStore.Build(
+          args.file_path, args.output_file, args.dataset, progress
+          )
+      print '[time_store] wrote', path
+
+    except Exception, ex:
+      print >> sys.stderr, '[time_store]', str( ex )
+      traceback.print_exc()
+      sys.exit( 1 )
+  #end main
+
+
+  #----------------------------------------------------------------------
+  #	METHOD:		TimeStore.Open()				-
+  #----------------------------------------------------------------------
+  @staticmethod
+  def Open( source_path, state_count = -1 ):
+    """Opens the current store for a source file if there is one.
+    Args:
+        source_path (str): path to the VERA output HDF5 file
+        state_count (int): expected number of state points, where values
+            lt 0 mean any
+    Returns:
+        TimeStore: instance or None
+"""
+    store = None
+    path = TimeStore.FindStorePath( source_path )
+    if path is not None:
+      store = TimeStore( path )
+      if state_count >= 0 and store.stateCount != state_count:
+        store.Close()
+        store = None
+
+    return  store
+  #end Open
+
+
+  #----------------------------------------------------------------------
+  #	METHOD:		TimeStore.SetAutoBuild()			-
+  #----------------------------------------------------------------------
+  @staticmethod
+  def SetAutoBuild( value ):
+    """
+    Args:
+        value (bool): True to build missing stores in the background when
+            files are opened
+"""
+    TimeStore.autoBuild_ = bool( value )
+  #end SetAutoBuild
+
+#end TimeStore
+
+
+#------------------------------------------------------------------------
+#	NAME:		__main__					-
+#------------------------------------------------------------------------
+if __name__ == '__main__':
+  TimeStore.main()
@@ -1,5 +1,5 @@
 """Event and state stuff.
 """
 
-__all__ = [ 'event', 'state' ]
+__all__ = [ 'event', 'state', 'state_scheduler' ]
 __version__ = '2.4.0'
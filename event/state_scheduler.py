@@ -0,0 +1,192 @@
+#!/usr/bin/env python
+# $Id$
+#------------------------------------------------------------------------
+#	NAME:		state_scheduler.py				-
+#	HISTORY:							-
+#		2026-10-18						-
+#	  Coalescing of state change updates to widgets.
+#------------------------------------------------------------------------
+"""Coalescing scheduler for state change updates.
+
+Rather than queueing one update per State.FireStateChange() call, a
+listener schedules itself with its reason mask.  Reasons for a listener
+already pending are OR'ed into the pending mask, so a burst of changes,
+such as from dragging a slider, results in a single update per listener
+that reads the latest state values when it runs.  Pending updates are
+run in priority order, visible widgets first, and each flush stops once
+its frame budget is spent, posting another flush for the rest so that
+input events are handled in between.
+
+No wx dependency here.  The function used to post a flush, typically
+``wx.CallAfter``, is passed to the constructor.
+"""
+import logging, threading, timeit, traceback
+import pdb
+
+
+#------------------------------------------------------------------------
+#	CLASS:		StateChangeScheduler				-
+#------------------------------------------------------------------------
+class StateChangeScheduler( object ):
+  """Merges state change reasons per target and runs target updates in
+budgeted batches.
+
+Properties:
+  frameBudget		seconds of updates run per flush, where at least
+			one update is always run
+  postFunc		function( func ) called to run a flush later
+"""
+
+
+#		-- Class Attributes
+#		--
+
+  FRAME_BUDGET = 0.04
+  """float: Default seconds of updates run per flush."""
+
+
+#		-- Object Methods
+#		--
+
+
+  #----------------------------------------------------------------------
+  #	METHOD:		StateChangeScheduler.__init__()			-
+  #----------------------------------------------------------------------
+  def __init__( self, post_func, frame_budget = None ):
+    """
+@param  post_func	function( func ) that calls func later on the
+			thread on which updates must run, e.g., wx.CallAfter
+@param  frame_budget	seconds of updates per flush, defaulting to
+			FRAME_BUDGET
+"""
+    self.frameBudget = \
+        StateChangeScheduler.FRAME_BUDGET  if frame_budget is None else \
+        frame_budget
+    self.postFunc = post_func
+
+    self._lock = threading.RLock()
+    self._logger = logging.getLogger( 'event' )
+    self._pending = {}
+    self._posted = False
+    self._sequence = 0
+  #end __init__
+
+
+  #----------------------------------------------------------------------
+  #	METHOD:		StateChangeScheduler.Cancel()			-
+  #----------------------------------------------------------------------
+  def Cancel( self, target ):
+    """Drops any pending update for the target.
+@param  target		target object
+@return			pending reason mask dropped, 0 if none
+"""
+    with self._lock:
+      entry = self._pending.pop( id( target ), None )
+    return  entry[ 1 ]  if entry is not None else  0
+  #end Cancel
+
+
+  #----------------------------------------------------------------------
+  #	METHOD:		StateChangeScheduler.Flush()			-
+  #----------------------------------------------------------------------
+  def Flush( self ):
+    """Runs pending updates in priority order until the frame budget is
+spent, posting another flush if any remain.  Normally called through
+postFunc, but may be called directly to run updates now.
+@return			number of updates run
+"""
+    with self._lock:
+      self._posted = False
+      entries = self._pending.values()
+
+#		-- Higher priority first, then in order scheduled
+#		--
+    ordered = []
+    for entry in entries:
+      priority = 0
+      if entry[ 3 ] is not None:
+        try:
+          priority = entry[ 3 ]()
+        except Exception:
+          pass
+      ordered.append( ( -priority, entry[ 4 ], entry ) )
+    ordered.sort( key = lambda x: x[ 0 : 2 ] )
+
+    count = 0
+    start_time = timeit.default_timer()
+    for priority, sequence, entry in ordered:
+      if count > 0 and \
+          timeit.default_timer() - start_time >= self.frameBudget:
+        break
+
+      target = entry[ 0 ]
+      with self._lock:
+        cur_entry = self._pending.get( id( target ) )
+        if cur_entry is not None and cur_entry[ 4 ] == sequence:
+          del self._pending[ id( target ) ]
+        else:
+          cur_entry = None
+
+#			-- Dead wx windows evaluate False
+      if cur_entry is not None and target:
+        try:
+          cur_entry[ 2 ]( cur_entry[ 1 ] )
+        except Exception:
+          self._logger.error( traceback.format_exc() )
+        count += 1
+    #end for
+
+    with self._lock:
+      if self._pending and not self._posted:
+        self._posted = True
+        self.postFunc( self.Flush )
+
+    return  count
+  #end Flush
+
+
+  #----------------------------------------------------------------------
+  #	METHOD:		StateChangeScheduler.GetPendingReason()		-
+  #----------------------------------------------------------------------
+  def GetPendingReason( self, target ):
+    """
+@param  target		target object
+@return			pending reason mask for the target, 0 if none
+"""
+    entry = self._pending.get( id( target ) )
+    return  entry[ 1 ]  if entry is not None else  0
+  #end GetPendingReason
+
+
+  #----------------------------------------------------------------------
+  #	METHOD:		StateChangeScheduler.Schedule()			-
+  #----------------------------------------------------------------------
+  def Schedule( self, target, reason, update_func, priority_func = None ):
+    """Merges the reason into any pending update for the target, posting
+a flush if one is not already posted.  The update function and priority
+function from the latest call are used.
+@param  target		target object, typically the widget
+@param  reason		reason mask
+@param  update_func	function( reason ) called with the merged mask
+@param  priority_func	optional function() returning a number, higher
+			run first, e.g., 1 for visible widgets
+"""
+    with self._lock:
+      key = id( target )
+      entry = self._pending.get( key )
+      if entry is None:
+        self._sequence += 1
+        self._pending[ key ] = \
+            [ target, reason, update_func, priority_func, self._sequence ]
+      else:
+        entry[ 1 ] |= reason
+        entry[ 2 ] = update_func
+        entry[ 3 ] = priority_func
+
+      if not self._posted:
+        self._posted = True
+        self.postFunc( self.Flush )
+    #end with
+  #end Schedule
+
+#end StateChangeScheduler
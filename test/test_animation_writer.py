@@ -0,0 +1,175 @@
+#!/usr/bin/env python
+# $Id$
+#------------------------------------------------------------------------
+#	NAME:		test_animation_writer.py			-
+#	HISTORY:							-
+#		2026-10-18						-
+#------------------------------------------------------------------------
+import os, shutil, struct, sys, tempfile, traceback, unittest, zipfile, zlib
+import numpy as np
+
+sys.path.insert( 0, os.path.join( os.path.dirname( __file__ ), os.pardir ) )
+
+from widget.animation_writer import *
+
+
+#------------------------------------------------------------------------
+#	CLASS:		TestAnimationWriter				-
+#------------------------------------------------------------------------
+class TestAnimationWriter( unittest.TestCase ):
+  """
+"""
+
+
+#		-- Object Methods
+#		--
+
+
+  #----------------------------------------------------------------------
+  #	METHOD:		TestAnimationWriter._CreateFrames()		-
+  #----------------------------------------------------------------------
+  def _CreateFrames( self, count, wd = 7, ht = 5 ):
+    rs = np.random.RandomState( 0 )
+    return  [
+        rs.randint( 0, 256, ( ht, wd, 4 ) ).astype( np.uint8 )
+        for i in xrange( count )
+        ]
+  #end _CreateFrames
+
+
+  #----------------------------------------------------------------------
+  #	METHOD:		TestAnimationWriter._ReadApng()			-
+  #----------------------------------------------------------------------
+  def _ReadApng( self, path ):
+    """
+    Returns:
+        tuple: ( frame count from acTL, list of ( ht, wd, 4 ) frames )
+"""
+    with open( path, 'rb' ) as fp:
+      content = fp.read()
+    self.assertEqual( content[ : 8 ], PNG_SIGNATURE )
+
+    frames = []
+    num_frames = wd = ht = None
+    sequence = 0
+    pos = 8
+    while pos < len( content ):
+      length, = struct.unpack( '>I', content[ pos : pos + 4 ] )
+      chunk_type = content[ pos + 4 : pos + 8 ]
+      data = content[ pos + 8 : pos + 8 + length ]
+      crc, = struct.unpack(
+          '>I', content[ pos + 8 + length : pos + 12 + length ]
+          )
+      self.assertEqual( crc, zlib.crc32( chunk_type + data ) & 0xffffffff )
+      pos += 12 + length
+
+      if chunk_type == b'IHDR':
+        wd, ht = struct.unpack( '>II', data[ : 8 ] )
+      elif chunk_type == b'acTL':
+        num_frames = struct.unpack( '>II', data )[ 0 ]
+      elif chunk_type in ( b'fcTL', b'fdAT' ):
+        self.assertEqual( struct.unpack( '>I', data[ : 4 ] )[ 0 ], sequence )
+        sequence += 1
+      if chunk_type in ( b'IDAT', b'fdAT' ):
+        raw = zlib.decompress(
+            data  if chunk_type == b'IDAT' else  data[ 4 : ]
+            )
+        rows = np.frombuffer( raw, dtype = np.uint8 ).reshape( ( ht, -1 ) )
+        frames.append( rows[ :, 1 : ].reshape( ( ht, wd, 4 ) ) )
+    #end while
+
+    return  num_frames, frames
+  #end _ReadApng
+
+
+  #----------------------------------------------------------------------
+  #	METHOD:		TestAnimationWriter.setUp()			-
+  #----------------------------------------------------------------------
+  def setUp( self ):
+    self.tempDir = tempfile.mkdtemp()
+  #end setUp
+
+
+  #----------------------------------------------------------------------
+  #	METHOD:		TestAnimationWriter.tearDown()			-
+  #----------------------------------------------------------------------
+  def tearDown( self ):
+    shutil.rmtree( self.tempDir, True )
+  #end tearDown
+
+
+  #----------------------------------------------------------------------
+  #	METHOD:		TestAnimationWriter.test_Apng()			-
+  #----------------------------------------------------------------------
+  def test_Apng( self ):
+    frames = self._CreateFrames( 5 )
+    for worker_count in ( 0, 2 ):
+      path = os.path.join( self.tempDir, 'anim%d.png' % worker_count )
+      writer = AnimationWriter.Create(
+          path, 0.1, len( frames ), worker_count = worker_count,
+          zip_path = path + '.images.zip'
+          )
+      self.assertIsInstance( writer, ApngWriter )
+      for frame in frames:
+        writer.AddFrame( frame )
+      writer.Close()
+
+      num_frames, read_frames = self._ReadApng( path )
+      self.assertEqual( num_frames, len( frames ) )
+      self.assertEqual( len( read_frames ), len( frames ) )
+      for expected, result in zip( frames, read_frames ):
+        self.assertTrue( np.array_equal( expected, result ) )
+
+      zfp = zipfile.ZipFile( path + '.images.zip' )
+      try:
+        self.assertEqual(
+            zfp.namelist(), [ '%04d.png' % i for i in xrange( 5 ) ]
+            )
+      finally:
+        zfp.close()
+    #end for worker_count
+  #end test_Apng
+
+
+  #----------------------------------------------------------------------
+  #	METHOD:		TestAnimationWriter.test_ApngPartial()		-
+  #----------------------------------------------------------------------
+  def test_ApngPartial( self ):
+    frames = self._CreateFrames( 3 )
+    frames[ 2 ] = frames[ 2 ][ : 4, : 6 ]
+
+    path = os.path.join( self.tempDir, 'partial.png' )
+    writer = AnimationWriter.Create( path, 0.5, 10 )
+    for frame in frames:
+      writer.AddFrame( frame )
+    writer.Close()
+
+    num_frames, read_frames = self._ReadApng( path )
+    self.assertEqual( num_frames, 3, 'acTL rewritten' )
+    self.assertTrue( np.array_equal( read_frames[ 2 ][ : 4, : 6 ], frames[ 2 ] ) )
+    self.assertEqual( read_frames[ 2 ][ 4 : ].sum(), 0, 'padded' )
+
+    path = os.path.join( self.tempDir, 'aborted.png' )
+    writer = AnimationWriter.Create( path, 0.5, 10, worker_count = 2 )
+    writer.AddFrame( frames[ 0 ] )
+    writer.Abort()
+    self.assertFalse( os.path.exists( path ) )
+
+    self.assertRaises(
+        ValueError, AnimationWriter.Create, 'anim.bmp', 0.1, 1
+        )
+  #end test_ApngPartial
+
+
+#		-- Static Methods
+#		--
+
+#end TestAnimationWriter
+
+
+#------------------------------------------------------------------------
+#	NAME:		main()						-
+#------------------------------------------------------------------------
+if __name__ == '__main__':
+  suite = unittest.TestLoader().loadTestsFromTestCase( TestAnimationWriter )
+  unittest.TextTestRunner( verbosity = 2 ).run( suite )
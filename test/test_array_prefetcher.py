@@ -0,0 +1,157 @@
+#!/usr/bin/env python
+# $Id$
+#------------------------------------------------------------------------
+#	NAME:		test_array_prefetcher.py			-
+#	HISTORY:							-
+#		2026-10-18						-
+#------------------------------------------------------------------------
+import os, sys, threading, time, traceback, unittest
+
+sys.path.insert( 0, os.path.join( os.path.dirname( __file__ ), os.pardir ) )
+
+from widget.array_prefetcher import *
+
+
+#------------------------------------------------------------------------
+#	CLASS:		TestArrayPrefetcher				-
+#------------------------------------------------------------------------
+class TestArrayPrefetcher( unittest.TestCase ):
+  """
+"""
+
+
+#		-- Object Methods
+#		--
+
+
+  #----------------------------------------------------------------------
+  #	METHOD:		TestArrayPrefetcher._Acquire()			-
+  #----------------------------------------------------------------------
+  def _Acquire( self, name, time_value ):
+    """Stands in for ``DataModelMgr.AcquireStateArray()``, blocking while
+``gate`` is clear and returning None for negative time values.
+"""
+    self.gate.wait()
+    with self.lock:
+      self.acquired.append( ( name, time_value ) )
+      self.threads.add( threading.current_thread().name )
+    return  None  if time_value < 0 else  [ name, time_value ]
+  #end _Acquire
+
+
+  #----------------------------------------------------------------------
+  #	METHOD:		TestArrayPrefetcher._Release()			-
+  #----------------------------------------------------------------------
+  def _Release( self, array ):
+    with self.lock:
+      self.released.append( tuple( array ) )
+  #end _Release
+
+
+  #----------------------------------------------------------------------
+  #	METHOD:		TestArrayPrefetcher.setUp()			-
+  #----------------------------------------------------------------------
+  def setUp( self ):
+    self.acquired = []
+    self.gate = threading.Event()
+    self.gate.set()
+    self.lock = threading.Lock()
+    self.prefetcher = ArrayPrefetcher( self._Acquire, self._Release )
+    self.released = []
+    self.threads = set()
+  #end setUp
+
+
+  #----------------------------------------------------------------------
+  #	METHOD:		TestArrayPrefetcher.tearDown()			-
+  #----------------------------------------------------------------------
+  def tearDown( self ):
+    self.gate.set()
+    self.prefetcher.Clear()
+    self.prefetcher.Wait( 5.0 )
+  #end tearDown
+
+
+  #----------------------------------------------------------------------
+  #	METHOD:		TestArrayPrefetcher.test_Cancel()		-
+  #----------------------------------------------------------------------
+  def test_Cancel( self ):
+    """A read in progress when no longer wanted is released, and queued
+reads are dropped.
+"""
+    self.gate.clear()
+    self.prefetcher.Prefetch([ ( 'a', 1.0 ), ( 'a', 2.0 ), ( 'a', 3.0 ) ])
+    time.sleep( 0.05 )
+    self.prefetcher.Prefetch([ ( 'a', 5.0 ) ])
+    self.gate.set()
+    self.assertTrue( self.prefetcher.Wait( 5.0 ) )
+
+    self.assertEqual( self.acquired, [ ( 'a', 1.0 ), ( 'a', 5.0 ) ] )
+    self.assertEqual( self.released, [ ( 'a', 1.0 ) ], 'unwanted on arrival' )
+    self.assertEqual( self.prefetcher.held.keys(), [ ( 'a', 5.0 ) ] )
+
+    self.prefetcher.Clear()
+    self.assertEqual( self.prefetcher.held, {} )
+    self.assertEqual( self.released, [ ( 'a', 1.0 ), ( 'a', 5.0 ) ] )
+  #end test_Cancel
+
+
+  #----------------------------------------------------------------------
+  #	METHOD:		TestArrayPrefetcher.test_GetNeighbors()		-
+  #----------------------------------------------------------------------
+  def test_GetNeighbors( self ):
+    values = [ 0.0, 1.5, 3.0, 4.5, 6.0 ]
+    self.assertEqual(
+        ArrayPrefetcher.GetNeighbors( values, 3.0, 1 ), [ 4.5, 1.5 ]
+        )
+    self.assertEqual(
+        ArrayPrefetcher.GetNeighbors( values, 3.1, 2 ),
+        [ 4.5, 1.5, 6.0, 0.0 ], 'nearest matched'
+        )
+    self.assertEqual(
+        ArrayPrefetcher.GetNeighbors( values, 0.0, 2 ), [ 1.5, 3.0 ]
+        )
+    self.assertEqual( ArrayPrefetcher.GetNeighbors( values, 6.0, 1 ), [ 4.5 ] )
+    self.assertEqual( ArrayPrefetcher.GetNeighbors( values, 3.0, 0 ), [] )
+    self.assertEqual( ArrayPrefetcher.GetNeighbors( [], 3.0, 1 ), [] )
+  #end test_GetNeighbors
+
+
+  #----------------------------------------------------------------------
+  #	METHOD:		TestArrayPrefetcher.test_Prefetch()		-
+  #----------------------------------------------------------------------
+  def test_Prefetch( self ):
+    keys = [ ( 'a', 2.0 ), ( 'a', 1.0 ), ( 'a', -1.0 ) ]
+    self.prefetcher.Prefetch( keys )
+    self.assertTrue( self.prefetcher.Wait( 5.0 ) )
+
+    self.assertEqual( self.acquired, keys, 'nearest first' )
+    self.assertEqual( self.threads, set([ 'ArrayPrefetcher' ]) )
+    self.assertTrue( self.prefetcher.IsHeld( ( 'a', 2.0 ) ) )
+    self.assertFalse( self.prefetcher.IsHeld( ( 'a', -1.0 ) ), 'not found' )
+    self.assertEqual( self.released, [] )
+
+#		-- Held arrays are not read again, unwanted are released
+    del self.acquired[ : ]
+    self.prefetcher.Prefetch([ ( 'a', 1.0 ), ( 'a', 0.0 ) ])
+    self.assertTrue( self.prefetcher.Wait( 5.0 ) )
+    self.assertEqual( self.acquired, [ ( 'a', 0.0 ) ] )
+    self.assertEqual( self.released, [ ( 'a', 2.0 ) ] )
+    self.assertEqual(
+        sorted( self.prefetcher.held.keys() ), [ ( 'a', 0.0 ), ( 'a', 1.0 ) ]
+        )
+  #end test_Prefetch
+
+
+#		-- Static Methods
+#		--
+
+#end TestArrayPrefetcher
+
+
+#------------------------------------------------------------------------
+#	NAME:		main()						-
+#------------------------------------------------------------------------
+if __name__ == '__main__':
+  suite = unittest.TestLoader().loadTestsFromTestCase( TestArrayPrefetcher )
+  unittest.TextTestRunner( verbosity = 2 ).run( suite )
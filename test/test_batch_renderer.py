@@ -0,0 +1,477 @@
+#!/usr/bin/env python
+# $Id$
+#------------------------------------------------------------------------
+#	NAME:		test_batch_renderer.py				-
+#	HISTORY:							-
+#		2026-10-18						-
+#------------------------------------------------------------------------
+import os, shutil, struct, sys, tempfile, traceback, unittest, zlib
+import numpy as np
+
+sys.path.insert( 0, os.path.join( os.path.dirname( __file__ ), os.pardir ) )
+
+from data.config import Config
+from widget.animation_writer import PNG_SIGNATURE
+from widget.batch_renderer import *
+from vera_file import CreateVeraFile
+
+
+#------------------------------------------------------------------------
+#	CLASS:		TestBatchRenderer				-
+#------------------------------------------------------------------------
+class TestBatchRenderer( unittest.TestCase ):
+  """Images rendered from a synthetic file, checked pixel by pixel against
+the dataset values mapped to colors.
+"""
+
+
+#		-- Object Methods
+#		--
+
+
+  #----------------------------------------------------------------------
+  #	METHOD:		TestBatchRenderer._AssertColor()		-
+  #----------------------------------------------------------------------
+  def _AssertColor( self, image, y, x, mapper, value, factor, msg ):
+    expected = \
+        BatchRenderer.BACKGROUND_COLOR  if factor == 0.0 else \
+        mapper.to_rgba( value, bytes = True )
+    self.assertEqual(
+        tuple( image[ y, x ] ), tuple( expected ),
+        '%s at ( %d, %d )' % ( msg, x, y )
+        )
+  #end _AssertColor
+
+
+  #----------------------------------------------------------------------
+  #	METHOD:		TestBatchRenderer._GetDataSet()			-
+  #----------------------------------------------------------------------
+  def _GetDataSet( self, renderer, qds_name, state_ndx ):
+    dm = renderer.dmgr.GetDataModel( qds_name )
+    return  np.array( dm.GetStateDataSet( state_ndx, qds_name.displayName ) )
+  #end _GetDataSet
+
+
+  #----------------------------------------------------------------------
+  #	METHOD:		TestBatchRenderer._Open()			-
+  #----------------------------------------------------------------------
+  def _Open( self ):
+    """
+@return			( renderer, qds_name, factors )
+"""
+    renderer = BatchRenderer.Open( [ self.path ] )
+    qds_name = DataSetName(
+        renderer.dmgr.GetFirstDataModel().GetName(), 'pin_powers'
+        )
+    return  renderer, qds_name, renderer.dmgr.GetFactors( qds_name )
+  #end _Open
+
+
+  #----------------------------------------------------------------------
+  #	METHOD:		TestBatchRenderer._ReadPng()			-
+  #----------------------------------------------------------------------
+  def _ReadPng( self, path ):
+    """
+@return			( (ht, wd, 4) image, list of tEXt ( keyword, value )
+			pairs )
+"""
+    with open( path, 'rb' ) as fp:
+      content = fp.read()
+    self.assertEqual( content[ : 8 ], PNG_SIGNATURE )
+
+    chunks = []
+    pos = 8
+    while pos < len( content ):
+      length, = struct.unpack( '>I', content[ pos : pos + 4 ] )
+      chunk_type = content[ pos + 4 : pos + 8 ]
+      data = content[ pos + 8 : pos + 8 + length ]
+      crc, = struct.unpack(
+          '>I', content[ pos + 8 + length : pos + 12 + length ]
+          )
+      self.assertEqual( crc, zlib.crc32( chunk_type + data ) & 0xffffffff )
+      chunks.append( ( chunk_type, data ) )
+      pos += 12 + length
+
+    self.assertEqual( chunks[ 0 ][ 0 ], b'IHDR' )
+    self.assertEqual( chunks[ -1 ][ 0 ], b'IEND' )
+    wd, ht, depth, color_type = \
+        struct.unpack( '>IIBB', chunks[ 0 ][ 1 ][ : 10 ] )
+    self.assertEqual( ( depth, color_type ), ( 8, 6 ) )
+
+    rows = np.frombuffer(
+        zlib.decompress(
+            b''.join( d for t, d in chunks if t == b'IDAT' )
+            ),
+        dtype = np.uint8
+        ).reshape( ht, wd * 4 + 1 )
+    self.assertTrue( np.all( rows[ :, 0 ] == 0 ), 'no filtering' )
+    text = [
+        tuple( d.split( b'\0', 1 ) ) for t, d in chunks if t == b'tEXt'
+        ]
+    return  rows[ :, 1 : ].reshape( ht, wd, 4 ), text
+  #end _ReadPng
+
+
+  #----------------------------------------------------------------------
+  #	METHOD:		TestBatchRenderer.setUp()			-
+  #----------------------------------------------------------------------
+  def setUp( self ):
+    self.tempDir = tempfile.mkdtemp()
+    Config.SetCacheDir( os.path.join( self.tempDir, 'cache' ) )
+    self.path = CreateVeraFile( os.path.join( self.tempDir, 'vera.h5' ) )
+  #end setUp
+
+
+  #----------------------------------------------------------------------
+  #	METHOD:		TestBatchRenderer.tearDown()			-
+  #----------------------------------------------------------------------
+  def tearDown( self ):
+    Config.SetCacheDir( None )
+    Config.SetWorkerCount( 0 )
+    shutil.rmtree( self.tempDir, True )
+  #end tearDown
+
+
+  #----------------------------------------------------------------------
+  #	METHOD:		TestBatchRenderer.test_CreateSpec()		-
+  #----------------------------------------------------------------------
+  def test_CreateSpec( self ):
+    renderer, qds_name, factors = self._Open()
+    try:
+      dmgr = renderer.dmgr
+      state_props = dict(
+          assemblyAddr = ( 2, 0, 1 ), axialValue = { 'cm': 150.0, 'pin': 1 },
+          curDataSet = qds_name.name,
+          timeValue = dmgr.GetTimeIndexValue( 4, qds_name )
+          )
+      self.assertIsNone( BatchRenderer.CreateSpec(
+          { 'classpath': 'widget.time_plots.TimePlots' }, state_props, dmgr
+          ) )
+      self.assertIsNone( BatchRenderer.CreateSpec(
+          { 'classpath': 'widget.core_view.Core2DView' }, {}, dmgr
+          ) )
+
+      spec = BatchRenderer.CreateSpec(
+          { 'classpath': 'widget.core_view.Core2DView', 'colormap': 'jet',
+              'dataRange': [ 0.0, float( 'nan' ) ], 'scaleType': 'log' },
+          state_props, dmgr
+          )
+      self.assertEqual( spec, dict(
+          widget = 'core', dataset = qds_name.name, assembly = 2, axial = 1,
+          state = 4, colormap = 'jet', data_range = spec[ 'data_range' ],
+          scale_type = 'log'
+          ) )
+
+      spec = BatchRenderer.CreateSpec(
+          { 'classpath': 'widget.core_axial_view.CoreYZView',
+              'axialValue': { 'cm': -1.0, 'pin': -1 }, 'subAddr': [ 1, 2 ],
+              'timeValue': -1.0 },
+          state_props, dmgr
+          )
+      self.assertEqual( spec, dict(
+          widget = 'axial', dataset = qds_name.name, assembly = 2,
+          mode = 'yz', sub_addr = ( 1, 2 )
+          ) )
+      self.assertEqual( BatchRenderer.CreateSpec(
+          { 'classpath': 'widget.core_view.Core2DView', 'mode': 'assy' },
+          state_props, dmgr
+          )[ 'widget' ], 'assembly' )
+    finally:
+      renderer.Close()
+  #end test_CreateSpec
+
+
+  #----------------------------------------------------------------------
+  #	METHOD:		TestBatchRenderer.test_RenderAssembly()		-
+  #----------------------------------------------------------------------
+  def test_RenderAssembly( self ):
+    renderer, qds_name, factors = self._Open()
+    try:
+      dset = self._GetDataSet( renderer, qds_name, 3 )
+      mapper = renderer._CreateMapper( qds_name, 3 )[ 0 ]
+      image, text = renderer.Render(
+          'assembly', qds_name, 3, assembly = 1, axial = 2, pin_size = 10,
+          show_legend = False
+          )
+      npin = dset.shape[ 0 ]
+      self.assertEqual( image.shape, ( npin * 10 + 2, npin * 10 + 2, 4 ) )
+      self.assertIn( ( 'Title', 'pin_powers: Assy (A-1), Axial 250.000' ),
+          text )
+
+      for row in xrange( npin ):
+        for col in xrange( npin ):
+          self._AssertColor(
+              image, 1 + row * 10 + 5, 1 + col * 10 + 5,
+              mapper, dset[ row, col, 2, 1 ], factors[ row, col, 2, 1 ],
+              'pin ( %d, %d )' % ( col, row )
+              )
+#			-- Outside the pin circle
+          self.assertEqual(
+              tuple( image[ 1 + row * 10, 1 + col * 10 ] ),
+              BatchRenderer.BACKGROUND_COLOR
+              )
+    finally:
+      renderer.Close()
+  #end test_RenderAssembly
+
+
+  #----------------------------------------------------------------------
+  #	METHOD:		TestBatchRenderer.test_RenderAxial()		-
+  #----------------------------------------------------------------------
+  def test_RenderAxial( self ):
+    """Levels top down, 100 cm each over a 4.3 cm pin pitch.
+"""
+    renderer, qds_name, factors = self._Open()
+    try:
+      dset = self._GetDataSet( renderer, qds_name, 1 )
+      mapper = renderer._CreateMapper( qds_name, 1 )[ 0 ]
+      image = renderer.Render(
+          'axial', qds_name, 1, assembly = 2, sub_addr = ( 1, 3 ),
+          show_legend = False
+          )[ 0 ]
+      npin, nax = dset.shape[ 0 ], dset.shape[ 2 ]
+      level_ht = int( 4.0 / ( 21.5 / npin ) * 100.0 )
+      assy_wd = npin * 4 + 1
+      self.assertEqual(
+          image.shape, ( nax * level_ht + 2, 2 * assy_wd + 1, 4 )
+          )
+
+#		-- Row 2 of the core holds assemblies 3 and 4
+      for i, assy_ndx in enumerate( ( 2, 3 ) ):
+        for level in xrange( nax ):
+          y = 1 + ( nax - 1 - level ) * level_ht + ( level_ht >> 1 )
+          for col in xrange( npin ):
+            self._AssertColor(
+                image, y, 1 + i * assy_wd + col * 4 + 2,
+                mapper, dset[ 3, col, level, assy_ndx ],
+                factors[ 3, col, level, assy_ndx ],
+                'assy %d level %d col %d' % ( assy_ndx, level, col )
+                )
+        self.assertEqual(
+            tuple( image[ 1, i * assy_wd ] ), BatchRenderer.OUTLINE_COLOR
+            )
+    finally:
+      renderer.Close()
+  #end test_RenderAxial
+
+
+  #----------------------------------------------------------------------
+  #	METHOD:		TestBatchRenderer.test_RenderCore()		-
+  #----------------------------------------------------------------------
+  def test_RenderCore( self ):
+    renderer, qds_name, factors = self._Open()
+    try:
+      dset = self._GetDataSet( renderer, qds_name, 2 )
+      core = renderer.dmgr.GetCore()
+      npin = core.npinx
+      assy_advance = npin * 4 + BatchRenderer.ASSEMBLY_GAP
+
+      for weights_mode in ( 'on', 'off' ):
+        msg = 'weights ' + weights_mode
+        cur_factors = factors  if weights_mode == 'on' else  None
+        mapper, ds_range = renderer._CreateMapper(
+            qds_name, 2, weights_mode = weights_mode
+            )
+        image, text = renderer.Render(
+            'core', qds_name, 2, axial = 1, weights_mode = weights_mode
+            )
+        im_wd = 2 * assy_advance + 1
+        self.assertEqual( image.shape[ 0 ], 2 * assy_advance + 1, msg )
+        self.assertGreater( image.shape[ 1 ], im_wd, 'legend' )
+        self.assertEqual(
+            tuple( image[ 0, 0 ] ), BatchRenderer.OUTLINE_COLOR, msg
+            )
+
+        for assy_row in xrange( 2 ):
+          for assy_col in xrange( 2 ):
+            assy_ndx = core.coreMap[ assy_row, assy_col ] - 1
+            for row in xrange( npin ):
+              for col in xrange( npin ):
+                self._AssertColor(
+                    image,
+                    1 + assy_row * assy_advance + row * 4 + 2,
+                    1 + assy_col * assy_advance + col * 4 + 2,
+                    mapper, dset[ row, col, 1, assy_ndx ],
+                    1.0  if cur_factors is None else
+                    cur_factors[ row, col, 1, assy_ndx ],
+                    '%s assy %d pin ( %d, %d )' %
+                        ( msg, assy_ndx, col, row )
+                    )
+        #end for assy_row
+
+#			-- Legend from the maximum down to the minimum
+        legend_x = im_wd + ( BatchRenderer.LEGEND_WIDTH >> 1 ) + 1
+        self.assertEqual(
+            tuple( image[ 2, legend_x ] ),
+            tuple( mapper.to_rgba( ds_range[ 1 ], bytes = True ) ), msg
+            )
+        self.assertEqual(
+            tuple( image[ image.shape[ 0 ] - 3, legend_x ] ),
+            tuple( mapper.to_rgba( ds_range[ 0 ], bytes = True ) ), msg
+            )
+        self.assertIn( ( 'Range', '%g %g' % ds_range ), text )
+      #end for weights_mode
+    finally:
+      renderer.Close()
+  #end test_RenderCore
+
+
+  #----------------------------------------------------------------------
+  #	METHOD:		TestBatchRenderer.test_RenderImages()		-
+  #----------------------------------------------------------------------
+  def test_RenderImages( self ):
+    """Images in job order, in this process and on a pool, and a pool
+stopped by closing the generator.
+"""
+    jobs = [
+        dict( widget = 'core', dataset = 'pin_powers', state = i % 6,
+            axial = i % 4 )
+        for i in xrange( 12 )
+        ]
+    jobs[ 5 ][ 'dataset' ] = 'no_such_dataset'
+
+    renderer = BatchRenderer.Open( [ self.path ] )
+    try:
+      expected = [
+          renderer.Render( 'core', 'pin_powers', job[ 'state' ],
+              axial = job[ 'axial' ] )[ 0 ]
+          for job in jobs
+          ]
+    finally:
+      renderer.Close()
+
+    for worker_count in ( 1, 3 ):
+      results = list( BatchRenderer.RenderImages(
+          [ self.path ], jobs, worker_count = worker_count
+          ) )
+      self.assertEqual( len( results ), len( jobs ) )
+      for i, ( image, error ) in enumerate( results ):
+        if i == 5:
+          self.assertIsNone( image )
+          self.assertIn( 'no_such_dataset', error )
+        else:
+          self.assertIsNone( error )
+          self.assertTrue( np.array_equal( image, expected[ i ] ),
+              '%d workers, job %d' % ( worker_count, i ) )
+      #end for i
+
+      images = BatchRenderer.RenderImages(
+          [ self.path ], jobs, worker_count = worker_count
+          )
+      self.assertTrue( np.array_equal( next( images )[ 0 ], expected[ 0 ] ) )
+      images.close()
+      with self.assertRaises( StopIteration ):
+        next( images )
+    #end for worker_count
+  #end test_RenderImages
+
+
+  #----------------------------------------------------------------------
+  #	METHOD:		TestBatchRenderer.test_Run()			-
+  #----------------------------------------------------------------------
+  def test_Run( self ):
+    """PNG files written in this process and on a pool match the rendered
+images, with the text as tEXt chunks.
+"""
+    jobs_by_count = {}
+    for worker_count in ( 1, 2 ):
+      jobs = []
+      for widget_type in BatchRenderer.WIDGET_TYPES:
+        for state_ndx in ( 0, 5 ):
+          jobs.append( dict(
+              widget = widget_type, dataset = 'pin_powers',
+              state = state_ndx, assembly = 3,
+              path = os.path.join(
+                  self.tempDir,
+                  '%s_%d_%d.png' % ( widget_type, state_ndx, worker_count )
+                  )
+              ) )
+      progress = []
+      results = BatchRenderer.Run(
+          [ self.path ], jobs, worker_count = worker_count,
+          callback = lambda *args: progress.append( args )
+          )
+      self.assertEqual(
+          sorted( results ), sorted( ( job[ 'path' ], None ) for job in jobs )
+          )
+      self.assertEqual(
+          [ p[ 2 : ] for p in progress ],
+          [ ( i + 1, len( jobs ) ) for i in xrange( len( jobs ) ) ]
+          )
+      jobs_by_count[ worker_count ] = jobs
+    #end for worker_count
+
+    renderer = BatchRenderer.Open( [ self.path ] )
+    try:
+      for worker_count, jobs in sorted( jobs_by_count.items() ):
+        for job in jobs:
+          kwargs = dict( job )
+          del kwargs[ 'path' ]
+          expected_image, expected_text = renderer.Render(
+              kwargs.pop( 'widget' ), kwargs.pop( 'dataset' ),
+              kwargs.pop( 'state' ), **kwargs
+              )
+          image, text = self._ReadPng( job[ 'path' ] )
+          self.assertTrue(
+              np.array_equal( image, expected_image ), job[ 'path' ]
+              )
+          self.assertEqual( text, expected_text, job[ 'path' ] )
+    finally:
+      renderer.Close()
+  #end test_Run
+
+
+  #----------------------------------------------------------------------
+  #	METHOD:		TestBatchRenderer.test_RunErrors()		-
+  #----------------------------------------------------------------------
+  def test_RunErrors( self ):
+    """File errors are raised before a pool is started, and job errors
+are reported by job.
+"""
+    jobs = [
+        dict( widget = 'core', dataset = 'pin_powers', state = i,
+            path = os.path.join( self.tempDir, 'core_%d.png' % i ) )
+        for i in xrange( 3 )
+        ]
+    bad_path = os.path.join( self.tempDir, 'bad.h5' )
+    with open( bad_path, 'w' ) as fp:
+      fp.write( 'not hdf5' )
+
+    for worker_count in ( 1, 2 ):
+      with self.assertRaises( IOError ):
+        BatchRenderer.Run(
+            [ self.path, os.path.join( self.tempDir, 'missing.h5' ) ],
+            jobs, worker_count = worker_count
+            )
+      with self.assertRaises( Exception ):
+        BatchRenderer.Run(
+            [ self.path, bad_path ], jobs, worker_count = worker_count
+            )
+
+      bad_job = dict(
+          jobs[ 0 ], dataset = 'no_such_dataset',
+          path = os.path.join( self.tempDir, 'bad.png' )
+          )
+      results = dict( BatchRenderer.Run(
+          [ self.path ], jobs + [ bad_job ], worker_count = worker_count
+          ) )
+      self.assertEqual( len( results ), 4 )
+      self.assertIn( 'no_such_dataset', results[ bad_job[ 'path' ] ] )
+      for job in jobs:
+        self.assertIsNone( results[ job[ 'path' ] ] )
+    #end for worker_count
+  #end test_RunErrors
+
+
+#		-- Static Methods
+#		--
+
+#end TestBatchRenderer
+
+
+#------------------------------------------------------------------------
+#	NAME:		main()						-
+#------------------------------------------------------------------------
+if __name__ == '__main__':
+  suite = unittest.TestLoader().loadTestsFromTestCase( TestBatchRenderer )
+  unittest.TextTestRunner( verbosity = 2 ).run( suite )
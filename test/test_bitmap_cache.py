@@ -0,0 +1,171 @@
+#!/usr/bin/env python
+# $Id$
+#------------------------------------------------------------------------
+#	NAME:		test_bitmap_cache.py				-
+#	HISTORY:							-
+#		2026-10-18						-
+#------------------------------------------------------------------------
+import gc, os, sys, traceback, unittest
+
+sys.path.insert( 0, os.path.join( os.path.dirname( __file__ ), os.pardir ) )
+
+from widget.bitmap_cache import *
+
+
+#------------------------------------------------------------------------
+#	CLASS:		FakeBitmap					-
+#------------------------------------------------------------------------
+class FakeBitmap( object ):
+  """Stands in for wx.Bitmap.
+"""
+
+  def __init__( self, wd, ht ):
+    self.destroyed = False
+    self.ht = ht
+    self.wd = wd
+
+  def Destroy( self ):
+    self.destroyed = True
+
+  def GetHeight( self ):
+    return  self.ht
+
+  def GetWidth( self ):
+    return  self.wd
+#end FakeBitmap
+
+
+#------------------------------------------------------------------------
+#	CLASS:		FakeOwner					-
+#------------------------------------------------------------------------
+class FakeOwner( object ):
+  """Stands in for a RasterWidget, with the state index as the tuple and
+distance from ``current``.
+"""
+
+  def __init__( self, current = 0 ):
+    self.current = current
+
+  def GetBitmapDistance( self, tpl ):
+    return  abs( tpl[ 0 ] - self.current )
+#end FakeOwner
+
+
+#------------------------------------------------------------------------
+#	CLASS:		TestBitmapCache					-
+#------------------------------------------------------------------------
+class TestBitmapCache( unittest.TestCase ):
+  """
+"""
+
+
+#		-- Object Methods
+#		--
+
+
+  #----------------------------------------------------------------------
+  #	METHOD:		TestBitmapCache.test_Accounting()		-
+  #----------------------------------------------------------------------
+  def test_Accounting( self ):
+    cache = BitmapCache( 10000 )
+    owner = FakeOwner()
+    bmaps = [ FakeBitmap( 10, 10 ) for i in xrange( 3 ) ]
+    for i, bmap in enumerate( bmaps ):
+      cache.Put( owner, ( i, ), bmap )
+    self.assertEqual( cache.bytes, 1200 )
+    self.assertTrue( cache.Has( owner, ( 1, ) ) )
+
+    self.assertIs( cache.Get( owner, ( 1, ) ), bmaps[ 1 ] )
+    self.assertIsNone( cache.Get( owner, ( 5, ) ) )
+    stats = cache.GetStats()
+    self.assertEqual( ( stats[ 'hits' ], stats[ 'misses' ] ), ( 1, 1 ) )
+    self.assertEqual( stats[ 'count' ], 3 )
+
+#		-- Replace
+    bigger = FakeBitmap( 20, 10 )
+    cache.Put( owner, ( 1, ), bigger )
+    self.assertEqual( cache.bytes, 1600 )
+    self.assertTrue( bmaps[ 1 ].destroyed, 'replaced bitmap destroyed' )
+    cache.Put( owner, ( 1, ), bigger )
+    self.assertEqual( cache.bytes, 1600, 'same bitmap counted once' )
+    self.assertFalse( bigger.destroyed )
+
+#		-- Remove does not destroy, Clear does
+    cache.Remove( owner, ( 0, ) )
+    self.assertEqual( cache.bytes, 1200 )
+    self.assertFalse( bmaps[ 0 ].destroyed )
+    cache.Clear( owner, ( 2, ) )
+    self.assertEqual( cache.bytes, 400, 'kept tuple' )
+    self.assertTrue( bigger.destroyed )
+    cache.Clear( owner )
+    self.assertEqual( cache.bytes, 0 )
+    self.assertTrue( bmaps[ 2 ].destroyed )
+    self.assertEqual( cache.GetStats()[ 'count' ], 0 )
+  #end test_Accounting
+
+
+  #----------------------------------------------------------------------
+  #	METHOD:		TestBitmapCache.test_Evict()			-
+  #----------------------------------------------------------------------
+  def test_Evict( self ):
+    cache = BitmapCache( 1000 )
+    owner = FakeOwner( 2 )
+    bmaps = {}
+    for i in ( 2, 0, 3, 1 ):
+      bmaps[ i ] = FakeBitmap( 10, 10 )
+      cache.Put( owner, ( i, ), bmaps[ i ] )
+
+#		-- Farthest first, then least recently used
+    self.assertEqual( cache.GetStats()[ 'count' ], 2 )
+    self.assertTrue( cache.Has( owner, ( 2, ) ), 'current kept' )
+    self.assertTrue( cache.Has( owner, ( 1, ) ), 'just put' )
+    self.assertTrue( bmaps[ 0 ].destroyed, 'farthest' )
+    self.assertTrue( bmaps[ 3 ].destroyed, 'older of distance 1' )
+    self.assertEqual( cache.GetStats()[ 'evictions' ], 2 )
+    self.assertEqual( cache.bytes, 800 )
+
+#		-- Current tuple is never evicted, even over budget
+    cache.SetBudget( 100 )
+    self.assertEqual( cache.GetStats()[ 'count' ], 1 )
+    self.assertTrue( cache.Has( owner, ( 2, ) ) )
+    self.assertEqual( cache.bytes, 400 )
+
+#		-- Entries of a collected owner go first
+    cache.SetBudget( 1000 )
+    other = FakeOwner( 0 )
+    cache.Put( other, ( 0, ), FakeBitmap( 10, 10 ) )
+    del other
+    gc.collect()
+    cache.Put( owner, ( 3, ), FakeBitmap( 10, 10 ) )
+    self.assertEqual( cache.bytes, 800 )
+    self.assertEqual(
+        sorted( k[ 1 ][ 0 ] for k in cache.entries ), [ 2, 3 ]
+        )
+  #end test_Evict
+
+
+  #----------------------------------------------------------------------
+  #	METHOD:		TestBitmapCache.test_SessionCache()		-
+  #----------------------------------------------------------------------
+  def test_SessionCache( self ):
+    state = FakeOwner()
+    cache = BitmapCache.GetSessionCache( state )
+    self.assertIs( BitmapCache.GetSessionCache( state ), cache, 'shared' )
+    self.assertIsNot( BitmapCache.GetSessionCache( FakeOwner() ), cache )
+    self.assertIsNot( BitmapCache.GetSessionCache( None ), cache, 'private' )
+    self.assertEqual( cache.budget, BitmapCache.GetDefaultBudget() )
+  #end test_SessionCache
+
+
+#		-- Static Methods
+#		--
+
+#end TestBitmapCache
+
+
+#------------------------------------------------------------------------
+#	NAME:		main()						-
+#------------------------------------------------------------------------
+if __name__ == '__main__':
+  suite = unittest.TestLoader().loadTestsFromTestCase( TestBitmapCache )
+  unittest.TextTestRunner( verbosity = 2 ).run( suite )
@@ -0,0 +1,138 @@
+#!/usr/bin/env python
+# $Id$
+#------------------------------------------------------------------------
+#	NAME:		test_datamodel_mgr.py				-
+#	HISTORY:							-
+#		2026-10-18						-
+#------------------------------------------------------------------------
+import os, shutil, sys, tempfile, threading, traceback, unittest
+
+sys.path.insert( 0, os.path.join( os.path.dirname( __file__ ), os.pardir ) )
+
+from data.config import Config
+from data.datamodel import DataModel
+from data.datamodel_mgr import DataModelMgr
+from vera_file import CreateVeraFile
+
+
+#------------------------------------------------------------------------
+#	CLASS:		TestDataModelMgr				-
+#------------------------------------------------------------------------
+class TestDataModelMgr( unittest.TestCase ):
+  """
+"""
+
+
+#		-- Object Methods
+#		--
+
+
+  #----------------------------------------------------------------------
+  #	METHOD:		TestDataModelMgr._ReadModel()			-
+  #----------------------------------------------------------------------
+  def _ReadModel( self, dmgr, h5f_param ):
+    """Wraps ``DataModelMgr._ReadModel()``, recording each model read.
+"""
+    dm = self.readModel( dmgr, h5f_param )
+    with self.lock:
+      self.models.append( dm )
+    return  dm
+  #end _ReadModel
+
+
+  #----------------------------------------------------------------------
+  #	METHOD:		TestDataModelMgr.setUp()			-
+  #----------------------------------------------------------------------
+  def setUp( self ):
+    self.tempDir = tempfile.mkdtemp()
+    Config.SetCacheDir( os.path.join( self.tempDir, 'cache' ) )
+    self.paths = [
+        CreateVeraFile( os.path.join( self.tempDir, 'vera%d.h5' % i ),
+            seed = i )
+        for i in xrange( 12 )
+        ]
+
+    self.lock = threading.Lock()
+    self.models = []
+    self.readModel = DataModelMgr._ReadModel
+    DataModelMgr._ReadModel = \
+        lambda dmgr, h5f_param: TestDataModelMgr._ReadModel(
+            self, dmgr, h5f_param
+            )
+  #end setUp
+
+
+  #----------------------------------------------------------------------
+  #	METHOD:		TestDataModelMgr.tearDown()			-
+  #----------------------------------------------------------------------
+  def tearDown( self ):
+    DataModelMgr._ReadModel = self.readModel
+    Config.SetCacheDir( None )
+    Config.SetWorkerCount( 0 )
+    shutil.rmtree( self.tempDir, True )
+  #end tearDown
+
+
+  #----------------------------------------------------------------------
+  #	METHOD:		TestDataModelMgr.test_OpenModels()		-
+  #----------------------------------------------------------------------
+  def test_OpenModels( self ):
+    dmgr = DataModelMgr()
+    try:
+      results = dmgr.OpenModels( self.paths[ : 3 ] )
+      self.assertTrue( all( isinstance( r, DataModel ) for r in results ) )
+      self.assertEqual(
+          dmgr.GetDataModelNames(), [ r.GetName() for r in results ],
+          'added in order'
+          )
+    finally:
+      dmgr.Close()
+  #end test_OpenModels
+
+
+  #----------------------------------------------------------------------
+  #	METHOD:		TestDataModelMgr.test_OpenModelsCancel()	-
+  #----------------------------------------------------------------------
+  def test_OpenModelsCancel( self ):
+    """Models read ahead of a cancel are closed, not leaked.
+"""
+    Config.SetWorkerCount( 4 )
+    cancel_event = threading.Event()
+
+    def callback( h5f_param, dm, cur_step, step_count ):
+      if cur_step == 1:
+        cancel_event.set()
+
+    dmgr = DataModelMgr()
+    try:
+      results = dmgr.OpenModels( self.paths, callback, cancel_event )
+      added = [ r for r in results if isinstance( r, DataModel ) ]
+      self.assertEqual( len( added ), 2 )
+      self.assertTrue( all(
+          isinstance( r, IOError ) for r in results[ len( added ) : ]
+          ) )
+      self.assertEqual( dmgr.GetDataModelCount(), 2 )
+      self.assertTrue( len( self.models ) > 2, 'read ahead' )
+
+      for dm in self.models:
+        if dm not in added:
+          self.assertIsNone( getattr( dm, 'h5File', None ), 'closed' )
+      for dm in added:
+        self.assertIsNotNone( dm.h5File, 'open' )
+    finally:
+      dmgr.Close()
+  #end test_OpenModelsCancel
+
+
+#		-- Static Methods
+#		--
+
+#end TestDataModelMgr
+
+
+#------------------------------------------------------------------------
+#	NAME:		main()						-
+#------------------------------------------------------------------------
+if __name__ == '__main__':
+  suite = unittest.TestLoader().loadTestsFromTestCase( TestDataModelMgr )
+  unittest.TextTestRunner( verbosity = 2 ).run( suite )
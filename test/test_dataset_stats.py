@@ -0,0 +1,110 @@
+#!/usr/bin/env python
+# $Id$
+#------------------------------------------------------------------------
+#	NAME:		test_dataset_stats.py				-
+#	HISTORY:							-
+#		2026-10-18						-
+#------------------------------------------------------------------------
+import os, sys, traceback, unittest
+import numpy as np
+
+sys.path.insert( 0, os.path.join( os.path.dirname( __file__ ), os.pardir ) )
+
+from data.dataset_stats import *
+from data.range_expr import *
+
+
+#------------------------------------------------------------------------
+#	CLASS:		TestDataSetStats				-
+#------------------------------------------------------------------------
+class TestDataSetStats( unittest.TestCase ):
+  """
+"""
+
+
+#		-- Object Methods
+#		--
+
+
+  #----------------------------------------------------------------------
+  #	METHOD:		TestDataSetStats.setUp()			-
+  #----------------------------------------------------------------------
+  def setUp( self ):
+    rs = np.random.RandomState( 7 )
+    self.data = rs.rand( 5, 5, 4, 9 )
+    self.data[ 0, 0, 0, 0 ] = np.nan
+    self.data[ 1, 1, 1, 1 ] = np.inf
+    self.data[ 2, 2, 2, 2 ] = -3.0
+    self.factors = np.ones( self.data.shape )
+    self.factors[ 3 ] = 0.0
+    self.data[ 3 ] = 100.0
+  #end setUp
+
+
+  #----------------------------------------------------------------------
+  #	METHOD:		TestDataSetStats.test_ReduceRange()		-
+  #----------------------------------------------------------------------
+  def test_ReduceRange( self ):
+    finite = self.data[ np.isfinite( self.data ) ]
+    vmin, vmax = DataSetStats.ReduceRange( self.data, chunk_bytes = 1000 )
+    self.assertEqual( vmin, finite.min(), 'min' )
+    self.assertEqual( vmax, finite.max(), 'max' )
+  #end test_ReduceRange
+
+
+  #----------------------------------------------------------------------
+  #	METHOD:		TestDataSetStats.test_ReduceRangeFactors()	-
+  #----------------------------------------------------------------------
+  def test_ReduceRangeFactors( self ):
+    valid = self.data[ self.factors > 0 ]
+    valid = valid[ np.isfinite( valid ) ]
+    vmin, vmax = DataSetStats.\
+        ReduceRange( self.data, self.factors, chunk_bytes = 1000 )
+    self.assertEqual( vmin, valid.min(), 'min' )
+    self.assertEqual( vmax, valid.max(), 'max' )
+  #end test_ReduceRangeFactors
+
+
+  #----------------------------------------------------------------------
+  #	METHOD:		TestDataSetStats.test_ReduceRangeLog()		-
+  #----------------------------------------------------------------------
+  def test_ReduceRangeLog( self ):
+    vmin, vmax = DataSetStats.ReduceRange( self.data, scale_type = 'log' )
+    self.assertTrue( vmin > 0.0, 'log min positive' )
+
+    vmin, vmax = DataSetStats.\
+        ReduceRange( np.array( -1.0 ), scale_type = 'log' )
+    self.assertTrue( np.isnan( vmin ) and np.isnan( vmax ), 'no valid values' )
+  #end test_ReduceRangeLog
+
+
+  #----------------------------------------------------------------------
+  #	METHOD:		TestDataSetStats.test_ReduceStatsThreshold()	-
+  #----------------------------------------------------------------------
+  def test_ReduceStatsThreshold( self ):
+    threshold = RangeExpression( '>= 0.2 <= 0.7' )
+    copy = threshold.ApplyThreshold( self.data )
+    expected = DataSetStats.ReduceStats( copy, self.factors )
+    stats = DataSetStats.ReduceStats(
+        self.data, self.factors, chunk_bytes = 1000, threshold = threshold
+        )
+    self.assertEqual( stats, expected, 'same as thresholded copy' )
+    self.assertTrue( 0.2 <= stats[ 'min' ] and stats[ 'max' ] <= 0.7 )
+
+    vmin, vmax = DataSetStats.ReduceRange( self.data, threshold = threshold )
+    self.assertEqual( ( vmin, vmax ), DataSetStats.ReduceRange( copy ) )
+  #end test_ReduceStatsThreshold
+
+
+#		-- Static Methods
+#		--
+
+#end TestDataSetStats
+
+
+#------------------------------------------------------------------------
+#	NAME:		main()						-
+#------------------------------------------------------------------------
+if __name__ == '__main__':
+  suite = unittest.TestLoader().loadTestsFromTestCase( TestDataSetStats )
+  unittest.TextTestRunner( verbosity = 2 ).run( suite )
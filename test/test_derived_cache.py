@@ -0,0 +1,185 @@
+#!/usr/bin/env python
+# $Id$
+#------------------------------------------------------------------------
+#	NAME:		test_derived_cache.py				-
+#	HISTORY:							-
+#		2026-10-18						-
+#------------------------------------------------------------------------
+import h5py, os, shutil, sys, tempfile, traceback, unittest
+import numpy as np
+
+sys.path.insert( 0, os.path.join( os.path.dirname( __file__ ), os.pardir ) )
+
+from data.derived_cache import *
+
+
+#------------------------------------------------------------------------
+#	CLASS:		TestDerivedCache				-
+#------------------------------------------------------------------------
+class TestDerivedCache( unittest.TestCase ):
+  """
+"""
+
+
+#		-- Object Methods
+#		--
+
+
+  #----------------------------------------------------------------------
+  #	METHOD:		TestDerivedCache.setUp()			-
+  #----------------------------------------------------------------------
+  def setUp( self ):
+    self.tempDir = tempfile.mkdtemp()
+    self.sourcePath = os.path.join( self.tempDir, 'source.h5' )
+    h5f = h5py.File( self.sourcePath, 'w' )
+    h5f.create_group( 'STATE_0001' ).create_dataset( 'keff', data = [ 1.0 ] )
+    h5f.close()
+  #end setUp
+
+
+  #----------------------------------------------------------------------
+  #	METHOD:		TestDerivedCache.tearDown()			-
+  #----------------------------------------------------------------------
+  def tearDown( self ):
+    shutil.rmtree( self.tempDir, True )
+  #end tearDown
+
+
+  #----------------------------------------------------------------------
+  #	METHOD:		TestDerivedCache.test_HeldDataSet()		-
+  #----------------------------------------------------------------------
+  def test_HeldDataSet( self ):
+    """A dataset from ``GetDataSet()`` must stay readable across
+``Put()`` and ``Remove()``.
+"""
+    key = DerivedCache.CreateKey( 'derive', 'pin_powers', ( 3, ), 'avg' )
+    cache = DerivedCache( self.sourcePath )
+    cache.Put( key, 'pin_powers_axial', { 0: np.ones( 4 ) } )
+    cache.Close()
+
+    cache = DerivedCache( self.sourcePath )
+    try:
+      dset = cache.GetDataSet( 'pin_powers_axial', 0 )
+      cache.Put( key + 'x', 'pin_powers_x', { 0: np.zeros( 4 ) } )
+      self.assertEqual( cache.FindName( key + 'x' ), 'pin_powers_x' )
+      self.assertTrue( np.array_equal( dset[ () ], np.ones( 4 ) ) )
+
+      cache.Remove( 'pin_powers_x' )
+      self.assertTrue( np.array_equal( dset[ () ], np.ones( 4 ) ) )
+    finally:
+      cache.Close()
+  #end test_HeldDataSet
+
+
+  #----------------------------------------------------------------------
+  #	METHOD:		TestDerivedCache.test_Locked()			-
+  #----------------------------------------------------------------------
+  def test_Locked( self ):
+    """A cache file that cannot be opened for append is read, with stores
+skipped for the session.
+"""
+    key = DerivedCache.CreateKey( 'derive', 'pin_powers', ( 3, ), 'avg' )
+    cache = DerivedCache( self.sourcePath )
+    cache.Put( key, 'pin_powers_axial', { 0: np.ones( 4 ) } )
+    cache.Close()
+
+    other = h5py.File( cache.cachePath, 'r' )
+    cache = DerivedCache( self.sourcePath )
+    try:
+      self.assertEqual( cache.h5File.mode, 'r' )
+      self.assertEqual( cache.FindName( key ), 'pin_powers_axial' )
+      cache.Put( key + 'x', 'pin_powers_x', { 0: np.zeros( 4 ) } )
+      self.assertIsNone( cache.FindName( key + 'x' ), 'skipped' )
+      self.assertTrue( np.array_equal(
+          np.array( cache.GetDataSet( 'pin_powers_axial', 0 ) ), np.ones( 4 )
+          ) )
+    finally:
+      other.close()
+      cache.Close()
+
+    cache = DerivedCache( self.sourcePath )
+    try:
+      cache.Put( key + 'x', 'pin_powers_x', { 0: np.zeros( 4 ) } )
+      self.assertEqual( cache.FindName( key + 'x' ), 'pin_powers_x' )
+      self.assertEqual( cache.FindName( key ), 'pin_powers_axial' )
+    finally:
+      cache.Close()
+  #end test_Locked
+
+
+  #----------------------------------------------------------------------
+  #	METHOD:		TestDerivedCache.test_Put()			-
+  #----------------------------------------------------------------------
+  def test_Put( self ):
+    key = DerivedCache.CreateKey( 'derive', 'pin_powers', ( 0, 1 ), 'avg' )
+    data = [ np.arange( 4.0 ).reshape( ( 1, 1, 4, 1 ) ) * i for i in ( 1, 2 ) ]
+
+    cache = DerivedCache( self.sourcePath )
+    self.assertEqual(
+        cache.cachePath, os.path.join( self.tempDir, 'source.derived.h5' ),
+        'beside the source'
+        )
+    cache.Put(
+        key, 'pin_powers_assy', { 0: data[ 0 ], 1: data[ 1 ] },
+        axial_mesh = np.arange( 5.0 )
+        )
+    cache.Close()
+
+#		-- Index on open, data on access
+    cache = DerivedCache( self.sourcePath )
+    try:
+      self.assertEqual( cache.FindName( key ), 'pin_powers_assy' )
+      self.assertIsNone( cache.FindName( key + 'x' ) )
+      entries = cache.GetEntries()
+      self.assertEqual( len( entries ), 1 )
+      ds_name, entry, dset = entries[ 0 ]
+      self.assertEqual( dset.shape, ( 1, 1, 4, 1 ) )
+      self.assertIsNone( entry[ 'dsType' ] )
+      self.assertEqual( entry[ 'axialMesh' ].tolist(), range( 5 ) )
+      self.assertTrue( np.array_equal(
+          np.array( cache.GetDataSet( 'pin_powers_assy', 1 ) ), data[ 1 ]
+          ) )
+      self.assertIsNone( cache.GetDataSet( 'pin_powers_assy', 2 ) )
+      self.assertEqual( cache.h5File.mode, 'r+', 'opened once for append' )
+
+      self.assertTrue( cache.Remove( 'pin_powers_assy' ) )
+      self.assertIsNone( cache.FindName( key ) )
+    finally:
+      cache.Close()
+  #end test_Put
+
+
+  #----------------------------------------------------------------------
+  #	METHOD:		TestDerivedCache.test_Stale()			-
+  #----------------------------------------------------------------------
+  def test_Stale( self ):
+    key = DerivedCache.CreateKey( 'difference', 'a', None, 'delta' )
+    self.assertEqual( key, 'difference|a||delta' )
+
+    cache = DerivedCache( self.sourcePath )
+    cache.Put( key, 'diff', { 0: np.ones( 3 ) }, ds_type = 'scalar' )
+    cache.Close()
+
+    with open( self.sourcePath, 'ab' ) as fp:
+      fp.write( '\0' )
+    cache = DerivedCache( self.sourcePath )
+    try:
+      self.assertIsNone( cache.FindName( key ), 'source changed' )
+      self.assertEqual( cache.GetEntries(), [] )
+    finally:
+      cache.Close()
+  #end test_Stale
+
+
+#		-- Static Methods
+#		--
+
+#end TestDerivedCache
+
+
+#------------------------------------------------------------------------
+#	NAME:		main()						-
+#------------------------------------------------------------------------
+if __name__ == '__main__':
+  suite = unittest.TestLoader().loadTestsFromTestCase( TestDerivedCache )
+  unittest.TextTestRunner( verbosity = 2 ).run( suite )
@@ -0,0 +1,124 @@
+#!/usr/bin/env python
+# $Id$
+#------------------------------------------------------------------------
+#	NAME:		test_derived_store.py				-
+#	HISTORY:							-
+#		2026-10-18						-
+#------------------------------------------------------------------------
+import h5py, os, shutil, sys, tempfile, traceback, unittest
+import numpy as np
+
+sys.path.insert( 0, os.path.join( os.path.dirname( __file__ ), os.pardir ) )
+
+from data.derived_store import *
+
+
+#------------------------------------------------------------------------
+#	CLASS:		TestDerivedStore				-
+#------------------------------------------------------------------------
+class TestDerivedStore( unittest.TestCase ):
+  """
+"""
+
+
+#		-- Object Methods
+#		--
+
+
+  #----------------------------------------------------------------------
+  #	METHOD:		TestDerivedStore.setUp()			-
+  #----------------------------------------------------------------------
+  def setUp( self ):
+    self.tempDir = tempfile.mkdtemp()
+    self.h5File = h5py.File( os.path.join( self.tempDir, 'derived.h5' ), 'w' )
+    self.group = self.h5File.create_group( 'STATE_0001' )
+    self.group.create_dataset( 'exposure', data = [ 1.5 ] )
+  #end setUp
+
+
+  #----------------------------------------------------------------------
+  #	METHOD:		TestDerivedStore.tearDown()			-
+  #----------------------------------------------------------------------
+  def tearDown( self ):
+    self.h5File.close()
+    shutil.rmtree( self.tempDir, True )
+  #end tearDown
+
+
+  #----------------------------------------------------------------------
+  #	METHOD:		TestDerivedStore.test_Backends()		-
+  #----------------------------------------------------------------------
+  def test_Backends( self ):
+    data = np.arange( 24, dtype = np.float64 ).reshape( ( 1, 2, 3, 4 ) )
+    for backend in DerivedStore.BACKENDS:
+      store = DerivedStore( self.h5File.filename, backend )
+      try:
+        dset = store.CreateDataSet( self.group, 'copy:x', data )
+        self.assertEqual( dset.shape, data.shape, backend )
+        self.assertEqual( dset.name, '/STATE_0001/copy:x', backend )
+        self.assertTrue( np.array_equal( np.array( dset ), data ), backend )
+        self.assertEqual( dset[ 0, 1, 2, 3 ], 23.0, backend )
+        self.assertEqual(
+            store.GetDataSet( self.group, 'copy:x' ).shape, data.shape
+            )
+        self.assertEqual(
+            'copy:x' in self.group, backend == 'hdf5',
+            backend + ' HDF5 use'
+            )
+
+#			-- Reads are copies
+        piece = dset[ 0, 0 ]
+        piece[ ... ] = -1.0
+        self.assertEqual( dset[ 0, 0, 0, 0 ], 0.0, backend + ' copy' )
+
+#			-- Fallback to the HDF5 group
+        self.assertTrue( store.HasDataSet( self.group, 'exposure' ) )
+        self.assertEqual(
+            store.GetDataSet( self.group, 'exposure' )[ 0 ], 1.5, backend
+            )
+
+        self.assertTrue( store.RemoveDataSet( self.group, 'copy:x' ) )
+        self.assertFalse( store.HasDataSet( self.group, 'copy:x' ) )
+        self.assertFalse( store.RemoveDataSet( self.group, 'copy:x' ) )
+      finally:
+        store.Close()
+    #end for backend
+  #end test_Backends
+
+
+  #----------------------------------------------------------------------
+  #	METHOD:		TestDerivedStore.test_Budget()			-
+  #----------------------------------------------------------------------
+  def test_Budget( self ):
+    store = DerivedStore( self.h5File.filename, 'memory', 1000 )
+    try:
+      small = store.CreateDataSet( self.group, 'small', np.ones( 100 ) )
+      large = store.CreateDataSet( self.group, 'large', np.ones( 200 ) )
+      self.assertNotIsInstance( small.data, np.memmap, 'within budget' )
+      self.assertIsInstance( large.data, np.memmap, 'spilled' )
+      self.assertEqual( store.bytes, 800 )
+      self.assertEqual( float( np.array( large ).sum() ), 200.0 )
+
+      store.RemoveDataSet( self.group, 'small' )
+      self.assertEqual( store.bytes, 0, 'budget released' )
+
+      spill_dir = store.spillDir
+      self.assertTrue( os.path.isdir( spill_dir ) )
+    finally:
+      store.Close()
+    self.assertFalse( os.path.exists( spill_dir ), 'spill files removed' )
+  #end test_Budget
+
+
+#		-- Static Methods
+#		--
+
+#end TestDerivedStore
+
+
+#------------------------------------------------------------------------
+#	NAME:		main()						-
+#------------------------------------------------------------------------
+if __name__ == '__main__':
+  suite = unittest.TestLoader().loadTestsFromTestCase( TestDerivedStore )
+  unittest.TextTestRunner( verbosity = 2 ).run( suite )
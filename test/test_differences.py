@@ -0,0 +1,213 @@
+#!/usr/bin/env python
+# $Id$
+#------------------------------------------------------------------------
+#	NAME:		test_differences.py				-
+#	HISTORY:							-
+#		2026-10-18						-
+#------------------------------------------------------------------------
+import os, shutil, sys, tempfile, traceback, unittest
+import numpy as np
+
+sys.path.insert( 0, os.path.join( os.path.dirname( __file__ ), os.pardir ) )
+
+from data.config import Config
+from data.datamodel import DataSetName
+from data.datamodel_mgr import DataModelMgr
+from data.differences import *
+from vera_file import CreateVeraFile
+
+
+#------------------------------------------------------------------------
+#	CLASS:		TestDifferences					-
+#------------------------------------------------------------------------
+class TestDifferences( unittest.TestCase ):
+  """Virtual and parallel differences must match the stored differences
+calculated state by state.
+"""
+
+
+#		-- Class Attributes
+#		--
+
+  KEYS = (
+      0, -1, 3, slice( 1, 3 ), slice( None, None, 2 ),
+      ( 1, slice( None ), -2, 3 ), ( -1, -1, -1, -1 ),
+      ( slice( None ), 2 ), ( 0, 0, slice( 1, 3 ) ),
+      Ellipsis, ( Ellipsis, ), ( Ellipsis, 1 ), ( 2, Ellipsis, -1 )
+      )
+
+  MODES = ( 'delta', 'pct' )
+
+
+#		-- Object Methods
+#		--
+
+
+  #----------------------------------------------------------------------
+  #	METHOD:		TestDifferences._Calc()				-
+  #----------------------------------------------------------------------
+  def _Calc( self, comp_name, diff_name, diff_mode, virtual ):
+    """
+@return			list of difference datasets by state point
+"""
+    ref_qds = DataSetName( self.refModel.GetName(), 'pin_powers' )
+    comp_dm = self.models[ comp_name ]
+    diff_qds = Differences( self.dmgr ).calc(
+        ref_qds, DataSetName( comp_dm.GetName(), 'pin_powers' ),
+        diff_name, diff_mode, virtual = virtual
+        )
+    self.assertEqual( diff_qds.displayName, diff_name )
+    return  [
+        comp_dm.GetStateDataSet( i, diff_name )
+        for i in xrange( comp_dm.GetStatesCount() )
+        ]
+  #end _Calc
+
+
+  #----------------------------------------------------------------------
+  #	METHOD:		TestDifferences._Expected()			-
+  #----------------------------------------------------------------------
+  def _Expected( self, comp_name, diff_mode ):
+    """Differences from whole state point arrays without the pool.
+"""
+    ref_dm = self.refModel
+    comp_dm = self.models[ comp_name ]
+    interp_func = None
+    if comp_name == 'interp':
+      interp = Interpolator(
+          self.dmgr.GetAxialMeshCenters(
+              DataSetName( ref_dm.GetName(), 'pin_powers' )
+              ),
+          self.dmgr.GetAxialMesh(
+              DataSetName( comp_dm.GetName(), 'pin_powers' )
+              ),
+          self.dmgr.GetAxialMeshCenters(
+              DataSetName( comp_dm.GetName(), 'pin_powers' )
+              )
+          )
+      interp_func = lambda data: interp.interpolate_integral_over_spline(
+          data, mode = 'linear', skip_assertions = True
+          )
+
+    return  [
+        Differences.calc_data(
+            np.array( ref_dm.GetStateDataSet( i, 'pin_powers' ) ),
+            np.array( comp_dm.GetStateDataSet( i, 'pin_powers' ) ),
+            diff_mode, interp_func
+            )
+        for i in xrange( comp_dm.GetStatesCount() )
+        ]
+  #end _Expected
+
+
+  #----------------------------------------------------------------------
+  #	METHOD:		TestDifferences.setUp()				-
+  #----------------------------------------------------------------------
+  def setUp( self ):
+    self.tempDir = tempfile.mkdtemp()
+    Config.SetCacheDir( os.path.join( self.tempDir, 'cache' ) )
+
+    self.dmgr = DataModelMgr()
+    self.models = {}
+    for name, nax, seed in (
+        ( 'ref', 4, 0 ), ( 'same', 4, 1 ), ( 'interp', 6, 2 )
+        ):
+      path = CreateVeraFile(
+          os.path.join( self.tempDir, name + '.h5' ), nax = nax, seed = seed
+          )
+      self.models[ name ] = self.dmgr.OpenModel( path )
+      self.models[ name ].WaitReady()
+    self.refModel = self.models[ 'ref' ]
+  #end setUp
+
+
+  #----------------------------------------------------------------------
+  #	METHOD:		TestDifferences.tearDown()			-
+  #----------------------------------------------------------------------
+  def tearDown( self ):
+    self.dmgr.Close()
+    Config.SetCacheDir( None )
+    Config.SetWorkerCount( 0 )
+    shutil.rmtree( self.tempDir, True )
+  #end tearDown
+
+
+  #----------------------------------------------------------------------
+  #	METHOD:		TestDifferences.test_Parallel()			-
+  #----------------------------------------------------------------------
+  def test_Parallel( self ):
+    """Stored differences calculated on one and several workers.
+"""
+    for comp_name in ( 'same', 'interp' ):
+      for diff_mode in TestDifferences.MODES:
+        expected = self._Expected( comp_name, diff_mode )
+        for worker_count in ( 1, 4 ):
+          Config.SetWorkerCount( worker_count )
+          diff_name = 'diff_%s_%d' % ( diff_mode, worker_count )
+          dsets = self._Calc( comp_name, diff_name, diff_mode, False )
+          self.assertEqual( len( dsets ), len( expected ) )
+          for i, dset in enumerate( dsets ):
+            self.assertNotIsInstance( dset, DifferenceDataSet )
+            self.assertTrue(
+                np.allclose( np.array( dset ), expected[ i ] ),
+                '%s %s, %d workers, state %d' %
+                    ( comp_name, diff_mode, worker_count, i )
+                )
+    #end for comp_name
+  #end test_Parallel
+
+
+  #----------------------------------------------------------------------
+  #	METHOD:		TestDifferences.test_Virtual()			-
+  #----------------------------------------------------------------------
+  def test_Virtual( self ):
+    """Indexing virtual differences matches indexing the stored ones.
+"""
+    for comp_name in ( 'same', 'interp' ):
+      for diff_mode in TestDifferences.MODES:
+        stored = self._Calc(
+            comp_name, 'stored_' + diff_mode, diff_mode, False
+            )
+        virtual = self._Calc(
+            comp_name, 'virtual_' + diff_mode, diff_mode, True
+            )
+        for i, vdset in enumerate( virtual ):
+          msg = '%s %s, state %d' % ( comp_name, diff_mode, i )
+          self.assertIsInstance( vdset, DifferenceDataSet )
+          expected = np.array( stored[ i ] )
+          self.assertEqual( vdset.shape, expected.shape )
+          self.assertTrue( np.allclose( np.array( vdset ), expected ), msg )
+          self.assertTrue( np.allclose( vdset.value, expected ), msg )
+
+          for key in TestDifferences.KEYS:
+            result = vdset[ key ]
+            self.assertEqual(
+                np.shape( result ), np.shape( expected[ key ] ),
+                '%s, key %s' % ( msg, key )
+                )
+            self.assertTrue(
+                np.allclose( result, expected[ key ] ),
+                '%s, key %s' % ( msg, key )
+                )
+          #end for key
+
+          self.assertIsInstance( vdset[ 0, 0, 0, 0 ], np.floating )
+          with self.assertRaises( ( IndexError, ValueError ) ):
+            vdset[ 0, 0, 0, 4 ]
+      #end for diff_mode
+    #end for comp_name
+  #end test_Virtual
+
+
+#		-- Static Methods
+#		--
+
+#end TestDifferences
+
+
+#------------------------------------------------------------------------
+#	NAME:		main()						-
+#------------------------------------------------------------------------
+if __name__ == '__main__':
+  suite = unittest.TestLoader().loadTestsFromTestCase( TestDifferences )
+  unittest.TextTestRunner( verbosity = 2 ).run( suite )
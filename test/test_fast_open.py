@@ -0,0 +1,131 @@
+#!/usr/bin/env python
+# $Id$
+#------------------------------------------------------------------------
+#	NAME:		test_fast_open.py				-
+#	HISTORY:							-
+#		2026-10-18						-
+#------------------------------------------------------------------------
+import os, shutil, sys, tempfile, threading, traceback, unittest
+
+sys.path.insert( 0, os.path.join( os.path.dirname( __file__ ), os.pardir ) )
+
+from data.config import Config
+from data.datamodel import DataModel, DataSetName
+from data.datamodel_mgr import DataModelMgr
+from vera_file import CreateVeraFile
+
+
+#------------------------------------------------------------------------
+#	CLASS:		TestFastOpen					-
+#------------------------------------------------------------------------
+class TestFastOpen( unittest.TestCase ):
+  """Read() in fast-open mode returns before the deferred work is done and
+fires 'ready' when it is.
+"""
+
+
+#		-- Object Methods
+#		--
+
+
+  #----------------------------------------------------------------------
+  #	METHOD:		TestFastOpen._ReadDeferred()			-
+  #----------------------------------------------------------------------
+  def _ReadDeferred( self, model ):
+    """Replaces ``DataModel._ReadDeferred()``, blocking while ``gate`` is
+clear.
+"""
+    self.gate.wait()
+    self.readDeferred( model )
+  #end _ReadDeferred
+
+
+  #----------------------------------------------------------------------
+  #	METHOD:		TestFastOpen.setUp()				-
+  #----------------------------------------------------------------------
+  def setUp( self ):
+    self.tempDir = tempfile.mkdtemp()
+    Config.SetCacheDir( os.path.join( self.tempDir, 'cache' ) )
+    self.path = CreateVeraFile( os.path.join( self.tempDir, 'vera.h5' ) )
+
+    self.events = []
+    self.gate = threading.Event()
+    self.readDeferred = DataModel._ReadDeferred
+    DataModel._ReadDeferred = \
+        lambda model: TestFastOpen._ReadDeferred( self, model )
+    DataModel.SetFastOpen( True )
+  #end setUp
+
+
+  #----------------------------------------------------------------------
+  #	METHOD:		TestFastOpen.tearDown()				-
+  #----------------------------------------------------------------------
+  def tearDown( self ):
+    self.gate.set()
+    DataModel._ReadDeferred = self.readDeferred
+    DataModel.SetFastOpen( False )
+    Config.SetCacheDir( None )
+    shutil.rmtree( self.tempDir, True )
+  #end tearDown
+
+
+  #----------------------------------------------------------------------
+  #	METHOD:		TestFastOpen.test_DataModel()			-
+  #----------------------------------------------------------------------
+  def test_DataModel( self ):
+    model = DataModel( self.path )
+    try:
+      model.AddListener( 'ready', lambda *args: self.events.append( args ) )
+      self.assertFalse( model.IsReady(), 'returned before deferred work' )
+      self.assertEqual( self.events, [] )
+      self.assertEqual( model.GetStatesCount(), 6 )
+
+      self.gate.set()
+      model.WaitReady()
+      model.readThread.join( 5.0 )
+      self.assertTrue( model.IsReady() )
+      self.assertEqual( self.events, [ ( model, ) ] )
+      self.assertIsNotNone( model.GetPinFactors() )
+    finally:
+      model.Close()
+  #end test_DataModel
+
+
+  #----------------------------------------------------------------------
+  #	METHOD:		TestFastOpen.test_DataModelMgr()		-
+  #----------------------------------------------------------------------
+  def test_DataModelMgr( self ):
+    dmgr = DataModelMgr()
+    try:
+      dmgr.AddListener(
+          'modelReady', lambda *args: self.events.append( args )
+          )
+      model = dmgr.OpenModel( self.path )
+      qds_name = DataSetName( model.GetName(), 'pin_powers' )
+      self.assertFalse( dmgr.IsReady() )
+      self.assertFalse( dmgr.IsReady( qds_name ) )
+
+      self.gate.set()
+      model.WaitReady()
+      model.readThread.join( 5.0 )
+      self.assertTrue( dmgr.IsReady() )
+      self.assertTrue( dmgr.IsReady( qds_name ) )
+      self.assertEqual( self.events, [ ( dmgr, model.GetName() ) ] )
+      self.assertIsNotNone( dmgr.GetFactors( qds_name ) )
+    finally:
+      dmgr.Close()
+  #end test_DataModelMgr
+
+
+#		-- Static Methods
+#		--
+
+#end TestFastOpen
+
+
+#------------------------------------------------------------------------
+#	NAME:		main()						-
+#------------------------------------------------------------------------
+if __name__ == '__main__':
+  suite = unittest.TestLoader().loadTestsFromTestCase( TestFastOpen )
+  unittest.TextTestRunner( verbosity = 2 ).run( suite )
@@ -0,0 +1,206 @@
+#!/usr/bin/env python
+# $Id$
+#------------------------------------------------------------------------
+#	NAME:		test_generic_averages.py			-
+#	HISTORY:							-
+#		2026-10-18						-
+#------------------------------------------------------------------------
+import os, shutil, sys, tempfile, traceback, unittest
+import numpy as np
+
+sys.path.insert( 0, os.path.join( os.path.dirname( __file__ ), os.pardir ) )
+
+from data.config import Config
+from data.datamodel import DataModel
+import data.generic_averages as gen_avg
+from vera_file import CreateVeraFile
+
+
+#------------------------------------------------------------------------
+#	CLASS:		TestGenericAverages				-
+#------------------------------------------------------------------------
+class TestGenericAverages( unittest.TestCase ):
+  """Batch averagers must match the per-state averagers they replace.
+"""
+
+
+#		-- Class Attributes
+#		--
+
+  AXES = ( 3, ( 0, 1 ), ( 0, 1, 3 ), ( 2, ), ( 0, 1, 2, 3 ) )
+
+  METHODS = ( 'avg', 'rms', 'stddev' )
+
+
+#		-- Object Methods
+#		--
+
+
+  #----------------------------------------------------------------------
+  #	METHOD:		TestGenericAverages._CreateAverager()		-
+  #----------------------------------------------------------------------
+  def _CreateAverager( self ):
+    return  gen_avg.Averages(
+        self.model.core,
+        np.array( self.model.GetStateDataSet( 0, 'pin_powers' ) ),
+        self.model.GetPinFactors()
+        )
+  #end _CreateAverager
+
+
+  #----------------------------------------------------------------------
+  #	METHOD:		TestGenericAverages.setUp()			-
+  #----------------------------------------------------------------------
+  def setUp( self ):
+    self.tempDir = tempfile.mkdtemp()
+    Config.SetCacheDir( os.path.join( self.tempDir, 'cache' ) )
+    self.model = DataModel(
+        CreateVeraFile( os.path.join( self.tempDir, 'vera.h5' ), 20 )
+        )
+    self.model.WaitReady()
+    self.dsets = [
+        self.model.GetStateDataSet( i, 'pin_exposures' )
+        for i in xrange( self.model.GetStatesCount() )
+        ]
+  #end setUp
+
+
+  #----------------------------------------------------------------------
+  #	METHOD:		TestGenericAverages.tearDown()			-
+  #----------------------------------------------------------------------
+  def tearDown( self ):
+    self.model.Close()
+    Config.SetCacheDir( None )
+    Config.SetWorkerCount( 0 )
+    shutil.rmtree( self.tempDir, True )
+  #end tearDown
+
+
+  #----------------------------------------------------------------------
+  #	METHOD:		TestGenericAverages.test_BatchMethods()		-
+  #----------------------------------------------------------------------
+  def test_BatchMethods( self ):
+    averager = self._CreateAverager()
+    data = np.array([ np.array( d ) for d in self.dsets ])
+    data[ 2, 1, 1, 0, 0 ] = np.nan
+    weights = np.asarray( averager.resolve_dset_weights( self.dsets[ 0 ] ) )
+
+    for method in TestGenericAverages.METHODS:
+      calc = getattr( averager, 'calc_' + method )
+      calc_batch = getattr( averager, 'calc_{0}_batch'.format( method ) )
+      for avg_axis in TestGenericAverages.AXES:
+        result = calc_batch( data, weights, avg_axis )
+        self.assertEqual( len( result ), len( data ) )
+        for i in xrange( len( data ) ):
+          expected = calc( data[ i ], avg_axis, True )
+          self.assertTrue(
+              np.allclose( result[ i ], expected, equal_nan = True ),
+              '{0:s} axis={1}, state {2:d}'.format( method, avg_axis, i )
+              )
+    #end for method
+  #end test_BatchMethods
+
+
+  #----------------------------------------------------------------------
+  #	METHOD:		TestGenericAverages.test_CreateDerivedDataSet()	-
+  #----------------------------------------------------------------------
+  def test_CreateDerivedDataSet( self ):
+    """Derivation through ``StatePool`` with two workers, which puts three
+of the twenty states in each batch.
+"""
+    Config.SetWorkerCount( 2 )
+    averager = self._CreateAverager()
+    for method in TestGenericAverages.METHODS:
+      calc = getattr( averager, 'calc_' + method )
+      for avg_axis in TestGenericAverages.AXES:
+        der_name = self.model.CreateDerivedDataSet2(
+            'pin_exposures', avg_axis, 'test_' + method + str( avg_axis ),
+            method
+            )
+        for i, dset in enumerate( self.dsets ):
+          expected = calc( dset, avg_axis, True )
+          result = np.array( self.model.GetStateDataSet( i, der_name ) )
+          self.assertTrue(
+              np.allclose(
+                  result.ravel(), np.ravel( expected ), equal_nan = True
+                  ),
+              '{0:s} axis={1}, state {2:d}'.format( method, avg_axis, i )
+              )
+    #end for method
+  #end test_CreateDerivedDataSet
+
+
+  #----------------------------------------------------------------------
+  #	METHOD:		TestGenericAverages.test_CreateDerivedNode()	-
+  #----------------------------------------------------------------------
+  def test_CreateDerivedNode( self ):
+    """``_CreateDerivedDataSet()`` through ``calc_pin_node_avg_batch()``
+must match the batch method applied to each state alone.
+"""
+    Config.SetWorkerCount( 2 )
+    der_name = \
+        self.model._CreateDerivedDataSet( 'pin', 'node', 'pin_exposures' )
+    self.assertEqual( self.model.GetDataSetType( der_name ), ':node' )
+
+    averager = self.model.GetAverager( 'pin' )
+    weights = np.asarray( averager.resolve_dset_weights( self.dsets[ 0 ] ) )
+    for i, dset in enumerate( self.dsets ):
+      expected = averager.calc_node_avg_batch(
+          np.array( dset )[ np.newaxis, ... ], weights
+          )[ 0 ]
+      result = np.array( self.model.GetStateDataSet( i, der_name ) )
+      self.assertEqual( result.shape, expected.shape )
+      self.assertTrue( np.allclose( result, expected ), 'state %d' % i )
+  #end test_CreateDerivedNode
+
+
+  #----------------------------------------------------------------------
+  #	METHOD:		TestGenericAverages.test_NodeAvgBatch()		-
+  #----------------------------------------------------------------------
+  def test_NodeAvgBatch( self ):
+    """Compares with the per-level ``_calc_node_sum()`` loop of
+``calc_node_avg()``.
+"""
+    averager = self._CreateAverager()
+    data = np.array([ np.array( d ) for d in self.dsets ])
+    npiny, npinx, nax, nass = data.shape[ 1 : ]
+    weights = np.asarray( averager.resolve_dset_weights( self.dsets[ 0 ] ) )
+    node_assy_wts = averager.get_node_assembly_weights( npiny, npinx )
+    node_wts = averager._calc_node_weights( node_assy_wts, weights )
+
+    result = averager.calc_node_avg_batch( data, weights )
+    self.assertEqual( result.shape, ( len( data ), 1, 4, nax, nass ) )
+
+    errors_save = np.seterr( divide = 'ignore', invalid = 'ignore' )
+    try:
+      for i in xrange( len( data ) ):
+        expected = np.zeros( ( 1, 4, nax, nass ) )
+        for l in xrange( nass ):
+          for k in xrange( nax ):
+            expected[ 0, :, k, l ] = averager._calc_node_sum(
+                npiny, npinx, node_assy_wts,
+                data[ i, :, :, k, l ] * weights[ :, :, k, l ]
+                )
+        expected = averager._fix_node_factors( expected ) / node_wts
+        expected[ expected == np.inf ] = 0.0
+        expected = np.nan_to_num( expected )
+        self.assertTrue(
+            np.allclose( result[ i ], expected ), 'state %d' % i
+            )
+    finally:
+      np.seterr( **errors_save )
+  #end test_NodeAvgBatch
+
+
+#		-- Static Methods
+#		--
+
+#end TestGenericAverages
+
+
+#------------------------------------------------------------------------
+#	NAME:		main()						-
+#------------------------------------------------------------------------
+if __name__ == '__main__':
+  suite = unittest.TestLoader().loadTestsFromTestCase( TestGenericAverages )
+  unittest.TextTestRunner( verbosity = 2 ).run( suite )
@@ -0,0 +1,96 @@
+#!/usr/bin/env python
+# $Id$
+#------------------------------------------------------------------------
+#	NAME:		test_index_expr.py				-
+#	HISTORY:							-
+#		2026-10-18						-
+#------------------------------------------------------------------------
+import h5py, os, shutil, sys, tempfile, traceback, unittest
+import numpy as np
+
+sys.path.insert( 0, os.path.join( os.path.dirname( __file__ ), os.pardir ) )
+
+from data.index_expr import *
+
+
+#------------------------------------------------------------------------
+#	CLASS:		TestIndexExpression				-
+#------------------------------------------------------------------------
+class TestIndexExpression( unittest.TestCase ):
+  """
+"""
+
+
+#		-- Object Methods
+#		--
+
+
+  #----------------------------------------------------------------------
+  #	METHOD:		TestIndexExpression.test_Apply()		-
+  #----------------------------------------------------------------------
+  def test_Apply( self ):
+    data = np.arange( 2 * 3 * 4 * 5.0 ).reshape( ( 2, 3, 4, 5 ) )
+    temp_dir = tempfile.mkdtemp()
+    try:
+      h5f = h5py.File( os.path.join( temp_dir, 'test.h5' ), 'w' )
+      dset = h5f.create_dataset( 'data', data = data )
+      for expr in (
+          '[ 0, 0, :, : ]', '[:,:,2:]', '[:,:1,3:]', '[ 1, ..., ::2 ]',
+          '[ 0, 0, 0, 0 ]', '[-1]', ''
+          ):
+        compiled = IndexExpression.Compile( expr )
+        expected = eval( 'data' + expr )
+        self.assertTrue(
+            np.array_equal( compiled.Apply( data ), expected ), expr
+            )
+        self.assertTrue(
+            np.array_equal( compiled.Apply( dset ), expected ), expr
+            )
+        self.assertEqual(
+            compiled.GetShape( data.shape ), np.shape( expected ), expr
+            )
+      h5f.close()
+    finally:
+      shutil.rmtree( temp_dir, True )
+
+    self.assertIs(
+        IndexExpression.Compile( '[:,:,2:]' ),
+        IndexExpression.Compile( '[:,:,2:]' ),
+        'cached'
+        )
+    for expr in ( '0, 0', '[ x ]', '[ 1:2:3:4 ]', '[ 0,, 1 ]' ):
+      self.assertRaises( ValueError, IndexExpression.Parse, expr )
+  #end test_Apply
+
+
+  #----------------------------------------------------------------------
+  #	METHOD:		TestIndexExpression.test_Assign()		-
+  #----------------------------------------------------------------------
+  def test_Assign( self ):
+    for expr, shape in (
+        ( '[ 0, 0, :, : ]', ( 5, 6 ) ),
+        ( '[ :, :, 0, : ]', ( 5, 1, 6 ) )
+        ):
+      value = np.arange( np.prod( shape ), dtype = np.float64 ).\
+          reshape( shape )
+      copy_shape = ( 1, 1, 5, 6 )  if len( shape ) == 2 else  ( 5, 1, 1, 6 )
+      expected = np.zeros( copy_shape )
+      exec( 'expected' + expr + ' = value' )
+      result = np.zeros( copy_shape )
+      IndexExpression.Compile( expr ).Assign( result, value )
+      self.assertTrue( np.array_equal( result, expected ), expr )
+  #end test_Assign
+
+
+#		-- Static Methods
+#		--
+
+#end TestIndexExpression
+
+
+#------------------------------------------------------------------------
+#	NAME:		main()						-
+#------------------------------------------------------------------------
+if __name__ == '__main__':
+  suite = unittest.TestLoader().loadTestsFromTestCase( TestIndexExpression )
+  unittest.TextTestRunner( verbosity = 2 ).run( suite )
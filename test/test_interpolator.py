@@ -0,0 +1,91 @@
+#!/usr/bin/env python
+# $Id$
+#------------------------------------------------------------------------
+#	NAME:		test_interpolator.py				-
+#	HISTORY:							-
+#		2026-10-18						-
+#------------------------------------------------------------------------
+import os, sys, traceback, unittest
+import numpy as np
+
+sys.path.insert( 0, os.path.join( os.path.dirname( __file__ ), os.pardir ) )
+
+from data.interpolator import *
+
+
+#------------------------------------------------------------------------
+#	CLASS:		TestInterpolator				-
+#------------------------------------------------------------------------
+class TestInterpolator( unittest.TestCase ):
+  """
+"""
+
+
+#		-- Object Methods
+#		--
+
+
+  #----------------------------------------------------------------------
+  #	METHOD:		TestInterpolator.setUp()			-
+  #----------------------------------------------------------------------
+  def setUp( self ):
+    src_mesh = np.array( [ 0.0, 2.0, 5.0, 7.5, 10.0, 12.0, 15.0 ] )
+    self.srcMeshCenters = (src_mesh[ : -1 ] + src_mesh[ 1 : ]) / 2.0
+    self.dstMesh = np.linspace( -1.0, 16.0, 12 )
+    self.srcData = np.random.RandomState( 11 ).rand( 3, 4, 6, 5 )
+  #end setUp
+
+
+  #----------------------------------------------------------------------
+  #	METHOD:		TestInterpolator.test_interpolate()		-
+  #----------------------------------------------------------------------
+  def test_interpolate( self ):
+    interp = Interpolator( self.srcMeshCenters, self.dstMesh )
+    for mode in ( 'linear', 'quad', 'cubic', 'nearest' ):
+      f = interp.create_interpolator( self.srcData, self.srcMeshCenters, mode )
+
+      result = \
+          interp.interpolate_integral_over_spline( self.srcData, mode = mode )
+      expected = interp.interpolate_integral_over_spline( self.srcData, f )
+      self.assertEqual( result.shape, ( 3, 4, 11, 5 ) )
+      self.assertTrue( np.allclose( result, expected ), 'integral ' + mode )
+
+      result = interp.interpolate_on_spline( self.srcData, mode = mode )
+      expected = interp.interpolate_on_spline( self.srcData, f )
+      self.assertTrue( np.allclose( result, expected ), 'spline ' + mode )
+    #end for mode
+
+    self.assertEqual( len( interp.weights ), 8, 'weights reused' )
+  #end test_interpolate
+
+
+  #----------------------------------------------------------------------
+  #	METHOD:		TestInterpolator.test_nonfinite()		-
+  #----------------------------------------------------------------------
+  def test_nonfinite( self ):
+    src_data = self.srcData.copy()
+    src_data[ 0, 0, 5, 0 ] = np.nan
+    interp = Interpolator( self.srcMeshCenters, self.dstMesh )
+
+    result = interp.interpolate_on_spline( src_data, mode = 'linear' )
+    nan_levels = np.flatnonzero( np.isnan( result[ 0, 0, :, 0 ] ) )
+    self.assertTrue(
+        nan_levels.size > 0 and nan_levels.min() >= 8,
+        'NaN limited to levels near the top'
+        )
+    self.assertTrue( np.isfinite( result[ 1 : ] ).all() )
+  #end test_nonfinite
+
+
+#		-- Static Methods
+#		--
+
+#end TestInterpolator
+
+
+#------------------------------------------------------------------------
+#	NAME:		main()						-
+#------------------------------------------------------------------------
+if __name__ == '__main__':
+  suite = unittest.TestLoader().loadTestsFromTestCase( TestInterpolator )
+  unittest.TextTestRunner( verbosity = 2 ).run( suite )
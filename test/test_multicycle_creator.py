@@ -0,0 +1,231 @@
+#!/usr/bin/env python
+# $Id$
+#------------------------------------------------------------------------
+#	NAME:		test_multicycle_creator.py			-
+#	HISTORY:							-
+#		2026-10-18						-
+#------------------------------------------------------------------------
+import h5py, json, os, shutil, sys, tempfile, traceback, unittest
+import numpy as np
+
+sys.path.insert( 0, os.path.join( os.path.dirname( __file__ ), os.pardir ) )
+
+from data.config import Config
+from data.multicycle_creator import MultiCycleCreator
+from vera_file import CreateVeraFile
+
+
+#------------------------------------------------------------------------
+#	CLASS:		TestMultiCycleCreator				-
+#------------------------------------------------------------------------
+class TestMultiCycleCreator( unittest.TestCase ):
+  """A run interrupted and resumed with --resume must write the same files
+as one that is not interrupted.
+"""
+
+
+#		-- Constants
+#		--
+
+  SHIFT_CORE_NAMES = (
+      'baffle_gap_inner',
+      'baffle_inner_radius', 'baffle_outer_radius',
+      'barrel_inner_radius', 'barrel_outer_radius',
+      'liner_inner_radius', 'liner_outer_radius',
+      'pad_angles', 'pad_inner_radius', 'pad_outer_radius',
+      'vessel_inner_radius', 'vessel_outer_radius'
+      )
+
+
+#		-- Object Methods
+#		--
+
+
+  #----------------------------------------------------------------------
+  #	METHOD:		TestMultiCycleCreator._AssertSameFiles()	-
+  #----------------------------------------------------------------------
+  def _AssertSameFiles( self, expected_path, path ):
+    expected = self._ReadFile( expected_path )
+    result = self._ReadFile( path )
+    self.assertEqual( sorted( result.keys() ), sorted( expected.keys() ) )
+    for name in sorted( expected.keys() ):
+      self.assertTrue(
+          np.array_equal( result[ name ], expected[ name ] ),
+          '%s %s' % ( os.path.basename( path ), name )
+          )
+  #end _AssertSameFiles
+
+
+  #----------------------------------------------------------------------
+  #	METHOD:		TestMultiCycleCreator._CreateCycle()		-
+  #----------------------------------------------------------------------
+  def _CreateCycle( self, name, seed ):
+    """Writes the MPACT and Shift files for a cycle.
+@return			cycle base path
+"""
+    base_path = os.path.join( self.tempDir, name )
+    CreateVeraFile( base_path + '.h5', seed = seed )
+    rand = np.random.RandomState( seed + 100 )
+
+    h5f = h5py.File( base_path + '.h5', 'a' )
+    try:
+      for i in xrange( 6 ):
+        group = h5f[ 'STATE_%04d' % (i + 1) ]
+        group[ 'exposure_efpd' ] = np.array( [ i * 20.0 ] )
+        group[ 'power' ] = np.array( [ 90.0 + i ] )
+    finally:
+      h5f.close()
+
+    h5f = h5py.File( base_path + '.shift.h5', 'w' )
+    try:
+      core_group = h5f.create_group( 'CORE' )
+      for ds_name in TestMultiCycleCreator.SHIFT_CORE_NAMES:
+        core_group[ ds_name ] = np.array( [ 100.0 + seed ] )
+      for i in xrange( 6 ):
+        h5f.create_group( 'STATE_%04d' % (i + 1) )[ 'vessel_tally' ] = \
+            rand.rand( 1, 3, 4, 2, 2 )
+    finally:
+      h5f.close()
+
+    return  base_path
+  #end _CreateCycle
+
+
+  #----------------------------------------------------------------------
+  #	METHOD:		TestMultiCycleCreator._ReadFile()		-
+  #----------------------------------------------------------------------
+  def _ReadFile( self, path ):
+    """
+@return			dict of np.ndarray by dataset path, and by
+			"path@attr" for attributes
+"""
+    result = {}
+    def visit( name, item ):
+      for key, value in item.attrs.items():
+        result[ name + '@' + key ] = np.asarray( value )
+      if isinstance( item, h5py.Dataset ):
+        result[ name ] = np.array( item )
+    #end visit
+
+    h5f = h5py.File( path, 'r' )
+    try:
+      h5f.visititems( visit )
+    finally:
+      h5f.close()
+    return  result
+  #end _ReadFile
+
+
+  #----------------------------------------------------------------------
+  #	METHOD:		TestMultiCycleCreator._RunInterrupted()		-
+  #----------------------------------------------------------------------
+  def _RunInterrupted( self, output_path, state_count ):
+    """Runs until ``state_count`` MPACT state points are written, stopping
+after the last of them is written but before its Shift state point and
+checkpoint.
+"""
+    creator = MultiCycleCreator()
+    process_state = creator._processMpactState
+    written = []
+
+    def process_then_stop( *args, **kwargs ):
+      process_state( *args, **kwargs )
+      written.append( args[ 2 ] )
+      if len( written ) == state_count:
+        raise KeyboardInterrupt( 'interrupted' )
+    #end process_then_stop
+
+    creator._processMpactState = process_then_stop
+    with self.assertRaises( KeyboardInterrupt ):
+      creator.run( output_path, *self.cyclePaths )
+  #end _RunInterrupted
+
+
+  #----------------------------------------------------------------------
+  #	METHOD:		TestMultiCycleCreator.setUp()			-
+  #----------------------------------------------------------------------
+  def setUp( self ):
+    self.stdout = sys.stdout
+    sys.stdout = open( os.devnull, 'w' )
+    self.tempDir = tempfile.mkdtemp()
+    Config.SetCacheDir( os.path.join( self.tempDir, 'cache' ) )
+    self.cyclePaths = [
+        self._CreateCycle( 'cycle%d' % i, i ) for i in xrange( 3 )
+        ]
+    self.expectedPath = os.path.join( self.tempDir, 'expected.h5' )
+    MultiCycleCreator().run( self.expectedPath, *self.cyclePaths )
+  #end setUp
+
+
+  #----------------------------------------------------------------------
+  #	METHOD:		TestMultiCycleCreator.tearDown()		-
+  #----------------------------------------------------------------------
+  def tearDown( self ):
+    sys.stdout.close()
+    sys.stdout = self.stdout
+    Config.SetCacheDir( None )
+    Config.SetWorkerCount( 0 )
+    shutil.rmtree( self.tempDir, True )
+  #end tearDown
+
+
+  #----------------------------------------------------------------------
+  #	METHOD:		TestMultiCycleCreator.test_Resume()		-
+  #----------------------------------------------------------------------
+  def test_Resume( self ):
+    """Interrupted in the first and second cycles, on one and several
+workers, and resumed with --resume.
+"""
+    expected = self._ReadFile( self.expectedPath )
+    self.assertEqual(
+        len([ n for n in expected if n.endswith( 'pin_lhr' ) ]), 16,
+        'six state points in the first cycle, five in each other'
+        )
+
+    for worker_count, state_count in ( ( 1, 3 ), ( 4, 8 ), ( 4, 11 ) ):
+      Config.SetWorkerCount( worker_count )
+      output_path = os.path.join(
+          self.tempDir, 'resumed%d_%d.h5' % ( worker_count, state_count )
+          )
+      self._RunInterrupted( output_path, state_count )
+
+      h5f = h5py.File( output_path, 'r' )
+      try:
+        checkpoint = json.loads(
+            h5f.attrs[ MultiCycleCreator.CHECKPOINT_ATTR ]
+            )
+        self.assertIn( 'STATE_%04d' % state_count, h5f, 'partial state' )
+      finally:
+        h5f.close()
+      self.assertEqual( checkpoint[ 'results' ][ 'state' ], state_count )
+
+      argv = sys.argv
+      sys.argv = \
+          [ 'multicycle_creator.py', '-o', output_path, '--resume' ] + \
+          self.cyclePaths
+      try:
+        MultiCycleCreator.main()
+      finally:
+        sys.argv = argv
+
+      self._AssertSameFiles( self.expectedPath, output_path )
+      self._AssertSameFiles(
+          self.expectedPath[ : -3 ] + '.shift.h5',
+          output_path[ : -3 ] + '.shift.h5'
+          )
+    #end for worker_count, state_count
+  #end test_Resume
+
+
+#		-- Static Methods
+#		--
+
+#end TestMultiCycleCreator
+
+
+#------------------------------------------------------------------------
+#	NAME:		main()						-
+#------------------------------------------------------------------------
+if __name__ == '__main__':
+  suite = unittest.TestLoader().loadTestsFromTestCase( TestMultiCycleCreator )
+  unittest.TextTestRunner( verbosity = 2 ).run( suite )
@@ -0,0 +1,195 @@
+#!/usr/bin/env python
+# $Id$
+#------------------------------------------------------------------------
+#	NAME:		test_rgba_raster.py				-
+#	HISTORY:							-
+#		2026-10-18						-
+#------------------------------------------------------------------------
+import os, sys, traceback, unittest
+import numpy as np
+
+sys.path.insert( 0, os.path.join( os.path.dirname( __file__ ), os.pardir ) )
+
+from widget.rgba_raster import *
+
+
+#------------------------------------------------------------------------
+#	CLASS:		GrayMapper					-
+#------------------------------------------------------------------------
+class GrayMapper( object ):
+  """Stands in for matplotlib.cm.ScalarMappable over [0,1].
+"""
+
+  def to_rgba( self, x, bytes = False ):
+    x = np.asarray( x )
+    assert x.ndim == 1, 'to_rgba() called with flattened values'
+    level = (np.nan_to_num( x ).clip( 0.0, 1.0 ) * 255).astype( np.uint8 )
+    result = np.empty( x.shape + ( 4, ), dtype = np.uint8 )
+    result[ ..., 0 : 3 ] = level[ ..., np.newaxis ]
+    result[ ..., 3 ] = 255
+    return  result
+#end GrayMapper
+
+
+#------------------------------------------------------------------------
+#	CLASS:		TestRgbaRaster					-
+#------------------------------------------------------------------------
+class TestRgbaRaster( unittest.TestCase ):
+  """
+"""
+
+
+#		-- Object Methods
+#		--
+
+
+  #----------------------------------------------------------------------
+  #	METHOD:		TestRgbaRaster.test_CreateAxisMap()		-
+  #----------------------------------------------------------------------
+  def test_CreateAxisMap( self ):
+    index, offset = RgbaRaster.CreateAxisMap( 12, [ 1, 4, 7 ], 4 )
+    self.assertEqual(
+        index.tolist(), [ -1, 0, 0, 0, 1, 1, 1, 2, 2, 2, 2, -1 ],
+        'later cells win overlaps'
+        )
+    self.assertEqual( offset[ 4 : 8 ].tolist(), [ 0, 1, 2, 0 ], 'offsets' )
+
+    index, offset = RgbaRaster.CreateAxisMap( 5, [ 0, 2 ], [ 1, 10 ] )
+    self.assertEqual(
+        index.tolist(), [ 0, -1, 1, 1, 1 ], 'variable sizes, clipped'
+        )
+  #end test_CreateAxisMap
+
+
+  #----------------------------------------------------------------------
+  #	METHOD:		TestRgbaRaster.test_CreatePolarMap()		-
+  #----------------------------------------------------------------------
+  def test_CreatePolarMap( self ):
+    r_edges = [ 2, 4, 6 ]
+    theta_edges = [ 0.0, np.pi / 4.0, np.pi / 2.0 ]
+    index = RgbaRaster.CreatePolarMap( 8, 8, ( 0, 0 ), r_edges, theta_edges )
+    self.assertEqual( index.shape, ( 8, 8 ) )
+    self.assertEqual( index[ 0, 0 ], -1, 'inside first radius' )
+    self.assertEqual( index[ 0, 2 ], 0, 'theta 0, r 0' )
+    self.assertEqual( index[ 0, 5 ], 1, 'theta 0, r 1' )
+    self.assertEqual( index[ 4, 1 ], 2 * 1 + 1, 'theta 1 is below, r 1' )
+    self.assertEqual( index[ 7, 7 ], -1, 'beyond last radius' )
+
+    index = RgbaRaster.CreatePolarMap( 8, 8, ( 8, 8 ), r_edges, theta_edges )
+    self.assertTrue( (index == -1).all(), 'quadrant outside image' )
+
+    cached = RgbaRaster.GetPolarMap( 8, 8, ( 0, 0 ), r_edges, theta_edges )
+    self.assertTrue( np.array_equal(
+        cached,
+        RgbaRaster.CreatePolarMap( 8, 8, ( 0, 0 ), r_edges, theta_edges )
+        ) )
+    self.assertIs(
+        RgbaRaster.GetPolarMap( 8, 8, ( 0, 0 ), r_edges, theta_edges ),
+        cached, 'cached'
+        )
+    self.assertFalse( cached.flags.writeable, 'shared map read-only' )
+  #end test_CreatePolarMap
+
+
+  #----------------------------------------------------------------------
+  #	METHOD:		TestRgbaRaster.test_CreateShapeMask()		-
+  #----------------------------------------------------------------------
+  def test_CreateShapeMask( self ):
+    mask = RgbaRaster.CreateShapeMask( 9, 9, 'ellipse' )
+    self.assertEqual( mask[ 0, 0 ], 0, 'corner outside' )
+    self.assertEqual( mask[ 4, 4 ], 1, 'center fill' )
+    self.assertEqual( mask[ 4, 0 ], 2, 'edge outline' )
+
+    mask = RgbaRaster.CreateShapeMask( 3, 2, outline = False )
+    self.assertTrue( (mask == 1).all(), 'rect fill only' )
+  #end test_CreateShapeMask
+
+
+  #----------------------------------------------------------------------
+  #	METHOD:		TestRgbaRaster.test_MapColors()			-
+  #----------------------------------------------------------------------
+  def test_MapColors( self ):
+    values = np.full( ( 2, 3, 4 ), 0.5 )
+    values[ 0, 0, 0 ] = np.nan
+    values[ 1, 1, 1 ] = np.inf
+    factors = np.ones( values.shape )
+    factors[ 1, 2, 3 ] = 0.0
+
+    colors = RgbaRaster.MapColors( values, GrayMapper(), factors )
+    self.assertEqual( colors.shape, ( 2, 3, 4, 4 ), 'shape' )
+    self.assertEqual( int( (colors[ ..., 3 ] == 0).sum() ), 3, 'masked' )
+    self.assertEqual( colors[ 0, 1, 2 ].tolist(), [ 127, 127, 127, 255 ] )
+  #end test_MapColors
+
+
+  #----------------------------------------------------------------------
+  #	METHOD:		TestRgbaRaster.test_PaintCells()		-
+  #----------------------------------------------------------------------
+  def test_PaintCells( self ):
+    colors = np.zeros( ( 2, 2, 4 ), dtype = np.uint8 )
+    colors[ 0, 0 ] = ( 200, 0, 0, 255 )
+    colors[ 1, 1 ] = ( 0, 200, 0, 255 )
+    image = RgbaRaster.CreateImage( 10, 10 )
+    image[ ... ] = ( 1, 2, 3, 4 )
+
+    y_map = RgbaRaster.CreateAxisMap( 10, [ 1, 5 ], 4 )
+    x_map = RgbaRaster.CreateAxisMap( 10, [ 1, 5 ], 4 )
+    RgbaRaster.PaintCells(
+        image, colors, y_map, x_map,
+        RgbaRaster.CreateShapeMask( 4, 4 ),
+        RgbaRaster.DarkenColors( colors, keep_transparent = True )
+        )
+
+#		-- Block replication of the fill color with darker outlines
+    self.assertEqual( image[ 2, 2 ].tolist(), [ 200, 0, 0, 255 ], 'fill' )
+    self.assertEqual( image[ 1, 3 ].tolist(), [ 100, 0, 0, 255 ], 'outline' )
+    self.assertEqual( image[ 7, 7 ].tolist(), [ 0, 200, 0, 255 ], 'fill' )
+#		-- Transparent cell and uncovered pixels unchanged
+    self.assertEqual( image[ 2, 6 ].tolist(), [ 1, 2, 3, 4 ], 'transparent' )
+    self.assertEqual( image[ 0, 0 ].tolist(), [ 1, 2, 3, 4 ], 'uncovered' )
+
+    block = RgbaRaster.CreateImage( 8, 8 )
+    RgbaRaster.PaintCells(
+        block, colors,
+        RgbaRaster.CreateAxisMap( 8, [ 0, 4 ], 4 ),
+        RgbaRaster.CreateAxisMap( 8, [ 0, 4 ], 4 )
+        )
+    expected = np.repeat( np.repeat( colors, 4, axis = 0 ), 4, axis = 1 )
+    self.assertTrue( np.array_equal( block, expected ), 'block replicate' )
+  #end test_PaintCells
+
+
+  #----------------------------------------------------------------------
+  #	METHOD:		TestRgbaRaster.test_PaintIndexed()		-
+  #----------------------------------------------------------------------
+  def test_PaintIndexed( self ):
+    colors = np.zeros( ( 2, 2, 4 ), dtype = np.uint8 )
+    colors[ 0, 1 ] = ( 200, 0, 0, 255 )
+    colors[ 1, 0 ] = ( 0, 200, 0, 255 )
+    index_map = np.array( [ [ -1, 0, 1 ], [ 2, 3, 1 ] ] )
+    image = RgbaRaster.CreateImage( 5, 4 )
+    image[ ... ] = ( 1, 2, 3, 4 )
+
+    RgbaRaster.PaintIndexed( image[ 1 : 3, 1 : 4 ], colors, index_map )
+    self.assertEqual( image[ 1, 3 ].tolist(), [ 200, 0, 0, 255 ], 'cell 1' )
+    self.assertEqual( image[ 2, 3 ].tolist(), [ 200, 0, 0, 255 ], 'cell 1' )
+    self.assertEqual( image[ 2, 1 ].tolist(), [ 0, 200, 0, 255 ], 'cell 2' )
+    for y, x in ( ( 1, 1 ), ( 1, 2 ), ( 2, 2 ), ( 0, 0 ), ( 3, 4 ) ):
+      self.assertEqual(
+          image[ y, x ].tolist(), [ 1, 2, 3, 4 ], 'unchanged %d,%d' % ( y, x )
+          )
+  #end test_PaintIndexed
+
+
+#		-- Static Methods
+#		--
+
+#end TestRgbaRaster
+
+
+#------------------------------------------------------------------------
+#	NAME:		main()						-
+#------------------------------------------------------------------------
+if __name__ == '__main__':
+  suite = unittest.TestLoader().loadTestsFromTestCase( TestRgbaRaster )
+  unittest.TextTestRunner( verbosity = 2 ).run( suite )
@@ -0,0 +1,154 @@
+#!/usr/bin/env python
+# $Id$
+#------------------------------------------------------------------------
+#	NAME:		test_slice_cache.py				-
+#	HISTORY:							-
+#		2026-10-18						-
+#------------------------------------------------------------------------
+import os, sys, threading, time, traceback, unittest
+import numpy as np
+
+sys.path.insert( 0, os.path.join( os.path.dirname( __file__ ), os.pardir ) )
+
+from data.slice_cache import *
+
+
+#------------------------------------------------------------------------
+#	CLASS:		TestSliceCache					-
+#------------------------------------------------------------------------
+class TestSliceCache( unittest.TestCase ):
+  """
+"""
+
+
+#		-- Object Methods
+#		--
+
+
+  #----------------------------------------------------------------------
+  #	METHOD:		TestSliceCache._Loader()			-
+  #----------------------------------------------------------------------
+  def _Loader( self, value, delay = 0.0 ):
+    def load():
+      with self.lock:
+        self.loadCount += 1
+      if delay > 0.0:
+        time.sleep( delay )
+      return  np.full( ( 4, 4, 2, 2 ), value )
+    return  load
+  #end _Loader
+
+
+  #----------------------------------------------------------------------
+  #	METHOD:		TestSliceCache.setUp()				-
+  #----------------------------------------------------------------------
+  def setUp( self ):
+    self.budget = SliceCache.GetBudget()
+    self.loadCount = 0
+    self.lock = threading.Lock()
+    SliceCache.Clear()
+  #end setUp
+
+
+  #----------------------------------------------------------------------
+  #	METHOD:		TestSliceCache.tearDown()			-
+  #----------------------------------------------------------------------
+  def tearDown( self ):
+    SliceCache.SetBudget( self.budget )
+    SliceCache.Clear()
+  #end tearDown
+
+
+  #----------------------------------------------------------------------
+  #	METHOD:		TestSliceCache.test_Evict()			-
+  #----------------------------------------------------------------------
+  def test_Evict( self ):
+    nbytes = np.full( ( 4, 4, 2, 2 ), 0.0 ).nbytes
+    SliceCache.SetBudget( nbytes * 2 )
+
+    held = SliceCache.Acquire( ( 'm', 'ds', 0, '' ), 1, self._Loader( 0.0 ) )
+    SliceCache.Get( ( 'm', 'ds', 1, '' ), 1, self._Loader( 1.0 ) )
+    SliceCache.Get( ( 'm', 'ds', 2, '' ), 1, self._Loader( 2.0 ) )
+    self.assertEqual( SliceCache.GetBytes(), nbytes * 2, 'within budget' )
+
+    SliceCache.Get( ( 'm', 'ds', 0, '' ), 1, self._Loader( 0.0 ) )
+    SliceCache.Get( ( 'm', 'ds', 2, '' ), 1, self._Loader( 2.0 ) )
+    self.assertEqual( self.loadCount, 3, 'held entry not evicted' )
+
+    SliceCache.Release( held )
+    SliceCache.SetBudget( nbytes )
+    SliceCache.Get( ( 'm', 'ds', 2, '' ), 1, self._Loader( 2.0 ) )
+    self.assertEqual( self.loadCount, 3, 'most recent kept' )
+    SliceCache.Get( ( 'm', 'ds', 0, '' ), 1, self._Loader( 0.0 ) )
+    self.assertEqual( self.loadCount, 4, 'released entry evicted' )
+
+    SliceCache.Clear( 'm' )
+    self.assertEqual( SliceCache.GetBytes(), 0, 'cleared' )
+  #end test_Evict
+
+
+  #----------------------------------------------------------------------
+  #	METHOD:		TestSliceCache.test_Get()			-
+  #----------------------------------------------------------------------
+  def test_Get( self ):
+    key = ( 'm', 'ds', 0, '' )
+    results = []
+    threads = [
+        threading.Thread( target = lambda: results.append(
+            SliceCache.Get( key, 1, self._Loader( 1.0, 0.05 ) )
+            ) )
+        for i in xrange( 4 )
+        ]
+    for t in threads:
+      t.start()
+    for t in threads:
+      t.join()
+
+    self.assertEqual( self.loadCount, 1, 'one read for concurrent requests' )
+    self.assertTrue( all( r is results[ 0 ] for r in results ), 'shared' )
+    self.assertFalse( results[ 0 ].flags.writeable, 'read-only' )
+
+    replaced = SliceCache.Get( key, 2, self._Loader( 2.0 ) )
+    self.assertEqual( self.loadCount, 2, 'dataset identity changed' )
+    self.assertEqual( replaced[ 0, 0, 0, 0 ], 2.0 )
+
+    self.assertIsNone( SliceCache.Get( ( 'm', 'x', 0, '' ), 1, lambda: None ) )
+  #end test_Get
+
+
+  #----------------------------------------------------------------------
+  #	METHOD:		TestSliceCache.test_ReadOnly()			-
+  #----------------------------------------------------------------------
+  def test_ReadOnly( self ):
+    """Read-only arrays are cached without a copy, others are copied.
+"""
+    source = np.full( ( 4, 4, 2, 2 ), 1.0 )
+    result = SliceCache.Get( ( 'm', 'ds', 0, '' ), 1, lambda: source )
+    self.assertIsNot( result, source )
+    self.assertFalse( result.flags.writeable )
+    self.assertTrue( source.flags.writeable, 'source untouched' )
+
+    source.flags.writeable = False
+    result = SliceCache.Acquire( ( 'm', 'ds', 1, '' ), 1, lambda: source )
+    self.assertIs( result, source )
+    self.assertEqual( SliceCache.GetBytes(), source.nbytes * 2 )
+
+    SliceCache.SetBudget( 0 )
+    self.assertEqual( SliceCache.GetBytes(), source.nbytes, 'held' )
+    SliceCache.Release( result )
+    self.assertEqual( SliceCache.GetBytes(), 0 )
+  #end test_ReadOnly
+
+
+#		-- Static Methods
+#		--
+
+#end TestSliceCache
+
+
+#------------------------------------------------------------------------
+#	NAME:		main()						-
+#------------------------------------------------------------------------
+if __name__ == '__main__':
+  suite = unittest.TestLoader().loadTestsFromTestCase( TestSliceCache )
+  unittest.TextTestRunner( verbosity = 2 ).run( suite )
@@ -0,0 +1,228 @@
+#!/usr/bin/env python
+# $Id$
+#------------------------------------------------------------------------
+#	NAME:		test_state_pool.py				-
+#	HISTORY:							-
+#		2026-10-18						-
+#------------------------------------------------------------------------
+import os, sys, threading, time, traceback, unittest
+
+sys.path.insert( 0, os.path.join( os.path.dirname( __file__ ), os.pardir ) )
+
+from data.state_pool import *
+
+
+#------------------------------------------------------------------------
+#	CLASS:		TestStatePool					-
+#------------------------------------------------------------------------
+class TestStatePool( unittest.TestCase ):
+  """
+"""
+
+
+#		-- Object Methods
+#		--
+
+
+  #----------------------------------------------------------------------
+  #	METHOD:		TestStatePool._Compute()			-
+  #----------------------------------------------------------------------
+  def _Compute( self, state_ndx ):
+    """Sleeps longer for earlier states so results arrive out of order.
+"""
+    with self.lock:
+      self.computeThreads.add( threading.current_thread().name )
+      self.computed.append( state_ndx )
+    time.sleep( 0.002 * (20 - state_ndx % 20) )
+    return  state_ndx * 10
+  #end _Compute
+
+
+  #----------------------------------------------------------------------
+  #	METHOD:		TestStatePool.setUp()				-
+  #----------------------------------------------------------------------
+  def setUp( self ):
+    self.computeThreads = set()
+    self.computed = []
+    self.lock = threading.Lock()
+    self.writes = []
+  #end setUp
+
+
+  #----------------------------------------------------------------------
+  #	METHOD:		TestStatePool.test_Cancel()			-
+  #----------------------------------------------------------------------
+  def test_Cancel( self ):
+    cancel_event = threading.Event()
+    callbacks = []
+
+    def callback( state_ndx ):
+      callbacks.append( state_ndx )
+      if len( callbacks ) == 5:
+        cancel_event.set()
+
+    for worker_count in ( 1, 4 ):
+      del callbacks[ : ]
+      del self.writes[ : ]
+      cancel_event.clear()
+      completed = StatePool( worker_count ).Run(
+          xrange( 30 ), self._Compute, self._Write, callback, cancel_event
+          )
+      self.assertFalse( completed, 'cancelled, %d workers' % worker_count )
+      self.assertEqual( callbacks, range( 5 ) )
+      self.assertEqual( [ w[ 0 ] for w in self.writes ], range( 5 ) )
+
+    self.assertTrue(
+        StatePool( 4 ).Run( [], self._Compute, cancel_event = cancel_event ),
+        'nothing to do'
+        )
+    self.assertFalse(
+        StatePool( 4 ).Run( xrange( 3 ), self._Compute, self._Write,
+            cancel_event = cancel_event ),
+        'cancelled before start'
+        )
+  #end test_Cancel
+
+
+  #----------------------------------------------------------------------
+  #	METHOD:		TestStatePool.test_Discard()			-
+  #----------------------------------------------------------------------
+  def test_Discard( self ):
+    """Every result computed is either written or discarded.
+"""
+    cancel_event = threading.Event()
+    discards = []
+
+    def callback( state_ndx ):
+      if state_ndx == 4:
+        cancel_event.set()
+
+    def compute( state_ndx ):
+      if state_ndx == 12:
+        raise ValueError( 'compute %d' % state_ndx )
+      return  self._Compute( state_ndx )
+
+    def discard( state_ndx, result ):
+      discards.append( ( state_ndx, result ) )
+
+    def handled():
+      return  sorted(
+          [ w[ 0 ] for w in self.writes ] + [ d[ 0 ] for d in discards ]
+          )
+
+    for worker_count in ( 1, 4 ):
+      del discards[ : ]
+      del self.computed[ : ]
+      del self.writes[ : ]
+      cancel_event.clear()
+      self.assertFalse( StatePool( worker_count ).Run(
+          xrange( 30 ), self._Compute, self._Write, callback, cancel_event,
+          discard
+          ) )
+      self.assertEqual( [ w[ 0 ] for w in self.writes ], range( 5 ) )
+      self.assertEqual(
+          sorted( self.computed ), handled(),
+          'cancelled, %d workers' % worker_count
+          )
+      self.assertTrue( all( r == i * 10 for i, r in discards ) )
+    self.assertTrue( len( discards ) > 0, 'computed ahead' )
+
+    del discards[ : ]
+    del self.computed[ : ]
+    del self.writes[ : ]
+    with self.assertRaises( ValueError ):
+      StatePool( 4 ).Run(
+          xrange( 30 ), compute, self._Write, discard_func = discard
+          )
+    self.assertEqual( sorted( self.computed ), handled(), 'error' )
+  #end test_Discard
+
+
+  #----------------------------------------------------------------------
+  #	METHOD:		TestStatePool.test_Error()			-
+  #----------------------------------------------------------------------
+  def test_Error( self ):
+    def compute( state_ndx ):
+      if state_ndx == 7:
+        raise ValueError( 'compute %d' % state_ndx )
+      return  self._Compute( state_ndx )
+
+    def write( state_ndx, result ):
+      if state_ndx == 3:
+        raise KeyError( 'write %d' % state_ndx )
+      self._Write( state_ndx, result )
+
+    for worker_count in ( 1, 4 ):
+      del self.writes[ : ]
+      with self.assertRaises( ValueError ) as ctx:
+        StatePool( worker_count ).Run( xrange( 20 ), compute, self._Write )
+      self.assertEqual( str( ctx.exception ), 'compute 7' )
+      self.assertTrue(
+          all( w[ 0 ] < 7 for w in self.writes ),
+          'no writes past the failed state'
+          )
+
+      with self.assertRaises( KeyError ):
+        StatePool( worker_count ).Run( xrange( 20 ), self._Compute, write )
+
+    self.assertEqual(
+        [ th.name for th in threading.enumerate()
+            if th.name.startswith( 'StatePool' ) ],
+        [], 'workers joined'
+        )
+  #end test_Error
+
+
+  #----------------------------------------------------------------------
+  #	METHOD:		TestStatePool.test_Run()			-
+  #----------------------------------------------------------------------
+  def test_Run( self ):
+    callbacks = []
+    state_indexes = range( 40 )
+    state_indexes.reverse()
+    caller = threading.current_thread().name
+
+    completed = StatePool( 4 ).Run(
+        state_indexes, self._Compute, self._Write, callbacks.append
+        )
+    self.assertTrue( completed )
+    self.assertEqual(
+        self.writes, [ ( i, i * 10, caller ) for i in state_indexes ],
+        'written in order on the calling thread'
+        )
+    self.assertEqual( callbacks, state_indexes )
+    self.assertTrue( len( self.computeThreads ) > 1, 'computed on workers' )
+    self.assertNotIn( caller, self.computeThreads )
+
+    self.computeThreads.clear()
+    del self.writes[ : ]
+    self.assertTrue(
+        StatePool( 1 ).Run( xrange( 3 ), self._Compute, self._Write )
+        )
+    self.assertEqual( self.computeThreads, set( [ caller ] ), 'single worker' )
+    self.assertEqual( [ w[ 1 ] for w in self.writes ], [ 0, 10, 20 ] )
+  #end test_Run
+
+
+  #----------------------------------------------------------------------
+  #	METHOD:		TestStatePool._Write()				-
+  #----------------------------------------------------------------------
+  def _Write( self, state_ndx, result ):
+    self.writes.append(
+        ( state_ndx, result, threading.current_thread().name )
+        )
+  #end _Write
+
+
+#		-- Static Methods
+#		--
+
+#end TestStatePool
+
+
+#------------------------------------------------------------------------
+#	NAME:		main()						-
+#------------------------------------------------------------------------
+if __name__ == '__main__':
+  suite = unittest.TestLoader().loadTestsFromTestCase( TestStatePool )
+  unittest.TextTestRunner( verbosity = 2 ).run( suite )
@@ -0,0 +1,127 @@
+#!/usr/bin/env python
+# $Id$
+#------------------------------------------------------------------------
+#	NAME:		test_state_scheduler.py				-
+#	HISTORY:							-
+#		2026-10-18						-
+#------------------------------------------------------------------------
+import os, sys, time, traceback, unittest
+
+sys.path.insert( 0, os.path.join( os.path.dirname( __file__ ), os.pardir ) )
+
+from event.state_scheduler import *
+
+
+#------------------------------------------------------------------------
+#	CLASS:		Target						-
+#------------------------------------------------------------------------
+class Target( object ):
+  """Stands in for a widget, recording updates.
+"""
+
+  def __init__( self, name, updates, visible = True, delay = 0.0 ):
+    self.alive = True
+    self.delay = delay
+    self.name = name
+    self.updates = updates
+    self.visible = visible
+
+  def __nonzero__( self ):
+    return  self.alive
+
+  def IsVisible( self ):
+    return  self.visible
+
+  def Update( self, reason ):
+    if self.delay > 0.0:
+      time.sleep( self.delay )
+    self.updates.append( ( self.name, reason ) )
+#end Target
+
+
+#------------------------------------------------------------------------
+#	CLASS:		TestStateChangeScheduler			-
+#------------------------------------------------------------------------
+class TestStateChangeScheduler( unittest.TestCase ):
+  """
+"""
+
+
+#		-- Object Methods
+#		--
+
+
+  #----------------------------------------------------------------------
+  #	METHOD:		TestStateChangeScheduler.setUp()		-
+  #----------------------------------------------------------------------
+  def setUp( self ):
+    self.posted = []
+    self.updates = []
+  #end setUp
+
+
+  #----------------------------------------------------------------------
+  #	METHOD:		TestStateChangeScheduler.test_Budget()		-
+  #----------------------------------------------------------------------
+  def test_Budget( self ):
+    scheduler = StateChangeScheduler( self.posted.append, 0.01 )
+    targets = [
+        Target( i, self.updates, delay = 0.02 ) for i in xrange( 3 )
+        ]
+    for t in targets:
+      scheduler.Schedule( t, 0x1, t.Update )
+
+    self.assertEqual( scheduler.Flush(), 1, 'at least one per flush' )
+    self.assertEqual( len( self.posted ), 2, 'flush reposted' )
+    scheduler.frameBudget = 1.0
+    self.assertEqual( self.posted.pop()(), 2 )
+    self.assertEqual( [ u[ 0 ] for u in self.updates ], [ 0, 1, 2 ] )
+  #end test_Budget
+
+
+  #----------------------------------------------------------------------
+  #	METHOD:		TestStateChangeScheduler.test_Schedule()	-
+  #----------------------------------------------------------------------
+  def test_Schedule( self ):
+    scheduler = StateChangeScheduler( self.posted.append )
+    hidden = Target( 'hidden', self.updates, visible = False )
+    visible = Target( 'visible', self.updates )
+    dead = Target( 'dead', self.updates )
+    cancelled = Target( 'cancelled', self.updates )
+
+    for t in ( hidden, visible, dead, cancelled ):
+      scheduler.Schedule( t, 0x2, t.Update, t.IsVisible )
+    for i in xrange( 10 ):
+      scheduler.Schedule( hidden, 0x1 << (i % 3), hidden.Update, hidden.IsVisible )
+      scheduler.Schedule( visible, 0x8, visible.Update, visible.IsVisible )
+
+    self.assertEqual( len( self.posted ), 1, 'one flush posted' )
+    self.assertEqual( scheduler.GetPendingReason( hidden ), 0x7, 'merged' )
+    self.assertEqual( scheduler.Cancel( cancelled ), 0x2 )
+    dead.alive = False
+
+    self.assertEqual( self.posted.pop()(), 2 )
+    self.assertEqual(
+        self.updates, [ ( 'visible', 0xa ), ( 'hidden', 0x7 ) ],
+        'visible first, merged reasons, dead and cancelled skipped'
+        )
+    self.assertEqual( len( self.posted ), 0, 'nothing pending' )
+
+    scheduler.Schedule( hidden, 0x10, hidden.Update )
+    self.assertEqual( len( self.posted ), 1, 'posted again' )
+  #end test_Schedule
+
+
+#		-- Static Methods
+#		--
+
+#end TestStateChangeScheduler
+
+
+#------------------------------------------------------------------------
+#	NAME:		main()						-
+#------------------------------------------------------------------------
+if __name__ == '__main__':
+  suite = unittest.TestLoader().\
+      loadTestsFromTestCase( TestStateChangeScheduler )
+  unittest.TextTestRunner( verbosity = 2 ).run( suite )
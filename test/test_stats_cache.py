@@ -0,0 +1,224 @@
+#!/usr/bin/env python
+# $Id$
+#------------------------------------------------------------------------
+#	NAME:		test_stats_cache.py				-
+#	HISTORY:							-
+#		2026-10-18						-
+#------------------------------------------------------------------------
+import os, shutil, sys, tempfile, time, traceback, unittest
+import numpy as np
+
+sys.path.insert( 0, os.path.join( os.path.dirname( __file__ ), os.pardir ) )
+
+from data.config import Config
+from data.datamodel import DataModel
+from data.stats_cache import *
+from vera_file import CreateVeraFile
+
+
+#------------------------------------------------------------------------
+#	CLASS:		TestStatsCache					-
+#------------------------------------------------------------------------
+class TestStatsCache( unittest.TestCase ):
+  """
+"""
+
+
+#		-- Object Methods
+#		--
+
+
+  #----------------------------------------------------------------------
+  #	METHOD:		TestStatsCache._Fill()				-
+  #----------------------------------------------------------------------
+  def _Fill( self, cache ):
+    cache.PutStats(
+        self.key, 1, 3,
+        dict( min = 0.5, max = 2.5, argmin = 4, argmax = 7, count = 9 )
+        )
+    cache.PutHistogram(
+        self.key, 1, 3, np.arange( 4 ), np.linspace( 0.5, 2.5, 5 )
+        )
+    cache.PutStats(
+        self.sessionKey, 0, 3, dict( min = 1.0 ), persist = False
+        )
+  #end _Fill
+
+
+  #----------------------------------------------------------------------
+  #	METHOD:		TestStatsCache.setUp()				-
+  #----------------------------------------------------------------------
+  def setUp( self ):
+    self.tempDir = tempfile.mkdtemp()
+    self.cachePath = os.path.join( self.tempDir, 'source.stats.h5' )
+    self.key = StatsCache.CreateKey( 'pin_powers', '[:,:,1,:]', True )
+    self.sessionKey = StatsCache.CreateKey( 'session' )
+    self.sourcePath = os.path.join( self.tempDir, 'source.h5' )
+    with open( self.sourcePath, 'wb' ) as fp:
+      fp.write( b'\0' * 64 )
+  #end setUp
+
+
+  #----------------------------------------------------------------------
+  #	METHOD:		TestStatsCache.tearDown()			-
+  #----------------------------------------------------------------------
+  def tearDown( self ):
+    shutil.rmtree( self.tempDir, True )
+  #end tearDown
+
+
+  #----------------------------------------------------------------------
+  #	METHOD:		TestStatsCache.test_DataModel()			-
+  #----------------------------------------------------------------------
+  def test_DataModel( self ):
+    Config.SetCacheDir( os.path.join( self.tempDir, 'cache' ) )
+    model = DataModel(
+        CreateVeraFile( os.path.join( self.tempDir, 'vera.h5' ), 4 )
+        )
+    try:
+      model.WaitReady()
+      der_name = model.CreateDerivedDataSet2( 'pin_powers', 3, 'der_test' )
+      addr, state_ndx, value = model.FindMinMaxValueAddr( 'max', der_name )
+      self.assertTrue( value < 1.0 )
+      self.assertEqual( len( model.statsCache.memoryKeys ), 1, 'session' )
+
+#		-- Recreated from another source
+      for i in xrange( model.GetStatesCount() ):
+        model.GetDerivedState( i ).RemoveDataSet( der_name )
+      model.CreateDerivedDataSet2( 'pin_cladtemps', 3, der_name )
+      addr, state_ndx, value = model.FindMinMaxValueAddr( 'max', der_name )
+      self.assertTrue( value > 1.0, 'not the stale pin_powers maximum' )
+
+      model.SetDataSetThreshold( der_name, '>= 0.5' )
+      self.assertEqual( len( model.statsCache.memoryKeys ), 0, 'threshold' )
+    finally:
+      model.Close()
+      Config.SetCacheDir( None )
+  #end test_DataModel
+
+
+  #----------------------------------------------------------------------
+  #	METHOD:		TestStatsCache.test_Flush()			-
+  #----------------------------------------------------------------------
+  def test_Flush( self ):
+    cache = StatsCache( self.sourcePath, self.cachePath )
+    self._Fill( cache )
+    cache.Flush()
+    self.assertFalse( os.path.exists( self.cachePath ), 'within interval' )
+
+    cache.lastFlushTime -= StatsCache.FLUSH_INTERVAL
+    cache.Flush()
+    self.assertTrue( os.path.exists( self.cachePath ), 'interval passed' )
+    self.assertEqual( len( cache.dirtyKeys ), 0 )
+
+    cache.PutStats( self.key, 2, 3, dict( min = 3.0 ) )
+    cache.Flush()
+    self.assertIsNone(
+        StatsCache( self.sourcePath, self.cachePath ).GetStats( self.key, 2 ),
+        'not yet written'
+        )
+    cache.Close()
+    self.assertEqual(
+        StatsCache( self.sourcePath, self.cachePath ).
+            GetStats( self.key, 2 )[ 'min' ],
+        3.0, 'written on close'
+        )
+  #end test_Flush
+
+
+  #----------------------------------------------------------------------
+  #	METHOD:		TestStatsCache.test_Invalidate()		-
+  #----------------------------------------------------------------------
+  def test_Invalidate( self ):
+    cache = StatsCache( self.sourcePath, self.cachePath )
+    self._Fill( cache )
+    cache.Close()
+
+#		-- Modification time
+    st = os.stat( self.sourcePath )
+    os.utime( self.sourcePath, ( st.st_atime, st.st_mtime + 10.0 ) )
+    cache = StatsCache( self.sourcePath, self.cachePath )
+    self.assertIsNone( cache.GetStats( self.key, 1 ), 'mtime changed' )
+    self._Fill( cache )
+    cache.Close()
+    self.assertIsNotNone(
+        StatsCache( self.sourcePath, self.cachePath ).GetStats( self.key, 1 ),
+        'rewritten'
+        )
+
+#		-- Size, same modification time
+    st = os.stat( self.sourcePath )
+    with open( self.sourcePath, 'ab' ) as fp:
+      fp.write( b'\0' )
+    os.utime( self.sourcePath, ( st.st_atime, st.st_mtime ) )
+    cache = StatsCache( self.sourcePath, self.cachePath )
+    self.assertIsNone( cache.GetStats( self.key, 1 ), 'size changed' )
+    self.assertIsNone( cache.GetHistogram( self.key, 1, 4 ) )
+  #end test_Invalidate
+
+
+  #----------------------------------------------------------------------
+  #	METHOD:		TestStatsCache.test_Persist()			-
+  #----------------------------------------------------------------------
+  def test_Persist( self ):
+    cache = StatsCache( self.sourcePath, self.cachePath )
+    self._Fill( cache )
+    cache.Close()
+
+    cache = StatsCache( self.sourcePath, self.cachePath )
+    stats = cache.GetStats( self.key, 1 )
+    self.assertEqual( stats[ 'min' ], 0.5 )
+    self.assertEqual( stats[ 'max' ], 2.5 )
+    self.assertEqual( stats[ 'argmax' ], 7 )
+    self.assertEqual( stats[ 'count' ], 9 )
+    self.assertEqual( stats[ 'nan_count' ], 0, 'fill value' )
+    self.assertIsNone( cache.GetStats( self.key, 0 ), 'state not stored' )
+
+    counts, edges = cache.GetHistogram( self.key, 1, 4 )
+    self.assertTrue( np.array_equal( counts, np.arange( 4 ) ) )
+    self.assertTrue( np.allclose( edges, np.linspace( 0.5, 2.5, 5 ) ) )
+
+    self.assertIsNone( cache.GetStats( self.sessionKey, 0 ), 'memory only' )
+
+    mem_cache = StatsCache( self.sourcePath, self.cachePath, False )
+    self.assertIsNone( mem_cache.cachePath )
+    self.assertIsNone( mem_cache.GetStats( self.key, 1 ), 'not loaded' )
+  #end test_Persist
+
+
+  #----------------------------------------------------------------------
+  #	METHOD:		TestStatsCache.test_Remove()			-
+  #----------------------------------------------------------------------
+  def test_Remove( self ):
+    cache = StatsCache( self.sourcePath, self.cachePath )
+    self._Fill( cache )
+    cache.PutHistogram(
+        self.sessionKey, 0, 3, np.arange( 2 ), np.arange( 3 )
+        )
+    cache.PutHistogram(
+        self.sessionKey, 0, 3, np.arange( 3 ), np.arange( 4 ), persist = False
+        )
+
+    self.assertEqual( cache.Remove( 'pin_powers' ), 0, 'persistent kept' )
+    self.assertIsNotNone( cache.GetStats( self.key, 1 ) )
+    self.assertEqual( cache.Remove( 'session' ), 2 )
+    self.assertIsNone( cache.GetStats( self.sessionKey, 0 ) )
+    self.assertIsNone( cache.GetHistogram( self.sessionKey, 0, 3 ) )
+    self.assertIsNotNone(
+        cache.GetHistogram( self.sessionKey, 0, 2 ), 'persistent kept'
+        )
+  #end test_Remove
+
+
+#		-- Static Methods
+#		--
+
+#end TestStatsCache
+
+
+#------------------------------------------------------------------------
+#	NAME:		main()						-
+#------------------------------------------------------------------------
+if __name__ == '__main__':
+  suite = unittest.TestLoader().loadTestsFromTestCase( TestStatsCache )
+  unittest.TextTestRunner( verbosity = 2 ).run( suite )
@@ -0,0 +1,119 @@
+#!/usr/bin/env python
+# $Id$
+#------------------------------------------------------------------------
+#	NAME:		test_time_store.py				-
+#	HISTORY:							-
+#		2026-10-18						-
+#------------------------------------------------------------------------
+import h5py, os, shutil, sys, tempfile, traceback, unittest
+import numpy as np
+
+sys.path.insert( 0, os.path.join( os.path.dirname( __file__ ), os.pardir ) )
+
+from data.time_store import *
+
+
+#------------------------------------------------------------------------
+#	CLASS:		TestTimeStore					-
+#------------------------------------------------------------------------
+class TestTimeStore( unittest.TestCase ):
+  """
+"""
+
+
+#		-- Object Methods
+#		--
+
+
+  #----------------------------------------------------------------------
+  #	METHOD:		TestTimeStore.setUp()				-
+  #----------------------------------------------------------------------
+  def setUp( self ):
+    self.tempDir = tempfile.mkdtemp()
+    self.sourcePath = os.path.join( self.tempDir, 'source.h5' )
+
+    rand = np.random.RandomState( 0 )
+    self.values = {}
+    h5f = h5py.File( self.sourcePath, 'w' )
+#		-- STATE_0003 missing, as in files with skipped states
+    for n in ( 1, 2, 4, 5 ):
+      group = h5f.create_group( 'STATE_%04d' % n )
+      for name, shape in \
+          ( ( 'keff', ( 1, ) ), ( 'pin_powers', ( 3, 3, 4, 5 ) ) ):
+        data = rand.uniform( size = shape )
+        group.create_dataset( name, data = data )
+        self.values.setdefault( name, [] ).append( data )
+      if n > 1:
+        group.create_dataset( 'partial', data = [ 1.0 ] )
+    h5f.close()
+  #end setUp
+
+
+  #----------------------------------------------------------------------
+  #	METHOD:		TestTimeStore.tearDown()			-
+  #----------------------------------------------------------------------
+  def tearDown( self ):
+    shutil.rmtree( self.tempDir, True )
+  #end tearDown
+
+
+  #----------------------------------------------------------------------
+  #	METHOD:		TestTimeStore.test_Build()			-
+  #----------------------------------------------------------------------
+  def test_Build( self ):
+    store_path = os.path.splitext( self.sourcePath )[ 0 ] + '.time.h5'
+    saved_slab_bytes = TimeStore.SLAB_BYTES
+    TimeStore.SLAB_BYTES = 1
+    try:
+      TimeStore.Build( self.sourcePath, store_path )
+    finally:
+      TimeStore.SLAB_BYTES = saved_slab_bytes
+
+    store = TimeStore.Open( self.sourcePath, 4 )
+    self.assertIsNotNone( store, 'sidecar store found' )
+    try:
+      self.assertEqual( store.stateCount, 4 )
+      self.assertFalse( store.HasDataSet( 'partial' ), 'not in every state' )
+      for name, states in self.values.iteritems():
+        dset = store.GetDataSet( name )
+        self.assertEqual( dset.shape, states[ 0 ].shape + ( 4, ) )
+        self.assertTrue(
+            np.array_equal( dset[ ... ], np.stack( states, axis = -1 ) ),
+            name + ' transposed'
+            )
+    finally:
+      store.Close()
+
+    self.assertIsNone( TimeStore.Open( self.sourcePath, 5 ), 'state count' )
+#		-- Stale once the source changes
+    with open( self.sourcePath, 'ab' ) as fp:
+      fp.write( '\0' )
+    self.assertIsNone( TimeStore.FindStorePath( self.sourcePath ), 'stale' )
+  #end test_Build
+
+
+  #----------------------------------------------------------------------
+  #	METHOD:		TestTimeStore.test_CreateChunks()		-
+  #----------------------------------------------------------------------
+  def test_CreateChunks( self ):
+    chunks = TimeStore.CreateChunks( ( 17, 17, 49, 193 ), 60, 8 )
+    self.assertEqual( chunks[ -1 ], 60, 'full time axis' )
+    self.assertLessEqual(
+        np.prod( chunks ) * 8, TimeStore.CHUNK_BYTES, 'chunk size'
+        )
+    self.assertEqual( chunks[ 0 : 2 ], ( 17, 17 ), 'leading axes first' )
+  #end test_CreateChunks
+
+
+#		-- Static Methods
+#		--
+
+#end TestTimeStore
+
+
+#------------------------------------------------------------------------
+#	NAME:		main()						-
+#------------------------------------------------------------------------
+if __name__ == '__main__':
+  suite = unittest.TestLoader().loadTestsFromTestCase( TestTimeStore )
+  unittest.TextTestRunner( verbosity = 2 ).run( suite )
@@ -0,0 +1,261 @@
+#!/usr/bin/env python
+# $Id$
+#------------------------------------------------------------------------
+#	NAME:		test_time_values.py				-
+#	HISTORY:							-
+#		2026-10-18						-
+#------------------------------------------------------------------------
+import h5py, os, shutil, sys, tempfile, traceback, unittest
+import numpy as np
+
+sys.path.insert( 0, os.path.join( os.path.dirname( __file__ ), os.pardir ) )
+
+from data.config import Config
+from data.datamodel import DataModel
+from data.time_store import TimeStore
+from vera_file import CreateVeraFile
+
+
+#------------------------------------------------------------------------
+#	CLASS:		TestTimeValues					-
+#------------------------------------------------------------------------
+class TestTimeValues( unittest.TestCase ):
+  """DataModel.ReadDataSetTimeValues() against the values in the file.
+"""
+
+
+#		-- Object Methods
+#		--
+
+
+  #----------------------------------------------------------------------
+  #	METHOD:		TestTimeValues._ReadFile()			-
+  #----------------------------------------------------------------------
+  def _ReadFile( self, ds_name ):
+    """
+@return			np.ndarray with states on the first axis
+"""
+    h5f = h5py.File( self.path, 'r' )
+    try:
+      result = np.array([
+          np.array( h5f[ 'STATE_%04d' % (i + 1) ][ ds_name ] )
+          for i in xrange( self.model.GetStatesCount() )
+          ])
+    finally:
+      h5f.close()
+    return  result
+  #end _ReadFile
+
+
+  #----------------------------------------------------------------------
+  #	METHOD:		TestTimeValues.setUp()				-
+  #----------------------------------------------------------------------
+  def setUp( self ):
+    self.tempDir = tempfile.mkdtemp()
+    Config.SetCacheDir( os.path.join( self.tempDir, 'cache' ) )
+    self.path = CreateVeraFile( os.path.join( self.tempDir, 'vera.h5' ), 5 )
+    self.model = DataModel( self.path )
+    self.model.WaitReady()
+  #end setUp
+
+
+  #----------------------------------------------------------------------
+  #	METHOD:		TestTimeValues.tearDown()			-
+  #----------------------------------------------------------------------
+  def tearDown( self ):
+    self.model.Close()
+    Config.SetCacheDir( None )
+    shutil.rmtree( self.tempDir, True )
+  #end tearDown
+
+
+  #----------------------------------------------------------------------
+  #	METHOD:		TestTimeValues.test_Cache()			-
+  #----------------------------------------------------------------------
+  def test_Cache( self ):
+    """Values are cached per pin, so only pins not yet read are read.
+"""
+    spec = dict(
+        ds_name = 'pin_powers', assembly_index = 2, axial_cm = 150.0,
+        sub_addrs = [ ( 1, 1 ), ( 2, 3 ) ]
+        )
+    self.model.ReadDataSetTimeValues( spec )
+    keys = [ k for k in self.model.timeValuesCache if k[ 0 ] == 'pin_powers' ]
+    self.assertEqual( sorted( k[ 2 ] for k in keys ), [ ( 1, 1 ), ( 2, 3 ) ] )
+
+#		-- Marked cached value is returned for the pin already read
+    marked_key = [ k for k in keys if k[ 2 ] == ( 1, 1 ) ][ 0 ]
+    self.model.timeValuesCache[ marked_key ] = np.arange( 5.0 )
+    result = self.model.ReadDataSetTimeValues(
+        dict( spec, sub_addrs = [ ( 4, 4 ), ( 1, 1 ) ] )
+        )
+    self.assertEqual(
+        sorted( result[ 'pin_powers' ].keys() ), [ ( 1, 1 ), ( 4, 4 ) ]
+        )
+    self.assertTrue(
+        np.array_equal( result[ 'pin_powers' ][ ( 1, 1 ) ], np.arange( 5.0 ) )
+        )
+    ax_ndx = self.model.CreateAxialValue( cm = 150.0 ).pinIndex
+    self.assertTrue( np.allclose(
+        result[ 'pin_powers' ][ ( 4, 4 ) ],
+        self._ReadFile( 'pin_powers' )[ :, 4, 4, ax_ndx, 2 ]
+        ) )
+    self.assertEqual(
+        len([ k for k in self.model.timeValuesCache
+            if k[ 0 ] == 'pin_powers' ]),
+        3
+        )
+
+#		-- Copies in and out
+    result[ 'pin_powers' ][ ( 4, 4 ) ][ : ] = -1.0
+    self.assertTrue( np.all(
+        self.model.ReadDataSetTimeValues( spec )[ 'pin_powers' ][ ( 1, 1 ) ]
+        == np.arange( 5.0 )
+        ) )
+    self.assertTrue( np.all( self.model.ReadDataSetTimeValues(
+        dict( spec, sub_addrs = [ ( 4, 4 ) ] )
+        )[ 'pin_powers' ][ ( 4, 4 ) ] >= 0.0 ) )
+
+#		-- Another location is another address
+    self.model.ReadDataSetTimeValues( dict( spec, axial_cm = 350.0 ) )
+    self.assertEqual(
+        len([ k for k in self.model.timeValuesCache
+            if k[ 0 ] == 'pin_powers' ]),
+        5
+        )
+
+#		-- Dropped with a threshold change
+    self.model.SetDataSetThreshold( 'pin_powers', '>= 0.5' )
+    self.assertEqual(
+        [ k for k in self.model.timeValuesCache if k[ 0 ] == 'pin_powers' ],
+        []
+        )
+  #end test_Cache
+
+
+  #----------------------------------------------------------------------
+  #	METHOD:		TestTimeValues.test_Read()			-
+  #----------------------------------------------------------------------
+  def test_Read( self ):
+    sub_addrs = [ ( 0, 0 ), ( 3, 1 ), ( 9, 9 ), ( 3, 1 ) ]
+    result = self.model.ReadDataSetTimeValues(
+        dict( ds_name = 'state' ),
+        dict( ds_name = 'keff' ),
+        dict( ds_name = '*exposure' ),
+        dict(
+            ds_name = 'pin_exposures', assembly_index = 1, axial_cm = 50.0,
+            sub_addrs = sub_addrs
+            )
+        )
+    self.assertTrue(
+        np.array_equal( result[ 'state' ], np.arange( 1.0, 6.0 ) )
+        )
+    self.assertTrue(
+        np.allclose( result[ 'keff' ], self._ReadFile( 'keff' )[ :, 0 ] )
+        )
+    self.assertTrue(
+        np.allclose( result[ '*exposure' ], np.arange( 5 ) * 1.5 )
+        )
+
+    ax_ndx = self.model.CreateAxialValue( cm = 50.0 ).pinIndex
+    expected = self._ReadFile( 'pin_exposures' )[ :, :, :, ax_ndx, 1 ]
+    values = result[ 'pin_exposures' ]
+    self.assertEqual(
+        sorted( values.keys() ), [ ( 0, 0 ), ( 3, 1 ), ( 4, 4 ) ],
+        'clamped and unique'
+        )
+    for col, row in values:
+      self.assertEqual( values[ ( col, row ) ].dtype, np.float64 )
+      self.assertTrue(
+          np.allclose( values[ ( col, row ) ], expected[ :, row, col ] ),
+          str( ( col, row ) )
+          )
+
+#		-- Same from the cache
+    cached = self.model.ReadDataSetTimeValues(
+        dict(
+            ds_name = 'pin_exposures', assembly_index = 1, axial_cm = 50.0,
+            sub_addrs = sub_addrs
+            ),
+        dict( ds_name = 'keff' )
+        )
+    self.assertTrue( np.array_equal( cached[ 'keff' ], result[ 'keff' ] ) )
+    for addr in values:
+      self.assertTrue(
+          np.array_equal( cached[ 'pin_exposures' ][ addr ], values[ addr ] )
+          )
+  #end test_Read
+
+
+  #----------------------------------------------------------------------
+  #	METHOD:		TestTimeValues.test_TimeStore()			-
+  #----------------------------------------------------------------------
+  def test_TimeStore( self ):
+    """Pin, scalar, and detector histories read from the time-major store
+match those read by state point.
+"""
+    self.model.Close()
+    h5f = h5py.File( self.path, 'a' )
+    try:
+      rand = np.random.RandomState( 3 )
+      for i in xrange( 5 ):
+        h5f[ 'STATE_%04d' % (i + 1) ][ 'detector_response' ] = \
+            rand.rand( 4, 4 )
+    finally:
+      h5f.close()
+
+    specs = (
+        dict( ds_name = 'keff' ),
+        dict( ds_name = 'detector_response', axial_cm = 250.0,
+            detector_index = 2 ),
+        dict( ds_name = 'pin_powers', assembly_index = 3, axial_cm = 50.0,
+            sub_addrs = [ ( 1, 2 ), ( 3, 0 ) ] )
+        )
+    self.model = DataModel( self.path )
+    self.model.WaitReady()
+    self.assertEqual(
+        self.model.GetDataSetType( 'detector_response' ), 'detector'
+        )
+    expected = self.model.ReadDataSetTimeValues( *specs )
+    self.model.Close()
+
+    TimeStore.Build( self.path )
+    self.model = DataModel( self.path )
+    self.model.WaitReady()
+    self.assertIsNotNone( self.model.timeStore )
+    for spec in specs:
+      ds_name = spec[ 'ds_name' ]
+      self.assertIsNotNone(
+          self.model._GetTimeStoreDataSet(
+              self.model.timeStore, ds_name,
+              self.model.GetDataSetDefByDsName( ds_name )
+              ),
+          ds_name + ' in store'
+          )
+
+    result = self.model.ReadDataSetTimeValues( *specs )
+    self.assertTrue(
+        np.array_equal( result[ 'keff' ], expected[ 'keff' ] )
+        )
+    self.assertTrue( np.array_equal(
+        result[ 'detector_response' ], expected[ 'detector_response' ]
+        ) )
+    for addr in expected[ 'pin_powers' ]:
+      self.assertTrue( np.array_equal(
+          result[ 'pin_powers' ][ addr ], expected[ 'pin_powers' ][ addr ]
+          ) )
+  #end test_TimeStore
+
+
+#		-- Static Methods
+#		--
+
+#end TestTimeValues
+
+
+#------------------------------------------------------------------------
+#	NAME:		main()						-
+#------------------------------------------------------------------------
+if __name__ == '__main__':
+  suite = unittest.TestLoader().loadTestsFromTestCase( TestTimeValues )
+  unittest.TextTestRunner( verbosity = 2 ).run( suite )
@@ -0,0 +1,181 @@
+#!/usr/bin/env python
+# $Id$
+#------------------------------------------------------------------------
+#	NAME:		test_volume_matrix.py				-
+#	HISTORY:							-
+#		2026-10-18						-
+#------------------------------------------------------------------------
+import bisect, os, shutil, sys, tempfile, traceback, unittest
+import numpy as np
+
+sys.path.insert( 0, os.path.join( os.path.dirname( __file__ ), os.pardir ) )
+
+from data.config import Config
+from data.datamodel import DataSetName
+from data.datamodel_mgr import DataModelMgr
+from data.utils import *
+from view3d.volume_matrix import *
+from vera_file import CreateVeraFile
+
+
+#------------------------------------------------------------------------
+#	CLASS:		TestVolumeMatrix				-
+#------------------------------------------------------------------------
+class TestVolumeMatrix( unittest.TestCase ):
+  """
+"""
+
+
+#		-- Object Methods
+#		--
+
+
+  #----------------------------------------------------------------------
+  #	METHOD:		TestVolumeMatrix._CreateLoopMatrix()		-
+  #----------------------------------------------------------------------
+  def _CreateLoopMatrix(
+      self, dset_value, core_map, extent, npinx, npiny, mesh_levels, side
+      ):
+    """Per-pin loop implementation replaced by VolumeMatrix.
+"""
+    dset_shape = dset_value.shape
+    z_size = mesh_levels[ -1 ]
+    matrix = np.zeros( ( z_size, npinx * extent[ -2 ], npiny * extent[ -1 ] ) )
+
+    pin_y = 0
+    for assy_y in xrange( extent[ 3 ] - 1, extent[ 1 ] - 1, -1 ):
+      pin_x = 0
+      for assy_x in xrange( extent[ 0 ], extent[ 2 ] ):
+        assy_ndx = core_map[ assy_y, assy_x ] - 1
+        if assy_ndx >= 0:
+          for z in xrange( z_size ):
+            if side == 'right':
+              ax_level = DataUtils.FindListIndex( mesh_levels, z )
+            else:
+              ax_level = min(
+                  bisect.bisect_left( mesh_levels, z ), len( mesh_levels ) - 1
+                  )
+            pin_y2 = 0
+            for y in xrange( npiny - 1, -1, -1 ):
+              data_y = min( y, dset_shape[ 0 ] - 1 )
+              for x in xrange( npinx ):
+                data_x = min( x, dset_shape[ 1 ] - 1 )
+                matrix[ z, pin_x + x, pin_y + pin_y2 ] = \
+                    dset_value[ data_y, data_x, ax_level, assy_ndx ]
+              pin_y2 += 1
+        pin_x += npinx
+      pin_y += npiny
+
+    return  matrix
+  #end _CreateLoopMatrix
+
+
+  #----------------------------------------------------------------------
+  #	METHOD:		TestVolumeMatrix.setUp()			-
+  #----------------------------------------------------------------------
+  def setUp( self ):
+    self.coreMap = np.array([
+        [ 0, 1, 2, 0 ],
+        [ 3, 4, 5, 6 ],
+        [ 0, 7, 8, 0 ]
+        ])
+    self.dsetValue = \
+        np.random.RandomState( 7 ).rand( 4, 3, 5, 8 ).astype( np.float32 )
+    self.meshLevels = [ 2, 3, 6, 8, 11 ]
+  #end setUp
+
+
+  #----------------------------------------------------------------------
+  #	METHOD:		TestVolumeMatrix.test_CreateLevelMap()		-
+  #----------------------------------------------------------------------
+  def test_CreateLevelMap( self ):
+    self.assertEqual(
+        VolumeMatrix.CreateLevelMap( [ 2, 3, 6 ], 3, 'left' ).tolist(),
+        [ 0, 0, 0, 1, 2, 2 ]
+        )
+    self.assertEqual(
+        VolumeMatrix.CreateLevelMap( [ 2, 3, 6 ], 3, 'right' ).tolist(),
+        [ 0, 0, 0, 1, 1, 1 ]
+        )
+    self.assertEqual(
+        VolumeMatrix.CreateLevelMap( [ 2, 3, 6 ], 2, 'left' ).tolist(),
+        [ 0, 0, 0, 1, 1, 1 ], 'clipped to dataset levels'
+        )
+  #end test_CreateLevelMap
+
+
+  #----------------------------------------------------------------------
+  #	METHOD:		TestVolumeMatrix.test_CreateMatrix()		-
+  #----------------------------------------------------------------------
+  def test_CreateMatrix( self ):
+    for extent in ( ( 0, 0, 4, 3, 4, 3 ), ( 1, 1, 3, 3, 2, 2 ) ):
+      for npinx, npiny in ( ( 3, 4 ), ( 5, 6 ) ):
+        for side in ( 'left', 'right' ):
+          matrix = VolumeMatrix.CreateMatrix(
+              self.dsetValue, self.coreMap, extent, npinx, npiny,
+              VolumeMatrix.CreateLevelMap(
+                  self.meshLevels, self.dsetValue.shape[ 2 ], side
+                  )
+              )
+          expected = self._CreateLoopMatrix(
+              self.dsetValue, self.coreMap, extent, npinx, npiny,
+              self.meshLevels, side
+              )
+          self.assertEqual( matrix.shape, expected.shape )
+          self.assertTrue(
+              np.array_equal( matrix, expected ),
+              'extent=%s, pins=%s, side=%s' %
+              ( str( extent ), str( ( npinx, npiny ) ), side )
+              )
+  #end test_CreateMatrix
+
+
+  #----------------------------------------------------------------------
+  #	METHOD:		TestVolumeMatrix.test_GetMatrix()		-
+  #----------------------------------------------------------------------
+  def test_GetMatrix( self ):
+    temp_dir = tempfile.mkdtemp()
+    Config.SetCacheDir( os.path.join( temp_dir, 'cache' ) )
+    dmgr = DataModelMgr()
+    try:
+      model = dmgr.OpenModel(
+          CreateVeraFile( os.path.join( temp_dir, 'vera.h5' ), 3 )
+          )
+      model.WaitReady()
+      qds_name = DataSetName( model.GetName(), 'pin_powers' )
+      time_value = dmgr.GetTimeValues()[ 1 ]
+      args = ( qds_name, time_value, ( 0, 0, 2, 2, 2, 2 ), [ 1, 2, 3, 4 ] )
+
+      matrix = VolumeMatrix.GetMatrix( dmgr, *(args + ( 'left', )) )
+      self.assertEqual( matrix.shape, ( 4, 10, 10 ) )
+      self.assertFalse( matrix.flags.writeable, 'shared matrix read-only' )
+      with self.assertRaises( ValueError ):
+        matrix[ 0, 0, 0 ] = 1.0
+      self.assertIs(
+          VolumeMatrix.GetMatrix( dmgr, *(args + ( 'left', )) ), matrix,
+          'cached'
+          )
+      self.assertFalse(
+          VolumeMatrix.GetMatrix( dmgr, *(args + ( 'right', )) ).
+              flags.writeable
+          )
+    finally:
+      dmgr.Close()
+      VolumeMatrix.ClearCache()
+      Config.SetCacheDir( None )
+      shutil.rmtree( temp_dir, True )
+  #end test_GetMatrix
+
+
+#		-- Static Methods
+#		--
+
+#end TestVolumeMatrix
+
+
+#------------------------------------------------------------------------
+#	NAME:		main()						-
+#------------------------------------------------------------------------
+if __name__ == '__main__':
+  suite = unittest.TestLoader().loadTestsFromTestCase( TestVolumeMatrix )
+  unittest.TextTestRunner( verbosity = 2 ).run( suite )
@@ -0,0 +1,59 @@
+#!/usr/bin/env python
+# $Id$
+#------------------------------------------------------------------------
+#	NAME:		vera_file.py					-
+#	HISTORY:							-
+#		2026-10-18						-
+#	  Synthetic VERA output files for tests.
+#------------------------------------------------------------------------
+"""Writes small synthetic VERA output files so tests do not depend on
+external data.  The core is a 2x2 assembly map with ``npin`` x ``npin``
+pins, four assemblies, and ``nax`` axial levels.
+"""
+import h5py
+import numpy as np
+
+
+#------------------------------------------------------------------------
+#	FUNCTION:	CreateVeraFile()				-
+#------------------------------------------------------------------------
+def CreateVeraFile( path, nstates = 6, npin = 5, nax = 4, seed = 0 ):
+  """Writes a VERA output file with pin_powers, pin_exposures,
+pin_cladtemps, and scalar exposure, hours, and keff datasets in each state.
+Pin (0,0) has zero power and volume.
+  Args:
+      path (str): path to the file to create
+      nstates (int): number of STATE_nnnn groups
+      npin (int): pins per assembly side
+      nax (int): number of axial levels
+      seed (int): random seed for dataset values
+  Returns:
+      str: path
+"""
+  rand = np.random.RandomState( seed )
+  h5f = h5py.File( path, 'w' )
+  try:
+    core_group = h5f.create_group( 'CORE' )
+    core_group[ 'core_map' ] = np.array( [ [ 1, 2 ], [ 3, 4 ] ] )
+    core_group[ 'axial_mesh' ] = np.linspace( 0.0, 400.0, nax + 1 )
+    core_group[ 'core_sym' ] = np.array( [ 1 ] )
+    core_group[ 'apitch' ] = np.array( [ 21.5 ] )
+    volumes = np.ones( ( npin, npin, nax, 4 ) )
+    volumes[ 0, 0 ] = 0.0
+    core_group[ 'pin_volumes' ] = volumes
+
+    for i in xrange( nstates ):
+      group = h5f.create_group( 'STATE_%04d' % (i + 1) )
+      group[ 'exposure' ] = np.array( [ i * 1.5 ] )
+      group[ 'hours' ] = np.array( [ i * 10.0 ] )
+      powers = rand.rand( npin, npin, nax, 4 )
+      powers[ 0, 0 ] = 0.0
+      group[ 'pin_powers' ] = powers
+      group[ 'pin_exposures' ] = rand.rand( npin, npin, nax, 4 ) * 10.0
+      group[ 'pin_cladtemps' ] = rand.rand( npin, npin, nax, 4 ) * 300.0
+      group[ 'keff' ] = np.array( [ 1.0 + i * 0.001 ] )
+  finally:
+    h5f.close()
+
+  return  path
+#end CreateVeraFile
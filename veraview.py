@@ -3,6 +3,13 @@
 #------------------------------------------------------------------------
 #	NAME:		veraview.py					-
 #	HISTORY:							-
+#		2026-10-18						-
+#	  Reading files concurrently in _OpenFileBegin().  Added
+#	  --derived-cache, --derived-store, --derived-store-mb, and
+#	  --virtual-differences options.  Calling freeze_support() for
+#	  the animation encoding process pool.  Redrawing widgets when a
+#	  fast-open model is ready.  Passing the fast frames animation
+#	  option.
 #		2019-01-19	leerw@ornl.gov				-
 #         Transitioned to Murray's new Volume3DView.
 #		2018-12-21	leerw@ornl.gov				-
@@ -195,7 +202,7 @@
 #		2014-12-08	leerw@ornl.gov				-
 #		2014-11-15	leerw@ornl.gov				-
 #------------------------------------------------------------------------
-import argparse, logging, os, six, sys, threading, time, traceback
+import argparse, logging, multiprocessing, os, six, sys, threading, time, traceback
 import pdb  # set_trace()
 
 try:
@@ -225,13 +232,16 @@ from bean.range_bean import *
 from data.config import Config
 from data.datamodel import *
 from data.datamodel_mgr import *
+from data.differences import Differences
 
 from event.state import *
 
 from view3d.env3d import *
 
 from widget.animators import *
+from widget.bitmap_cache import *
 from widget.image_ops import *
+from widget.raster_widget import *
 from widget.widget_config import *
 from widget.widgetcontainer import *
 
@@ -753,6 +763,19 @@ unnecessary.
 #  #end OnInit
 
 
+  #----------------------------------------------------------------------
+  #	METHOD:		VeraViewApp._OnModelReady()			-
+  #----------------------------------------------------------------------
+  def _OnModelReady( self, dmgr, model_name ):
+    """DataModelMgr 'modelReady' listener, called on the model's read
+thread, which has widgets drawn with placeholder factors redrawn on the UI
+thread.
+"""
+    if self.state is not None:
+      wx.CallAfter( self.state.FireStateChange, STATE_CHANGE_dataModelMgr )
+  #end _OnModelReady
+
+
   #----------------------------------------------------------------------
   #	METHOD:		VeraViewApp.RemoveFrame()			-
   #----------------------------------------------------------------------
@@ -871,29 +894,102 @@ been created.
 	  nargs = '*'
           )
 
+      parser.add_argument(
+	  '--bitmap-cache-mb',
+	  default = 0,
+	  help = 'megabytes of rendered images to cache across all views, ' +
+	      'defaulting to 256',
+	  type = int
+          )
+
       parser.add_argument(
 	  '--debug',
 	  action = 'store_true',
 	  help = 'run in debug mode'
           )
 
+      parser.add_argument(
+	  '--derived-cache',
+	  action = 'store_true',
+	  help = 'save derived and difference datasets beside each file ' +
+	      '(name.derived.h5) and reuse them in later sessions'
+	  )
+
+      parser.add_argument(
+	  '--derived-store',
+	  choices = DerivedStore.BACKENDS,
+	  help = 'storage for derived datasets, defaulting to memory, ' +
+	      'which spills to memory-mapped files past --derived-store-mb'
+	  )
+
+      parser.add_argument(
+	  '--derived-store-mb',
+	  default = 0,
+	  help = 'megabytes of derived datasets to hold in memory per file, ' +
+	      'defaulting to 256',
+	  type = int
+	  )
+
+      parser.add_argument(
+	  '--fast-open',
+	  action = 'store_true',
+	  help = 'show files after reading the CORE and state point index, ' +
+	      'completing pin weights and auto-derived datasets in the background'
+          )
+
       parser.add_argument(
 	  '--load-session',
 	  action = 'store_true',
 	  help = 'load the session on startup, overriding any file paths'
           )
 
+      parser.add_argument(
+	  '--prefetch-steps',
+	  default = -1,
+	  help = 'number of neighboring state points whose data are read ' +
+	      'in the background, 0 to disable, defaulting to 1',
+	  type = int
+          )
+
       parser.add_argument(
 	  '--session',
 	  help = 'path to session file to load'
           )
 
+      parser.add_argument(
+	  '--no-stats-cache',
+	  action = 'store_true',
+	  help = 'do not read or write the persistent dataset statistics cache'
+          )
+
+      parser.add_argument(
+	  '--time-store',
+	  action = 'store_true',
+	  help = 'build time-major companion stores for files opened without ' +
+	      'one, in the background, for faster history plots'
+          )
+
       parser.add_argument(
 	  '--trace',
 	  action = 'store_true',
 	  help = 'trace call calls to stderr'
           )
 
+      parser.add_argument(
+	  '--virtual-differences',
+	  action = 'store_true',
+	  help = 'calculate difference datasets for the values shown ' +
+	      'instead of storing them for all state points'
+          )
+
+      parser.add_argument(
+	  '--workers',
+	  default = 0,
+	  help = 'number of worker threads for per-state calculations, ' +
+	      'defaulting to the number of CPUs (at most 8)',
+	  type = int
+          )
+
 #      parser.add_argument(
 #	  '--skip-startup-session-check',
 #	  action = 'store_true',
@@ -905,6 +1001,36 @@ been created.
       if args.trace:
         sys.settrace( VeraViewApp.trace )
 
+      if args.no_stats_cache:
+        StatsCache.SetEnabled( False )
+
+      if args.derived_cache:
+        DerivedCache.SetEnabled( True )
+
+      if args.derived_store:
+        DerivedStore.SetBackend( args.derived_store )
+
+      if args.derived_store_mb > 0:
+        DerivedStore.SetBudget( args.derived_store_mb << 20 )
+
+      if args.fast_open:
+        DataModel.SetFastOpen( True )
+
+      if args.time_store:
+        TimeStore.SetAutoBuild( True )
+
+      if args.virtual_differences:
+        Differences.set_virtual( True )
+
+      if args.workers > 0:
+        Config.SetWorkerCount( args.workers )
+
+      if args.bitmap_cache_mb > 0:
+        BitmapCache.SetDefaultBudget( args.bitmap_cache_mb << 20 )
+
+      if args.prefetch_steps >= 0:
+        RasterWidget.SetPrefetchSteps( args.prefetch_steps )
+
       #Config.SetRootDir( os.path.dirname( os.path.abspath( __file__ ) ) )
       root_dir = os.path.dirname( os.path.abspath( __file__ ) )
       if not os.path.isdir( os.path.join( root_dir, 'res' ) ):
@@ -932,6 +1058,7 @@ been created.
       app.sessionPath = args.session
       #app.skipSession = args.skip_startup_session_check
       app.state = state
+      state.dataModelMgr.AddListener( 'modelReady', app._OnModelReady )
 
       #app.frame = VeraViewFrame( app, state )
       frame = VeraViewFrame( app, state )
@@ -2655,13 +2782,27 @@ May be called from any thread.
       if not hasattr( file_paths, '__iter__' ):
         file_paths = [ file_paths ]
 
+#			-- Files are read concurrently
+      def progress( f, dm, cur_step, step_count ):
+        dialog.Pulse( 'Read {0} of {1}:{2}{3}'.format(
+	    cur_step + 1, step_count, os.linesep, f
+	    ) )
+      #end progress
+
+      self.state.LogListeners( self.logger, 'Before OpenModels()' )
+      results = dmgr.OpenModels( file_paths, progress )
+      self.state.LogListeners( self.logger, 'After OpenModels()' )
+
       data_model = None
-      for f in file_paths:
-	try:
-	  self.state.LogListeners( self.logger, 'Before OpenModel()' )
-          dm = dmgr.OpenModel( f )
+      for f, dm in zip( file_paths, results ):
+	if isinstance( dm, HtmlException ):
+	  html_message += '\n<h3>' + f + '</h3>\n' + dm.htmlMessage
+
+        elif isinstance( dm, Exception ):
+	  html_message += '\n<h3>' + f + '</h3>\n' + str( dm )
+
+	else:
 	  warning_messages += dm.GetReadMessages()
-	  self.state.LogListeners( self.logger, 'After OpenModel()' )
 	  if not data_model:
 	    data_model = dm
 
@@ -2674,13 +2815,7 @@ May be called from any thread.
 	    cur_message += '</ul>\n'
 	    html_message += cur_message
 	  #end if messages
-
-	except HtmlException, ex:
-	  html_message += '\n<h3>' + f + '</h3>\n' + ex.htmlMessage
-
-        except Exception, ex:
-	  html_message += '\n<h3>' + f + '</h3>\n' + str( ex )
-      #end for f
+      #end for f, dm
 
       status[ 'data_model' ] = data_model
       status[ 'html_message' ] = html_message
@@ -2871,7 +3006,8 @@ Must be called from the UI event thread
 	  animator.Run(
 	      file_path,
 	      self.animateOptionsDialog.frame_delay,
-	      self.animateOptionsDialog.show_selections
+	      self.animateOptionsDialog.show_selections,
+	      self.animateOptionsDialog.fast_frames
 	      )
       #end if file_path is not None
     #end if we have a destination file path
@@ -3944,4 +4080,5 @@ class VeraViewGrid( wx.Panel ):
 #end VeraViewGrid
 
 if __name__ == '__main__':
+  multiprocessing.freeze_support()
   VeraViewApp.main()
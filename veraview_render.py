@@ -0,0 +1,428 @@
+#!/usr/bin/env python
+# $Id$
+#------------------------------------------------------------------------
+#	NAME:		veraview_render.py				-
+#	HISTORY:							-
+#		2026-10-18						-
+#	  Headless batch rendering of core, assembly, and core axial
+#	  images.
+#------------------------------------------------------------------------
+"""Renders core, assembly, and core axial view images to PNG files without
+a display.
+
+Files are named on the command line, or with a session (.vview) file, in
+which case the session's Core2DView, Assembly2DView, and CoreAxial2DView
+widgets are rendered with their datasets, colormaps, ranges, and
+selections unless overridden.  Images are rendered over the requested
+state indexes and axial levels on a pool of worker processes, e.g.,
+
+  veraview_render.py -w core,axial -d pin_powers -s all -a 10-20 \\
+      -o images run1.h5
+"""
+import argparse, logging, multiprocessing, os, re, sys, traceback
+import pdb
+
+from data.config import Config
+from widget.batch_renderer import *
+from widget.widget_config import *
+
+
+#------------------------------------------------------------------------
+#	CLASS:		VeraViewRender					-
+#------------------------------------------------------------------------
+class VeraViewRender( object ):
+  """Command line batch renderer.
+"""
+
+
+#		-- Class Attributes
+#		--
+
+  NAME_FORMATS = \
+    {
+    'assembly': '{widget}_{dataset}_assy{assembly:03d}_s{state:03d}_a{axial:03d}.png',
+    'axial': '{widget}-{mode}_{dataset}_assy{assembly:03d}_s{state:03d}.png',
+    'core': '{widget}_{dataset}_s{state:03d}_a{axial:03d}.png'
+    }
+  """dict: Default output file name format by widget type."""
+
+
+#		-- Static Methods
+#		--
+
+
+  #----------------------------------------------------------------------
+  #	METHOD:		VeraViewRender.CreateJobs()			-
+  #----------------------------------------------------------------------
+  @staticmethod
+  def CreateJobs( renderer, specs, states, axials, output_dir, name_format ):
+    """Expands widget specs over states and axial levels.
+    Args:
+        renderer (BatchRenderer): renderer with the files open
+        specs (list): dicts with 'widget' and 'dataset' and optional
+            'state' and 'axial' defaults and ``Render()`` keyword
+            arguments
+        states (str): state index list, see ``ParseIndexes()``, or None
+            for each spec's 'state' or all states
+        axials (str): axial level index list or None for each spec's
+            'axial' or all levels
+        output_dir (str): path to the directory for files
+        name_format (str): optional file name format, where None
+            uses ``NAME_FORMATS``
+    Returns:
+        list: job dicts for ``BatchRenderer.Run()``
+    Raises:
+        ValueError: if a dataset is not found or an index list is invalid
+"""
+    dmgr = renderer.dmgr
+    jobs = []
+    paths = set()
+    for spec in specs:
+      qds_name = DataSetName.Resolve( spec[ 'dataset' ] )
+      dm = dmgr.GetDataModel( qds_name ) or dmgr.GetFirstDataModel()
+      qds_name = DataSetName( dm.GetName(), qds_name.displayName )
+      dset = dm.GetStateDataSet( 0, qds_name.displayName )
+      if dset is None:
+        raise ValueError( 'Dataset not found: ' + qds_name.name )
+
+      state_count = dm.GetStatesCount()
+      state_ndxs = \
+          VeraViewRender.ParseIndexes( states, state_count ) \
+          if states else \
+          [ min( spec[ 'state' ], state_count - 1 ) ] \
+          if spec.get( 'state', -1 ) >= 0 else \
+          range( state_count )
+
+      if spec[ 'widget' ] == 'axial':
+        axial_ndxs = [ 0 ]
+      elif axials:
+        axial_ndxs = VeraViewRender.ParseIndexes( axials, dset.shape[ 2 ] )
+      elif spec.get( 'axial', -1 ) >= 0:
+        axial_ndxs = [ min( spec[ 'axial' ], dset.shape[ 2 ] - 1 ) ]
+      else:
+        axial_ndxs = range( dset.shape[ 2 ] )
+
+      fmt = name_format or VeraViewRender.NAME_FORMATS[ spec[ 'widget' ] ]
+      ds_label = re.sub( r'[^\w.-]+', '_', qds_name.displayName )
+      for state_ndx in state_ndxs:
+        for axial_ndx in axial_ndxs:
+          job = dict( spec )
+          job.update(
+              axial = axial_ndx, dataset = qds_name.name, state = state_ndx
+              )
+          name = fmt.format(
+              assembly = job.get( 'assembly', 0 ), axial = axial_ndx,
+              dataset = ds_label, mode = job.get( 'mode', 'xz' ),
+              model = dm.GetName(), state = state_ndx,
+              widget = job[ 'widget' ]
+              )
+          base, ext = os.path.splitext( os.path.join( output_dir, name ) )
+          path = base + ext
+          n = 1
+          while path in paths:
+            n += 1
+            path = '%s-%d%s' % ( base, n, ext )
+          paths.add( path )
+          job[ 'path' ] = path
+          jobs.append( job )
+        #end for axial_ndx
+      #end for state_ndx
+    #end for spec
+
+    return  jobs
+  #end CreateJobs
+
+
+  #----------------------------------------------------------------------
+  #	METHOD:		VeraViewRender.CreateSessionSpecs()		-
+  #----------------------------------------------------------------------
+  @staticmethod
+  def CreateSessionSpecs( session, dmgr ):
+    """Creates widget specs from the supported widgets in a session.
+    Args:
+        session (WidgetConfig): session
+        dmgr (DataModelMgr): manager with the session files open
+    Returns:
+        list: spec dicts, see ``CreateJobs()``
+"""
+    state_props = session.GetStateProps()
+    specs = []
+    for props in session.GetWidgetProps():
+      spec = BatchRenderer.CreateSpec( props, state_props, dmgr )
+      if spec is not None:
+        specs.append( spec )
+
+    return  specs
+  #end CreateSessionSpecs
+
+
+  #----------------------------------------------------------------------
+  #	METHOD:		VeraViewRender.main()				-
+  #----------------------------------------------------------------------
+  @staticmethod
+  def main():
+    try:
+      parser = argparse.ArgumentParser(
+          description = 'Render core, assembly, and core axial images ' +
+              'to PNG files without a display'
+          )
+
+      parser.add_argument(
+          'file_path',
+          help = 'paths to HDF5 data files or a session (.vview) file',
+          nargs = '+'
+          )
+
+      parser.add_argument(
+          '-a', '--axials',
+          help = '0-based axial level indexes, e.g., "0,5,10-20" or ' +
+              '"all", defaulting to the session axial or all levels'
+          )
+
+      parser.add_argument(
+          '--assembly',
+          help = '0-based assembly index for assembly and axial images, ' +
+              'defaulting to the session assembly or 0',
+          type = int
+          )
+
+      parser.add_argument(
+          '--colormap',
+          help = 'matplotlib colormap name, defaulting to the session ' +
+              'colormap or "%s"' % Config.defaultCmapName_
+          )
+
+      parser.add_argument(
+          '-d', '--datasets',
+          help = 'comma-separated dataset names, defaulting to the ' +
+              'session datasets or "pin_powers"'
+          )
+
+      parser.add_argument(
+          '--mode',
+          choices = ( 'xz', 'yz' ),
+          help = 'axial image orientation, defaulting to the session ' +
+              'mode or "xz"'
+          )
+
+      parser.add_argument(
+          '--name-format',
+          help = 'output file name format with {widget}, {dataset}, ' +
+              '{model}, {state}, {axial}, {assembly}, and {mode} fields'
+          )
+
+      parser.add_argument(
+          '--no-legend',
+          action = 'store_true',
+          help = 'omit the legend color bar'
+          )
+
+      parser.add_argument(
+          '-o', '--output-dir',
+          default = '.',
+          help = 'directory for image files, defaulting to the ' +
+              'current directory'
+          )
+
+      parser.add_argument(
+          '--pin-size',
+          default = 0,
+          help = 'pixels per pin, defaulting to %s' % ', '.join(
+              '%d for %s' % ( v, k )
+              for k, v in sorted( BatchRenderer.DEFAULT_PIN_SIZES.items() )
+              ),
+          type = int
+          )
+
+      parser.add_argument(
+          '--scale-mode',
+          choices = ( 'all', 'state' ),
+          default = 'all',
+          help = 'color scale over all state points or each state point'
+          )
+
+      parser.add_argument(
+          '-s', '--states',
+          help = '0-based state point indexes, e.g., "0,5,10-20" or ' +
+              '"all", defaulting to the session state point or all'
+          )
+
+      parser.add_argument(
+          '--weights',
+          choices = ( 'on', 'off' ),
+          help = 'apply pin factors, defaulting to the session ' +
+              'setting or "on"'
+          )
+
+      parser.add_argument(
+          '-w', '--widgets',
+          help = 'comma-separated image types from %s, defaulting to ' \
+              'the session widgets or "core"' % \
+              ', '.join( BatchRenderer.WIDGET_TYPES )
+          )
+
+      parser.add_argument(
+          '--workers',
+          default = 0,
+          help = 'number of worker processes, ' +
+              'defaulting to the number of CPUs (at most 8)',
+          type = int
+          )
+
+      args = parser.parse_args()
+
+      root_dir = os.path.dirname( os.path.abspath( __file__ ) )
+      if not os.path.isdir( os.path.join( root_dir, 'res' ) ):
+        root_dir = os.path.dirname( root_dir )
+      Config.SetRootDir( root_dir )
+
+      worker_count = \
+          args.workers  if args.workers > 0 else  Config.GetWorkerCount()
+
+#			-- Files or session
+#			--
+      session = state_props = None
+      if len( args.file_path ) == 1 and args.file_path[ 0 ].endswith( '.vview' ):
+        session = WidgetConfig( args.file_path[ 0 ] )
+        paths = session.GetDataModelPaths() or []
+        state_props = session.GetStateProps()
+      else:
+        paths = args.file_path
+      files_not_found = [ f for f in paths if not os.path.exists( f ) ]
+      if not paths or files_not_found:
+        raise IOError( 'Files not found: ' + ', '.join( files_not_found ) )
+
+      if args.widgets:
+        widget_types = [ w.strip() for w in args.widgets.split( ',' ) ]
+        for w in widget_types:
+          if w not in BatchRenderer.WIDGET_TYPES:
+            parser.error( 'invalid widget type: ' + w )
+
+#			-- Specs and jobs, closing the files before forking
+#			--
+      renderer = BatchRenderer.Open( paths, state_props )
+      try:
+        specs = []
+        if session is not None:
+          specs = VeraViewRender.CreateSessionSpecs( session, renderer.dmgr )
+          if args.widgets:
+            specs = [ s for s in specs if s[ 'widget' ] in widget_types ]
+          if args.datasets:
+            specs = [
+                dict( s, dataset = ds_name.strip() )
+                for s in specs for ds_name in args.datasets.split( ',' )
+                ]
+
+        if not specs:
+          specs = [
+              { 'widget': w, 'dataset': ds_name.strip() }
+              for w in (widget_types if args.widgets else [ 'core' ])
+              for ds_name in (args.datasets or 'pin_powers').split( ',' )
+              ]
+
+        for spec in specs:
+          for key, value in (
+              ( 'assembly', args.assembly ),
+              ( 'colormap', args.colormap ),
+              ( 'mode', args.mode ),
+              ( 'pin_size', args.pin_size or None )
+              ):
+            if value is not None:
+              spec[ key ] = value
+          spec[ 'scale_mode' ] = args.scale_mode
+          spec[ 'show_legend' ] = not args.no_legend
+          spec[ 'weights_mode' ] = args.weights or \
+              (state_props or {}).get( 'weightsMode', 'on' )
+          if spec[ 'widget' ] == 'assembly' or spec[ 'widget' ] == 'axial':
+            spec[ 'assembly' ] = renderer.FindAssembly(
+                spec.get( 'assembly', 0 )
+                )[ 0 ]
+
+        if not os.path.isdir( args.output_dir ):
+          os.makedirs( args.output_dir )
+        jobs = VeraViewRender.CreateJobs(
+            renderer, specs, args.states, args.axials,
+            args.output_dir, args.name_format
+            )
+      finally:
+        renderer.Close()
+
+#			-- Render
+#			--
+      def report( path, error, cur_step, step_count ):
+        if error:
+          print >> sys.stderr, '[veraview_render] %s failed:' % path
+          print >> sys.stderr, error
+        else:
+          print '[veraview_render] %d/%d %s' % ( cur_step, step_count, path )
+      #end report
+
+      worker_props = dict(
+          ( k, state_props[ k ] )
+          for k in ( 'dataModelMgr.thresholds', 'timeDataSet' )
+          if state_props and k in state_props
+          )
+      results = BatchRenderer.Run(
+          paths, jobs, worker_props, worker_count, report
+          )
+      errors = [ r for r in results if r[ 1 ] ]
+      print '[veraview_render] finished, %d images, %d errors' % \
+          ( len( results ) - len( errors ), len( errors ) )
+      if errors:
+        sys.exit( 1 )
+
+    except Exception, ex:
+      msg = str( ex )
+      print >> sys.stderr, msg
+      et, ev, tb = sys.exc_info()
+      while tb:
+        print >> sys.stderr, \
+            'File=' + str( tb.tb_frame.f_code ) + \
+            ', Line=' + str( traceback.tb_lineno( tb ) )
+        tb = tb.tb_next
+      #end while
+      logging.error( msg )
+      sys.exit( 1 )
+  #end main
+
+
+  #----------------------------------------------------------------------
+  #	METHOD:		VeraViewRender.ParseIndexes()			-
+  #----------------------------------------------------------------------
+  @staticmethod
+  def ParseIndexes( text, count ):
+    """Parses a list of 0-based indexes.
+    Args:
+        text (str): 'all' or comma-separated indexes and inclusive ranges,
+            e.g., '0,5,10-20'
+        count (int): number of items, indexes past the end being dropped
+    Returns:
+        list: sorted unique indexes
+    Raises:
+        ValueError: if ``text`` is invalid
+"""
+    if text.strip().lower() == 'all':
+      return  range( count )
+
+    result = set()
+    try:
+      for item in text.split( ',' ):
+        bounds = [ int( b ) for b in item.split( '-' ) ]
+        if len( bounds ) > 2:
+          raise ValueError( item )
+        result.update( xrange( bounds[ 0 ], bounds[ -1 ] + 1 ) )
+    except ValueError:
+      raise ValueError( 'Invalid index list: ' + text )
+
+    return  sorted( i for i in result if 0 <= i < count )
+  #end ParseIndexes
+
+#end VeraViewRender
+
+
+#------------------------------------------------------------------------
+#	NAME:		__main__					-
+#------------------------------------------------------------------------
+if __name__ == '__main__':
+  multiprocessing.freeze_support()
+  VeraViewRender.main()
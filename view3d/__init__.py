@@ -5,6 +5,7 @@ __all__ = \
   [
     'env3d',
     'slider_view',
+    'volume_matrix',
     'volume_view'
   ]
 __version__ = '2.4.0'
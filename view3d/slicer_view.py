@@ -2,6 +2,8 @@
 #------------------------------------------------------------------------
 #	NAME:		slicer_view.py					-
 #	HISTORY:							-
+#		2026-10-18						-
+#	  Creating the 3D matrix with VolumeMatrix.
 #		2017-08-18	leerw@ornl.gov				-
 #	  Using AxialValue class.
 #		2017-05-13	leerw@ornl.gov				-
@@ -49,6 +51,8 @@ from event.state import *
 from widget.widget import *
 from widget.widgetcontainer import *
 
+from .volume_matrix import *
+
 
 #------------------------------------------------------------------------
 #	CLASS:		Slicer3DView					-
@@ -191,13 +195,6 @@ assembly_addr ( assy_ndx, assy_col, assy_row ), and sub_addr.
     if core is not None and self.curDataSet and \
         self.coreExtent is not None and \
         (core.npinx > 0 or core.npiny > 0):
-      dset = self.dmgr.GetH5DataSet( self.curDataSet, self.timeValue )
-      dset_value = np.array( dset )
-      dset_shape = dset.shape
-
-      cur_npinx = max( core.npinx, dset_shape[ 1 ] )
-      cur_npiny = max( core.npiny, dset_shape[ 0 ] )
-
       if self.logger.isEnabledFor( logging.DEBUG ):
         self.logger.debug(
 	    'curDataSet=%s, stateIndex=%d',
@@ -211,49 +208,14 @@ assembly_addr ( assy_ndx, assy_col, assy_row ), and sub_addr.
 	  int( (ax_mesh[ i + 1 ] - ax_mesh[ 0 ]) / pin_pitch )
 	  for i in range( len( ax_mesh ) - 1 )
           ]
-      z_size = self.meshLevels[ -1 ]
 
       # z, x, y(bottom up)
       #xxxxx +1 on pin ranges if a channel dataset
-      matrix = np.ndarray(
-	( z_size,
-	  cur_npinx * self.coreExtent[ -2 ],
-	  cur_npiny * self.coreExtent[ -1 ] ),
-	np.float64
-	)
-      matrix.fill( 0.0 )
-    
-      pin_y = 0
-      for assy_y in \
-          xrange( self.coreExtent[ 3 ] - 1, self.coreExtent[ 1 ] - 1, -1 ):
-        pin_x = 0
-        for assy_x in xrange( self.coreExtent[ 0 ], self.coreExtent[ 2 ] ):
-          assy_ndx = core.coreMap[ assy_y, assy_x ] - 1
-          if assy_ndx >= 0:
-	    assy_ndx = min( assy_ndx, dset_shape[ 3 ] - 1 )
-	    for z in xrange( z_size ):
-	      #xxx is this off by one?
-	      ax_level = DataUtils.FindListIndex( self.meshLevels, z )
-	      ax_level = min( ax_level, dset_shape[ 2 ] - 1 )
-	      pin_y2 = 0
-	      for y in xrange( cur_npiny - 1, -1, -1 ):
-		data_y = min( y, dset_shape[ 0 ] - 1 )
-
-	        for x in xrange( cur_npinx ):
-		  data_x = min( x, dset_shape[ 1 ] - 1 )
-	          matrix[ z, pin_x + x, pin_y + pin_y2 ] = \
-	              dset_value[ data_y, data_x, ax_level, assy_ndx ]
-	        #end for x
-	        pin_y2 += 1
-	      #end for y
-	    #end for z
-          #end if assy_ndx >= 0
-
-          pin_x += cur_npinx
-        #end for assy_x
-
-        pin_y += cur_npiny
-      #end for assy_y
+      #xxx is the 'right' level mapping off by one?
+      matrix = VolumeMatrix.GetMatrix(
+          self.dmgr, self.curDataSet, self.timeValue, self.coreExtent,
+	  self.meshLevels, 'right'
+	  )
     #end if valid properties
 
     return  matrix
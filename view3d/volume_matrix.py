@@ -0,0 +1,268 @@
+#!/usr/bin/env python
+# $Id$
+#------------------------------------------------------------------------
+#	NAME:		volume_matrix.py				-
+#	HISTORY:							-
+#		2026-10-18						-
+#	  Vectorized 3D matrix creation for the 3D views.
+#	  Reading state arrays through DataModelMgr.GetStateArray().
+#	  Read-only cached matrices.
+#------------------------------------------------------------------------
+"""Creation of the (z, x, y) matrices displayed by the 3D views.
+
+The matrix is assembled from a pin dataset with numpy fancy indexing in
+place of per-pin loops.  The z-to-axial-level map is computed once per
+matrix, each distinct axial level plane is gathered once over the core
+extent, and the planes are replicated over z in a single take.
+
+Matrices are cached per (dataset, time value, extent), so switching between
+3D views or back to a previous state point costs nothing.  Cached matrices
+are shared and read-only, so callers must copy before modifying.
+
+No wx or mayavi dependency here, so the module can be used and tested
+without a display.
+"""
+import collections, logging, threading
+import numpy as np
+import pdb
+
+
+#------------------------------------------------------------------------
+#	CLASS:		VolumeMatrix					-
+#------------------------------------------------------------------------
+class VolumeMatrix( object ):
+  """Static methods for creating and caching 3D view matrices.
+"""
+
+
+#		-- Class Attributes
+#		--
+
+  cache_ = collections.OrderedDict()
+
+  cacheBudget_ = 512 << 20
+
+  cacheBytes_ = 0
+
+  cacheLock_ = threading.RLock()
+
+
+#		-- Static Methods
+#		--
+
+
+  #----------------------------------------------------------------------
+  #	METHOD:		ClearCache()					-
+  #----------------------------------------------------------------------
+  @staticmethod
+  def ClearCache( qds_name = None ):
+    """Removes cached matrices.
+    Args:
+        qds_name (DataSetName): optional dataset whose matrices to remove,
+            where None means all
+"""
+    with VolumeMatrix.cacheLock_:
+      for key in list( VolumeMatrix.cache_.keys() ):
+        if qds_name is None or key[ 0 ] == qds_name:
+          VolumeMatrix._RemoveEntry( key )
+  #end ClearCache
+
+
+  #----------------------------------------------------------------------
+  #	METHOD:		CreateLevelMap()				-
+  #----------------------------------------------------------------------
+  @staticmethod
+  def CreateLevelMap( mesh_levels, level_count, side = 'left' ):
+    """Maps each z position to an axial level.
+    Args:
+        mesh_levels (sequence): ascending z position of the top of each
+            axial level
+        level_count (int): number of axial levels in the dataset
+        side (str): 'left' for the first level whose top is at or above z,
+            as ``bisect.bisect_left()``, or 'right' for the last level whose
+            top is at or below z, as ``DataUtils.FindListIndex()``
+    Returns:
+        np.ndarray: axial level index for each z position in
+            [0, mesh_levels[ -1 ])
+"""
+    mesh_levels = np.asarray( mesh_levels )
+    z = np.arange( int( mesh_levels[ -1 ] ) )
+    if side == 'right':
+      level_map = np.searchsorted( mesh_levels, z, side = 'right' ) - 1
+    else:
+      level_map = np.searchsorted( mesh_levels, z, side = 'left' )
+
+    return  level_map.clip( 0, min( len( mesh_levels ), level_count ) - 1 )
+  #end CreateLevelMap
+
+
+  #----------------------------------------------------------------------
+  #	METHOD:		CreateMatrix()					-
+  #----------------------------------------------------------------------
+  @staticmethod
+  def CreateMatrix( dset_value, core_map, extent, npinx, npiny, level_map ):
+    """Creates the matrix for a core extent.  Assemblies are placed left to
+right and bottom up, with pin rows flipped so y increases upward.  Pin
+indexes beyond the dataset shape repeat the last pin, and positions
+without an assembly are zero.
+    Args:
+        dset_value (np.ndarray): ( npiny, npinx, nax, nass ) pin values
+        core_map (np.ndarray): 1-based assembly numbers, 0 for none
+        extent (sequence): ( left, top, right + 1, bottom + 1, nx, ny )
+            in assemblies
+        npinx (int): matrix pins per assembly in x
+        npiny (int): matrix pins per assembly in y
+        level_map (np.ndarray): ``CreateLevelMap()`` result
+    Returns:
+        np.ndarray: ( len( level_map ), npinx * nx, npiny * ny ) float64
+"""
+    dset_shape = dset_value.shape
+    left, top, right, bottom, nx, ny = extent[ 0 : 6 ]
+
+#		-- Assembly index at each ( x, y ) position, bottom up
+#		--
+    assy_map = np.asarray( core_map )[ top : bottom, left : right ][ :: -1 ]
+    assy_map = \
+        (assy_map.astype( np.int64 ) - 1).clip( -1, dset_shape[ 3 ] - 1 )
+    assy_x = np.repeat( np.arange( assy_map.shape[ 1 ] ), npinx )
+    assy_y = np.repeat( np.arange( assy_map.shape[ 0 ] ), npiny )
+    assy_ndxs = assy_map[ assy_y[ np.newaxis, : ], assy_x[ :, np.newaxis ] ]
+
+    pin_x = np.tile(
+        np.arange( npinx ).clip( 0, dset_shape[ 1 ] - 1 ),
+        assy_map.shape[ 1 ]
+        )
+    pin_y = np.tile(
+        np.arange( npiny - 1, -1, -1 ).clip( 0, dset_shape[ 0 ] - 1 ),
+        assy_map.shape[ 0 ]
+        )
+
+#		-- Gather each level used once, then replicate over z
+#		--
+    levels, level_ndxs = np.unique( level_map, return_inverse = True )
+    planes = dset_value[
+        pin_y[ np.newaxis, np.newaxis, : ],
+        pin_x[ np.newaxis, :, np.newaxis ],
+        levels[ :, np.newaxis, np.newaxis ],
+        assy_ndxs.clip( 0 )[ np.newaxis, :, : ]
+        ].astype( np.float64 )
+    planes[ :, assy_ndxs < 0 ] = 0.0
+
+    shape = ( len( level_map ), npinx * nx, npiny * ny )
+    if planes.shape[ 1 : ] == shape[ 1 : ]:
+      matrix = planes[ level_ndxs ]
+    else:
+      matrix = np.zeros( shape )
+      matrix[ :, : planes.shape[ 1 ], : planes.shape[ 2 ] ] = \
+          planes[ level_ndxs, : shape[ 1 ], : shape[ 2 ] ]
+    return  matrix
+  #end CreateMatrix
+
+
+  #----------------------------------------------------------------------
+  #	METHOD:		GetMatrix()					-
+  #----------------------------------------------------------------------
+  @staticmethod
+  def GetMatrix( dmgr, qds_name, time_value, extent, mesh_levels, side ):
+    """Retrieves the cached matrix for the dataset, time value, and core
+extent, creating and caching it if necessary.  The h5py file and dataset
+are checked, so a model name reused for another file is not served stale.
+    Args:
+        dmgr (data.datamodel_mgr.DataModelMgr): data model manager
+        qds_name (DataSetName): dataset name
+        time_value (float): time value
+        extent (sequence): core extent in assemblies
+        mesh_levels (sequence): ascending z position of the top of each
+            axial level
+        side (str): ``CreateLevelMap()`` side
+    Returns:
+        np.ndarray: read-only matrix or None if the dataset is not found
+"""
+    matrix = None
+    core = dmgr.GetCore()
+    dset = dmgr.GetH5DataSet( qds_name, time_value )
+
+    if core is not None and dset is not None:
+      key = ( qds_name, time_value, tuple( extent ), side )
+      try:
+        ident = ( dset.file.filename, dset.name, hash( dset.id ), dset.shape )
+      except Exception:
+        ident = None
+
+      with VolumeMatrix.cacheLock_:
+        entry = VolumeMatrix.cache_.pop( key, None )
+        if entry is not None and entry[ 0 ] == ident and ident is not None:
+          VolumeMatrix.cache_[ key ] = entry
+          matrix = entry[ 1 ]
+        elif entry is not None:
+          VolumeMatrix.cacheBytes_ -= entry[ 1 ].nbytes
+
+      if matrix is None:
+        dset_value = dmgr.GetStateArray( qds_name, time_value )
+        matrix = VolumeMatrix.CreateMatrix(
+            dset_value, core.coreMap, extent,
+            max( core.npinx, dset_value.shape[ 1 ] ),
+            max( core.npiny, dset_value.shape[ 0 ] ),
+            VolumeMatrix.CreateLevelMap(
+                mesh_levels, dset_value.shape[ 2 ], side
+                )
+            )
+        matrix.flags.writeable = False
+        if ident is not None:
+          VolumeMatrix._PutEntry( key, ident, matrix )
+    #end if core is not None and dset is not None
+
+    return  matrix
+  #end GetMatrix
+
+
+  #----------------------------------------------------------------------
+  #	METHOD:		_PutEntry()					-
+  #----------------------------------------------------------------------
+  @staticmethod
+  def _PutEntry( key, ident, matrix ):
+    """Adds a matrix, evicting the least recently used to stay within the
+budget.  A matrix larger than the budget is not cached.
+"""
+    if matrix.nbytes <= VolumeMatrix.cacheBudget_:
+      with VolumeMatrix.cacheLock_:
+        if key in VolumeMatrix.cache_:
+          VolumeMatrix._RemoveEntry( key )
+        VolumeMatrix.cache_[ key ] = ( ident, matrix )
+        VolumeMatrix.cacheBytes_ += matrix.nbytes
+
+        while VolumeMatrix.cacheBytes_ > VolumeMatrix.cacheBudget_:
+          VolumeMatrix._RemoveEntry( next( iter( VolumeMatrix.cache_ ) ) )
+  #end _PutEntry
+
+
+  #----------------------------------------------------------------------
+  #	METHOD:		_RemoveEntry()					-
+  #----------------------------------------------------------------------
+  @staticmethod
+  def _RemoveEntry( key ):
+    """Caller must hold ``cacheLock_``.
+"""
+    entry = VolumeMatrix.cache_.pop( key )
+    VolumeMatrix.cacheBytes_ -= entry[ 1 ].nbytes
+  #end _RemoveEntry
+
+
+  #----------------------------------------------------------------------
+  #	METHOD:		SetCacheBudget()				-
+  #----------------------------------------------------------------------
+  @staticmethod
+  def SetCacheBudget( value ):
+    """
+    Args:
+        value (int): byte budget for cached matrices, where 0 disables
+            caching
+"""
+    with VolumeMatrix.cacheLock_:
+      VolumeMatrix.cacheBudget_ = max( 0, value )
+      while VolumeMatrix.cache_ and \
+          VolumeMatrix.cacheBytes_ > VolumeMatrix.cacheBudget_:
+        VolumeMatrix._RemoveEntry( next( iter( VolumeMatrix.cache_ ) ) )
+  #end SetCacheBudget
+
+#end VolumeMatrix
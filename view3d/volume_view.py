@@ -2,6 +2,8 @@
 # -----------------------------------------------------------------------
 #  NAME:    volume_view.py          -
 #  HISTORY:              -
+#    2026-10-18
+#    Creating the 3D matrix with VolumeMatrix.
 #    2018-01-23  purvesmh@ornl.gov
 #    VolumeViewAlt moved back to Volume3DView to provide new 3D volume
 #    view capability. WIP full core viz support
@@ -27,7 +29,6 @@
 #    Changed _CreateClipboardData() signature.
 #    2016-03-08  leerw@ornl.gov        -
 # -----------------------------------------------------------------------
-import bisect
 import functools
 import logging
 import math
@@ -61,6 +62,8 @@ from event.state import *
 from widget.widget import *
 from widget.widgetcontainer import *
 
+from .volume_matrix import *
+
 
 # -----------------------------------------------------------------------
 #  CLASS:    Volume3DView                                            -
@@ -135,13 +138,6 @@ class Volume3DView(Widget):
     if core is not None and self.curDataSet and \
             self.coreExtent is not None and \
             (core.npinx > 0 or core.npiny > 0):
-      dset = self.dmgr.GetH5DataSet(self.curDataSet, self.timeValue)
-      dset_value = np.array(dset)
-      dset_shape = dset.shape
-
-      cur_npinx = max(core.npinx, dset_shape[1])
-      cur_npiny = max(core.npiny, dset_shape[0])
-
       if self.logger.isEnabledFor(logging.DEBUG):
         self.logger.debug(
             'curDataSet=%s, stateIndex=%d',
@@ -155,52 +151,13 @@ class Volume3DView(Widget):
           int((ax_mesh[i + 1] - ax_mesh[0]) / pin_pitch)
           for i in range(len(ax_mesh) - 1)
       ]
-      z_size = self.meshLevels[-1]
 
       # z, x, y(bottom up)
       # xxxxx +1 on pin ranges if a channel dataset
-      matrix = np.ndarray(
-          # (z_size, core.npinx * assy_range[5], core.npiny * assy_range[4]),
-          (z_size,
-              cur_npinx * self.coreExtent[-2],
-              cur_npiny * self.coreExtent[-1]),
-          np.float64
+      matrix = VolumeMatrix.GetMatrix(
+          self.dmgr, self.curDataSet, self.timeValue, self.coreExtent,
+          self.meshLevels, 'left'
       )
-      matrix.fill(0.0)
-
-      pin_y = 0
-      # for assy_y in range( assy_range[ 3 ] - 1, assy_range[ 1 ] - 1, -1 ):
-      for assy_y in xrange(self.coreExtent[3] - 1, self.coreExtent[1] - 1, -1):
-        pin_x = 0
-        # for assy_x in range( assy_range[ 0 ], assy_range[ 2 ] ):
-        for assy_x in xrange(self.coreExtent[0], self.coreExtent[2]):
-          assy_ndx = core.coreMap[assy_y, assy_x] - 1
-          if assy_ndx >= 0:
-            for z in xrange(z_size):
-              ax_level = min(
-                  bisect.bisect_left(self.meshLevels, z),
-                  len(self.meshLevels) - 1
-              )
-              # for y in range( core.npiny ):
-              pin_y2 = 0
-              for y in xrange(cur_npiny - 1, -1, -1):
-                data_y = min(y, dset_shape[0] - 1)
-
-                for x in xrange(cur_npinx):
-                  data_x = min(x, dset_shape[1] - 1)
-                  matrix[z, pin_x + x, pin_y + pin_y2] = \
-                      dset_value[data_y, data_x, ax_level, assy_ndx]
-                # end for x
-                pin_y2 += 1
-              # end for y
-            # end for z
-          # end if assy_ndx
-
-          pin_x += cur_npinx
-        # end for assy_x
-
-        pin_y += cur_npiny
-      # end for assy_y
     # end if self.data is not None
 
     return matrix
@@ -4,8 +4,11 @@
 __all__ = \
   [
     'animators',
+    'array_prefetcher',
     'assembly_view',
     'axial_plot',
+    'batch_renderer',
+    'bitmap_cache',
     'colormaps.py',
     'core_axial_view',
     'core_view',
@@ -18,6 +21,7 @@ __all__ = \
     'legend3',
     'plot_widget',
     'raster_widget',
+    'rgba_raster',
     'subpin_len_plot',
     'subpin_plot',
     'subpin_view',
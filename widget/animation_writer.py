@@ -0,0 +1,721 @@
+#!/usr/bin/env python
+# $Id$
+#------------------------------------------------------------------------
+#	NAME:		animation_writer.py				-
+#	HISTORY:							-
+#		2026-10-18						-
+#	  Incremental animated GIF, APNG, and MP4 encoding of RGBA frames.
+#------------------------------------------------------------------------
+"""Writers that encode an animation while its frames are still being
+rendered.
+
+Frames are RGBA ``np.ndarray`` buffers passed in order to ``AddFrame()``.
+The per-frame work, palette quantization for GIF, deflating scanlines for
+APNG and the frame images zip, and flattening for MP4, runs on a
+``multiprocessing`` pool, and encoded frames are written in order as they
+complete.  The file is finished shortly after the last frame is added.
+
+GIF frames share the palette of the first frame, whose legend covers the
+full colormap, which keeps the colors from flickering between frames.  PIL
+is required for GIF, APNG needs only zlib, and MP4 is written with
+``imageio`` when it is installed.
+
+No wx dependency here, so the module can be used and tested without a
+display.
+"""
+import collections, multiprocessing, os, struct, sys, zipfile, zlib
+import numpy as np
+import pdb
+
+try:
+  import PIL.Image
+  from PIL import GifImagePlugin
+except Exception:
+  GifImagePlugin = None
+
+try:
+  import imageio
+except Exception:
+  imageio = None
+
+
+BACKGROUND_COLOR = ( 236, 236, 236 )
+
+PNG_SIGNATURE = b'\x89PNG\r\n\x1a\n'
+
+
+#------------------------------------------------------------------------
+#	NAME:		_CreatePngChunk()				-
+#------------------------------------------------------------------------
+def _CreatePngChunk( chunk_type, data ):
+  """
+  Args:
+      chunk_type (bytes): four character chunk type
+      data (bytes): chunk data
+  Returns:
+      bytes: chunk with length and CRC
+"""
+  return  \
+      struct.pack( '>I', len( data ) ) + chunk_type + data + \
+      struct.pack( '>I', zlib.crc32( chunk_type + data ) & 0xffffffff )
+#end _CreatePngChunk
+
+
+#------------------------------------------------------------------------
+#	NAME:		CreatePngFile()					-
+#------------------------------------------------------------------------
+def CreatePngFile( wd, ht, deflated, text = None ):
+  """
+  Args:
+      wd (int): image width
+      ht (int): image height
+      deflated (bytes): result of ``DeflateImage()``
+      text (sequence): optional ( keyword, value ) pairs written as tEXt
+          chunks
+  Returns:
+      bytes: PNG file contents
+"""
+  text_chunks = b''.join(
+      _CreatePngChunk( b'tEXt', bytes( key ) + b'\0' + bytes( value ) )
+      for key, value in (text or ())
+      )
+  return  \
+      PNG_SIGNATURE + \
+      _CreatePngChunk(
+          b'IHDR', struct.pack( '>IIBBBBB', wd, ht, 8, 6, 0, 0, 0 )
+          ) + \
+      text_chunks + \
+      _CreatePngChunk( b'IDAT', deflated ) + \
+      _CreatePngChunk( b'IEND', b'' )
+#end CreatePngFile
+
+
+#------------------------------------------------------------------------
+#	NAME:		DeflateImage()					-
+#------------------------------------------------------------------------
+def DeflateImage( image, params = None ):
+  """Creates PNG image data with no scanline filtering.
+  Args:
+      image (np.ndarray): (ht, wd, 4) uint8 RGBA buffer
+      params (dict): ignored
+  Returns:
+      bytes: compressed scanlines
+"""
+  ht = image.shape[ 0 ]
+  rows = np.zeros( ( ht, image.shape[ 1 ] * 4 + 1 ), dtype = np.uint8 )
+  rows[ :, 1 : ] = image.reshape( ( ht, -1 ) )
+  return  zlib.compress( rows.tobytes(), 6 )
+#end DeflateImage
+
+
+#------------------------------------------------------------------------
+#	NAME:		_EncodeFrame()					-
+#------------------------------------------------------------------------
+def _EncodeFrame( encode_func, image, params, zip_flag ):
+  """Pool task wrapping the writer-specific encode function.
+  Args:
+      encode_func (callable): module function to apply, prototype
+          func( image, params ), returning the encoded frame
+      image (np.ndarray): (ht, wd, 4) uint8 RGBA buffer
+      params (dict): writer parameters
+      zip_flag (bool): True to also create a PNG file for the frame
+  Returns:
+      tuple: ( encoded frame, PNG file contents or None )
+"""
+  png_file = None
+  if zip_flag:
+    png_file = CreatePngFile(
+        image.shape[ 1 ], image.shape[ 0 ], DeflateImage( image )
+        )
+  return  encode_func( image, params ), png_file
+#end _EncodeFrame
+
+
+#------------------------------------------------------------------------
+#	NAME:		_FlattenImage()					-
+#------------------------------------------------------------------------
+def _FlattenImage( image, params = None ):
+  """Composites an RGBA frame over ``BACKGROUND_COLOR``.
+  Args:
+      image (np.ndarray): (ht, wd, 4) uint8 RGBA buffer
+      params (dict): ignored
+  Returns:
+      np.ndarray: (ht, wd, 3) uint8 RGB buffer
+"""
+  alpha = image[ :, :, 3 : 4 ].astype( np.float32 ) / 255.0
+  rgb = \
+      image[ :, :, : 3 ].astype( np.float32 ) * alpha + \
+      np.array( BACKGROUND_COLOR, dtype = np.float32 ) * (1.0 - alpha)
+  return  np.rint( rgb ).astype( np.uint8 )
+#end _FlattenImage
+
+
+#------------------------------------------------------------------------
+#	NAME:		_QuantizeGifFrame()				-
+#------------------------------------------------------------------------
+def _QuantizeGifFrame( image, params ):
+  """Maps a frame to the shared palette and encodes it.
+  Args:
+      image (np.ndarray): (ht, wd, 4) uint8 RGBA buffer
+      params (dict): 'duration' in ms and 'palette', a list of 768 ints
+  Returns:
+      bytes: GIF frame data
+"""
+  palette_im = PIL.Image.new( 'P', ( 1, 1 ) )
+  palette_im.putpalette( params[ 'palette' ] )
+  im = PIL.Image.fromarray( _FlattenImage( image ), 'RGB' ).\
+      quantize( palette = palette_im )
+  return  b''.join(
+      GifImagePlugin.getdata( im, ( 0, 0 ), duration = params[ 'duration' ] )
+      )
+#end _QuantizeGifFrame
+
+
+#------------------------------------------------------------------------
+#	CLASS:		AnimationWriter					-
+#------------------------------------------------------------------------
+class AnimationWriter( object ):
+  """Base class for incremental animation writers.  Use ``Create()`` to
+get the writer for a file extension.
+
+Properties:
+  frameCount		number of frames written
+  frameDelay		delay in seconds between frames
+  path			output file path
+  size			( wd, ht ) of the first frame, to which later frames
+			are padded or cropped
+"""
+
+
+#		-- Class Attributes
+#		--
+
+  ENCODE_FUNC = None
+  """callable: Module function run on the pool for each frame."""
+
+  FORMATS = collections.OrderedDict( [
+      ( 'gif', 'GIF files (*.gif)|*.gif' ),
+      ( 'png', 'Animated PNG files (*.png)|*.png' ),
+      ( 'mp4', 'MP4 files (*.mp4)|*.mp4' )
+      ] )
+  """OrderedDict: File dialog wildcard by extension."""
+
+
+#		-- Object Methods
+#		--
+
+
+  #----------------------------------------------------------------------
+  #	METHOD:		AnimationWriter.__init__()			-
+  #----------------------------------------------------------------------
+  def __init__(
+      self, file_path, frame_delay, frame_total,
+      worker_count = 0, zip_path = None
+      ):
+    """
+    Args:
+        file_path (str): path to the file to create
+        frame_delay (float): delay in seconds between frames
+        frame_total (int): number of frames expected
+        worker_count (int): number of pool processes, where values lt 2
+            encode on the calling thread
+        zip_path (str): optional path to a zip file of PNG frame images
+"""
+    self.frameCount = 0
+    self.frameDelay = frame_delay
+    self.frameTotal = frame_total
+    self.params = {}
+    self.path = file_path
+    self.pending = collections.deque()
+    self.pool = \
+        multiprocessing.Pool( worker_count )  if worker_count > 1 else  None
+    self.maxPending = max( 2, worker_count * 2 )
+    self.size = None
+    self.zipFile = \
+        zipfile.ZipFile( zip_path, 'w', zipfile.ZIP_STORED ) \
+        if zip_path else  None
+  #end __init__
+
+
+  #----------------------------------------------------------------------
+  #	METHOD:		AnimationWriter.Abort()				-
+  #----------------------------------------------------------------------
+  def Abort( self ):
+    """Stops encoding, closes files, and removes the output file.
+"""
+    self.pending.clear()
+    self._ClosePool( True )
+    try:
+      self._CloseFile()
+    finally:
+      if self.zipFile is not None:
+        self.zipFile.close()
+      if os.path.exists( self.path ):
+        os.remove( self.path )
+  #end Abort
+
+
+  #----------------------------------------------------------------------
+  #	METHOD:		AnimationWriter.AddFrame()			-
+  #----------------------------------------------------------------------
+  def AddFrame( self, image ):
+    """Queues the next frame for encoding and writes any frames whose
+encoding has completed, blocking if too many frames are pending.
+    Args:
+        image (np.ndarray): (ht, wd, 4) uint8 RGBA buffer
+"""
+    image = np.asarray( image, dtype = np.uint8 )
+    if self.size is None:
+      self.size = ( image.shape[ 1 ], image.shape[ 0 ] )
+      self._Begin( image )
+    else:
+      image = AnimationWriter.FitImage( image, self.size )
+
+    args = ( self.ENCODE_FUNC, image, self.params, self.zipFile is not None )
+    if self.pool is None:
+      self.pending.append( _EncodeFrame( *args ) )
+    else:
+      self.pending.append( self.pool.apply_async( _EncodeFrame, args ) )
+    self._WritePending( len( self.pending ) >= self.maxPending )
+  #end AddFrame
+
+
+  #----------------------------------------------------------------------
+  #	METHOD:		AnimationWriter._Begin()			-
+  #----------------------------------------------------------------------
+  def _Begin( self, image ):
+    """Called with the first frame before it is encoded to open the file
+and set ``params``.  Must be implemented by extensions.
+    Args:
+        image (np.ndarray): first frame
+"""
+    pass
+  #end _Begin
+
+
+  #----------------------------------------------------------------------
+  #	METHOD:		AnimationWriter.Close()				-
+  #----------------------------------------------------------------------
+  def Close( self ):
+    """Writes remaining frames and completes the file.
+"""
+    try:
+      while self.pending:
+        self._WritePending( True )
+      self._End()
+    finally:
+      self._ClosePool( False )
+      self._CloseFile()
+      if self.zipFile is not None:
+        self.zipFile.close()
+  #end Close
+
+
+  #----------------------------------------------------------------------
+  #	METHOD:		AnimationWriter._CloseFile()			-
+  #----------------------------------------------------------------------
+  def _CloseFile( self ):
+    """Closes the output.  Must be implemented by extensions.
+"""
+    pass
+  #end _CloseFile
+
+
+  #----------------------------------------------------------------------
+  #	METHOD:		AnimationWriter._ClosePool()			-
+  #----------------------------------------------------------------------
+  def _ClosePool( self, terminate ):
+    if self.pool is not None:
+      if terminate:
+        self.pool.terminate()
+      else:
+        self.pool.close()
+      self.pool.join()
+      self.pool = None
+  #end _ClosePool
+
+
+  #----------------------------------------------------------------------
+  #	METHOD:		AnimationWriter._End()				-
+  #----------------------------------------------------------------------
+  def _End( self ):
+    """Called after the last frame is written to complete the file.
+Must be implemented by extensions.
+"""
+    pass
+  #end _End
+
+
+  #----------------------------------------------------------------------
+  #	METHOD:		AnimationWriter._WriteFrame()			-
+  #----------------------------------------------------------------------
+  def _WriteFrame( self, ndx, encoded ):
+    """Writes an encoded frame.  Must be implemented by extensions.
+    Args:
+        ndx (int): 0-based frame index
+        encoded: result of ``ENCODE_FUNC``
+"""
+    pass
+  #end _WriteFrame
+
+
+  #----------------------------------------------------------------------
+  #	METHOD:		AnimationWriter._WritePending()			-
+  #----------------------------------------------------------------------
+  def _WritePending( self, block ):
+    """Writes frames in order from the front of the pending queue while
+they are ready.
+    Args:
+        block (bool): True to wait for the first pending frame
+"""
+    while self.pending:
+      item = self.pending[ 0 ]
+      if self.pool is not None:
+        if not (block or item.ready()):
+          break
+        item = item.get()
+      self.pending.popleft()
+      block = False
+
+      encoded, png_file = item
+      self._WriteFrame( self.frameCount, encoded )
+      if png_file is not None:
+        self.zipFile.writestr(
+            '{0:04d}.png'.format( self.frameCount ), png_file
+            )
+      self.frameCount += 1
+    #end while
+  #end _WritePending
+
+
+#		-- Static Methods
+#		--
+
+
+  #----------------------------------------------------------------------
+  #	METHOD:		AnimationWriter.Create()			-
+  #----------------------------------------------------------------------
+  @staticmethod
+  def Create( file_path, frame_delay, frame_total, **kwargs ):
+    """Creates the writer for the file extension.
+    Args:
+        file_path (str): path to the file to create, with extension '.gif',
+            '.png', or '.mp4'
+        frame_delay (float): delay in seconds between frames
+        frame_total (int): number of frames expected
+        **kwargs: 'worker_count' and 'zip_path' as for ``__init__()``
+    Returns:
+        AnimationWriter: new writer
+    Raises:
+        ValueError: if the extension is not supported or its dependency is
+            not installed
+"""
+    ext = AnimationWriter.GetFormat( file_path )
+    if not AnimationWriter.IsFormatAvailable( ext ):
+      raise ValueError(
+          'Cannot create "%s", format not available' %
+          os.path.basename( file_path )
+          )
+
+    cls = \
+        ApngWriter  if ext == 'png' else \
+        Mp4Writer  if ext == 'mp4' else \
+        GifWriter
+    return  cls( file_path, frame_delay, frame_total, **kwargs )
+  #end Create
+
+
+  #----------------------------------------------------------------------
+  #	METHOD:		AnimationWriter.FitImage()			-
+  #----------------------------------------------------------------------
+  @staticmethod
+  def FitImage( image, size ):
+    """Pads with transparent pixels or crops a frame to a size.
+    Args:
+        image (np.ndarray): (ht, wd, 4) uint8 RGBA buffer
+        size (tuple): ( wd, ht )
+    Returns:
+        np.ndarray: ``image`` if the size matches, otherwise a new buffer
+"""
+    wd, ht = size
+    if image.shape[ 0 ] != ht or image.shape[ 1 ] != wd:
+      fitted = np.zeros( ( ht, wd, 4 ), dtype = np.uint8 )
+      copy_ht = min( ht, image.shape[ 0 ] )
+      copy_wd = min( wd, image.shape[ 1 ] )
+      fitted[ : copy_ht, : copy_wd ] = image[ : copy_ht, : copy_wd ]
+      image = fitted
+    return  image
+  #end FitImage
+
+
+  #----------------------------------------------------------------------
+  #	METHOD:		AnimationWriter.GetFormat()			-
+  #----------------------------------------------------------------------
+  @staticmethod
+  def GetFormat( file_path ):
+    """
+    Args:
+        file_path (str): file path
+    Returns:
+        str: lowercase extension without the dot, e.g., 'gif'
+"""
+    return  os.path.splitext( file_path )[ 1 ][ 1 : ].lower()
+  #end GetFormat
+
+
+  #----------------------------------------------------------------------
+  #	METHOD:		AnimationWriter.GetWildcard()			-
+  #----------------------------------------------------------------------
+  @staticmethod
+  def GetWildcard():
+    """
+    Returns:
+        str: file dialog wildcard for the available formats
+"""
+    return  '|'.join(
+        v for k, v in AnimationWriter.FORMATS.iteritems()
+        if AnimationWriter.IsFormatAvailable( k )
+        )
+  #end GetWildcard
+
+
+  #----------------------------------------------------------------------
+  #	METHOD:		AnimationWriter.IsFormatAvailable()		-
+  #----------------------------------------------------------------------
+  @staticmethod
+  def IsFormatAvailable( ext ):
+    """
+    Args:
+        ext (str): extension as returned by ``GetFormat()``
+    Returns:
+        bool: True if the format is supported and its dependency is
+            installed
+"""
+    return  \
+        ext == 'png' or \
+        (ext == 'gif' and GifImagePlugin is not None) or \
+        (ext == 'mp4' and imageio is not None)
+  #end IsFormatAvailable
+
+#end AnimationWriter
+
+
+#------------------------------------------------------------------------
+#	CLASS:		ApngWriter					-
+#------------------------------------------------------------------------
+class ApngWriter( AnimationWriter ):
+  """Animated PNG with RGBA frames.  The frame count in the acTL chunk is
+``frame_total`` and is rewritten on close if fewer frames were added.
+"""
+
+  ENCODE_FUNC = staticmethod( DeflateImage )
+
+
+  #----------------------------------------------------------------------
+  #	METHOD:		ApngWriter.__init__()				-
+  #----------------------------------------------------------------------
+  def __init__( self, *args, **kwargs ):
+    super( ApngWriter, self ).__init__( *args, **kwargs )
+    self.acTLOffset = 0
+    self.fp = None
+    self.sequence = 0
+  #end __init__
+
+
+  #----------------------------------------------------------------------
+  #	METHOD:		ApngWriter._Begin()				-
+  #----------------------------------------------------------------------
+  def _Begin( self, image ):
+    self.fp = open( self.path, 'wb' )
+    self.fp.write( PNG_SIGNATURE )
+    self.fp.write( _CreatePngChunk(
+        b'IHDR',
+        struct.pack( '>IIBBBBB', self.size[ 0 ], self.size[ 1 ], 8, 6, 0, 0, 0 )
+        ) )
+    self.acTLOffset = self.fp.tell()
+    self.fp.write( self._CreateAcTL( self.frameTotal ) )
+  #end _Begin
+
+
+  #----------------------------------------------------------------------
+  #	METHOD:		ApngWriter._CloseFile()				-
+  #----------------------------------------------------------------------
+  def _CloseFile( self ):
+    if self.fp is not None:
+      self.fp.close()
+      self.fp = None
+  #end _CloseFile
+
+
+  #----------------------------------------------------------------------
+  #	METHOD:		ApngWriter._CreateAcTL()			-
+  #----------------------------------------------------------------------
+  def _CreateAcTL( self, frame_count ):
+    """
+    Returns:
+        bytes: animation control chunk, playing indefinitely
+"""
+    return  _CreatePngChunk( b'acTL', struct.pack( '>II', frame_count, 0 ) )
+  #end _CreateAcTL
+
+
+  #----------------------------------------------------------------------
+  #	METHOD:		ApngWriter._End()				-
+  #----------------------------------------------------------------------
+  def _End( self ):
+    if self.fp is not None:
+      self.fp.write( _CreatePngChunk( b'IEND', b'' ) )
+      if self.frameCount != self.frameTotal:
+        self.fp.seek( self.acTLOffset )
+        self.fp.write( self._CreateAcTL( self.frameCount ) )
+  #end _End
+
+
+  #----------------------------------------------------------------------
+  #	METHOD:		ApngWriter._WriteFrame()			-
+  #----------------------------------------------------------------------
+  def _WriteFrame( self, ndx, encoded ):
+    delay_ms = max( 1, int( round( self.frameDelay * 1000.0 ) ) )
+    self.fp.write( _CreatePngChunk(
+        b'fcTL',
+        struct.pack(
+            '>IIIIIHHBB', self.sequence, self.size[ 0 ], self.size[ 1 ],
+            0, 0, min( delay_ms, 0xffff ), 1000, 0, 0
+            )
+        ) )
+    self.sequence += 1
+
+    if ndx == 0:
+      self.fp.write( _CreatePngChunk( b'IDAT', encoded ) )
+    else:
+      self.fp.write( _CreatePngChunk(
+          b'fdAT', struct.pack( '>I', self.sequence ) + encoded
+          ) )
+      self.sequence += 1
+  #end _WriteFrame
+
+#end ApngWriter
+
+
+#------------------------------------------------------------------------
+#	CLASS:		GifWriter					-
+#------------------------------------------------------------------------
+class GifWriter( AnimationWriter ):
+  """Animated GIF, looping indefinitely, with the first frame's adaptive
+palette shared by all frames.
+"""
+
+  ENCODE_FUNC = staticmethod( _QuantizeGifFrame )
+
+
+  #----------------------------------------------------------------------
+  #	METHOD:		GifWriter.__init__()				-
+  #----------------------------------------------------------------------
+  def __init__( self, *args, **kwargs ):
+    super( GifWriter, self ).__init__( *args, **kwargs )
+    self.fp = None
+  #end __init__
+
+
+  #----------------------------------------------------------------------
+  #	METHOD:		GifWriter._Begin()				-
+  #----------------------------------------------------------------------
+  def _Begin( self, image ):
+    """Creates the palette from the first frame and writes the header
+with the looping extension.
+"""
+    duration = max( 10, int( round( self.frameDelay * 1000.0 ) ) )
+    im = PIL.Image.fromarray( _FlattenImage( image ), 'RGB' ).quantize( 256 )
+    self.params = \
+      {
+      'duration': duration,
+      'palette': ( im.getpalette() + [ 0 ] * 768 )[ : 768 ]
+      }
+
+    header = GifImagePlugin.getheader( im, None, { 'duration': duration } )[ 0 ]
+    self.fp = open( self.path, 'wb' )
+    self.fp.write( b''.join( header ) )
+#		-- NETSCAPE2.0 application extension, loop forever
+    self.fp.write(
+        b'!\xff\x0bNETSCAPE2.0\x03\x01' + struct.pack( '<H', 0 ) + b'\x00'
+        )
+  #end _Begin
+
+
+  #----------------------------------------------------------------------
+  #	METHOD:		GifWriter._CloseFile()				-
+  #----------------------------------------------------------------------
+  def _CloseFile( self ):
+    if self.fp is not None:
+      self.fp.close()
+      self.fp = None
+  #end _CloseFile
+
+
+  #----------------------------------------------------------------------
+  #	METHOD:		GifWriter._End()				-
+  #----------------------------------------------------------------------
+  def _End( self ):
+    if self.fp is not None:
+      self.fp.write( b';' )
+  #end _End
+
+
+  #----------------------------------------------------------------------
+  #	METHOD:		GifWriter._WriteFrame()				-
+  #----------------------------------------------------------------------
+  def _WriteFrame( self, ndx, encoded ):
+    self.fp.write( encoded )
+  #end _WriteFrame
+
+#end GifWriter
+
+
+#------------------------------------------------------------------------
+#	CLASS:		Mp4Writer					-
+#------------------------------------------------------------------------
+class Mp4Writer( AnimationWriter ):
+  """MP4 video written with ``imageio``, frames flattened over the
+background color.
+"""
+
+  ENCODE_FUNC = staticmethod( _FlattenImage )
+
+
+  #----------------------------------------------------------------------
+  #	METHOD:		Mp4Writer.__init__()				-
+  #----------------------------------------------------------------------
+  def __init__( self, *args, **kwargs ):
+    super( Mp4Writer, self ).__init__( *args, **kwargs )
+    self.writer = None
+  #end __init__
+
+
+  #----------------------------------------------------------------------
+  #	METHOD:		Mp4Writer._Begin()				-
+  #----------------------------------------------------------------------
+  def _Begin( self, image ):
+    self.writer = imageio.get_writer(
+        self.path, fps = 1.0 / max( 0.001, self.frameDelay )
+        )
+  #end _Begin
+
+
+  #----------------------------------------------------------------------
+  #	METHOD:		Mp4Writer._CloseFile()				-
+  #----------------------------------------------------------------------
+  def _CloseFile( self ):
+    if self.writer is not None:
+      self.writer.close()
+      self.writer = None
+  #end _CloseFile
+
+
+  #----------------------------------------------------------------------
+  #	METHOD:		Mp4Writer._WriteFrame()				-
+  #----------------------------------------------------------------------
+  def _WriteFrame( self, ndx, encoded ):
+    self.writer.append_data( encoded )
+  #end _WriteFrame
+
+#end Mp4Writer
@@ -3,6 +3,13 @@
 #------------------------------------------------------------------------
 #	NAME:		animators.py				        -
 #	HISTORY:							-
+#		2026-10-18						-
+#	  Frames rendered with RasterWidget.CreateFrameImage() off the UI
+#	  event loop where possible and encoded as they are rendered with
+#	  AnimationWriter into GIF, APNG, or MP4, replacing the polling
+#	  loop, per-frame GIF files, and gifsicle.  Optional fast frames
+#	  for widgets with a BatchRenderer equivalent, rendered headless
+#	  on a process pool without titles, labels, or legend values.
 #		2019-01-16	leerw@ornl.gov				-
 #         Transition from tally to fluence.
 #		2018-10-02	leerw@ornl.gov				-
@@ -34,8 +41,9 @@
 #------------------------------------------------------------------------
 import glob, inspect, logging, math, os, platform, \
     StringIO, shutil, six, subprocess, sys, \
-    time, tempfile, threading, zipfile
-#import traceback
+    time, tempfile, threading, traceback, zipfile
+import h5py
+import numpy as np
 #import pdb
 
 try:
@@ -51,7 +59,10 @@ except Exception:
   raise ImportError, 'The Python Imaging Library (PIL) required for this component'
 
 #import bean.animate_options_bean as aob
+from .animation_writer import AnimationWriter
+from .batch_renderer import BatchRenderer
 from .bean import animate_options_bean as aob
+from .widget_config import WidgetConfig
 from data.config import Config
 from data.datamodel import *
 from event.state import *
@@ -114,101 +125,229 @@ class Animator( object ):
 
 
   #----------------------------------------------------------------------
-  #	METHOD:		Animator.CreateAnimatedImage()                  -
+  #	METHOD:		Animator._CallOnUIThread()			-
   #----------------------------------------------------------------------
-  def CreateAnimatedImage( self, file_path, temp_dir, frame_delay ):
-    """
-    Args:
-        file_path (str): path to GIF file to create
-        temp_dir (str): path to temporary directory to hold frame images
-	frame_delay (float): delay in seconds b/w frames
+  def _CallOnUIThread( self, func, *args, **kwargs ):
+    """Calls a function on the UI thread and waits for it to finish.  Must
+be called from a background thread.
+@param  func		function to call
+@return			result of func
 """
-    zfp = zipfile.ZipFile( file_path + '.images.zip', 'w', zipfile.ZIP_DEFLATED )
-    fnames = sorted( glob.glob( os.path.join( temp_dir, '*.png' ) ) )
-    try:
-      for f in sorted( fnames ):
-#      # subprocess.call() fails on Windows
-#      os.system( 'convert "%s" "%s.gif"' % ( f, f ) )
-	gif_name = f.replace( '.png', '.gif' )
-        png_im = PIL.Image.open( f )
-        gif_im = PIL.Image.new( "RGBA", png_im.size, ( 236, 236, 236, 255 ) )
-        gif_im.paste( png_im, ( 0, 0 ), png_im )
-        #gif_im.save( f + '.gif', 'GIF' )
-        gif_im.save( gif_name, 'GIF' )
-
-	zfp.write( f, os.path.basename( f ) )
-	zfp.write( gif_name, os.path.basename( gif_name ) )
-      #end for f
-    finally:
-      zfp.close()
-
-#        [ 'gifsicle', '--disposal=background', '--delay=50', '--loop' ]
-    delay_csecs = max( 1, int( math.floor( frame_delay * 100.0 ) ) )
-    delay_arg = '--delay={0:d}'.format( delay_csecs )
-    args = \
-        [ 'gifsicle', '--disposal=background', delay_arg ] + \
-        sorted( glob.glob( os.path.join( temp_dir, '*.gif' ) ) ) + \
-	[ '-o', file_path ]
-    proc = subprocess.Popen( args )
-    proc.wait()
-#    os.system(
-#        'convert -dispose Background -delay 50 -loop 99 "%s" "%s"' % \
-#        ( os.path.join( temp_dir, '*.gif' ), file_path )
-#        )
-
-#               -- Create HTML file
-#               --
-    fp = file( file_path + '.html', 'w' )
-    try:
-      name = os.path.basename( file_path )
-      print >> fp, '<header><title>%s</title></header>' % name
-      print >> fp, '<body><img src="%s"/></body>' % name
-    finally:
-      fp.close()
-  #end CreateAnimatedImage
+    done = threading.Event()
+    result = {}
+
+    def call():
+      try:
+	result[ 'value' ] = func( *args, **kwargs )
+      except Exception, ex:
+	result[ 'error' ] = ex
+      finally:
+	done.set()
+
+    wx.CallAfter( call )
+    done.wait()
+    if 'error' in result:
+      raise result[ 'error' ]
+    return  result.get( 'value' )
+  #end _CallOnUIThread
 
 
   #----------------------------------------------------------------------
-  #	METHOD:		Animator._CreateStepImage()			-
+  #	METHOD:		Animator._CreateFrameArgs()			-
   #----------------------------------------------------------------------
-  def _CreateStepImage( self, dialog, fpath, show_selections = False ):
-    """Must be called on the UI thread.
+  def _CreateFrameArgs( self, step ):
+    """Defines the widget CreateFrameImage() overrides for a step.  This
+implementation returns None, in which case frames are created by updating
+the widget state on the UI thread with _DoStepUpdate().  Called on the
+worker thread.
+@param  step		0-based step index
+@return			dict of overrides or None
 """
-    pct = int( self.nextStep * 100.0 / (self.totalSteps + 1) )
-    msg = 'Creating frame %d/%d' % ( (self.nextStep + 1), self.totalSteps )
-    self.logger.info( msg )
+    return  None
+  #end _CreateFrameArgs
 
-    #cancelled, skipped = dialog.Update( pct, msg )
-    cancelled = dialog.WasCancelled()
-    pair = dialog.Update( pct, msg )
-    dialog.Fit()
 
-    if not cancelled:
-      if self.callback:
-        self.callback( self.nextStep + 1, self.totalSteps, msg )
+  #----------------------------------------------------------------------
+  #	METHOD:		Animator._CreateFrameImage()			-
+  #----------------------------------------------------------------------
+  def _CreateFrameImage( self, step, temp_dir, show_selections = False ):
+    """Renders a frame directly from the data with the widget's
+CreateFrameImage() if available, on the UI thread only on Linux where
+bitmaps must be created there.  Otherwise falls back to stepping the widget
+with _CreateStepImage().  Called on the worker thread.
+@param  step		0-based step index
+@param  temp_dir	directory for fallback frame images
+@param  show_selections	toggle
+@return			( ht, wd, 4 ) uint8 RGBA np.ndarray or None
+"""
+    frame_args = self._CreateFrameArgs( step )
+    if frame_args is not None and hasattr( self.widget, 'CreateFrameImage' ):
+      if Config.IsLinux():
+	image = self._CallOnUIThread(
+	    self.widget.CreateFrameImage, show_selections, **frame_args
+	    )
+      else:
+	image = self.widget.CreateFrameImage( show_selections, **frame_args )
 
-      self._DoStepUpdate()
-      while self.widget.IsBusy():
-	self.logger.debug( 'widget.IsBusy wait' )
-        wx.Yield()
+    else:
+      fpath = os.path.join( temp_dir, '{0:04d}.png'.format( step ) )
+      self._CallOnUIThread(
+	  self._CreateStepImage, step, fpath, show_selections
+	  )
+      image = None
+      if os.path.exists( fpath ):
+	image = np.array( PIL.Image.open( fpath ).convert( 'RGBA' ) )
+	os.remove( fpath )
+    #end else not frame_args
 
-      self.widget.CreatePrintImage( fpath, hilite = show_selections )
+    return  image
+  #end _CreateFrameImage
 
-      self.stepLock.acquire()
-      try:
-        self.nextStep += 1
-      finally:
-        self.stepLock.release()
+
+  #----------------------------------------------------------------------
+  #	METHOD:		Animator._CreateFrames()			-
+  #----------------------------------------------------------------------
+  def _CreateFrames(
+      self, temp_dir, show_selections = False, fast_frames = False
+      ):
+    """Generator creating the frame image for each step with
+_CreateFrameImage().  With ``fast_frames``, frames are instead rendered on a
+process pool with ``BatchRenderer.RenderImages()`` if _CreateRenderJobs()
+provides jobs.  Headless frames have only the raster and legend color bar,
+with no title, labels, legend values, or selections.  Called on the worker
+thread.
+@param  temp_dir	directory for fallback frame images
+@param  show_selections	toggle
+@param  fast_frames	True to render headless frames without text where
+			possible
+@return			generator of ( ht, wd, 4 ) uint8 RGBA np.ndarray or
+			None for each step
+"""
+    jobs = self._CreateRenderJobs()  if fast_frames else  None
+    if jobs is None:
+      for step in xrange( self.totalSteps ):
+	yield  self._CreateFrameImage( step, temp_dir, show_selections )
 
     else:
-      if self.callback:
-        self.callback( 0, 0, 'Aborted' )
-      self.stepLock.acquire()
+      paths = [
+          self.dmgr.GetDataModel( name ).GetH5File().filename
+	  for name in self.dmgr.GetDataModelNames()
+	  ]
+      state_props = \
+        {
+	'dataModelMgr.thresholds': self.dmgr.SaveDataSetThresholds(),
+	'timeDataSet': self.state.timeDataSet
+	}
+      images = BatchRenderer.RenderImages(
+          paths, jobs, state_props, Config.GetWorkerCount()
+	  )
       try:
-        self.nextStep = self.totalSteps + 1
+        for image, error in images:
+	  if error:
+	    raise Exception( error )
+	  yield  image
       finally:
-        self.stepLock.release()
-    #end else canceled
+        images.close()
+    #end else jobs
+  #end _CreateFrames
+
+
+  #----------------------------------------------------------------------
+  #	METHOD:		Animator._CreateHtmlFile()			-
+  #----------------------------------------------------------------------
+  def _CreateHtmlFile( self, file_path ):
+    """Creates an HTML file showing the animation.
+@param  file_path	path to the animation file
+"""
+    fp = file( file_path + '.html', 'w' )
+    try:
+      name = os.path.basename( file_path )
+      print >> fp, '<header><title>%s</title></header>' % name
+      if AnimationWriter.GetFormat( file_path ) == 'mp4':
+	print >> fp, \
+	    '<body><video src="%s" autoplay loop controls></video></body>' % \
+	    name
+      else:
+	print >> fp, '<body><img src="%s"/></body>' % name
+    finally:
+      fp.close()
+  #end _CreateHtmlFile
+
+
+  #----------------------------------------------------------------------
+  #	METHOD:		Animator._CreateRenderJobs()			-
+  #----------------------------------------------------------------------
+  def _CreateRenderJobs( self ):
+    """Creates ``BatchRenderer`` jobs for the steps if the widget has a
+headless equivalent and shows a dataset read from the files, which the
+pool processes open on their own.  Called on the worker thread.
+@return			list of job dicts or None to render with the widget
+"""
+    jobs = None
+    qds_name = self.curDataSet
+    dm = self.dmgr.GetDataModel( qds_name )  if qds_name else  None
+    dset = dm.GetStateDataSet( 0, qds_name.displayName )  if dm else  None
+    if isinstance( dset, h5py.Dataset ) and len( dset.shape ) >= 4 and \
+        not self.dmgr.IsDerivedDataSet( qds_name ) and \
+	self._CreateFrameArgs( 0 ) is not None:
+      state_props = {}
+      self.state.SaveProps( state_props )
+      widget_props = \
+          self._CallOnUIThread( WidgetConfig.CreateWidgetProps, self.widget )
+      spec = BatchRenderer.CreateSpec( widget_props, state_props, self.dmgr )
+
+      if spec is not None:
+        spec.update(
+	    dataset = qds_name.name,
+	    scale_mode = self.state.scaleMode,
+	    weights_mode = self.state.weightsMode
+	    )
+        spec.setdefault(
+	    'state',
+	    self.dmgr.GetTimeValueIndex( self.widget.timeValue, qds_name )
+	    )
+        spec.setdefault( 'axial', max( 0, self.widget.axialValue.pinIndex ) )
+
+        jobs = []
+        for step in xrange( self.totalSteps ):
+	  frame_args = self._CreateFrameArgs( step )
+	  job = dict( spec )
+	  if 'state_index' in frame_args:
+	    job[ 'state' ] = frame_args[ 'state_index' ]
+	  axial_value = frame_args.get( 'axial_value' )
+	  if axial_value is not None:
+	    job[ 'axial' ] = axial_value.pinIndex
+	  jobs.append( job )
+
+#			-- Steps not on the pin mesh need the widget
+        if any( job[ 'axial' ] < 0 for job in jobs ):
+	  jobs = None
+      #end if spec
+    #end if dset
+
+    return  jobs
+  #end _CreateRenderJobs
+
+
+  #----------------------------------------------------------------------
+  #	METHOD:		Animator._CreateStepImage()			-
+  #----------------------------------------------------------------------
+  def _CreateStepImage( self, step, fpath, show_selections = False ):
+    """Updates the widget state for the step and writes its print image,
+which CreatePrintImage() renders from the updated state without waiting on
+the widget's own bitmap.  Must be called on the UI thread.
+@param  step		0-based step index
+@param  fpath		path to the PNG file to create
+@param  show_selections	toggle
+"""
+    self.stepLock.acquire()
+    try:
+      self.nextStep = step
+    finally:
+      self.stepLock.release()
+
+    self._DoStepUpdate()
+    self.widget.CreatePrintImage( fpath, hilite = show_selections )
   #end _CreateStepImage
 
 
@@ -250,14 +389,19 @@ class Animator( object ):
   def Run(
       self, file_path,
       frame_delay = aob.DEFAULT_frameDelay,
-      show_selections = aob.DEFAULT_showSelections
+      show_selections = aob.DEFAULT_showSelections,
+      fast_frames = aob.DEFAULT_fastFrames
       ):
     """Must be called from the UI event thread.
 Creates a worker thread with the _RunBegin() and _Runend() methods.
     Args:
-        file_path (str): path to GIF file to create
+        file_path (str): path to the file to create, where the extension
+	    ('.gif', '.png', or '.mp4') selects the format
 	frame_delay (float): delay in seconds b/w frames
 	show_selections (bool): toggle
+	fast_frames (bool): True to render frames headless on a process pool
+	    where the widget allows, omitting the title, labels, legend
+	    values, and selections
 """
     
     if Config.IsWindows():
@@ -277,7 +421,7 @@ Creates a worker thread with the _RunBegin() and _Runend() methods.
     wxlibdr.startWorker(
 	self._RunEnd,
 	self._RunBackground,
-	wargs = [ dialog, file_path, frame_delay, show_selections ]
+	wargs = [ dialog, file_path, frame_delay, show_selections, fast_frames ]
         )
   #end Run
 
@@ -285,44 +429,58 @@ Creates a worker thread with the _RunBegin() and _Runend() methods.
   #----------------------------------------------------------------------
   #	METHOD:		Animator._RunBackground()			-
   #----------------------------------------------------------------------
-  def _RunBackground( self, dialog, file_path, frame_delay, show_selections ):
-    """
+  def _RunBackground(
+      self, dialog, file_path, frame_delay, show_selections,
+      fast_frames = False
+      ):
+    """Renders each frame and passes it to an AnimationWriter, which
+encodes frames on a process pool while the next ones are rendered.
 """
     temp_dir = tempfile.mkdtemp( '.animation' )
     status = { 'dialog': dialog, 'file_path': file_path, 'temp_dir': temp_dir }
+    frames = writer = None
 
     try:
-      self.nextStep = 0
-      while not dialog.WasCancelled() and self.nextStep < self.totalSteps:
-        wait_for_step = self.nextStep + 1
-	fpath = os.path.join( temp_dir, '{0:04d}.png'.format( self.nextStep ) )
-	wx.CallAfter( self._CreateStepImage, dialog, fpath, show_selections )
-
-	blocking = True
-	while blocking:
-	  time.sleep( 0.25 )  # 0.1
-	  self.stepLock.acquire()
-	  try:
-	    blocking = self.nextStep < wait_for_step
-	  finally:
-	    self.stepLock.release()
-	#end while blocking
+      writer = AnimationWriter.Create(
+	  file_path, frame_delay, self.totalSteps,
+	  worker_count = Config.GetWorkerCount(),
+	  zip_path = file_path + '.images.zip'
+	  )
+
+      frames = self._CreateFrames( temp_dir, show_selections, fast_frames )
+      step = 0
+      while not dialog.WasCancelled() and step < self.totalSteps:
+	wx.CallAfter( self._UpdateProgress, dialog, step )
+	image = next( frames, None )
+	if image is None:
+	  raise Exception( 'Frame %d not created' % (step + 1) )
+	writer.AddFrame( image )
+	step += 1
       #end while stepping
 
-      if dialog.WasCancelled() or self.nextStep > self.totalSteps:
-        status[ 'messages' ] = [ 'Aborted' ]
+      if dialog.WasCancelled():
+	status[ 'messages' ] = [ 'Aborted' ]
+	writer.Abort()
+	if self.callback:
+	  wx.CallAfter( self.callback, 0, 0, 'Aborted' )
       else:
-        wx.CallAfter( dialog.Pulse, 'Creating animated GIF' )
-        self.CreateAnimatedImage( file_path, temp_dir, frame_delay )
+	wx.CallAfter( dialog.Pulse, 'Finishing animated image' )
+	writer.Close()
+	self._CreateHtmlFile( file_path )
+      writer = None
 
     except Exception, ex :
       buf = StringIO.StringIO()
       traceback.print_exc( file = buf )
       self.logger.warning( buf.getvalue() )
       status[ 'messages' ] = \
-          [ 'Error creating image:' + os.linesep + str( ex ) ]
+	  [ 'Error creating image:' + os.linesep + str( ex ) ]
+      if writer is not None:
+	writer.Abort()
 
     finally:
+      if frames is not None:
+        frames.close()
       shutil.rmtree( status[ 'temp_dir' ] )
 
     if self.logger.isEnabledFor( logging.INFO ):
@@ -344,7 +502,7 @@ Creates a worker thread with the _RunBegin() and _Runend() methods.
       messages = status.get( 'messages' )
       if messages is not None and len( messages ) > 0:
         msg = \
-	    'Animated GIF not created:\n' + \
+	    'Animated image not created:\n' + \
             '\n '.join( messages )
         wx.MessageBox( msg, 'Save Animated Image', wx.OK_DEFAULT )
     #end if
@@ -353,6 +511,25 @@ Creates a worker thread with the _RunBegin() and _Runend() methods.
     #shutil.rmtree( status[ 'temp_dir' ] )
   #end _RunEnd
 
+
+  #----------------------------------------------------------------------
+  #	METHOD:		Animator._UpdateProgress()			-
+  #----------------------------------------------------------------------
+  def _UpdateProgress( self, dialog, step ):
+    """Must be called on the UI thread.
+@param  dialog		progress dialog
+@param  step		0-based step index of the frame being created
+"""
+    if not dialog.WasCancelled():
+      pct = int( step * 100.0 / (self.totalSteps + 1) )
+      msg = 'Creating frame %d/%d' % ( (step + 1), self.totalSteps )
+      self.logger.info( msg )
+      dialog.Update( pct, msg )
+      dialog.Fit()
+      if self.callback:
+	self.callback( step + 1, self.totalSteps, msg )
+  #end _UpdateProgress
+
 #end Animator
 
 
@@ -367,6 +544,18 @@ class AllAxialAnimator( Animator ):
 #		--
 
 
+  #----------------------------------------------------------------------
+  #	METHOD:		AllAxialAnimator._CreateFrameArgs()		-
+  #----------------------------------------------------------------------
+  def _CreateFrameArgs( self, step ):
+    """
+@param  step		0-based step index
+@return			dict of overrides
+"""
+    return  { 'axial_value': self.dmgr.GetAxialValue( None, all_ndx = step ) }
+  #end _CreateFrameArgs
+
+
   #----------------------------------------------------------------------
   #	METHOD:		AllAxialAnimator._DoStepUpdate()		-
   #----------------------------------------------------------------------
@@ -445,6 +634,19 @@ class BaseAxialAnimator( Animator ):
   #end __init__
 
 
+  #----------------------------------------------------------------------
+  #	METHOD:		BaseAxialAnimator._CreateFrameArgs()		-
+  #----------------------------------------------------------------------
+  def _CreateFrameArgs( self, step ):
+    """
+@param  step		0-based step index
+@return			dict of overrides
+"""
+    ax_args = { self.indexName: step }
+    return  { 'axial_value': self.dmgr.GetAxialValue( None, **ax_args ) }
+  #end _CreateFrameArgs
+
+
   #----------------------------------------------------------------------
   #	METHOD:		BaseAxialAnimator._DoStepUpdate()		-
   #----------------------------------------------------------------------
@@ -581,6 +783,22 @@ class StatePointAnimator( Animator ):
 #		--
 
 
+  #----------------------------------------------------------------------
+  #	METHOD:		StatePointAnimator._CreateFrameArgs()		-
+  #----------------------------------------------------------------------
+  def _CreateFrameArgs( self, step ):
+    """
+@param  step		0-based step index
+@return			dict of overrides
+"""
+    return  \
+      {
+      'state_index': step,
+      'time_value': self.dmgr.GetTimeIndexValue( step, self.curDataSet )
+      }
+  #end _CreateFrameArgs
+
+
   #----------------------------------------------------------------------
   #	METHOD:		StatePointAnimator._DoStepUpdate()		-
   #----------------------------------------------------------------------
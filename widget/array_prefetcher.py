@@ -0,0 +1,202 @@
+#!/usr/bin/env python
+# $Id$
+#------------------------------------------------------------------------
+#	NAME:		array_prefetcher.py				-
+#	HISTORY:							-
+#		2026-10-18						-
+#	  Background reads of neighboring state point arrays.
+#------------------------------------------------------------------------
+"""Background reads of the dataset arrays a raster widget is likely to show
+next.
+
+Only data are read off the UI thread.  Bitmaps are still created on the UI
+thread when a neighbor is shown, from the array already in memory.  Arrays
+are held, typically with ``DataModelMgr.AcquireStateArray()``, until no
+longer wanted, so they are not evicted from the shared slice cache in
+between.
+
+No wx dependency here.
+"""
+import logging, threading, traceback
+import pdb
+
+
+#------------------------------------------------------------------------
+#	CLASS:		ArrayPrefetcher					-
+#------------------------------------------------------------------------
+class ArrayPrefetcher( object ):
+  """Reads wanted arrays nearest first on a single daemon thread and holds
+them until no longer wanted.  Keys are argument tuples for the acquire
+function, e.g., ( qds_name, time_value ).
+
+Properties:
+    acquireFunc (callable): func( *key ) returning a held array or None
+    held (dict): arrays held by key
+    releaseFunc (callable): func( array ) releasing a held array
+"""
+
+
+#		-- Object Methods
+#		--
+
+
+  #----------------------------------------------------------------------
+  #	METHOD:		ArrayPrefetcher.__init__()			-
+  #----------------------------------------------------------------------
+  def __init__( self, acquire_func, release_func ):
+    """
+    Args:
+        acquire_func (callable): func( *key ) returning a held array or
+            None, called on the prefetch thread
+        release_func (callable): func( array ), called on the thread that
+            drops the array
+"""
+    self.acquireFunc = acquire_func
+    self.held = {}
+    self.releaseFunc = release_func
+
+    self._lock = threading.RLock()
+    self._logger = logging.getLogger( 'widget' )
+    self._queue = []
+    self._thread = None
+    self._wanted = set()
+  #end __init__
+
+
+  #----------------------------------------------------------------------
+  #	METHOD:		ArrayPrefetcher.Clear()				-
+  #----------------------------------------------------------------------
+  def Clear( self ):
+    """Cancels queued reads and releases all held arrays.  A read in
+progress is released when it completes.
+"""
+    self.Prefetch( [] )
+  #end Clear
+
+
+  #----------------------------------------------------------------------
+  #	METHOD:		ArrayPrefetcher.IsHeld()			-
+  #----------------------------------------------------------------------
+  def IsHeld( self, key ):
+    """
+    Args:
+        key (tuple): key
+    Returns:
+        bool: True if the array for the key has been read and is held
+"""
+    with self._lock:
+      return  key in self.held
+  #end IsHeld
+
+
+  #----------------------------------------------------------------------
+  #	METHOD:		ArrayPrefetcher.Prefetch()			-
+  #----------------------------------------------------------------------
+  def Prefetch( self, keys ):
+    """Replaces the wanted keys, releasing held arrays no longer wanted and
+queueing reads for the rest, and starts the prefetch thread if necessary.
+    Args:
+        keys (list): keys, nearest first
+"""
+    with self._lock:
+      self._wanted = set( keys )
+      released = [
+          self.held.pop( k ) for k in list( self.held.keys() )
+          if k not in self._wanted
+          ]
+      self._queue = [ k for k in keys if k not in self.held ]
+
+      if self._queue and self._thread is None:
+        self._thread = threading.Thread(
+            target = self._Run, name = 'ArrayPrefetcher'
+            )
+        self._thread.daemon = True
+        self._thread.start()
+    #end with
+
+    for array in released:
+      self.releaseFunc( array )
+  #end Prefetch
+
+
+  #----------------------------------------------------------------------
+  #	METHOD:		ArrayPrefetcher._Run()				-
+  #----------------------------------------------------------------------
+  def _Run( self ):
+    """Prefetch thread body, reading queued keys until the queue is empty.
+"""
+    while True:
+      with self._lock:
+        if not self._queue:
+          self._thread = None
+          break
+        key = self._queue.pop( 0 )
+
+      array = None
+      try:
+        array = self.acquireFunc( *key )
+      except Exception:
+        self._logger.warning( traceback.format_exc() )
+
+      if array is not None:
+        with self._lock:
+          keep = key in self._wanted and key not in self.held
+          if keep:
+            self.held[ key ] = array
+        if not keep:
+          self.releaseFunc( array )
+    #end while
+  #end _Run
+
+
+  #----------------------------------------------------------------------
+  #	METHOD:		ArrayPrefetcher.Wait()				-
+  #----------------------------------------------------------------------
+  def Wait( self, timeout = None ):
+    """Waits for queued reads to complete.
+    Args:
+        timeout (float): optional seconds to wait
+    Returns:
+        bool: True if no reads are pending
+"""
+    with self._lock:
+      thread = self._thread
+    if thread is not None:
+      thread.join( timeout )
+    with self._lock:
+      return  self._thread is None
+  #end Wait
+
+
+#		-- Static Methods
+#		--
+
+
+  #----------------------------------------------------------------------
+  #	METHOD:		ArrayPrefetcher.GetNeighbors()			-
+  #----------------------------------------------------------------------
+  @staticmethod
+  def GetNeighbors( values, cur_value, steps ):
+    """Finds the values around the current one.
+    Args:
+        values (list): values in state point order, e.g., time values
+        cur_value (float): current value, matched to the nearest
+        steps (int): number of neighbors in each direction
+    Returns:
+        list: neighboring values, nearest first, later before earlier
+"""
+    result = []
+    if values and steps > 0:
+      ndx = min(
+          xrange( len( values ) ),
+          key = lambda i: abs( values[ i ] - cur_value )
+          )
+      for i in xrange( 1, steps + 1 ):
+        for j in ( ndx + i, ndx - i ):
+          if j >= 0 and j < len( values ):
+            result.append( values[ j ] )
+
+    return  result
+  #end GetNeighbors
+
+#end ArrayPrefetcher
@@ -3,6 +3,10 @@
 #------------------------------------------------------------------------
 #	NAME:		assembly_view.py				-
 #	HISTORY:							-
+#		2026-10-18						-
+#	  Rasterizing cells with RgbaRaster instead of per-cell GC calls.
+#	  Reading state arrays through DataModelMgr.GetStateArray().
+#	  Drawing unweighted until a fast-open model is ready.
 #		2018-03-01	leerw@ornl.gov				-
 #	  Migrating to _CreateEmptyBitmapAndDC().
 #		2018-02-10	leerw@ornl.gov				-
@@ -211,7 +215,7 @@ Attrs/properties:
       core = self.dmgr.GetCore()
 
     if dset is not None and core is not None:
-      dset_value = np.array( dset )
+      dset_value = self.dmgr.GetStateArray( self.curDataSet, self.timeValue )
       dset_shape = dset_value.shape
       axial_level = min( self.axialValue.pinIndex, dset_shape[ 2 ] - 1 )
 
@@ -273,7 +277,7 @@ Attrs/properties:
       core = self.dmgr.GetCore()
 
     if dset is not None and core is not None:
-      dset_value = np.array( dset )
+      dset_value = self.dmgr.GetStateArray( self.curDataSet, self.timeValue )
       dset_shape = dset_value.shape
       axial_level = min( self.axialValue.pinIndex, dset_shape[ 2 ] - 1 )
       assy_ndx = min( self.assemblyAddr[ 0 ], dset_shape[ 3 ] - 1 )
@@ -321,7 +325,7 @@ Attrs/properties:
       core = self.dmgr.GetCore()
 
     if dset is not None and core is not None:
-      dset_value = np.array( dset )
+      dset_value = self.dmgr.GetStateArray( self.curDataSet, self.timeValue )
       dset_shape = dset_value.shape
       #axial_level = min( self.axialValue.pinIndex, dset_shape[ 2 ] - 1 )
       assy_ndx = min( self.assemblyAddr[ 0 ], dset_shape[ 3 ] - 1 )
@@ -658,14 +662,15 @@ If neither are specified, a default 'scale' value of 24 is used.
 
 #		-- "Item" is chan or pin
       item_factors = None
-      if self.state.weightsMode == 'on':
+      if self.state.weightsMode == 'on' and \
+          self.dmgr.IsReady( self.curDataSet ):
         item_factors = self.dmgr.GetFactors( self.curDataSet )
 
       if dset is None:
         dset_array = None
 	dset_shape = ( 0, 0, 0, 0 )
       else:
-        dset_array = np.array( dset )
+        dset_array = self.dmgr.GetStateArray( self.curDataSet, self.timeValue )
         dset_shape = dset.shape
 
       title_templ, title_size = self._CreateTitleTemplate(
@@ -683,112 +688,114 @@ If neither are specified, a default 'scale' value of 24 is used.
       axial_value = self.dmgr.\
           GetAxialValue( self.curDataSet, core_ndx = axial_level )
 
-#			-- Create image
+#			-- Map values to colors in one step, cells outside the
+#			-- dataset getting only the no-data outline
 #			--
-      bmap, dc = self._CreateEmptyBitmapAndDC( im_wd, im_ht )
-      gc = self._CreateGraphicsContext( dc )
-
-      trans_brush = self._CreateTransparentBrush( gc )
-      trans_color_arr = np.array([ 0, 0, 0, 0 ], dtype = np.uint8 )
+      item_rows = np.arange( self.cellRange[ 1 ], self.cellRange[ 3 ] )
+      item_cols = np.arange( self.cellRange[ 0 ], self.cellRange[ 2 ] )
+      in_range = \
+	  (item_rows < dset_shape[ 0 ])[ :, np.newaxis ] & \
+	  (item_cols < dset_shape[ 1 ])[ np.newaxis, : ]
+      cell_ndx = np.ix_(
+	  np.minimum( item_rows, dset_shape[ 0 ] - 1 ),
+	  np.minimum( item_cols, dset_shape[ 1 ] - 1 )
+	  )
 
-      nodata_pen_color = ( 155, 155, 155, 255 )
-      nodata_pen = gc.CreatePen( wx.Pen( nodata_pen_color, 1 ) )
+      cur_array = dset_array[ :, :, axial_level, assy_ndx ][ cell_ndx ]
+      cur_factors = None
+      if item_factors is not None:
+	cur_factors = item_factors[ :, :, axial_level, assy_ndx ][ cell_ndx ]
+      colors = RgbaRaster.MapColors( cur_array, mapper, cur_factors )
+      colors[ ~in_range ] = 0
 
-      if self.showLabels:
-	glabel_font = gc.CreateFont( label_font, wx.BLACK )
-        gc.SetFont( glabel_font )
+      outline_colors = RgbaRaster.DarkenColors( colors )
+      outline_colors[ ~in_range ] = ( 155, 155, 155, 255 )
 
-#			-- Map values to colors
+#			-- Rasterize and create image
 #			--
-      cur_array = dset_array[ :, :, axial_level, assy_ndx ]
-      colors = mapper.to_rgba( cur_array, bytes = True )
-      if item_factors is not None:
-        cur_factors = item_factors[ :, :, axial_level, assy_ndx ]
-        colors[ cur_factors == 0 ] = trans_color_arr
-	colors[ np.isnan( cur_array ) ] = trans_color_arr
-	colors[ np.isinf( cur_array ) ] = trans_color_arr
+      item_advance = pin_wd + pin_gap
+      image = RgbaRaster.CreateImage( im_wd, im_ht )
+      RgbaRaster.PaintCells(
+	  image, colors,
+	  RgbaRaster.CreateAxisMap(
+	      im_ht,
+	      assy_region[ 1 ] + np.arange( item_rows.size ) * item_advance,
+	      pin_wd + 1
+	      ),
+	  RgbaRaster.CreateAxisMap(
+	      im_wd,
+	      assy_region[ 0 ] + np.arange( item_cols.size ) * item_advance,
+	      pin_wd + 1
+	      ),
+	  RgbaRaster.CreateShapeMask( pin_wd + 1, pin_wd + 1 ),
+	  outline_colors
+	  )
+
+      bmap, dc = self._CreateBitmapAndDCFromRgba( image )
+      gc = self._CreateGraphicsContext( dc )
 
-#			-- Loop on rows
+#			-- Labels
 #			--
-      item_y = assy_region[ 1 ]
-      for item_row in xrange( self.cellRange[ 1 ], self.cellRange[ 3 ], 1 ):
-#				-- Row label
-#				--
-	if self.showLabels and item_row < core.npiny:
-	  label = '%d' % (item_row + 1)
-	  text_size = gc.GetFullTextExtent( label )
-	  label_size = ( text_size[ 0 ], text_size[ 1 ] )
-	  label_y = item_y + ((pin_wd - label_size[ 1 ]) / 2.0)
-	  #gc.DrawText( label, 1, label_y, trans_brush )
-	  gc.DrawText( label, 1, label_y )
-
-	  if self.channelMode and \
-	      item_row == min( core.npiny, self.cellRange[ 3 ] - 1 ) - 1:
-	    label = '%d' % (item_row + 2)
+      if self.showLabels:
+	glabel_font = gc.CreateFont( label_font, wx.BLACK )
+	gc.SetFont( glabel_font )
+
+	item_y = assy_region[ 1 ]
+	for item_row in item_rows:
+	  if item_row < core.npiny:
+	    label = '%d' % (item_row + 1)
 	    text_size = gc.GetFullTextExtent( label )
-	    label_size = ( text_size[ 0 ], text_size[ 1 ] )
-	    label_y = item_y + pin_wd + pin_gap + \
-	        ((pin_wd - label_size[ 1 ]) / 2.0)
-	    #gc.DrawText( label, 1, label_y, trans_brush )
+	    label_y = item_y + ((pin_wd - text_size[ 1 ]) / 2.0)
 	    gc.DrawText( label, 1, label_y )
-	#end if self.showLabels and item_row < core.npiny
 
-#				-- Loop on col
-#				--
+	    if self.channelMode and \
+		item_row == min( core.npiny, self.cellRange[ 3 ] - 1 ) - 1:
+	      label = '%d' % (item_row + 2)
+	      text_size = gc.GetFullTextExtent( label )
+	      label_y = item_y + item_advance + \
+		  ((pin_wd - text_size[ 1 ]) / 2.0)
+	      gc.DrawText( label, 1, label_y )
+	  #end if item_row < core.npiny
+	  item_y += item_advance
+	#end for item_row
+
 	item_x = assy_region[ 0 ]
-	for item_col in range( self.cellRange[ 0 ], self.cellRange[ 2 ], 1 ):
-#					-- Column label
-#					--
-	  if self.showLabels and \
-	      item_row == self.cellRange[ 1 ] and item_col < core.npinx:
+	for item_col in item_cols:
+	  if item_col < core.npinx:
 	    label = '%d' % (item_col + 1)
 	    text_size = gc.GetFullTextExtent( label )
-	    label_size = ( text_size[ 0 ], text_size[ 1 ] )
-	    label_x = item_x + ((pin_wd - label_size[ 0 ]) / 2.0)
-	    #gc.DrawText( label, label_x, 1, trans_brush )
+	    label_x = item_x + ((pin_wd - text_size[ 0 ]) / 2.0)
 	    gc.DrawText( label, label_x, 1 )
 
 	    if self.channelMode and \
-	        item_col == min( core.npinx, self.cellRange[ 2 ] - 1 ) - 1:
+		item_col == min( core.npinx, self.cellRange[ 2 ] - 1 ) - 1:
 	      label = '%d' % (item_col + 2)
 	      text_size = gc.GetFullTextExtent( label )
-	      label_size = ( text_size[ 0 ], text_size[ 1 ] )
-	      label_x = item_x + pin_wd + pin_gap + \
-	          ((pin_wd - label_size[ 0 ]) / 2.0)
-	      #gc.DrawText( label, label_x, 1, trans_brush )
+	      label_x = item_x + item_advance + \
+		  ((pin_wd - text_size[ 0 ]) / 2.0)
 	      gc.DrawText( label, label_x, 1 )
-	  #end if self.showLabels and ...
-
-#					-- Check row and col in range
-	  if item_row < dset_shape[ 0 ] and item_col < dset_shape[ 1 ]:
-	    brush_color = colors[ item_row, item_col ].tolist()
-	    gc.SetBrush( gc.CreateBrush( wx.TheBrushList.FindOrCreateBrush(
-	        wx.Colour( *brush_color ), wx.BRUSHSTYLE_SOLID
-		) ) )
-	    pen_color = Widget.GetDarkerColor( brush_color )
-	    gc.SetPen( gc.CreatePen( wx.Pen( pen_color, 1 ) ) )
-
-	    gc.DrawRectangle( item_x, item_y, pin_wd, pin_wd )
-
-	    if value_font is not None and brush_color[ 3 ] > 0:
-	      value = dset_array[ item_row, item_col, axial_level, assy_ndx ]
-	      value_draw_list.append((
-	          self._CreateValueString( value ),
-                  Widget.GetContrastColor( *brush_color ),
-                  item_x, item_y, pin_wd, pin_wd
-                  ))
-	    #end if value_font defined
-
-	  else: # if item_row < dset_shape[ 0 ] and item_col < dset_shape[ 1 ]:
-	    gc.SetBrush( trans_brush )
-	    gc.SetPen( nodata_pen )
-	    gc.DrawRectangle( item_x, item_y, pin_wd, pin_wd )
-
-	  item_x += pin_wd + pin_gap
+	  #end if item_col < core.npinx
+	  item_x += item_advance
 	#end for item_col
+      #end if self.showLabels
+
+#			-- Values
+#			--
+      if value_font is not None:
+	for i, j in zip( *np.nonzero( colors[ ..., 3 ] > 0 ) ):
+	  value = dset_array[
+	      item_rows[ i ], item_cols[ j ], axial_level, assy_ndx
+	      ]
+	  value_draw_list.append((
+	      self._CreateValueString( value ),
+	      Widget.GetContrastColor( *colors[ i, j ].tolist() ),
+	      assy_region[ 0 ] + j * item_advance,
+	      assy_region[ 1 ] + i * item_advance,
+	      pin_wd, pin_wd
+	      ))
+      #end if value_font is not None
 
-	item_y += pin_wd + pin_gap
-      #end for item_row
+      item_y = assy_region[ 1 ] + item_rows.size * item_advance
 
 #			-- Draw pins
 #			--
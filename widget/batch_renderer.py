@@ -0,0 +1,927 @@
+#!/usr/bin/env python
+# $Id$
+#------------------------------------------------------------------------
+#	NAME:		batch_renderer.py				-
+#	HISTORY:							-
+#		2026-10-18						-
+#	  Headless core, assembly, and core axial image rendering.
+#	  Files validated before starting the pool, worker renderers closed
+#	  with multiprocessing.util.Finalize.  Added CreateSpec() and
+#	  RenderImages() for animation frames.
+#------------------------------------------------------------------------
+"""Renders core, assembly, and core axial images to PNG files without a
+display, for reports needing many images from many runs.
+
+Images are painted with ``RgbaRaster`` the same way ``Core2DView``,
+``Assembly2DView``, and ``CoreAxial2DView`` paint their cell grids, with
+assembly outlines and a legend color bar, but without text, since there is
+no wx font rendering.  The title, dataset, state, axial value, and data
+range are written instead as PNG tEXt chunks.
+
+``BatchRenderer.Run()`` renders a list of job dicts on a
+``multiprocessing`` pool, each process opening its own ``DataModelMgr``
+for the files.  ``BatchRenderer.RenderImages()`` does the same, returning
+the images in order instead of writing files, for animation frames.
+
+No wx dependency here, so the module can be used without a display.
+"""
+import logging, math, multiprocessing, multiprocessing.util, os, sys, traceback
+import numpy as np
+import pdb
+
+try:
+  from matplotlib import cm, colors
+except Exception:
+  raise ImportError( 'The matplotlib module is required for this component' )
+
+from data.config import Config
+from data.datamodel_mgr import *
+
+from .animation_writer import CreatePngFile, DeflateImage
+from .rgba_raster import *
+
+
+NAN = float( 'nan' )
+
+renderer_ = None
+"""BatchRenderer: Per-process instance created by ``_InitWorker()``."""
+
+
+#------------------------------------------------------------------------
+#	NAME:		_InitWorker()					-
+#------------------------------------------------------------------------
+def _InitWorker( paths, state_props ):
+  """Pool initializer opening the files in the worker process, with the
+files closed when the process exits.  The files must have been checked with
+``BatchRenderer.CheckFiles()``, since a pool replaces a worker whose
+initializer raises with another that will fail the same way.
+  Args:
+      paths (list): HDF5 file paths
+      state_props (dict): optional session state properties
+"""
+  global renderer_
+  renderer_ = BatchRenderer.Open( paths, state_props )
+  multiprocessing.util.Finalize(
+      renderer_, renderer_.Close, exitpriority = 10
+      )
+#end _InitWorker
+
+
+#------------------------------------------------------------------------
+#	NAME:		_RenderImage()					-
+#------------------------------------------------------------------------
+def _RenderImage( job, renderer = None ):
+  """Pool task rendering one job without writing a file.
+  Args:
+      job (dict): job, see ``BatchRenderer.RenderJob()``, where any 'path'
+          item is ignored
+      renderer (BatchRenderer): instance to use instead of ``renderer_``
+  Returns:
+      tuple: ( image or None, error message or None )
+"""
+  kwargs = dict( job )
+  kwargs.pop( 'path', None )
+  try:
+    image = ( renderer or renderer_ ).Render(
+        kwargs.pop( 'widget' ), kwargs.pop( 'dataset' ),
+        kwargs.pop( 'state' ), **kwargs
+        )[ 0 ]
+    result = ( image, None )
+  except Exception, ex:
+    result = ( None, traceback.format_exc() )
+  return  result
+#end _RenderImage
+
+
+#------------------------------------------------------------------------
+#	NAME:		_RenderJob()					-
+#------------------------------------------------------------------------
+def _RenderJob( job, renderer = None ):
+  """Pool task rendering one job.
+  Args:
+      job (dict): job, see ``BatchRenderer.RenderJob()``
+      renderer (BatchRenderer): instance to use instead of ``renderer_``
+  Returns:
+      tuple: ( output path, error message or None )
+"""
+  try:
+    ( renderer or renderer_ ).RenderJob( job )
+    result = ( job[ 'path' ], None )
+  except Exception, ex:
+    result = ( job[ 'path' ], traceback.format_exc() )
+  return  result
+#end _RenderJob
+
+
+#------------------------------------------------------------------------
+#	CLASS:		BatchRenderer					-
+#------------------------------------------------------------------------
+class BatchRenderer( object ):
+  """Renders widget images for a ``DataModelMgr``.
+
+Properties:
+  dmgr			DataModelMgr instance
+  logger		logging.Logger instance
+"""
+
+
+#		-- Class Attributes
+#		--
+
+  ASSEMBLY_GAP = 2
+  """int: Pixels between assemblies, including the outline."""
+
+  BACKGROUND_COLOR = ( 236, 236, 236, 255 )
+
+  DEFAULT_PIN_SIZES = { 'assembly': 24, 'axial': 4, 'core': 4 }
+  """dict: Default pixels per pin by widget type."""
+
+  LEGEND_WIDTH = 16
+
+  OUTLINE_COLOR = ( 155, 155, 155, 255 )
+
+  WIDGET_TYPES = ( 'assembly', 'axial', 'core' )
+
+  WIDGET_TYPES_BY_CLASS = \
+    {
+    'widget.assembly_view.Assembly2DView': 'assembly',
+    'widget.core_axial_view.CoreAxial2DView': 'axial',
+    'widget.core_axial_view.CoreXZView': 'axial',
+    'widget.core_axial_view.CoreYZView': 'axial',
+    'widget.core_view.Core2DView': 'core'
+    }
+  """dict: Widget type for session widget classpaths."""
+
+
+#		-- Object Methods
+#		--
+
+
+  #----------------------------------------------------------------------
+  #	METHOD:		BatchRenderer.__init__()			-
+  #----------------------------------------------------------------------
+  def __init__( self, dmgr ):
+    """
+    Args:
+        dmgr (DataModelMgr): manager with the files open
+"""
+    self.dmgr = dmgr
+    self.logger = logging.getLogger( 'widget' )
+  #end __init__
+
+
+  #----------------------------------------------------------------------
+  #	METHOD:		BatchRenderer._AddLegend()			-
+  #----------------------------------------------------------------------
+  def _AddLegend( self, image, mapper ):
+    """Places a vertical color bar from the maximum at the top to the
+minimum at the bottom to the right of the image.
+    Args:
+        image (np.ndarray): (ht, wd, 4) uint8 rendered cells
+        mapper (matplotlib.cm.ScalarMappable): color mapper
+    Returns:
+        np.ndarray: new (ht, wd, 4) uint8 image with the legend
+"""
+    im_ht, im_wd = image.shape[ 0 : 2 ]
+    bar_ht = max( 32, im_ht - 2 )
+    legend_x = im_wd + (BatchRenderer.LEGEND_WIDTH >> 1)
+    result = RgbaRaster.CreateImage(
+        legend_x + BatchRenderer.LEGEND_WIDTH + 1, max( im_ht, bar_ht + 2 )
+        )
+    result[ 0 : im_ht, 0 : im_wd ] = image
+
+    fractions = np.linspace( 1.0, 0.0, bar_ht - 2 )
+    values = np.asarray( mapper.norm.inverse( fractions ) )
+    bar_colors = mapper.to_rgba( values, bytes = True )
+
+    bar = result[ 1 : bar_ht + 1, legend_x : legend_x + BatchRenderer.LEGEND_WIDTH ]
+    bar[ 1 : -1, 1 : -1 ] = bar_colors[ :, np.newaxis, : ]
+    BatchRenderer._DrawRects(
+        result, [ legend_x ], [ 1 ],
+        BatchRenderer.LEGEND_WIDTH, bar_ht, ( 0, 0, 0, 255 )
+        )
+    return  result
+  #end _AddLegend
+
+
+  #----------------------------------------------------------------------
+  #	METHOD:		BatchRenderer.Close()				-
+  #----------------------------------------------------------------------
+  def Close( self ):
+    self.dmgr.Close()
+  #end Close
+
+
+  #----------------------------------------------------------------------
+  #	METHOD:		BatchRenderer._CreateMapper()			-
+  #----------------------------------------------------------------------
+  def _CreateMapper( self, qds_name, state_ndx, **kwargs ):
+    """Creates the color mapper as ``RasterWidget._CreateBaseDrawConfig()``
+does, with the range resolved as in ``Widget._ResolveDataRange()``.
+    Args:
+        qds_name (DataSetName): dataset name
+        state_ndx (int): 0-based state index
+    Keyword Args:
+        colormap (str): colormap name
+        data_range (sequence): ( min, max ) custom range, where None or NaN
+            values are calculated
+        scale_mode (str): 'all' for the range over all states, 'state' for
+            the range of the state
+        scale_type (str): 'linear' or 'log', defaulting to the dataset's
+        weights_mode (str): 'on' to apply factors
+    Returns:
+        tuple: ( matplotlib.cm.ScalarMappable, ( min, max ) )
+"""
+    time_value = \
+        self.dmgr.GetTimeIndexValue( state_ndx, qds_name ) \
+        if kwargs.get( 'scale_mode' ) == 'state' else  -1.0
+    calc_range = self.dmgr.GetRange(
+        qds_name, time_value,
+        use_factors = kwargs.get( 'weights_mode', 'on' ) == 'on'
+        )
+
+    ds_range = list( kwargs.get( 'data_range' ) or ( NAN, NAN ) )
+    for i in xrange( 2 ):
+      if ds_range[ i ] is None or math.isnan( ds_range[ i ] ):
+        ds_range[ i ] = \
+            calc_range[ i ]  if calc_range else \
+            ( -10.0, 10.0 )[ i ]
+    if ds_range[ 0 ] >= ds_range[ 1 ]:
+      span = abs( ds_range[ 0 ] ) * 0.1
+      ds_range[ 1 ] = ds_range[ 0 ] + span
+      ds_range[ 0 ] -= span
+
+    scale_type = kwargs.get( 'scale_type' ) or \
+        self.dmgr.GetDataSetScaleType( qds_name )
+    if scale_type == 'log':
+      norm = colors.LogNorm(
+          vmin = max( ds_range[ 0 ], 1.0e-16 ),
+          vmax = max( ds_range[ 1 ], 1.0e-16 ),
+          clip = True
+          )
+    else:
+      norm = colors.Normalize(
+          vmin = ds_range[ 0 ], vmax = ds_range[ 1 ], clip = True
+          )
+    mapper = cm.ScalarMappable(
+        norm = norm,
+        cmap = cm.get_cmap(
+            kwargs.get( 'colormap' ) or Config.defaultCmapName_
+            )
+        )
+    return  mapper, tuple( ds_range )
+  #end _CreateMapper
+
+
+  #----------------------------------------------------------------------
+  #	METHOD:		BatchRenderer.FindAssembly()			-
+  #----------------------------------------------------------------------
+  def FindAssembly( self, assy_ndx ):
+    """
+    Args:
+        assy_ndx (int): 0-based assembly index
+    Returns:
+        tuple: ( assy_ndx, col, row ) in the core map
+    Raises:
+        ValueError: if ``assy_ndx`` is not in the core map
+"""
+    core = self.dmgr.GetCore()
+    rows, cols = np.nonzero( core.coreMap == assy_ndx + 1 )
+    if rows.size == 0:
+      raise ValueError( 'Assembly index not in core map: %d' % assy_ndx )
+    return  ( assy_ndx, int( cols[ 0 ] ), int( rows[ 0 ] ) )
+  #end FindAssembly
+
+
+  #----------------------------------------------------------------------
+  #	METHOD:		BatchRenderer._GetItemLimits()			-
+  #----------------------------------------------------------------------
+  def _GetItemLimits( self, core, dset_shape ):
+    """Pin or channel grid size, as in the raster widgets.
+    Returns:
+        tuple: ( col_limit, row_limit, cur_nxpin, cur_nypin, channel_flag )
+"""
+    channel_flag = \
+        dset_shape[ 0 ] == core.npiny + 1 and dset_shape[ 1 ] == core.npinx + 1
+    if channel_flag:
+      col_limit = core.npinx + 1
+      row_limit = core.npiny + 1
+    else:
+      col_limit = core.npinx
+      row_limit = core.npiny
+    return  \
+        col_limit, row_limit, \
+        min( col_limit, dset_shape[ 1 ] ), min( row_limit, dset_shape[ 0 ] ), \
+        channel_flag
+  #end _GetItemLimits
+
+
+  #----------------------------------------------------------------------
+  #	METHOD:		BatchRenderer.Render()				-
+  #----------------------------------------------------------------------
+  def Render( self, widget_type, qds_name, state_ndx, **kwargs ):
+    """Renders an image.
+    Args:
+        widget_type (str): 'assembly', 'axial', or 'core'
+        qds_name (DataSetName): dataset name or qualified name string
+        state_ndx (int): 0-based state index
+    Keyword Args:
+        assembly (int): 0-based assembly index for 'assembly' and 'axial'
+        axial (int): 0-based axial level for 'assembly' and 'core'
+        mode (str): 'xz' or 'yz' for 'axial'
+        pin_size (int): pixels per pin
+        show_legend (bool): False to omit the legend
+        sub_addr (tuple): 0-based ( col, row ) pin address for 'axial'
+        (others): see ``_CreateMapper()``
+    Returns:
+        tuple: ( np.ndarray (ht, wd, 4) uint8 image, list of
+            ( keyword, value ) text pairs )
+    Raises:
+        ValueError: if the dataset is not found or ``widget_type`` is
+            invalid
+"""
+    qds_name = DataSetName.Resolve( qds_name )
+    dm = self.dmgr.GetDataModel( qds_name )
+    if dm is None:
+      dm = self.dmgr.GetFirstDataModel()
+      if dm is not None:
+        qds_name = DataSetName( dm.GetName(), qds_name.displayName )
+
+    dset = None
+    if dm is not None:
+      dset = dm.GetStateDataSet( state_ndx, qds_name.displayName )
+    if dset is None or len( dset.shape ) < 4:
+      raise ValueError(
+          'Dataset "%s" not found for state %d' % ( qds_name, state_ndx )
+          )
+
+    if widget_type not in BatchRenderer.WIDGET_TYPES:
+      raise ValueError( 'Invalid widget type: ' + str( widget_type ) )
+    pin_wd = max(
+        1,
+        int( kwargs.get( 'pin_size' ) or
+            BatchRenderer.DEFAULT_PIN_SIZES[ widget_type ] )
+        )
+
+    mapper, ds_range = self._CreateMapper( qds_name, state_ndx, **kwargs )
+    factors = None
+    if kwargs.get( 'weights_mode', 'on' ) == 'on':
+      factors = self.dmgr.GetFactors( qds_name )
+
+    method = getattr( self, '_Render' + widget_type.capitalize() )
+    image, title = method(
+        qds_name, np.array( dset ), factors, mapper, pin_wd, **kwargs
+        )
+    if kwargs.get( 'show_legend', True ):
+      image = self._AddLegend( image, mapper )
+    RgbaRaster.FillBackground( image, BatchRenderer.BACKGROUND_COLOR )
+
+    text = [
+        ( 'Title', title ),
+        ( 'Dataset', qds_name.name ),
+        ( 'State', str( state_ndx ) ),
+        ( 'Time', '%g' % self.dmgr.GetTimeIndexValue( state_ndx, qds_name ) ),
+        ( 'Range', '%g %g' % ds_range ),
+        ( 'Software', 'VERAView' )
+        ]
+    return  image, text
+  #end Render
+
+
+  #----------------------------------------------------------------------
+  #	METHOD:		BatchRenderer._RenderAssembly()			-
+  #----------------------------------------------------------------------
+  def _RenderAssembly(
+      self, qds_name, dset_array, factors, mapper, pin_wd, **kwargs
+      ):
+    """Renders one assembly at an axial level, pins as circles and channels
+as squares, as in ``Assembly2DView``.
+    Returns:
+        tuple: ( image, title )
+"""
+    core = self.dmgr.GetCore()
+    dset_shape = dset_array.shape
+    col_limit, row_limit, cur_nxpin, cur_nypin, channel_flag = \
+        self._GetItemLimits( core, dset_shape )
+
+    assy_ndx = min( int( kwargs.get( 'assembly', 0 ) ), dset_shape[ 3 ] - 1 )
+    assy_addr = self.FindAssembly( assy_ndx )
+    axial_level = min( int( kwargs.get( 'axial', 0 ) ), dset_shape[ 2 ] - 1 )
+
+    item_rows = np.minimum( np.arange( row_limit ), cur_nypin - 1 )
+    item_cols = np.minimum( np.arange( col_limit ), cur_nxpin - 1 )
+    ndx = np.ix_( item_rows, item_cols, [ axial_level ], [ assy_ndx ] )
+    colors = RgbaRaster.MapColors(
+        dset_array[ ndx ][ :, :, 0, 0 ], mapper,
+        factors[ ndx ][ :, :, 0, 0 ]  if factors is not None else  None
+        )
+
+    image = RgbaRaster.CreateImage(
+        col_limit * pin_wd + 2, row_limit * pin_wd + 2
+        )
+    RgbaRaster.PaintCells(
+        image, colors,
+        RgbaRaster.CreateAxisMap(
+            image.shape[ 0 ], 1 + np.arange( row_limit ) * pin_wd, pin_wd
+            ),
+        RgbaRaster.CreateAxisMap(
+            image.shape[ 1 ], 1 + np.arange( col_limit ) * pin_wd, pin_wd
+            ),
+        RgbaRaster.CreateShapeMask(
+            pin_wd, pin_wd, 'rect'  if channel_flag else  'ellipse'
+            ),
+        RgbaRaster.DarkenColors( colors )
+        )
+
+    axial_value = self.dmgr.GetAxialValue( qds_name, core_ndx = axial_level )
+    title = '%s: Assy %s, Axial %.3f' % (
+        qds_name.displayName,
+        core.CreateAssyLabel( *assy_addr[ 1 : 3 ] ), axial_value.cm
+        )
+    return  image, title
+  #end _RenderAssembly
+
+
+  #----------------------------------------------------------------------
+  #	METHOD:		BatchRenderer._RenderAxial()			-
+  #----------------------------------------------------------------------
+  def _RenderAxial(
+      self, qds_name, dset_array, factors, mapper, pin_wd, **kwargs
+      ):
+    """Renders a vertical slice through the core along the row ('xz') or
+column ('yz') of an assembly, with level heights from the axial mesh, as in
+``CoreAxial2DView``.
+    Returns:
+        tuple: ( image, title )
+"""
+    core = self.dmgr.GetCore()
+    dset_shape = dset_array.shape
+    mode = 'yz'  if kwargs.get( 'mode' ) == 'yz' else  'xz'
+    col_limit, row_limit, cur_nxpin, cur_nypin, channel_flag = \
+        self._GetItemLimits( core, dset_shape )
+
+    assy_ndx = min( int( kwargs.get( 'assembly', 0 ) ), dset_shape[ 3 ] - 1 )
+    assy_addr = self.FindAssembly( assy_ndx )
+    sub_addr = kwargs.get( 'sub_addr' ) or ( core.npinx >> 1, core.npiny >> 1 )
+    if mode == 'xz':
+      assy_ndxs = core.coreMap[ assy_addr[ 2 ], : ] - 1
+      pin_cell = min( sub_addr[ 1 ], cur_nypin - 1 )
+      item_ndx = np.minimum( np.arange( col_limit ), cur_nxpin - 1 )
+      cur_ndx = np.ix_( [ pin_cell ], item_ndx, np.arange( dset_shape[ 2 ] ) )
+      npin = core.npinx
+      addresses = 'Assy Row %s, Pin Row %d' % \
+          ( core.GetRowLabel( assy_addr[ 2 ] ), pin_cell + 1 )
+    else:
+      assy_ndxs = core.coreMap[ :, assy_addr[ 1 ] ] - 1
+      pin_cell = min( sub_addr[ 0 ], cur_nxpin - 1 )
+      item_ndx = np.minimum( np.arange( row_limit ), cur_nypin - 1 )
+      cur_ndx = np.ix_( item_ndx, [ pin_cell ], np.arange( dset_shape[ 2 ] ) )
+      npin = core.npiny
+      addresses = 'Assy Col %s, Pin Col %d' % \
+          ( core.GetColLabel( assy_addr[ 1 ] ), pin_cell + 1 )
+    assy_ndxs[ assy_ndxs >= dset_shape[ 3 ] ] = -1
+
+#		-- Rows are axial levels, top down
+    nrows = dset_shape[ 2 ]
+    axial_mesh = self.dmgr.GetAxialMesh2( qds_name )
+    if axial_mesh is None or len( axial_mesh ) != nrows + 1:
+      axial_mesh = np.arange( nrows + 1, dtype = np.float64 )
+    cm_per_pin = core.GetAssemblyPitch() / max( npin, 1 )
+    axial_pix_per_cm = pin_wd / cm_per_pin
+    row_dys = np.maximum(
+        1, np.floor( axial_pix_per_cm * np.diff( axial_mesh ) )
+        ).astype( np.int64 )[ :: -1 ]
+    row_ys = 1 + np.cumsum( row_dys ) - row_dys
+
+    cur_array = dset_array[ cur_ndx ].\
+        reshape( item_ndx.size, nrows, -1 )[ :, :: -1 ]
+    cur_factors = None
+    if factors is not None:
+      cur_factors = factors[ cur_ndx ].\
+          reshape( cur_array.shape )[ :, :: -1 ]
+
+#		-- Last assembly entry is transparent
+    colors = RgbaRaster.MapColors( cur_array, mapper, cur_factors )
+    colors = np.concatenate(
+        ( colors, np.zeros( colors.shape[ 0 : 2 ] + ( 1, 4 ), np.uint8 ) ),
+        axis = 2
+        )
+
+    assy_wd = item_ndx.size * pin_wd + 1
+    grid_assy_x = np.repeat( np.arange( assy_ndxs.size ), item_ndx.size )
+    grid_item_x = np.tile( np.arange( item_ndx.size ), assy_ndxs.size )
+    grid_colors = colors[
+        grid_item_x[ np.newaxis, : ], np.arange( nrows )[ :, np.newaxis ],
+        assy_ndxs[ grid_assy_x ][ np.newaxis, : ]
+        ]
+
+    image = RgbaRaster.CreateImage(
+        assy_ndxs.size * assy_wd + 1, int( row_dys.sum() ) + 2
+        )
+    RgbaRaster.PaintCells(
+        image, grid_colors,
+        RgbaRaster.CreateAxisMap( image.shape[ 0 ], row_ys, row_dys ),
+        RgbaRaster.CreateAxisMap(
+            image.shape[ 1 ],
+            1 + grid_assy_x * assy_wd + grid_item_x * pin_wd, pin_wd
+            )
+        )
+
+    for j in np.flatnonzero( assy_ndxs >= 0 ):
+      BatchRenderer._DrawRects(
+          image, [ j * assy_wd ] * nrows, row_ys - 1,
+          assy_wd + 1, row_dys + 1, BatchRenderer.OUTLINE_COLOR
+          )
+
+    title = '%s: %s' % ( qds_name.displayName, addresses )
+    return  image, title
+  #end _RenderAxial
+
+
+  #----------------------------------------------------------------------
+  #	METHOD:		BatchRenderer._RenderCore()			-
+  #----------------------------------------------------------------------
+  def _RenderCore(
+      self, qds_name, dset_array, factors, mapper, pin_wd, **kwargs
+      ):
+    """Renders the pin grid of every assembly at an axial level, as in
+``Core2DView``.  Nodal datasets are shown as four nodes per assembly.
+    Returns:
+        tuple: ( image, title )
+"""
+    core = self.dmgr.GetCore()
+    dset_shape = dset_array.shape
+    nodal_flag = self.dmgr.IsNodalType( self.dmgr.GetDataSetType( qds_name ) )
+    if nodal_flag:
+      col_limit = row_limit = 2
+      pin_wd = max( pin_wd, (pin_wd * core.npinx) >> 1 )
+    else:
+      col_limit, row_limit, cur_nxpin, cur_nypin, channel_flag = \
+          self._GetItemLimits( core, dset_shape )
+
+    axial_level = min( int( kwargs.get( 'axial', 0 ) ), dset_shape[ 2 ] - 1 )
+    assy_ndxs = core.coreMap - 1
+    assy_ndxs[ assy_ndxs >= dset_shape[ 3 ] ] = -1
+
+    cur_array = dset_array[ :, :, axial_level, : ]
+    cur_factors = None
+    if factors is not None:
+      cur_factors = factors[ :, :, axial_level, : ]
+    if nodal_flag:
+      cur_array = cur_array[ 0, 0 : 4 ].reshape( 2, 2, -1 )
+      if cur_factors is not None:
+        cur_factors = cur_factors[ 0, 0 : 4 ].reshape( 2, 2, -1 )
+    else:
+      item_rows = np.minimum( np.arange( row_limit ), cur_nypin - 1 )
+      item_cols = np.minimum( np.arange( col_limit ), cur_nxpin - 1 )
+      cur_array = cur_array[ np.ix_( item_rows, item_cols ) ]
+      if cur_factors is not None:
+        cur_factors = cur_factors[ np.ix_( item_rows, item_cols ) ]
+
+#		-- Last assembly entry is transparent
+    colors = RgbaRaster.MapColors( cur_array, mapper, cur_factors )
+    colors = np.concatenate(
+        ( colors, np.zeros( colors.shape[ 0 : 2 ] + ( 1, 4 ), np.uint8 ) ),
+        axis = 2
+        )
+
+    nassy_rows, nassy_cols = assy_ndxs.shape
+    assy_wd = col_limit * pin_wd + 1
+    assy_ht = row_limit * pin_wd + 1
+    assy_advance_x = assy_wd + BatchRenderer.ASSEMBLY_GAP - 1
+    assy_advance_y = assy_ht + BatchRenderer.ASSEMBLY_GAP - 1
+    grid_assy_y = np.repeat( np.arange( nassy_rows ), row_limit )
+    grid_item_y = np.tile( np.arange( row_limit ), nassy_rows )
+    grid_assy_x = np.repeat( np.arange( nassy_cols ), col_limit )
+    grid_item_x = np.tile( np.arange( col_limit ), nassy_cols )
+    grid_colors = colors[
+        grid_item_y[ :, np.newaxis ], grid_item_x[ np.newaxis, : ],
+        assy_ndxs[ grid_assy_y[ :, np.newaxis ], grid_assy_x[ np.newaxis, : ] ]
+        ]
+
+    image = RgbaRaster.CreateImage(
+        nassy_cols * assy_advance_x + 1, nassy_rows * assy_advance_y + 1
+        )
+    RgbaRaster.PaintCells(
+        image, grid_colors,
+        RgbaRaster.CreateAxisMap(
+            image.shape[ 0 ],
+            1 + grid_assy_y * assy_advance_y + grid_item_y * pin_wd, pin_wd
+            ),
+        RgbaRaster.CreateAxisMap(
+            image.shape[ 1 ],
+            1 + grid_assy_x * assy_advance_x + grid_item_x * pin_wd, pin_wd
+            )
+        )
+
+    rows, cols = np.nonzero( assy_ndxs >= 0 )
+    BatchRenderer._DrawRects(
+        image, cols * assy_advance_x, rows * assy_advance_y,
+        assy_wd + 1, assy_ht + 1, BatchRenderer.OUTLINE_COLOR
+        )
+
+    axial_value = self.dmgr.GetAxialValue( qds_name, core_ndx = axial_level )
+    title = '%s: Axial %.3f' % ( qds_name.displayName, axial_value.cm )
+    return  image, title
+  #end _RenderCore
+
+
+  #----------------------------------------------------------------------
+  #	METHOD:		BatchRenderer.RenderJob()			-
+  #----------------------------------------------------------------------
+  def RenderJob( self, job ):
+    """Renders a job and writes the PNG file.
+    Args:
+        job (dict): 'widget', 'dataset', 'state', and 'path' items, with
+            other items passed as ``Render()`` keyword arguments
+"""
+    kwargs = dict( job )
+    image, text = self.Render(
+        kwargs.pop( 'widget' ), kwargs.pop( 'dataset' ),
+        kwargs.pop( 'state' ), **kwargs
+        )
+    BatchRenderer.WritePng( image, job[ 'path' ], text )
+  #end RenderJob
+
+
+#		-- Static Methods
+#		--
+
+
+  #----------------------------------------------------------------------
+  #	METHOD:		BatchRenderer.CheckFiles()			-
+  #----------------------------------------------------------------------
+  @staticmethod
+  def CheckFiles( paths, state_props = None ):
+    """Opens and closes the files in this process to find any that cannot
+be read before starting pool processes.
+    Args:
+        paths (list): HDF5 file paths
+        state_props (dict): optional session state properties
+    Raises:
+        IOError: if a file does not exist
+        Exception: first error opening a file
+"""
+    for path in paths:
+      if not os.path.isfile( path ):
+        raise IOError( 'File not found: ' + str( path ) )
+    BatchRenderer.Open( paths, state_props ).Close()
+  #end CheckFiles
+
+
+  #----------------------------------------------------------------------
+  #	METHOD:		BatchRenderer.CreateSpec()			-
+  #----------------------------------------------------------------------
+  @staticmethod
+  def CreateSpec( widget_props, state_props, dmgr ):
+    """Creates a job spec from widget properties, as saved in a session or
+by ``WidgetConfig.CreateWidgetProps()``.
+    Args:
+        widget_props (dict): widget properties with 'classpath'
+        state_props (dict): session state properties, providing values
+            not in ``widget_props``
+        dmgr (DataModelMgr): manager with the files open
+    Returns:
+        dict: spec with 'widget' and 'dataset' and optional 'state' and
+            'axial' defaults and ``Render()`` keyword arguments, or None
+            if the widget has no headless renderer or no dataset
+"""
+    widget_type = BatchRenderer.WIDGET_TYPES_BY_CLASS.\
+        get( widget_props.get( 'classpath' ) )
+    if widget_type == 'core' and widget_props.get( 'mode' ) == 'assy':
+      widget_type = 'assembly'
+
+    def get( key ):
+      return  widget_props.get( key, state_props.get( key ) )
+
+    spec = None
+    if widget_type is not None and get( 'curDataSet' ) is not None:
+      spec = { 'widget': widget_type, 'dataset': get( 'curDataSet' ) }
+      if widget_props.get( 'colormap' ):
+        spec[ 'colormap' ] = widget_props[ 'colormap' ]
+      if widget_props.get( 'dataRange' ):
+        spec[ 'data_range' ] = widget_props[ 'dataRange' ]
+      if widget_props.get( 'scaleType' ) in ( 'linear', 'log' ):
+        spec[ 'scale_type' ] = widget_props[ 'scaleType' ]
+      if widget_type == 'axial':
+        spec[ 'mode' ] = \
+            'yz' \
+            if widget_props.get( 'classpath', '' ).endswith( 'YZView' ) or \
+                widget_props.get( 'mode' ) == 'yz' else \
+            'xz'
+
+      assy_addr = get( 'assemblyAddr' )
+      if assy_addr:
+        spec[ 'assembly' ] = int( assy_addr[ 0 ] )
+      sub_addr = get( 'subAddr' )
+      if sub_addr:
+        spec[ 'sub_addr' ] = tuple( sub_addr )
+      axial_value = get( 'axialValue' )
+      if isinstance( axial_value, dict ) and axial_value.get( 'pin', -1 ) >= 0:
+        spec[ 'axial' ] = axial_value[ 'pin' ]
+      time_value = get( 'timeValue' )
+      if time_value is not None and time_value >= 0.0:
+        spec[ 'state' ] = dmgr.GetTimeValueIndex(
+            time_value, DataSetName.Resolve( spec[ 'dataset' ] )
+            )
+    #end if widget_type
+
+    return  spec
+  #end CreateSpec
+
+
+  #----------------------------------------------------------------------
+  #	METHOD:		BatchRenderer._DrawRects()			-
+  #----------------------------------------------------------------------
+  @staticmethod
+  def _DrawRects( image, xs, ys, wds, hts, color ):
+    """Draws one-pixel rectangle outlines in place, clipped to the image.
+    Args:
+        image (np.ndarray): (ht, wd, 4) uint8 buffer
+        xs (sequence): left pixel for each rectangle
+        ys (sequence): top pixel for each rectangle
+        wds (int or sequence): outer width of all or each rectangle
+        hts (int or sequence): outer height of all or each rectangle
+        color (sequence): RGBA outline color
+"""
+    im_ht, im_wd = image.shape[ 0 : 2 ]
+    xs = np.asarray( xs, dtype = np.int64 ).ravel()
+    ys = np.asarray( ys, dtype = np.int64 ).ravel()
+    wds = np.broadcast_to( np.asarray( wds, dtype = np.int64 ), xs.shape )
+    hts = np.broadcast_to( np.asarray( hts, dtype = np.int64 ), xs.shape )
+    color = np.asarray( color, dtype = np.uint8 )
+
+    for x, y, wd, ht in zip( xs, ys, wds, hts ):
+      right = min( x + wd, im_wd )
+      bottom = min( y + ht, im_ht )
+      x0 = max( x, 0 )
+      y0 = max( y, 0 )
+      if x0 < right and y0 < bottom:
+        if y >= 0:
+          image[ y, x0 : right ] = color
+        if y + ht - 1 < im_ht:
+          image[ y + ht - 1, x0 : right ] = color
+        if x >= 0:
+          image[ y0 : bottom, x ] = color
+        if x + wd - 1 < im_wd:
+          image[ y0 : bottom, x + wd - 1 ] = color
+    #end for x, y, wd, ht
+  #end _DrawRects
+
+
+  #----------------------------------------------------------------------
+  #	METHOD:		BatchRenderer.Open()				-
+  #----------------------------------------------------------------------
+  @staticmethod
+  def Open( paths, state_props = None ):
+    """Opens files in a new ``DataModelMgr``.
+    Args:
+        paths (list): HDF5 file paths
+        state_props (dict): optional session state properties providing
+            'timeDataSet' and 'dataModelMgr.thresholds'
+    Returns:
+        BatchRenderer: new instance
+    Raises:
+        Exception: first error opening a file
+"""
+    dmgr = DataModelMgr()
+    for result in dmgr.OpenModels( paths ):
+      if isinstance( result, Exception ):
+        dmgr.Close()
+        raise result
+
+    if state_props:
+      if 'dataModelMgr.thresholds' in state_props:
+        dmgr.LoadDataSetThresholds( state_props[ 'dataModelMgr.thresholds' ] )
+      if state_props.get( 'timeDataSet' ):
+        dmgr.SetTimeDataSet( state_props[ 'timeDataSet' ] )
+
+    return  BatchRenderer( dmgr )
+  #end Open
+
+
+  #----------------------------------------------------------------------
+  #	METHOD:		BatchRenderer.RenderImages()			-
+  #----------------------------------------------------------------------
+  @staticmethod
+  def RenderImages( paths, jobs, state_props = None, worker_count = 0 ):
+    """Generator rendering job images in order, each pool process opening
+the files once.  Closing the generator early stops the pool.
+    Args:
+        paths (list): HDF5 file paths
+        jobs (list): job dicts, see ``RenderJob()``, where 'path' items
+            are not needed
+        state_props (dict): optional session state properties
+        worker_count (int): number of pool processes, where values lt 2
+            render in this process
+    Yields:
+        tuple: ( np.ndarray (ht, wd, 4) uint8 image or None, error message
+            or None ) for each job in order
+    Raises:
+        Exception: first error opening a file
+"""
+    if worker_count > 1 and len( jobs ) > 1:
+      BatchRenderer.CheckFiles( paths, state_props )
+      pool = multiprocessing.Pool(
+          min( worker_count, len( jobs ) ),
+          _InitWorker, ( paths, state_props )
+          )
+      try:
+        for result in pool.imap( _RenderImage, jobs ):
+          yield  result
+        pool.close()
+      except:
+        pool.terminate()
+        raise
+      finally:
+        pool.join()
+
+    else:
+      renderer = BatchRenderer.Open( paths, state_props )
+      try:
+        for job in jobs:
+          yield  _RenderImage( job, renderer )
+      finally:
+        renderer.Close()
+  #end RenderImages
+
+
+  #----------------------------------------------------------------------
+  #	METHOD:		BatchRenderer.Run()				-
+  #----------------------------------------------------------------------
+  @staticmethod
+  def Run(
+      paths, jobs,
+      state_props = None, worker_count = 0, callback = None
+      ):
+    """Renders jobs, each pool process opening the files once.  The
+calling process should not have the files open when ``worker_count`` is
+gt 1.  The files are checked here before the pool is started.
+    Args:
+        paths (list): HDF5 file paths
+        jobs (list): job dicts, see ``RenderJob()``
+        state_props (dict): optional session state properties
+        worker_count (int): number of pool processes, where values lt 2
+            render in this process
+        callback (callable): optional progress callback, prototype
+            func( path, error_message_or_None, cur_step, step_count )
+    Returns:
+        list: ( path, error message or None ) for each job in completion
+            order
+    Raises:
+        Exception: first error opening a file
+"""
+    results = []
+
+    def update( result ):
+      results.append( result )
+      if callback:
+        callback( result[ 0 ], result[ 1 ], len( results ), len( jobs ) )
+    #end update
+
+    if worker_count > 1 and len( jobs ) > 1:
+      BatchRenderer.CheckFiles( paths, state_props )
+      pool = multiprocessing.Pool(
+          min( worker_count, len( jobs ) ),
+          _InitWorker, ( paths, state_props )
+          )
+      try:
+        for result in pool.imap_unordered( _RenderJob, jobs ):
+          update( result )
+        pool.close()
+      except:
+        pool.terminate()
+        raise
+      finally:
+        pool.join()
+
+    else:
+      renderer = BatchRenderer.Open( paths, state_props )
+      try:
+        for job in jobs:
+          update( _RenderJob( job, renderer ) )
+      finally:
+        renderer.Close()
+
+    return  results
+  #end Run
+
+
+  #----------------------------------------------------------------------
+  #	METHOD:		BatchRenderer.WritePng()			-
+  #----------------------------------------------------------------------
+  @staticmethod
+  def WritePng( image, file_path, text = None ):
+    """
+    Args:
+        image (np.ndarray): (ht, wd, 4) uint8 RGBA buffer
+        file_path (str): path to the file to write
+        text (sequence): optional ( keyword, value ) pairs
+"""
+    with open( file_path, 'wb' ) as fp:
+      fp.write( CreatePngFile(
+          image.shape[ 1 ], image.shape[ 0 ], DeflateImage( image ), text
+          ) )
+  #end WritePng
+
+#end BatchRenderer
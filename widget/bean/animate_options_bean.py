@@ -3,6 +3,8 @@
 #------------------------------------------------------------------------
 #	NAME:		animate_options_bean.py				-
 #	HISTORY:							-
+#		2026-10-18						-
+#	  Added fast frames option.
 #		2018-10-02	leerw@ornl.gov				-
 #		2018-10-01	leerw@ornl.gov				-
 #------------------------------------------------------------------------
@@ -19,6 +21,8 @@ except Exception:
 
 DEFAULT_frameDelay = 0.1
 
+DEFAULT_fastFrames = False
+
 DEFAULT_showSelections = True
 
 
@@ -26,7 +30,9 @@ DEFAULT_showSelections = True
 #	CLASS:		AnimateOptionsBean				-
 #------------------------------------------------------------------------
 class AnimateOptionsBean( wx.Panel ):
-  """Panel with inputs for showing selections and setting the delay speed.
+  """Panel with inputs for showing selections, setting the delay speed, and
+choosing fast frames, which are rendered headless without a title, labels,
+legend values, or selections.
 """
 
 
@@ -40,7 +46,8 @@ class AnimateOptionsBean( wx.Panel ):
   def __init__(
       self, container, id = -1,
       frame_delay = DEFAULT_frameDelay,
-      show_selections = DEFAULT_showSelections
+      show_selections = DEFAULT_showSelections,
+      fast_frames = DEFAULT_fastFrames
       ):
     """
 """
@@ -49,10 +56,12 @@ class AnimateOptionsBean( wx.Panel ):
 
     self._delay_fmt = '{0:.2f}'
     self._values = dict(
+	fast_frames = fast_frames,
 	frame_delay = frame_delay,
 	show_selections = show_selections
         )
 
+    self._fast_frames_ctrl = \
     self._frame_delay_field = \
     self._show_selections_ctrl = None
 
@@ -67,11 +76,20 @@ class AnimateOptionsBean( wx.Panel ):
   def Enable( self, flag = True ):
     super( AnimateOptionsBean, self ).Enable( flag )
 
+    self._fast_frames_ctrl.Enable( flag )
     self._frame_delay_field.Enable( flag )
     self._show_selections_ctrl.Enable( flag )
   #end Enable
 
 
+  #----------------------------------------------------------------------
+  #	METHOD:		AnimateOptionsBean.GetFastFrames()		-
+  #----------------------------------------------------------------------
+  def GetFastFrames( self ):
+    return  self._values.get( 'fast_frames', DEFAULT_fastFrames )
+  #end GetFastFrames
+
+
   #----------------------------------------------------------------------
   #	METHOD:		AnimateOptionsBean.GetFrameDelay()		-
   #----------------------------------------------------------------------
@@ -98,7 +116,7 @@ class AnimateOptionsBean( wx.Panel ):
 """
 #		-- Panel
 #		--
-    sizer = wx.FlexGridSizer( 2, 2, 6, 4 )  # rows, cols, vgap, hgap
+    sizer = wx.FlexGridSizer( 3, 2, 6, 4 )  # rows, cols, vgap, hgap
     sizer.SetFlexibleDirection( wx.HORIZONTAL )
     self.SetSizer( sizer )
 
@@ -138,6 +156,28 @@ class AnimateOptionsBean( wx.Panel ):
         self._show_selections_ctrl, 0,
 	wx.ALIGN_LEFT | wx.ALIGN_CENTER_VERTICAL | wx.EXPAND, 0
 	)
+
+#		-- Fast frames
+#		--
+    self._fast_frames_ctrl = wx.CheckBox( self, wx.ID_ANY )
+    self._fast_frames_ctrl.SetValue( self.GetFastFrames() )
+    self._fast_frames_ctrl.SetToolTipString(
+        'Render frames in parallel without the title, labels, legend ' +
+	'values, or selections'
+	)
+    self._fast_frames_ctrl.Bind( wx.EVT_CHECKBOX, self._OnCheck )
+
+    sizer.Add(
+        wx.StaticText(
+	    self, wx.ID_ANY, label = 'Fast, Unlabeled Frames:',
+	    style = wx.ALIGN_RIGHT
+	    ),
+	0, wx.ALIGN_RIGHT | wx.ALIGN_CENTER_VERTICAL, 0
+        )
+    sizer.Add(
+        self._fast_frames_ctrl, 0,
+	wx.ALIGN_LEFT | wx.ALIGN_CENTER_VERTICAL | wx.EXPAND, 0
+	)
     #sizer.AddStretchSpacer()
 
     self.Fit()
@@ -150,7 +190,10 @@ class AnimateOptionsBean( wx.Panel ):
   def _OnCheck( self, ev ):
     """
 """
-    self._values[ 'show_selections' ] = ev.IsChecked()
+    if ev.GetEventObject() is self._fast_frames_ctrl:
+      self._values[ 'fast_frames' ] = ev.IsChecked()
+    else:
+      self._values[ 'show_selections' ] = ev.IsChecked()
   #end _OnCheck
 
 
@@ -184,6 +227,20 @@ class AnimateOptionsBean( wx.Panel ):
   #end _OnFocusOut
 
 
+  #----------------------------------------------------------------------
+  #	METHOD:		AnimateOptionsBean.SetFastFrames()		-
+  #----------------------------------------------------------------------
+  def SetFastFrames( self, value ):
+    """
+    Args:
+        value (bool): fast frames toggle value
+"""
+    self._values[ 'fast_frames' ] = value
+    self._fast_frames_ctrl.SetValue( value )
+    self._fast_frames_ctrl.Update()
+  #end SetFastFrames
+
+
   #----------------------------------------------------------------------
   #	METHOD:		AnimateOptionsBean.SetFrameDelay()		-
   #----------------------------------------------------------------------
@@ -217,6 +274,8 @@ class AnimateOptionsBean( wx.Panel ):
 #		-- Properties
 #		--
 
+  fast_frames = property( GetFastFrames, SetFastFrames )
+
   frame_delay = property( GetFrameDelay, SetFrameDelay )
 
   show_selections = property( GetShowSelections, SetShowSelections )
@@ -235,6 +294,7 @@ class AnimateOptionsDialog( wx.Dialog ):
 #		-- Class Attributes
 #		--
 
+  last_fast_frames_ = DEFAULT_fastFrames
   last_frame_delay_ = DEFAULT_frameDelay
   last_show_selections_ = DEFAULT_showSelections
 
@@ -352,7 +412,12 @@ class AnimateOptionsDialog( wx.Dialog ):
   #----------------------------------------------------------------------
   #	METHOD:		AnimateOptionsDialog.ShowModal()		-
   #----------------------------------------------------------------------
-  def ShowModal( self, frame_delay = None, show_selections = None ):
+  def ShowModal(
+      self, frame_delay = None, show_selections = None, fast_frames = None
+      ):
+    self._bean.fast_frames = \
+	fast_frames  if fast_frames is not None else \
+        AnimateOptionsDialog.last_fast_frames_
     self._bean.frame_delay = \
 	frame_delay  if frame_delay is not None else \
         AnimateOptionsDialog.last_frame_delay_
@@ -363,6 +428,7 @@ class AnimateOptionsDialog( wx.Dialog ):
     retcode = super( AnimateOptionsDialog, self ).ShowModal()
 
     if retcode != wx.ID_CANCEL:
+      AnimateOptionsDialog.last_fast_frames_ = self.fast_frames
       AnimateOptionsDialog.last_frame_delay_ = self.frame_delay
       AnimateOptionsDialog.last_show_selections_ = self.show_selections
 
@@ -375,6 +441,10 @@ class AnimateOptionsDialog( wx.Dialog ):
 
   bean = property( lambda x: x._bean )
 
+  fast_frames = property(
+      lambda x: x._values.get( 'fast_frames', DEFAULT_fastFrames )
+      )
+
   frame_delay = property(
       lambda x: x._values.get( 'frame_delay', DEFAULT_frameDelay )
       )
@@ -0,0 +1,359 @@
+#!/usr/bin/env python
+# $Id$
+#------------------------------------------------------------------------
+#	NAME:		bitmap_cache.py					-
+#	HISTORY:							-
+#		2026-10-18						-
+#	  Bounded bitmap cache shared by RasterWidget instances.
+#------------------------------------------------------------------------
+"""Byte-bounded cache of rendered bitmaps shared by the raster widgets of a
+session, where a session is all the widget containers sharing an event
+State.
+
+Entries are keyed by owner widget and state tuple.  When a put exceeds the
+byte budget, entries farthest from their owner's current position are
+evicted first, with ties going to the least recently used.  Each owner
+supplies the distance with a ``GetBitmapDistance( tpl )`` method, where
+0 means the currently-displayed tuple, which is never evicted.
+"""
+import collections, logging, sys, threading, weakref
+import pdb
+
+
+#------------------------------------------------------------------------
+#	CLASS:		BitmapCache					-
+#------------------------------------------------------------------------
+class BitmapCache( object ):
+  """LRU bitmap cache with a byte budget.
+
+Properties:
+    budget (int): maximum number of bytes held
+    bytes (int): number of bytes currently held
+"""
+
+
+#		-- Class Attributes
+#		--
+
+  defaultBudget_ = 256 << 20
+
+  sessionCaches_ = weakref.WeakKeyDictionary()
+
+  sessionCachesLock_ = threading.Lock()
+
+
+#		-- Object Methods
+#		--
+
+
+  #----------------------------------------------------------------------
+  #	METHOD:		BitmapCache.__init__()				-
+  #----------------------------------------------------------------------
+  def __init__( self, budget = 0 ):
+    """
+    Args:
+        budget (int): byte budget, where values le 0 mean the default
+"""
+    self.logger = logging.getLogger( 'widget' )
+
+    self.budget = budget  if budget > 0 else  BitmapCache.defaultBudget_
+    self.bytes = 0
+    self.entries = collections.OrderedDict()
+    self.lock = threading.RLock()
+    self.owners = {}
+
+    self.evictions = 0
+    self.hits = 0
+    self.misses = 0
+  #end __init__
+
+
+  #----------------------------------------------------------------------
+  #	METHOD:		BitmapCache._CheckOwner()			-
+  #----------------------------------------------------------------------
+  def _CheckOwner( self, owner ):
+    """Purges entries left by a garbage-collected owner with the same id.
+Caller must hold ``lock``.
+    Args:
+        owner (object): owner widget
+    Returns:
+        int: owner id
+"""
+    owner_id = id( owner )
+    ref = self.owners.get( owner_id )
+    if ref is not None and ref() is not owner:
+      for key in list( self.entries.keys() ):
+        if key[ 0 ] == owner_id:
+	  self._Remove( key, True )
+      del self.owners[ owner_id ]
+    return  owner_id
+  #end _CheckOwner
+
+
+  #----------------------------------------------------------------------
+  #	METHOD:		BitmapCache.Clear()				-
+  #----------------------------------------------------------------------
+  def Clear( self, owner, keep_tuple = None ):
+    """Removes and destroys all the owner's bitmaps.
+    Args:
+        owner (object): owner widget
+	keep_tuple (tuple): optional tuple to keep
+"""
+    with self.lock:
+      owner_id = id( owner )
+      for key in list( self.entries.keys() ):
+        if key[ 0 ] == owner_id and key[ 1 ] != keep_tuple:
+	  self._Remove( key, True )
+      if keep_tuple is None:
+        self.owners.pop( owner_id, None )
+  #end Clear
+
+
+  #----------------------------------------------------------------------
+  #	METHOD:		BitmapCache._Evict()				-
+  #----------------------------------------------------------------------
+  def _Evict( self, keep_key ):
+    """Evicts entries until within budget, farthest and then least recently
+used first.  Caller must hold ``lock``.
+    Args:
+        keep_key (tuple): key not to evict
+"""
+    candidates = []
+    order = 0
+    for key in self.entries:
+      if key != keep_key:
+        distance = self._GetDistance( key )
+        if distance != 0:
+          candidates.append( ( -distance, order, key ) )
+      order += 1
+    candidates.sort()
+
+    for item in candidates:
+      if self.bytes <= self.budget:
+        break
+      self._Remove( item[ 2 ], True )
+      self.evictions += 1
+
+    if self.logger.isEnabledFor( logging.DEBUG ):
+      self.logger.debug( 'bitmap cache: %s', str( self.GetStats() ) )
+  #end _Evict
+
+
+  #----------------------------------------------------------------------
+  #	METHOD:		BitmapCache.Get()				-
+  #----------------------------------------------------------------------
+  def Get( self, owner, tpl ):
+    """Retrieves a bitmap, making it the most recently used.
+    Args:
+        owner (object): owner widget
+	tpl (tuple): state tuple
+    Returns:
+        wx.Bitmap: bitmap or None if not cached
+"""
+    bmap = None
+    with self.lock:
+      key = ( self._CheckOwner( owner ), tpl )
+      entry = self.entries.pop( key, None )
+      if entry is None:
+        self.misses += 1
+      else:
+        self.entries[ key ] = entry
+        self.hits += 1
+	bmap = entry[ 0 ]
+
+    return  bmap
+  #end Get
+
+
+  #----------------------------------------------------------------------
+  #	METHOD:		BitmapCache._GetDistance()			-
+  #----------------------------------------------------------------------
+  def _GetDistance( self, key ):
+    """Caller must hold ``lock``.
+    Returns:
+        float: owner distance, sys.float_info.max if the owner is gone
+"""
+    ref = self.owners.get( key[ 0 ] )
+    owner = ref()  if ref is not None else  None
+    return \
+        sys.float_info.max  if owner is None else \
+        owner.GetBitmapDistance( key[ 1 ] )
+  #end _GetDistance
+
+
+  #----------------------------------------------------------------------
+  #	METHOD:		BitmapCache.GetStats()				-
+  #----------------------------------------------------------------------
+  def GetStats( self ):
+    """
+    Returns:
+        dict: keys 'budget', 'bytes', 'count', 'evictions', 'hits', 'misses'
+"""
+    with self.lock:
+      return  dict(
+          budget = self.budget, bytes = self.bytes,
+	  count = len( self.entries ), evictions = self.evictions,
+	  hits = self.hits, misses = self.misses
+	  )
+  #end GetStats
+
+
+  #----------------------------------------------------------------------
+  #	METHOD:		BitmapCache.Has()				-
+  #----------------------------------------------------------------------
+  def Has( self, owner, tpl ):
+    """Checks for a bitmap without affecting recency or statistics.
+    Args:
+        owner (object): owner widget
+	tpl (tuple): state tuple
+    Returns:
+        bool: True if cached
+"""
+    with self.lock:
+      return  ( self._CheckOwner( owner ), tpl ) in self.entries
+  #end Has
+
+
+  #----------------------------------------------------------------------
+  #	METHOD:		BitmapCache.Put()				-
+  #----------------------------------------------------------------------
+  def Put( self, owner, tpl, bmap ):
+    """Adds or replaces a bitmap, evicting others if over budget.
+    Args:
+        owner (object): owner widget with a GetBitmapDistance() method
+	tpl (tuple): state tuple
+	bmap (wx.Bitmap): bitmap to cache
+"""
+    with self.lock:
+      owner_id = self._CheckOwner( owner )
+      if owner_id not in self.owners:
+        self.owners[ owner_id ] = weakref.ref( owner )
+
+      key = ( owner_id, tpl )
+      old_entry = self.entries.get( key )
+      if old_entry is not None:
+        self._Remove( key, old_entry[ 0 ] is not bmap )
+
+      nbytes = BitmapCache.GetBitmapBytes( bmap )
+      self.entries[ key ] = ( bmap, nbytes )
+      self.bytes += nbytes
+
+      if self.bytes > self.budget:
+        self._Evict( key )
+  #end Put
+
+
+  #----------------------------------------------------------------------
+  #	METHOD:		BitmapCache.Remove()				-
+  #----------------------------------------------------------------------
+  def Remove( self, owner, tpl ):
+    """Removes a bitmap without destroying it.
+    Args:
+        owner (object): owner widget
+	tpl (tuple): state tuple
+"""
+    with self.lock:
+      key = ( id( owner ), tpl )
+      if key in self.entries:
+        self._Remove( key, False )
+  #end Remove
+
+
+  #----------------------------------------------------------------------
+  #	METHOD:		BitmapCache._Remove()				-
+  #----------------------------------------------------------------------
+  def _Remove( self, key, destroy_flag ):
+    """Caller must hold ``lock``.
+"""
+    bmap, nbytes = self.entries.pop( key )
+    self.bytes -= nbytes
+    if destroy_flag and hasattr( bmap, 'Destroy' ):
+      bmap.Destroy()
+  #end _Remove
+
+
+  #----------------------------------------------------------------------
+  #	METHOD:		BitmapCache.SetBudget()				-
+  #----------------------------------------------------------------------
+  def SetBudget( self, budget ):
+    """
+    Args:
+        budget (int): byte budget, where values le 0 mean the default
+"""
+    with self.lock:
+      self.budget = budget  if budget > 0 else  BitmapCache.defaultBudget_
+      if self.bytes > self.budget:
+        self._Evict( None )
+  #end SetBudget
+
+
+#		-- Static Methods
+#		--
+
+
+  #----------------------------------------------------------------------
+  #	METHOD:		BitmapCache.GetBitmapBytes()			-
+  #----------------------------------------------------------------------
+  @staticmethod
+  def GetBitmapBytes( bmap ):
+    """Estimates bitmap memory as RGBA pixels.
+    Args:
+        bmap (wx.Bitmap): bitmap
+    Returns:
+        int: number of bytes
+"""
+    return \
+        bmap.GetWidth() * bmap.GetHeight() * 4 \
+        if hasattr( bmap, 'GetWidth' ) else  0
+  #end GetBitmapBytes
+
+
+  #----------------------------------------------------------------------
+  #	METHOD:		BitmapCache.GetDefaultBudget()			-
+  #----------------------------------------------------------------------
+  @staticmethod
+  def GetDefaultBudget():
+    return  BitmapCache.defaultBudget_
+  #end GetDefaultBudget
+
+
+  #----------------------------------------------------------------------
+  #	METHOD:		BitmapCache.GetSessionCache()			-
+  #----------------------------------------------------------------------
+  @staticmethod
+  def GetSessionCache( state ):
+    """Retrieves or creates the cache shared by widgets with the event
+state.
+    Args:
+        state (event.state.State): event state for the session, or None
+	    for a private cache
+    Returns:
+        BitmapCache: cache instance
+"""
+    if state is None:
+      cache = BitmapCache()
+    else:
+      with BitmapCache.sessionCachesLock_:
+        cache = BitmapCache.sessionCaches_.get( state )
+        if cache is None:
+          cache = BitmapCache()
+	  BitmapCache.sessionCaches_[ state ] = cache
+
+    return  cache
+  #end GetSessionCache
+
+
+  #----------------------------------------------------------------------
+  #	METHOD:		BitmapCache.SetDefaultBudget()			-
+  #----------------------------------------------------------------------
+  @staticmethod
+  def SetDefaultBudget( value ):
+    """
+    Args:
+        value (int): default byte budget for new caches
+"""
+    if value > 0:
+      BitmapCache.defaultBudget_ = value
+  #end SetDefaultBudget
+
+#end BitmapCache
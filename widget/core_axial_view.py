@@ -3,6 +3,10 @@
 #------------------------------------------------------------------------
 #	NAME:		core_axial_view.py				-
 #	HISTORY:							-
+#		2026-10-18						-
+#	  Rasterizing pins with RgbaRaster instead of per-pin GC calls.
+#	  Reading state arrays through DataModelMgr.GetStateArray().
+#	  Drawing unweighted until a fast-open model is ready.
 #		2018-07-13	leerw@ornl.gov				-
 #	  Fixed FindCell() bug found by Luke to keep axial_level within
 #	  current range.
@@ -189,7 +193,7 @@ Properties:
       core = self.dmgr.GetCore()
 
     if dset is not None and core is not None:
-      dset_value = np.array( dset )
+      dset_value = self.dmgr.GetStateArray( self.curDataSet, self.timeValue )
       dset_shape = dset_value.shape
       #axial_level = min( self.axialValue.pinIndex, dset_shape[ 2 ] - 1 )
 
@@ -288,7 +292,7 @@ Properties:
       core = self.dmgr.GetCore()
 
     if dset is not None and core is not None:
-      dset_value = np.array( dset )
+      dset_value = self.dmgr.GetStateArray( self.curDataSet, self.timeValue )
       dset_shape = dset_value.shape
 
       if self.mode == 'xz':
@@ -388,7 +392,7 @@ Properties:
       core = self.dmgr.GetCore()
 
     if dset is not None and core is not None:
-      dset_value = np.array( dset )
+      dset_value = self.dmgr.GetStateArray( self.curDataSet, self.timeValue )
       dset_shape = dset_value.shape
       assy_ndx = min( self.assemblyAddr[ 0 ], dset_shape[ 3 ] - 1 )
       axial_level = min( self.axialValue.pinIndex, dset_shape[ 2 ] - 1 )
@@ -685,10 +689,11 @@ If neither are specified, a default 'scale' value of 4 is used.
       #dset = self.dmgr.GetH5DataSet( self.curDataSet, self.timeValue )
       #core = self.dmgr.GetCore()
       pin_factors = None
-      if self.state.weightsMode == 'on':
+      if self.state.weightsMode == 'on' and \
+          self.dmgr.IsReady( self.curDataSet ):
         pin_factors = self.dmgr.GetFactors( self.curDataSet )
 
-      dset_array = np.array( dset )
+      dset_array = self.dmgr.GetStateArray( self.curDataSet, self.timeValue )
       dset_shape = dset.shape
 
       ds_range = config[ 'dataRange' ]
@@ -742,185 +747,125 @@ If neither are specified, a default 'scale' value of 4 is used.
 
       node_value_draw_list = []
 
-#			-- Create image
+#			-- Map the visible items to colors in one step
 #			--
-      bmap, dc = self._CreateEmptyBitmapAndDC( im_wd, im_ht )
+      assy_cols = np.arange( self.cellRange[ 0 ], self.cellRange[ 2 ] )
+      if self.mode == 'xz':
+	assy_ndxs = core.coreMap[ tuple_in[ 1 ], assy_cols ] - 1
+      else:
+	assy_ndxs = core.coreMap[ assy_cols, tuple_in[ 1 ] ] - 1
+      assy_ndxs[ assy_ndxs >= dset_shape[ 3 ] ] = -1
+
+#				-- Rows are axial levels, top down
+      nrows = len( axial_levels_dy )
+      row_levels = self.cellRange[ 1 ] + np.arange( nrows - 1, -1, -1 )
+      row_dys = np.array( axial_levels_dy[ :: -1 ], dtype = np.int64 )
+      row_ys = core_region[ 1 ] + np.cumsum( row_dys ) - row_dys
+
+      if self.nodalMode:
+	item_ndx = np.array( node_cells )
+	item_wd = node_wd
+	cur_ndx = np.ix_( [ 0 ], item_ndx, row_levels )
+      else:
+	item_ndx = np.minimum( np.arange( len( pin_range ) ), cur_npin - 1 )
+	item_wd = pin_wd
+	if self.mode == 'xz':
+	  cur_ndx = np.ix_( [ pin_cell ], item_ndx, row_levels )
+	else:
+	  cur_ndx = np.ix_( item_ndx, [ pin_cell ], row_levels )
+
+      cur_array = dset_array[ cur_ndx ].reshape( item_ndx.size, nrows, -1 )
+      cur_factors = None
+      if pin_factors is not None:
+	cur_factors = pin_factors[ cur_ndx ].reshape( cur_array.shape )
+
+#				-- Last assembly entry is transparent
+      colors = RgbaRaster.MapColors( cur_array, mapper, cur_factors )
+      colors = np.concatenate(
+	  ( colors, np.zeros( colors.shape[ 0 : 2 ] + ( 1, 4 ), np.uint8 ) ),
+	  axis = 2
+	  )
+
+      grid_assy_x = np.repeat( np.arange( assy_cols.size ), item_ndx.size )
+      grid_item_x = np.tile( np.arange( item_ndx.size ), assy_cols.size )
+      grid_colors = colors[
+	  grid_item_x[ np.newaxis, : ], np.arange( nrows )[ :, np.newaxis ],
+	  assy_ndxs[ grid_assy_x ][ np.newaxis, : ]
+	  ]
+
+#			-- Rasterize and create image
+#			--
+      image = RgbaRaster.CreateImage( im_wd, im_ht )
+      RgbaRaster.PaintCells(
+	  image, grid_colors,
+	  RgbaRaster.CreateAxisMap( im_ht, row_ys, row_dys + 1 ),
+	  RgbaRaster.CreateAxisMap(
+	      im_wd,
+	      core_region[ 0 ] + 1 + grid_assy_x * assy_wd +
+		  grid_item_x * item_wd,
+	      item_wd + 1
+	      )
+	  )
+
+      bmap, dc = self._CreateBitmapAndDCFromRgba( image )
       gc = self._CreateGraphicsContext( dc )
       trans_brush = self._CreateTransparentBrush( gc )
-      trans_color_arr = np.array([ 0, 0, 0, 0 ], dtype = np.uint8 )
 
+#			-- Labels
+#			--
       if self.showLabels:
-        glabel_font = gc.CreateFont( label_font, wx.BLACK )
+	glabel_font = gc.CreateFont( label_font, wx.BLACK )
 	gc.SetFont( glabel_font )
 
-      assy_pen = gc.CreatePen( wx.ThePenList.FindOrCreatePen(
-          wx.Colour( 155, 155, 155, 255 ), 1, wx.PENSTYLE_SOLID
-          ) )
-      node_pen = gc.CreatePen( wx.ThePenList.FindOrCreatePen(
-          wx.Colour( 100, 100, 100, 255 ), 1, wx.PENSTYLE_SOLID
-          ) )
-
-#			-- Loop on axial levels
-#			--
-      last_axial_label_y = 0;
-      axial_y = core_region[ 1 ]
-      for ax in range( len( axial_levels_dy ) - 1, -1, -1 ):
-        cur_dy = axial_levels_dy[ ax ]
-	axial_level = ax + self.cellRange[ 1 ]
-
-#				-- Row label
-#				--
-	if self.showLabels:
+	last_axial_label_y = 0
+	for axial_level, axial_y, cur_dy in zip( row_levels, row_ys, row_dys ):
 	  label = '%02d' % (axial_level + 1)
-	  #label_size = label_font.getsize( label )
 	  label_size = gc.GetFullTextExtent( label )
 	  label_y = axial_y + ((cur_dy - label_size[ 1 ]) / 2.0)
 	  if (last_axial_label_y + label_size[ 1 ] + 1) < (axial_y + cur_dy):
 	    gc.DrawText( label, 1, label_y )
 	    last_axial_label_y = axial_y
+	#end for axial_level, axial_y, cur_dy
 
-#				-- Loop on col
-#				--
+	label_ndx = 0 if self.mode == 'xz' else 1
 	assy_x = core_region[ 0 ]
-	for assy_col in range( self.cellRange[ 0 ], self.cellRange[ 2 ], 1 ):
-#					-- Column label
-#					--
-	  if ax == len( axial_levels_dy ) - 1 and self.showLabels:
-	    label_ndx = 0 if self.mode == 'xz' else 1
-	    label = core.GetCoreLabel( label_ndx, assy_col )
-	    label_size = gc.GetFullTextExtent( label )
-	    label_x = assy_x + ((assy_wd - label_size[ 0 ]) / 2.0)
-	    gc.DrawText( label, label_x, 1 )
-	  #end if
-
-	  if self.mode == 'xz':
-	    assy_ndx = core.coreMap[ tuple_in[ 1 ], assy_col ] - 1
-	  else:
-	    assy_ndx = core.coreMap[ assy_col, tuple_in[ 1 ] ] - 1
-
-#					-- Assembly referenced?
-#					--
-	  if assy_ndx >= 0 and assy_ndx < dset_shape[ 3 ]:
-#						-- Map to colors
-	    cur_factors = None
-	    if self.nodalMode:
-              cur_array = dset_array[ 0, :, axial_level, assy_ndx ]
-	      if pin_factors is not None:
-	        cur_factors = pin_factors[ 0, :, axial_level, assy_ndx ]
-
-	    elif self.mode == 'xz':
-              cur_array = dset_array[ pin_cell, :, axial_level, assy_ndx ]
-	      if pin_factors is not None:
-	        cur_factors = pin_factors[ pin_cell, :, axial_level, assy_ndx ]
-
-	    else: # 'yz'
-              cur_array = dset_array[ :, pin_cell, axial_level, assy_ndx ]
-	      if pin_factors is not None:
-	        cur_factors = pin_factors[ :, pin_cell, axial_level, assy_ndx ]
-
-            colors = mapper.to_rgba( cur_array, bytes = True )
-	    if cur_factors is not None:
-	      colors[ cur_factors == 0 ] = trans_color_arr
-            colors[ np.isnan( cur_array ) ] = trans_color_arr
-            colors[ np.isinf( cur_array ) ] = trans_color_arr
-
-	    if self.nodalMode:
-	      node_x = assy_x + 1
-
-	      for node_ndx in node_cells:
-#	        value = dset_array[ 0, node_ndx, axial_level, assy_ndx ]
-#	        if pin_factors is None:
-#	          pin_factor = 1
-#	        else:
-#	          pin_factor = pin_factors[ 0, node_ndx, axial_level, assy_ndx ]
-#
-#	        if not ( pin_factor == 0 or self.dmgr.IsBadValue( value ) ):
-#		  pen_color = mapper.to_rgba( value, bytes = True )
-	        cur_color = colors[ node_ndx ]
-		if cur_color[ 3 ] > 0:
-		  pen_color = cur_color.tolist()
-		  gc.SetPen( gc.CreatePen( wx.ThePenList.FindOrCreatePen(
-		      wx.Colour( *pen_color ), 1, wx.PENSTYLE_SOLID
-		      ) ) )
-	          brush_color = pen_color
-		  gc.SetBrush( gc.CreateBrush(
-		      wx.TheBrushList.FindOrCreateBrush(
-		          wx.Colour( *brush_color ), wx.BRUSHSTYLE_SOLID
-		          )
-		      ) )
-		  gc.DrawRectangle( node_x, axial_y, node_wd + 1, cur_dy + 1 )
-
-		  value = cur_array[ node_ndx ]
-		  node_value_draw_list.append((
-		      self._CreateValueString( value ),
-                      Widget.GetContrastColor( *brush_color ),
-                      node_x, axial_y, node_wd, cur_dy
-		      ))
-		#end if cur_color[ 3 ] > 0
-
-	        node_x += node_wd
-	      #end for node cells
-
-	    else: # not self.nodalMode:
-	      pin_x = assy_x + 1
-
-	      for pin_col in pin_range:
-	        cur_pin_col = min( pin_col, cur_npin - 1 )
-	        cur_color = colors[ cur_pin_col ]
-
-#	        if self.mode == 'xz':
-#	          value = \
-#		      dset_array[ pin_cell, cur_pin_col, axial_level, assy_ndx ]
-#	          if pin_factors is None:
-#	            pin_factor = 1
-#		  else:
-#	            pin_factor = \
-#		     pin_factors[ pin_cell, cur_pin_col, axial_level, assy_ndx ]
-#	        else:
-#	          value = \
-#		      dset_array[ cur_pin_col, pin_cell, axial_level, assy_ndx ]
-#	          if pin_factors is None:
-#	            pin_factor = 1
-#		  else:
-#	            pin_factor = \
-#		     pin_factors[ cur_pin_col, pin_cell, axial_level, assy_ndx ]
-#
-#	        if not ( pin_factor == 0 or self.dmgr.IsBadValue( value ) ):
-#		  pen_color = mapper.to_rgba( value, bytes = True )
-
-		if isinstance( cur_color[ 3 ], np.ndarray ):
-		  self.logger.warning(
-		      'LOOK: cur_color[ 3 ] isa %s, cur_pin_col=%d, colors:%s%s',
-		      type( cur_color[ 3 ] ).__name__,
-		      cur_pin_col, os.linesep, str( colors )
-		      )
-		  pdb.set_trace()
-		elif cur_color[ 3 ] > 0:
-		  pen_color = cur_color.tolist()
-		  gc.SetPen( gc.CreatePen( wx.ThePenList.FindOrCreatePen(
-		      wx.Colour( *pen_color ), 1, wx.PENSTYLE_SOLID
-		      ) ) )
-	          brush_color = pen_color
-		  gc.SetBrush( gc.CreateBrush(
-		      wx.TheBrushList.FindOrCreateBrush(
-		          wx.Colour( *brush_color ), wx.BRUSHSTYLE_SOLID
-		      ) ) )
-		  gc.DrawRectangle( pin_x, axial_y, pin_wd + 1, cur_dy + 1 )
-	        #end if valid value
-	        pin_x += pin_wd
-	      #end for pin cols
-	    #end if-else self.nodalMode
-
-	    gc.SetBrush( trans_brush )
-	    gc.SetPen( assy_pen )
-	    gc.DrawRectangle( assy_x, axial_y, assy_wd + 1, cur_dy + 1 )
-	  #end if assembly referenced
-
+	for assy_col in assy_cols:
+	  label = core.GetCoreLabel( label_ndx, assy_col )
+	  label_size = gc.GetFullTextExtent( label )
+	  label_x = assy_x + ((assy_wd - label_size[ 0 ]) / 2.0)
+	  gc.DrawText( label, label_x, 1 )
 	  assy_x += assy_wd
-	#end for assy_col
+      #end if self.showLabels
 
-	axial_y += cur_dy
-      #end for ax in range( len( axial_levels_dy ) - 1, -1, -1 )
+#			-- Assembly outlines and node values
+#			--
+      gc.SetBrush( trans_brush )
+      gc.SetPen( gc.CreatePen( wx.ThePenList.FindOrCreatePen(
+	  wx.Colour( 155, 155, 155, 255 ), 1, wx.PENSTYLE_SOLID
+	  ) ) )
+
+      for j in np.flatnonzero( assy_ndxs >= 0 ):
+	assy_ndx = assy_ndxs[ j ]
+	assy_x = core_region[ 0 ] + j * assy_wd
+	for row in xrange( nrows ):
+	  axial_y = row_ys[ row ]
+	  cur_dy = row_dys[ row ]
+	  gc.DrawRectangle( assy_x, axial_y, assy_wd + 1, cur_dy + 1 )
+
+	  if self.nodalMode:
+	    for k in xrange( item_ndx.size ):
+	      brush_color = colors[ k, row, assy_ndx ]
+	      if brush_color[ 3 ] > 0:
+		node_value_draw_list.append((
+		    self._CreateValueString( cur_array[ k, row, assy_ndx ] ),
+		    Widget.GetContrastColor( *brush_color.tolist() ),
+		    assy_x + 1 + k * node_wd, axial_y, node_wd, cur_dy
+		    ))
+	  #end if self.nodalMode
+	#end for row
+      #end for j
+
+      axial_y = core_region[ 1 ] + int( row_dys.sum() )
 
 #			-- Draw Values
 #			--
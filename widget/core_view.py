@@ -3,6 +3,10 @@
 #------------------------------------------------------------------------
 #	NAME:		core_view.py					-
 #	HISTORY:							-
+#		2026-10-18						-
+#	  Rasterizing pins with RgbaRaster instead of per-pin GC calls.
+#	  Reading state arrays through DataModelMgr.GetStateArray().
+#	  Drawing unweighted until a fast-open model is ready.
 #		2018-12-24	leerw@ornl.gov				-
 #         Invoking VeraViewApp.DoBusyEventOp() in event handlers.
 #		2018-03-10	leerw@ornl.gov				-
@@ -399,10 +403,11 @@ If neither are specified, a default 'scale' value of 24 is used.
 
 #		-- "Item" refers to channel or pin
       item_factors = None
-      if self.state.weightsMode == 'on':
+      if self.state.weightsMode == 'on' and \
+          self.dmgr.IsReady( self.curDataSet ):
         item_factors = self.dmgr.GetFactors( self.curDataSet )
 
-      dset_array = np.array( dset )
+      dset_array = self.dmgr.GetStateArray( self.curDataSet, self.timeValue )
       dset_shape = dset.shape
       cur_nxpin = 2 if self.nodalMode else min( core.npinx, dset_shape[ 1 ] )
       cur_nypin = 2 if self.nodalMode else min( core.npiny, dset_shape[ 0 ] )
@@ -423,94 +428,99 @@ If neither are specified, a default 'scale' value of 24 is used.
       axial_value = self.dmgr.\
           GetAxialValue( self.curDataSet, core_ndx = axial_level )
 
-#			-- Create image
+#			-- Map to colors in one step
 #			--
-      bmap, dc = self._CreateEmptyBitmapAndDC( im_wd, im_ht )
+      item_col_limit = cur_nxpin
+      if self.channelMode:
+	item_col_limit += 1
+      item_row_limit = cur_nypin
+      if self.channelMode:
+	item_row_limit += 1
+
+      cur_array = dset_array[ :, :, axial_level, assy_ndx ]
+      cur_factors = None
+      if item_factors is not None:
+	cur_factors = item_factors[ :, :, axial_level, assy_ndx ]
+      if self.nodalMode:
+	cur_array = cur_array[ 0, 0 : 4 ].reshape( 2, 2 )
+	if cur_factors is not None:
+	  cur_factors = cur_factors[ 0, 0 : 4 ].reshape( 2, 2 )
+      else:
+	item_rows = \
+	    np.minimum( np.arange( item_row_limit ), dset_shape[ 0 ] - 1 )
+	item_cols = \
+	    np.minimum( np.arange( item_col_limit ), dset_shape[ 1 ] - 1 )
+	cur_array = cur_array[ np.ix_( item_rows, item_cols ) ]
+	if cur_factors is not None:
+	  cur_factors = cur_factors[ np.ix_( item_rows, item_cols ) ]
+      colors = RgbaRaster.MapColors( cur_array, mapper, cur_factors )
+
+#			-- Rasterize and create image
+#			--
+      item_advance = pin_wd + pin_gap
+      image = RgbaRaster.CreateImage( im_wd, im_ht )
+      if self.nodalMode:
+	shape_mask = RgbaRaster.CreateShapeMask( pin_wd + 1, pin_wd + 1 )
+      else:
+	shape_mask = \
+	    RgbaRaster.CreateShapeMask( pin_wd + 1, pin_wd + 1, 'ellipse' )
+      RgbaRaster.PaintCells(
+	  image, colors,
+	  RgbaRaster.CreateAxisMap(
+	      im_ht,
+	      assy_region[ 1 ] + np.arange( colors.shape[ 0 ] ) * item_advance,
+	      pin_wd + 1
+	      ),
+	  RgbaRaster.CreateAxisMap(
+	      im_wd,
+	      assy_region[ 0 ] + np.arange( colors.shape[ 1 ] ) * item_advance,
+	      pin_wd + 1
+	      ),
+	  shape_mask,
+	  RgbaRaster.DarkenColors( colors, keep_transparent = True )
+	  )
+
+      bmap, dc = self._CreateBitmapAndDCFromRgba( image )
       gc = self._CreateGraphicsContext( dc )
-      trans_brush = self._CreateTransparentBrush( gc )
-      trans_color_arr = np.array([ 0, 0, 0, 0 ], dtype = np.uint8 )
 
+#			-- Labels
+#			--
       if self.showLabels:
 	glabel_font = gc.CreateFont( label_font, wx.BLACK )
-        gc.SetFont( glabel_font )
+	gc.SetFont( glabel_font )
 
-      item_col_limit = cur_nxpin
-      if self.channelMode:
-        item_col_limit += 1
-      item_row_limit = cur_nypin
-      if self.channelMode:
-        item_row_limit += 1
-
-      node_ndx = 0
-      item_y = assy_region[ 1 ]
-      for item_row in xrange( item_row_limit ):
-#				-- Row label
-#				--
-	if self.showLabels:
+	for item_row in xrange( item_row_limit ):
 	  label = '%d' % (item_row + 1)
 	  text_size = gc.GetFullTextExtent( label )
-	  label_size = ( text_size[ 0 ], text_size[ 1 ] )
-	  label_y = item_y + ((pin_wd + pin_gap - label_size[ 1 ]) / 2.0)
-	  #gc.DrawText( label, 1, label_y, trans_brush )
+	  label_y = assy_region[ 1 ] + item_row * item_advance + \
+	      ((item_advance - text_size[ 1 ]) / 2.0)
 	  gc.DrawText( label, 1, label_y )
 
-#					-- Loop on col
-#					--
-	item_x = assy_region[ 0 ]
 	for item_col in xrange( item_col_limit ):
-#						-- Column label
-#						--
-	  if item_row == 0 and self.showLabels:
-	    label = '%d' % (item_col + 1)
-	    text_size = gc.GetFullTextExtent( label )
-	    label_size = ( text_size[ 0 ], text_size[ 1 ] )
-	    label_x = item_x + ((pin_wd + pin_gap - label_size[ 0 ]) / 2.0)
-	    #gc.DrawText( label, label_x, 1, trans_brush )
-	    gc.DrawText( label, label_x, 1 )
-	  #end if writing column label
-
-#						-- Map to colors
-	  cur_array = dset_array[ :, :, axial_level, assy_ndx ]
-          colors = mapper.to_rgba( cur_array, bytes = True )
-          if item_factors is not None:
-	    cur_factors = item_factors[ :, :, axial_level, assy_ndx ]
-	    colors[ cur_factors == 0 ] = trans_color_arr
-	  colors[ np.isnan( cur_array ) ] = trans_color_arr
-	  colors[ np.isinf( cur_array ) ] = trans_color_arr
+	  label = '%d' % (item_col + 1)
+	  text_size = gc.GetFullTextExtent( label )
+	  label_x = assy_region[ 0 ] + item_col * item_advance + \
+	      ((item_advance - text_size[ 0 ]) / 2.0)
+	  gc.DrawText( label, label_x, 1 )
+      #end if self.showLabels
 
-	  if self.nodalMode:
-	    cur_color = colors[ 0, node_ndx ]
-	  else:
-	    cur_color = colors[ item_row, item_col ]
-
-	  if cur_color[ 3 ] > 0:
-	    brush_color = cur_color.tolist()
-	    gc.SetBrush( gc.CreateBrush( wx.TheBrushList.FindOrCreateBrush(
-	        wx.Colour( *brush_color ), wx.BRUSHSTYLE_SOLID
-		) ) )
-	    pen_color = Widget.GetDarkerColor( brush_color, 255 )
-	    gc.SetPen( gc.CreatePen( wx.ThePenList.FindOrCreatePen(
-		wx.Colour( *pen_color ), 1, wx.PENSTYLE_SOLID
-		) ) )
-
-	    if self.nodalMode:
-	      gc.DrawRectangle( item_x, item_y, pin_wd + 1, pin_wd + 1 )
-	      value = dset_array[ 0, node_ndx, axial_level, assy_ndx ]
-	      node_value_draw_list.append((
-	          self._CreateValueString( value ),
-                  Widget.GetContrastColor( *brush_color ),
-                  item_x, item_y, pin_wd, pin_wd
-                  ))
-	    else:
-	      gc.DrawEllipse( item_x, item_y, pin_wd, pin_wd )
-
-	  item_x += pin_wd + pin_gap
-	  if self.nodalMode:
-	    node_ndx += 1
-	#end for pin_col
+#			-- Node values
+#			--
+      if self.nodalMode:
+	for node_ndx in xrange( 4 ):
+	  brush_color = colors[ node_ndx >> 1, node_ndx & 1 ]
+	  if brush_color[ 3 ] > 0:
+	    value = dset_array[ 0, node_ndx, axial_level, assy_ndx ]
+	    node_value_draw_list.append((
+		self._CreateValueString( value ),
+		Widget.GetContrastColor( *brush_color.tolist() ),
+		assy_region[ 0 ] + (node_ndx & 1) * item_advance,
+		assy_region[ 1 ] + (node_ndx >> 1) * item_advance,
+		pin_wd, pin_wd
+		))
+      #end if self.nodalMode
 
-	item_y += pin_wd + pin_gap
-      #end for pin_row
+      item_y = assy_region[ 1 ] + item_row_limit * item_advance
 
 #			-- Draw pins
 #			--
@@ -623,7 +633,7 @@ If neither are specified, a default 'scale' value of 24 is used.
       core = self.dmgr.GetCore()
 
     if dset is not None and core is not None:
-      dset_value = np.array( dset )
+      dset_value = self.dmgr.GetStateArray( self.curDataSet, self.timeValue )
       dset_shape = dset_value.shape
       axial_level = min( self.axialValue.pinIndex, dset_shape[ 2 ] - 1 )
 
@@ -721,7 +731,7 @@ If neither are specified, a default 'scale' value of 24 is used.
       core = self.dmgr.GetCore()
 
     if dset is not None and core is not None:
-      dset_value = np.array( dset )
+      dset_value = self.dmgr.GetStateArray( self.curDataSet, self.timeValue )
       dset_shape = dset_value.shape
       assy_ndx = min( self.assemblyAddr[ 0 ], dset_shape[ 3 ] - 1 )
       axial_level = min( self.axialValue.pinIndex, dset_shape[ 2 ] - 1 )
@@ -943,10 +953,11 @@ If neither are specified, a default 'scale' value of 4 is used.
 
 #		-- "Item" refers to channel or pin
       item_factors = None
-      if self.state.weightsMode == 'on':
+      if self.state.weightsMode == 'on' and \
+          self.dmgr.IsReady( self.curDataSet ):
         item_factors = self.dmgr.GetFactors( self.curDataSet )
 
-      dset_array = np.array( dset )
+      dset_array = self.dmgr.GetStateArray( self.curDataSet, self.timeValue )
       dset_shape = dset.shape
       if self.nodalMode:
         cur_nxpin = cur_nypin = item_col_limit = item_row_limit = 2
@@ -982,143 +993,136 @@ If neither are specified, a default 'scale' value of 4 is used.
       axial_value = self.dmgr.\
           GetAxialValue( self.curDataSet, core_ndx = axial_level )
 
-#			-- Create image
+#			-- Map the visible pin grid to colors in one step
 #			--
-      bmap, dc = self._CreateEmptyBitmapAndDC( im_wd, im_ht )
+      assy_rows = np.arange( self.cellRange[ 1 ], self.cellRange[ 3 ] )
+      assy_cols = np.arange( self.cellRange[ 0 ], self.cellRange[ 2 ] )
+      assy_ndxs = core.coreMap[ np.ix_( assy_rows, assy_cols ) ] - 1
+      assy_ndxs[ assy_ndxs >= dset_shape[ 3 ] ] = -1
+
+      cur_array = dset_array[ :, :, axial_level, : ]
+      cur_factors = None
+      if item_factors is not None:
+	cur_factors = item_factors[ :, :, axial_level, : ]
+      if self.nodalMode:
+	cur_array = cur_array[ 0, 0 : 4 ].reshape( 2, 2, -1 )
+	if cur_factors is not None:
+	  cur_factors = cur_factors[ 0, 0 : 4 ].reshape( 2, 2, -1 )
+      else:
+	item_rows = np.minimum( np.arange( item_row_limit ), cur_nypin - 1 )
+	item_cols = np.minimum( np.arange( item_col_limit ), cur_nxpin - 1 )
+	cur_array = cur_array[ np.ix_( item_rows, item_cols ) ]
+	if cur_factors is not None:
+	  cur_factors = cur_factors[ np.ix_( item_rows, item_cols ) ]
+
+#				-- Last assembly entry is transparent
+      colors = RgbaRaster.MapColors( cur_array, mapper, cur_factors )
+      colors = np.concatenate(
+	  ( colors, np.zeros( colors.shape[ 0 : 2 ] + ( 1, 4 ), np.uint8 ) ),
+	  axis = 2
+	  )
+
+#				-- Pin grid rows and cols in assemblies
+      grid_assy_y = np.repeat( np.arange( assy_rows.size ), item_row_limit )
+      grid_item_y = np.tile( np.arange( item_row_limit ), assy_rows.size )
+      grid_assy_x = np.repeat( np.arange( assy_cols.size ), item_col_limit )
+      grid_item_x = np.tile( np.arange( item_col_limit ), assy_cols.size )
+      grid_colors = colors[
+	  grid_item_y[ :, np.newaxis ], grid_item_x[ np.newaxis, : ],
+	  assy_ndxs[ grid_assy_y[ :, np.newaxis ], grid_assy_x[ np.newaxis, : ] ]
+	  ]
+
+#			-- Rasterize and create image
+#			--
+      image = RgbaRaster.CreateImage( im_wd, im_ht )
+      y_map = RgbaRaster.CreateAxisMap(
+	  im_ht,
+	  core_region[ 1 ] + 1 + grid_assy_y * assy_advance +
+	      grid_item_y * pin_wd,
+	  pin_wd + 1
+	  )
+      x_map = RgbaRaster.CreateAxisMap(
+	  im_wd,
+	  core_region[ 0 ] + 1 + grid_assy_x * assy_advance +
+	      grid_item_x * pin_wd,
+	  pin_wd + 1
+	  )
+      if self.nodalMode:
+	node_colors = np.zeros_like( grid_colors )
+	node_colors[ grid_colors[ ..., 3 ] > 0 ] = ( 100, 100, 100, 255 )
+	RgbaRaster.PaintCells(
+	    image, grid_colors, y_map, x_map,
+	    RgbaRaster.CreateShapeMask( pin_wd + 1, pin_wd + 1 ), node_colors
+	    )
+      else:
+	RgbaRaster.PaintCells( image, grid_colors, y_map, x_map )
+
+      bmap, dc = self._CreateBitmapAndDCFromRgba( image )
       gc = self._CreateGraphicsContext( dc )
       trans_brush = self._CreateTransparentBrush( gc )
-      trans_color_arr = np.array([ 0, 0, 0, 0 ], dtype = np.uint8 )
 
+#			-- Labels
+#			--
       if self.showLabels:
 	glabel_font = gc.CreateFont( label_font, wx.BLACK )
-        gc.SetFont( glabel_font )
-
-      assy_pen = gc.CreatePen( wx.ThePenList.FindOrCreatePen(
-          wx.Colour( 155, 155, 155, 255 ), 1, wx.PENSTYLE_SOLID
-	  ) )
-      node_pen = gc.CreatePen( wx.ThePenList.FindOrCreatePen(
-          wx.Colour( 100, 100, 100, 255 ), 1, wx.PENSTYLE_SOLID
-	  ) )
+	gc.SetFont( glabel_font )
 
-#			-- Loop on assembly rows
-#			--
-      assy_y = core_region[ 1 ]
-      for assy_row in xrange( self.cellRange[ 1 ], self.cellRange[ 3 ], 1 ):
-        #xxx check for thread stop
-#				-- Row label
-#				--
-	if self.showLabels:
+	assy_y = core_region[ 1 ]
+	for assy_row in assy_rows:
 	  label = core.GetRowLabel( assy_row )
 	  label_size = gc.GetFullTextExtent( label )
 	  label_y = assy_y + ((assy_wd - label_size[ 1 ]) / 2.0)
-	  #gc.DrawText( label, 1, label_y, trans_brush )
 	  gc.DrawText( label, 1, label_y )
+	  assy_y += assy_advance
 
-#				-- Loop on col
-#				--
 	assy_x = core_region[ 0 ]
-	for assy_col in xrange( self.cellRange[ 0 ], self.cellRange[ 2 ], 1 ):
-	  #xxx check for thread stop
-	  brush_color = None
-#					-- Column label
-#					--
-	  if assy_row == self.cellRange[ 1 ] and self.showLabels:
-	    label = core.GetColLabel( assy_col )
-	    text_size = gc.GetFullTextExtent( label )
-	    label_size = ( text_size[ 0 ], text_size[ 1 ] )
-	    label_x = assy_x + ((assy_wd - label_size[ 0 ]) / 2.0)
-	    #gc.DrawText( label, label_x, 1, trans_brush )
-	    gc.DrawText( label, label_x, 1 )
-	  #end if writing column label
-
-	  assy_ndx = core.coreMap[ assy_row, assy_col ] - 1
-
-#					-- Assembly exists in the col,row
-#					--
-	  if assy_ndx >= 0 and assy_ndx < dset_shape[ 3 ]:
-	    item_y = assy_y + 1
-
-#						-- Map to colors
-	    cur_array = dset_array[ :, :, axial_level, assy_ndx ]
-            colors = mapper.to_rgba( cur_array, bytes = True )
-            if item_factors is not None:
-	      cur_factors = item_factors[ :, :, axial_level, assy_ndx ]
-	      colors[ cur_factors == 0 ] = trans_color_arr
-	    colors[ np.isnan( cur_array ) ] = trans_color_arr
-	    colors[ np.isinf( cur_array ) ] = trans_color_arr
-
-#						-- Loop on chan/pin rows
-	    node_ndx = 0
-	    for item_row in xrange( item_row_limit ):
-	      item_x = assy_x + 1
-#							-- Loop on chan/pin cols
-	      cur_item_row = min( item_row, cur_nypin - 1 )
-	      if cur_item_row >= 0:
-	        for item_col in xrange( item_col_limit ):
-	          cur_item_col = min( item_col, cur_nxpin - 1 )
-		  if self.nodalMode:
-		    cur_color = colors[ 0, node_ndx ]
-		  else:
-		    cur_color = colors[ cur_item_row, cur_item_col ]
-
-		  if cur_color[ 3 ] > 0:
-		    #pen_color = cmap( mapper.norm( value ), bytes = True )
-		    #pen_color = mapper.to_rgba( value, bytes = True )
-		    pen_color = cur_color.tolist()
-	            gc.SetPen( gc.CreatePen( wx.ThePenList.FindOrCreatePen(
-		        wx.Colour( *pen_color ), 1, wx.PENSTYLE_SOLID
-	                ) ) )
-	            brush_color = pen_color
-	            gc.SetBrush( gc.CreateBrush(
-		        wx.TheBrushList.FindOrCreateBrush(
-	                    wx.Colour( *brush_color ), wx.BRUSHSTYLE_SOLID
-			    )
-		        ) )
-		    #im_draw.ellipse
-	            gc.DrawRectangle( item_x, item_y, pin_wd + 1, pin_wd + 1 )
-
-		    if self.nodalMode:
-		      gc.SetBrush( trans_brush )
-		      gc.SetPen( node_pen )
-	              gc.DrawRectangle( item_x, item_y, pin_wd + 1, pin_wd + 1 )
-		      value = dset_array[ 0, node_ndx, axial_level, assy_ndx ]
-		      node_value_draw_list.append((
-			  self._CreateValueString( value ),
-                          Widget.GetContrastColor( *brush_color ),
-			  item_x, item_y, pin_wd, pin_wd
-		          ))
-		    #end if nodalMode
-	          #end if good value, not hidden by pin_factor
-
-	          item_x += pin_wd
-		  if self.nodalMode:
-		    node_ndx += 1
-	        #end for item_col
-	      #end if cur_item_row >= 0
-
-	      item_y += pin_wd
-	    #end for item_row
-
-	    gc.SetBrush( trans_brush )
-	    gc.SetPen( assy_pen )
-	    gc.DrawRectangle( assy_x, assy_y, assy_wd + 1, assy_wd + 1 )
+	for assy_col in assy_cols:
+	  label = core.GetColLabel( assy_col )
+	  text_size = gc.GetFullTextExtent( label )
+	  label_x = assy_x + ((assy_wd - text_size[ 0 ]) / 2.0)
+	  gc.DrawText( label, label_x, 1 )
+	  assy_x += assy_advance
+      #end if self.showLabels
+
+#			-- Assembly outlines and values
+#			--
+      gc.SetBrush( trans_brush )
+      gc.SetPen( gc.CreatePen( wx.ThePenList.FindOrCreatePen(
+	  wx.Colour( 155, 155, 155, 255 ), 1, wx.PENSTYLE_SOLID
+	  ) ) )
+
+      for i, j in zip( *np.nonzero( assy_ndxs >= 0 ) ):
+	assy_ndx = assy_ndxs[ i, j ]
+	assy_x = core_region[ 0 ] + j * assy_advance
+	assy_y = core_region[ 1 ] + i * assy_advance
+	gc.DrawRectangle( assy_x, assy_y, assy_wd + 1, assy_wd + 1 )
+
+	if self.nodalMode:
+	  for node_ndx in xrange( 4 ):
+	    brush_color = colors[ node_ndx >> 1, node_ndx & 1, assy_ndx ]
+	    if brush_color[ 3 ] > 0:
+	      value = dset_array[ 0, node_ndx, axial_level, assy_ndx ]
+	      node_value_draw_list.append((
+		  self._CreateValueString( value ),
+		  Widget.GetContrastColor( *brush_color.tolist() ),
+		  assy_x + 1 + (node_ndx & 1) * pin_wd,
+		  assy_y + 1 + (node_ndx >> 1) * pin_wd,
+		  pin_wd, pin_wd
+		  ))
+	  #end for node_ndx
+
 #-- Draw value for cross-pin integration derived datasets
 #--
-	    if draw_value_flag and brush_color is not None:
-	      value = dset_array[ 0, 0, axial_level, assy_ndx ]
-	      assy_value_draw_list.append((
-	          self._CreateValueString( value ),
-                  Widget.GetContrastColor( *brush_color ),
-		  assy_x, assy_y, assy_wd, assy_wd
-	          ))
-	    #end if draw_value_flag
-	  #end if assy_ndx >= 0 and assy_ndx < dset_shape[ 3 ]
-
-	  assy_x += assy_advance
-	#end for assy_col
+	elif draw_value_flag and colors[ 0, 0, assy_ndx, 3 ] > 0:
+	  value = dset_array[ 0, 0, axial_level, assy_ndx ]
+	  assy_value_draw_list.append((
+	      self._CreateValueString( value ),
+	      Widget.GetContrastColor( *colors[ 0, 0, assy_ndx ].tolist() ),
+	      assy_x, assy_y, assy_wd, assy_wd
+	      ))
+      #end for i, j
 
-        assy_y += assy_advance
-      #end for assy_row
+      assy_y = core_region[ 1 ] + assy_rows.size * assy_advance
 
 #			-- Draw Values
 #			--
@@ -1895,7 +1899,8 @@ be overridden by subclasses.
       pin_factors = None
 
       if self.nodalMode:
-        if self.state.weightsMode == 'on':
+        if self.state.weightsMode == 'on' and \
+            self.dmgr.IsReady( self.curDataSet ):
           pin_factors = self.dmgr.GetFactors( self.curDataSet )
         node_addr = pin_info[ 2 ]
 	if node_addr < dset.shape[ 1 ] and assy_ndx < dset.shape[ 3 ]:
@@ -1912,7 +1917,8 @@ be overridden by subclasses.
 	#end if node_addr and assy_ndx valid
 
       else:
-        if self.state.weightsMode == 'on':
+        if self.state.weightsMode == 'on' and \
+            self.dmgr.IsReady( self.curDataSet ):
           pin_factors = self.dmgr.GetFactors( self.curDataSet )
         pin_addr = pin_info[ 0 : 2 ]
         if pin_addr[ 1 ] < dset.shape[ 0 ] and \
@@ -3,6 +3,9 @@
 #------------------------------------------------------------------------
 #	NAME:		core_view_plot.py				-
 #	HISTORY:							-
+#		2026-10-18						-
+#	  Reading state arrays through DataModelMgr.GetStateArray().
+#	  Drawing unweighted until a fast-open model is ready.
 #		2018-08-21	leerw@ornl.gov				-
 #	  Added text values for assembly averages.
 #		2018-08-20	leerw@ornl.gov				-
@@ -816,10 +819,11 @@ method via super.SaveProps().
 #		-- "Item" refers to channel or pin
 #		--
       item_factors = None
-      if self.state.weightsMode == 'on':
+      if self.state.weightsMode == 'on' and \
+          self.dmgr.IsReady( self.curDataSet ):
         item_factors = self.dmgr.GetFactors( self.curDataSet )
      
-      dset_array = np.array( dset )
+      dset_array = self.dmgr.GetStateArray( self.curDataSet, self.timeValue )
       dset_shape = dset.shape
 ##      if self.nodalMode:
 ##        #self.npinx = self.npiny = item_col_limit = item_row_limit = 2
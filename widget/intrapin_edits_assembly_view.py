@@ -3,6 +3,8 @@
 #------------------------------------------------------------------------
 #	NAME:		intrapin_edits_assembly_view.py			-
 #	HISTORY:							-
+#		2026-10-18						-
+#	  Drawing unweighted until a fast-open model is ready.
 #		2018-10-22	leerw@ornl.gov				-
 #------------------------------------------------------------------------
 import logging, math, os, six, sys, threading, time, traceback
@@ -306,9 +308,11 @@ If neither are specified, a default 'scale' value of 24 is used.
 
 #		-- intrapin_edits has no_factors, so this should always be None
       cur_factors = pin_factors = None
-      if self.state.weightsMode == 'on':
+      if self.state.weightsMode == 'on' and \
+          self.dmgr.IsReady( self.curDataSet ):
         pin_factors = self.dmgr.GetFactors( self.curDataSet, True )
-        cur_factors = pin_factors[ :, :, axial_level, assy_ndx ]
+        if pin_factors is not None:
+          cur_factors = pin_factors[ :, :, axial_level, assy_ndx ]
 
       title_templ, title_size = self._CreateTitleTemplate(
 	  font, self.curDataSet, start_dset.shape, self.state.timeDataSet,
@@ -3,6 +3,15 @@
 #------------------------------------------------------------------------
 #       NAME:           raster_widget.py                                -
 #       HISTORY:                                                        -
+#               2026-10-18                                              -
+#         Added CreateFrameImage() for animation frames rendered with
+#         thread-local axialValue, stateIndex, and timeValue overrides.
+#         Bitmaps are held in a byte-bounded BitmapCache shared by the
+#         raster widgets of a session.
+#         Added _CreateBitmapAndDCFromRgba() for RgbaRaster painting.
+#         Prefetching data arrays for neighboring state points in the
+#         background.  Holding the current state point array with
+#         DataModelMgr.AcquireStateArray().
 #               2018-12-26      leerw@ornl.gov                          -
 #         Working on seemless notification for busy operations.
 #               2018-12-24      leerw@ornl.gov                          -
@@ -152,6 +161,9 @@ from data.config import *
 from data.rangescaler import *
 from event.state import *
 
+from .array_prefetcher import *
+from .bitmap_cache import *
+from .rgba_raster import *
 from .widget import *
 
 
@@ -171,7 +183,8 @@ Fields/Properties
 -----------------
 
 axialValue
-  local axial value state, getter is GetAxialValue()
+  local axial value state, getter is GetAxialValue(), which
+  CreateFrameImage() overrides for its own thread
 
 bitmapCtrl
   wx.StaticBitmap used to display the raster image and as the event source
@@ -179,16 +192,21 @@ bitmapCtrl
 bitmapPanel
   wx.Panel holding *bitmapCtrl*
 
-bitmapThreadArgs
-  arguments in current bitmap creation thread, used to avoid duplicate
-  threads to create the same bitmap
+arrayPrefetcher
+  ArrayPrefetcher reading and holding the dataset arrays for neighboring
+  state points
 
-bitmaps
-  dict caching bitmaps created, keyed by event state tuple, which is defined
+bitmapThreads
+  dict of bitmap_args for bitmap creation threads in progress, used to avoid
+  duplicate threads to create the same bitmap
+
+bitmapCache
+  BitmapCache shared by the raster widgets of the session, caching bitmaps
+  created, keyed by this widget and event state tuple, which is defined
   by extensions
 
 bitmapsLock
-  threading.RLock() to manage access to *bitmaps*
+  threading.RLock() to manage bitmap creation
 
 cellRange
   currently displayed zoom range
@@ -205,11 +223,21 @@ curSize
 data
   DataModel reference, getter is GetData()
 
+stateArray
+  array for the current dataset and time value, held in the shared slice
+  cache with DataModelMgr.AcquireStateArray() until the state changes or
+  ReleaseBitmaps() is called
+
+stateArrayKey
+  ( curDataSet, timeValue ) for *stateArray*
+
 stateIndex
-  0-based state point index, getter is GetStateIndex()
+  0-based state point index, getter is GetStateIndex(), which
+  CreateFrameImage() overrides for its own thread
 
 timeValue
-  current time value
+  current time value, getter is GetTimeValue(), which CreateFrameImage()
+  overrides for its own thread
 
 Framework Methods
 -----------------
@@ -222,6 +250,11 @@ _CreateDrawConfig()
   Must be implemented by extensions to build the drawing configuration based
   on widget size or a specified scale factor.
 
+_CreatePrefetchTimeValues()
+  Defines the time values whose dataset arrays are read in the background
+  after each UpdateState().  The implementation here returns the
+  neighboring state points.
+
 _CreateRasterImage()
   Must be implemented by extensions to create the raster image based on
   the event state tuple and a configuration created by _CreateDrawConfig().
@@ -296,7 +329,8 @@ _OnDragFinished()
 
 UpdateState()
   Implements this Widget framework method by calling _UpdateStateValues() and
-  managing bitmaps appropriately.  On a 'resize', the bitmap cache is cleared.
+  managing bitmaps appropriately.  On a 'resize', this widget's bitmaps are
+  removed from the cache.
   On a 'change' in event state selection, the appropriate bitmap is retrieved
   from the cache or created if necessary.
 
@@ -344,6 +378,9 @@ _CreateValueDisplay()
 
   jobid_ = 0
 
+  prefetchSteps_ = 1
+  """int: Number of neighbors to prefetch in each direction, 0 to disable."""
+
 
 #               -- Object Methods
 #               --
@@ -356,10 +393,14 @@ _CreateValueDisplay()
     """
 """
     #self.axialValue = DataModel.CreateEmptyAxialValue()
+    self.arrayPrefetcher = ArrayPrefetcher(
+        lambda *key: self.dmgr.AcquireStateArray( *key ),
+        lambda array: self.dmgr.ReleaseStateArray( array )
+        )
     self.axialValue = AxialValue()
-#nt self.bitmapThreads = {}  # key is args, only used in threaded image creation
+    self.bitmapThreads = {}  # key is args, only used in threaded image creation
     #self.bitmapThreadArgs = None
-    self.bitmaps = {}  # key is (row,col)
+    self.bitmapCache = BitmapCache.GetSessionCache( container.state )
     self.bitmapsLock = threading.RLock()
     self.cellRange = None  # left, top, right+1, bottom+1, dx, dy
     self.cellRangeStack = []
@@ -370,9 +411,12 @@ _CreateValueDisplay()
     self.dragStartPosition = None
     self.fitMode = 'ht'
     #self.isLoaded = False
+    self.renderLocal = threading.local()
 
     self.showLabels = True
     self.showLegend = True
+    self.stateArray = None
+    self.stateArrayKey = None
     self.stateIndex = -1
     self.timeValue = -1.0
     self.timer = None
@@ -498,8 +542,10 @@ Paired to _BitmapThreadStart().
   #     METHOD:         RasterWidget._BitmapThreadFinishImpl()          -
   #----------------------------------------------------------------------
   def _BitmapThreadFinishImpl( self, cur_tuple, bmap, bitmap_args ):
-    """Called from _BitmapThreadFinish().
+    """Called from _BitmapThreadFinish().  A bitmap whose creation was
+cancelled by _ClearBitmaps() is destroyed unless displayed.
 """
+    cached = False
 
 #               -- No tuple, give up
 #               --
@@ -507,6 +553,12 @@ Paired to _BitmapThreadStart().
       #bmap = None
 
       if bmap is None:
+        self.bitmapsLock.acquire()
+        try:
+          self.bitmapThreads.pop( bitmap_args, None )
+        finally:
+          self.bitmapsLock.release()
+
         bmap = self.blankBitmap
         if self.logger.isEnabledFor( logging.INFO ):
           self.logger.info( '%s: ** bmap is None **', self.GetTitle() )
@@ -518,17 +570,8 @@ Paired to _BitmapThreadStart().
         self.bitmapsLock.acquire()
         try:
           if bitmap_args in self.bitmapThreads:
-#            wx_im = wx.EmptyImage( *pil_im.size )
-#
-#            pil_im_data_str = pil_im.convert( 'RGB' ).tobytes()
-#            wx_im.SetData( pil_im_data_str )
-#
-#            pil_im_data_str = pil_im.convert( 'RGBA' ).tobytes()
-#            wx_im.SetAlphaData( pil_im_data_str[ 3 : : 4 ] )
-#
-#            bmap = wx.BitmapFromImage( wx_im )
-
-            self.bitmaps[ cur_tuple ] = bmap
+            self.bitmapCache.Put( self, cur_tuple, bmap )
+            cached = True
             del self.bitmapThreads[ bitmap_args ]
             #self.bitmapThreadArgs = None
           #end if bitmap_args in self.bitmapThreads
@@ -551,6 +594,12 @@ Paired to _BitmapThreadStart().
             )
       if bmap is not None and self.IsTupleCurrent( cur_tuple ):
         self._SetBitmap( self._HiliteBitmap( bmap ) )
+
+#                       -- Stale, neither cached nor shown
+#                       --
+      elif bmap is not None and bmap is not self.blankBitmap and \
+          not cached:
+        bmap.Destroy()
     #end if cur_tuple is not None and bitmap_args is not None
 
 #x    self._BusyEnd()
@@ -608,16 +657,9 @@ Calls _CreateRasterImage().
   def _ClearBitmaps( self, keep_tuple = None ):
     self.bitmapsLock.acquire()
     try:
-#nt   self.bitmapThreads.clear()
+      self.bitmapThreads.clear()
       self._SetBitmap( self.blankBitmap )
-
-      tuples = list( self.bitmaps.keys() )
-      for t in tuples:
-        if keep_tuple is None or keep_tuple != t:
-          b = self.bitmaps[ t ]
-          del self.bitmaps[ t ]
-          b.Destroy()
-      #end for
+      self.bitmapCache.Clear( self, keep_tuple )
 
     finally:
       self.bitmapsLock.release()
@@ -699,11 +741,10 @@ implementation returns None.
         if bmap is None:
           self.logger.warning( '%s: * bmap is None *', self.GetTitle() )
           #bmap = self.blankBitmap
-          if cur_tuple in self.bitmaps:
-            del self.bitmaps[ cur_tuple ]
+          self.bitmapCache.Remove( self, cur_tuple )
 
         else:
-          self.bitmaps[ cur_tuple ] = bmap
+          self.bitmapCache.Put( self, cur_tuple, bmap )
 
 #nt       if bitmap_args is not None and bitmap_args in self.bitmapThreads:
 #nt         del self.bitmapThreads[ bitmap_args ]
@@ -871,6 +912,43 @@ called from subclass _CreateDrawConfig() methods.
   #end _CreateBaseDrawConfig
 
 
+  #----------------------------------------------------------------------
+  #     METHOD:         RasterWidget._CreateBitmapAndDCFromRgba()       -
+  #----------------------------------------------------------------------
+  def _CreateBitmapAndDCFromRgba( self, image, bg_color = None ):
+    """Creates a bitmap from an RGBA buffer painted with ``RgbaRaster``
+in a single copy, filling transparent pixels with the same platform
+background as ``_CreateEmptyBitmapAndDC()``.
+    Args:
+        image (np.ndarray): (ht, wd, 4) uint8 buffer, modified in place
+        bg_color (wx.Colour): optional explicit background color
+    Returns:
+        wx.Bitmap, wx.MemoryDC: New bitmap object and DC on which labels,
+            grid lines and the legend can be drawn
+"""
+    if Config.IsLinux() and bg_color is None:
+      bg_color = self.GetBackgroundColour()
+
+    if bg_color is not None:
+      RgbaRaster.FillBackground( image, (
+          bg_color.red, bg_color.green, bg_color.blue, bg_color.alpha
+          ) )
+    elif Config.IsWindows():
+      RgbaRaster.FillBackground( image, ( 255, 255, 255, 255 ) )
+
+    ht, wd = image.shape[ 0 : 2 ]
+    bmap = wx.EmptyBitmapRGBA( wd, ht )
+    bmap.CopyFromBuffer(
+        np.ascontiguousarray( image ).tobytes(), wx.BitmapBufferFormat_RGBA
+        )
+
+    dc = wx.MemoryDC()
+    dc.SelectObject( bmap )
+
+    return  bmap, dc
+  #end _CreateBitmapAndDCFromRgba
+
+
   #----------------------------------------------------------------------
   #     METHOD:         RasterWidget._CreateClipboardImage()            -
   #----------------------------------------------------------------------
@@ -880,8 +958,8 @@ called from subclass _CreateDrawConfig() methods.
 """
     bmap = None
     cur_tuple = self._CreateStateTuple()
-    if cur_tuple in self.bitmaps:
-      bmap = self.bitmaps[ cur_tuple ]
+    if self.bitmapCache.Has( self, cur_tuple ):
+      bmap = self.bitmapCache.Get( self, cur_tuple )
     elif self.bitmapCtrl is not None:
       bmap = self.bitmapCtrl.GetBitmap()
 
@@ -1004,6 +1082,55 @@ specified, a default scale value of 8 is used.
 ##  #end _CreateGraphicsContext
 
 
+  #----------------------------------------------------------------------
+  #     METHOD:         RasterWidget.CreateFrameImage()                 -
+  #----------------------------------------------------------------------
+  def CreateFrameImage( self, hilite = False, **kwargs ):
+    """Creates the print image for an animation frame without changing the
+widget state or waiting on the UI event loop.  Overrides apply only to the
+calling thread while the image is created.  On Linux, must be called on the
+UI thread.
+@param  hilite          True to draw selections
+@param  kwargs
+  'axial_value'         optional AxialValue override
+  'state_index'         optional state point index override
+  'time_value'          optional time value override
+@return                 ( ht, wd, 4 ) uint8 RGBA np.ndarray or None
+"""
+    names = \
+      {
+      'axial_value': 'axialValue',
+      'state_index': 'stateIndex',
+      'time_value': 'timeValue'
+      }
+    overrides = [ names[ k ] for k in kwargs if k in names ]
+    for k in kwargs:
+      if k in names:
+        setattr( self.renderLocal, names[ k ], kwargs[ k ] )
+
+    try:
+      config = self._CreateDrawConfig(
+          font_scale = self.GetPrintFontScale(),
+          printing = True
+          )
+      bmap = self._CreateRasterImage( self._CreateStateTuple(), config )
+      if bmap is not None and hilite:
+        bmap = self._HiliteBitmap( bmap, config )
+    finally:
+      for name in overrides:
+        delattr( self.renderLocal, name )
+
+    image = None
+    if bmap is not None:
+      wd, ht = bmap.GetWidth(), bmap.GetHeight()
+      block = bytearray( wd * ht * 4 )
+      bmap.CopyToBuffer( block, wx.BitmapBufferFormat_RGBA )
+      image = np.frombuffer( block, dtype = np.uint8 ).reshape( ( ht, wd, 4 ) )
+
+    return  image
+  #end CreateFrameImage
+
+
   #----------------------------------------------------------------------
   #     METHOD:         RasterWidget._CreateMenuDef()                   -
   #----------------------------------------------------------------------
@@ -1140,6 +1267,26 @@ Must be called from the UI thread.
   #end _CreatePopupMenu
 
 
+  #----------------------------------------------------------------------
+  #     METHOD:         RasterWidget._CreatePrefetchTimeValues()        -
+  #----------------------------------------------------------------------
+  def _CreatePrefetchTimeValues( self ):
+    """Defines the time values whose arrays of the current dataset are read
+in the background, nearest first.  This implementation returns
+``prefetchSteps_`` state points in each direction.  The whole state point
+array is read, so axial levels and assemblies need no prefetch.
+@return                 list of time values
+"""
+    result = []
+    if self.curDataSet is not None:
+      result = ArrayPrefetcher.GetNeighbors(
+          self.dmgr.GetTimeValues( self.curDataSet ), self.timeValue,
+          RasterWidget.prefetchSteps_
+          )
+    return  result
+  #end _CreatePrefetchTimeValues
+
+
   #----------------------------------------------------------------------
   #     METHOD:         RasterWidget.CreatePrintImage()                 -
   #----------------------------------------------------------------------
@@ -2294,6 +2441,32 @@ Not tested!!
   #end GetAxialValue
 
 
+  #----------------------------------------------------------------------
+  #     METHOD:         RasterWidget.GetBitmapDistance()                -
+  #----------------------------------------------------------------------
+  def GetBitmapDistance( self, tpl ):
+    """Measures how far a cached bitmap tuple is from the current state
+tuple for ``bitmapCache`` eviction, as the sum of absolute differences of
+corresponding numeric items, typically state index and axial level, with
+other mismatched items counting as 1000.  Extensions may override.
+@param  tpl             tuple of state values
+@return                 distance, 0 for the current tuple
+"""
+    distance = 0
+    cur_tuple = self._CreateStateTuple()
+    if len( tpl ) != len( cur_tuple ):
+      distance = sys.float_info.max
+    else:
+      for a, b in zip( tpl, cur_tuple ):
+        if isinstance( a, ( int, long, float ) ) and \
+            isinstance( b, ( int, long, float ) ):
+          distance += abs( a - b )
+        elif a != b:
+          distance += 1000
+    return  distance
+  #end GetBitmapDistance
+
+
   #----------------------------------------------------------------------
   #     METHOD:         RasterWidget.GetInitialCellRange()              -
   #----------------------------------------------------------------------
@@ -2352,6 +2525,24 @@ does nothing.
   #end _HiliteBitmap
 
 
+  #----------------------------------------------------------------------
+  #     METHOD:         RasterWidget._HoldStateArray()                  -
+  #----------------------------------------------------------------------
+  def _HoldStateArray( self ):
+    """Holds the array for the current dataset and time value with
+``DataModelMgr.AcquireStateArray()``, releasing the one held for the
+previous state, so bitmaps for the shown state read it with
+``GetStateArray()`` instead of after it is evicted.
+"""
+    key = ( self.curDataSet, self.timeValue )  if self.curDataSet else  None
+    if key != self.stateArrayKey:
+      array = self.dmgr.AcquireStateArray( *key )  if key else  None
+      self._ReleaseStateArray()
+      self.stateArray = array
+      self.stateArrayKey = key
+  #end _HoldStateArray
+
+
   #----------------------------------------------------------------------
   #     METHOD:         RasterWidget._InitEventHandlers()               -
   #----------------------------------------------------------------------
@@ -2951,6 +3142,59 @@ This implementation is a noop.
   #end _OnUnzoom
 
 
+  #----------------------------------------------------------------------
+  #     METHOD:         RasterWidget._PrefetchArrays()                  -
+  #----------------------------------------------------------------------
+  def _PrefetchArrays( self ):
+    """Has ``arrayPrefetcher`` read the arrays for the time values from
+``_CreatePrefetchTimeValues()``, releasing any no longer wanted after a jump
+in selection.  Only data are read in the background, and bitmaps are
+created on the UI thread when a neighbor is shown.
+"""
+    keys = []
+    if self.config is not None:
+      keys = [
+          ( self.curDataSet, time_value )
+          for time_value in self._CreatePrefetchTimeValues()
+          ]
+    self.arrayPrefetcher.Prefetch( keys )
+  #end _PrefetchArrays
+
+
+  #----------------------------------------------------------------------
+  #     METHOD:         RasterWidget.ReleaseBitmaps()                   -
+  #----------------------------------------------------------------------
+  def ReleaseBitmaps( self ):
+    """Removes all this widget's bitmaps from ``bitmapCache``, called when
+the widget is closed.  Pending prefetches are cancelled and prefetched and
+held arrays released.
+"""
+    self.bitmapsLock.acquire()
+    try:
+      self.bitmapThreads.clear()
+    finally:
+      self.bitmapsLock.release()
+
+    self.arrayPrefetcher.Clear()
+    self._ReleaseStateArray()
+    self.bitmapCache.Clear( self )
+  #end ReleaseBitmaps
+
+
+  #----------------------------------------------------------------------
+  #     METHOD:         RasterWidget._ReleaseStateArray()               -
+  #----------------------------------------------------------------------
+  def _ReleaseStateArray( self ):
+    """Releases ``stateArray`` held by _HoldStateArray().
+"""
+    array = self.stateArray
+    self.stateArray = None
+    self.stateArrayKey = None
+    if array is not None:
+      self.dmgr.ReleaseStateArray( array )
+  #end _ReleaseStateArray
+
+
   #----------------------------------------------------------------------
   #     METHOD:         RasterWidget.SaveProps()                        -
   #----------------------------------------------------------------------
@@ -3049,13 +3293,18 @@ Calls ``_UpdateStateValues()``.
       changed = True
 
     if changed and self.config is not None:
+      self._HoldStateArray()
       must_create_image = True
       self.bitmapsLock.acquire()
       try:
-        if tpl in self.bitmaps:
+        bmap = self.bitmapCache.Get( self, tpl )
+        if bmap is not None:
           if self.logger.isEnabledFor( logging.DEBUG ):
-            self.logger.debug( '%s: cache hit', self.GetTitle() )
-          self._SetBitmap( self._HiliteBitmap( self.bitmaps[ tpl ] ) )
+            self.logger.debug(
+                '%s: cache hit, %s',
+                self.GetTitle(), str( self.bitmapCache.GetStats() )
+                )
+          self._SetBitmap( self._HiliteBitmap( bmap ) )
           must_create_image = False
 
         elif self.logger.isEnabledFor( logging.DEBUG ):
@@ -3069,6 +3318,8 @@ Calls ``_UpdateStateValues()``.
 
       if must_create_image:
         self._CreateAndSetBitmap( tpl, bitmap_args )
+
+      self._PrefetchArrays()
     #end if
 
     self._UpdateMenuItems(
@@ -3127,10 +3378,11 @@ Calls _UpdateStateValues().
       must_create_image = True
       self.bitmapsLock.acquire()
       try:
-        if tpl in self.bitmaps:
+        bmap = self.bitmapCache.Get( self, tpl )
+        if bmap is not None:
           if self.logger.isEnabledFor( logging.DEBUG ):
             self.logger.debug( '%s: cache hit', self.GetTitle() )
-          self._SetBitmap( self._HiliteBitmap( self.bitmaps[ tpl ] ) )
+          self._SetBitmap( self._HiliteBitmap( bmap ) )
           must_create_image = False
 
         elif bitmap_args in self.bitmapThreads:
@@ -3286,4 +3538,46 @@ will be called.
     return  kwargs
   #end _UpdateStateValues
 
+
+#               -- Properties
+#               --
+
+  axialValue = property(
+      lambda x : getattr(
+          getattr( x, 'renderLocal', None ), 'axialValue', x._axialValue
+          ),
+      lambda x, value : setattr( x, '_axialValue', value )
+      )
+
+  stateIndex = property(
+      lambda x : getattr(
+          getattr( x, 'renderLocal', None ), 'stateIndex', x._stateIndex
+          ),
+      lambda x, value : setattr( x, '_stateIndex', value )
+      )
+
+  timeValue = property(
+      lambda x : getattr(
+          getattr( x, 'renderLocal', None ), 'timeValue', x._timeValue
+          ),
+      lambda x, value : setattr( x, '_timeValue', value )
+      )
+
+
+#               -- Static Methods
+#               --
+
+
+  #----------------------------------------------------------------------
+  #     METHOD:         RasterWidget.SetPrefetchSteps()                 -
+  #----------------------------------------------------------------------
+  @staticmethod
+  def SetPrefetchSteps( value ):
+    """
+@param  value           number of neighbors to prefetch in each direction,
+                        where 0 disables prefetching
+"""
+    RasterWidget.prefetchSteps_ = max( 0, value )
+  #end SetPrefetchSteps
+
 #end RasterWidget
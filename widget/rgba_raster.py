@@ -0,0 +1,392 @@
+#!/usr/bin/env python
+# $Id$
+#------------------------------------------------------------------------
+#	NAME:		rgba_raster.py					-
+#	HISTORY:							-
+#		2026-10-18						-
+#	  Vectorized cell-grid rasterization into RGBA pixel buffers.
+#	  Added cached polar cell maps for vessel fluence.
+#------------------------------------------------------------------------
+"""Rasterization of colored cell grids into RGBA pixel buffers with numpy.
+
+A raster widget maps the visible values to colors with a single
+``mapper.to_rgba()`` call, describes where each cell row and column lands
+in pixels with ``CreateAxisMap()``, and paints the whole grid with
+``PaintCells()``.  The painted buffer becomes a bitmap in one call, after
+which labels, grid lines and the legend are drawn over it.  Painting
+replicates each cell color over its pixel block by gathering through the
+axis maps, so gaps between cells, overlapping cells and cells of varying
+size, such as axial levels, need no special handling.
+
+Polar grids such as the vessel fluence mesh are painted the same way
+through a per-pixel cell index map from ``GetPolarMap()``, which is cached
+by geometry so redrawing a different state or axial level is a single
+gather with ``PaintIndexed()``.
+
+No wx dependency here, so the module can be used and tested without a
+display.
+"""
+import math, sys, threading
+import numpy as np
+import pdb
+
+
+#------------------------------------------------------------------------
+#	CLASS:		RgbaRaster					-
+#------------------------------------------------------------------------
+class RgbaRaster( object ):
+  """Static methods for painting cell grids into (ht, wd, 4) uint8 RGBA
+image buffers.
+"""
+
+
+#		-- Class Attributes
+#		--
+
+  POLAR_CACHE_SIZE = 16
+  """int: Maximum number of polar maps cached by ``GetPolarMap()``."""
+
+  polarCache_ = {}
+
+  polarLock_ = threading.RLock()
+
+
+#		-- Static Methods
+#		--
+
+
+  #----------------------------------------------------------------------
+  #	METHOD:		CreateAxisMap()					-
+  #----------------------------------------------------------------------
+  @staticmethod
+  def CreateAxisMap( length, starts, sizes ):
+    """Maps each pixel along an image axis to the cell covering it.  Where
+cells overlap the later cell wins, as it would when drawing in order.
+    Args:
+        length (int): number of pixels along the axis
+        starts (sequence): starting pixel for each cell
+        sizes (int or sequence): pixel size of all cells or of each cell
+    Returns:
+        tuple: ( np.ndarray index, np.ndarray offset ), where ``index`` is
+            the cell index for each pixel, -1 if not covered, and
+            ``offset`` is the pixel position within the cell
+"""
+    index = np.full( length, -1, dtype = np.int64 )
+    offset = np.zeros( length, dtype = np.int64 )
+
+    starts = np.asarray( starts, dtype = np.int64 ).ravel()
+    sizes = np.broadcast_to(
+        np.asarray( sizes, dtype = np.int64 ), starts.shape
+        ).clip( 0 )
+    total = int( sizes.sum() )
+    if total > 0:
+      cells = np.repeat( np.arange( starts.size ), sizes )
+      firsts = np.cumsum( sizes ) - sizes
+      offsets = np.arange( total ) - np.repeat( firsts, sizes )
+      pixels = starts[ cells ] + offsets
+      in_range = (pixels >= 0) & (pixels < length)
+
+#			-- Keep the last cell for each pixel
+      pixels = pixels[ in_range ][ :: -1 ]
+      pixels, firsts = np.unique( pixels, return_index = True )
+      index[ pixels ] = cells[ in_range ][ :: -1 ][ firsts ]
+      offset[ pixels ] = offsets[ in_range ][ :: -1 ][ firsts ]
+    #end if total > 0
+
+    return  index, offset
+  #end CreateAxisMap
+
+
+  #----------------------------------------------------------------------
+  #	METHOD:		CreateImage()					-
+  #----------------------------------------------------------------------
+  @staticmethod
+  def CreateImage( wd, ht ):
+    """
+    Args:
+        wd (int): image width in pixels
+        ht (int): image height in pixels
+    Returns:
+        np.ndarray: transparent (ht, wd, 4) uint8 buffer
+"""
+    return  np.zeros( ( max( 0, ht ), max( 0, wd ), 4 ), dtype = np.uint8 )
+  #end CreateImage
+
+
+  #----------------------------------------------------------------------
+  #	METHOD:		CreatePolarMap()				-
+  #----------------------------------------------------------------------
+  @staticmethod
+  def CreatePolarMap( wd, ht, origin, r_edges, theta_edges ):
+    """Maps each pixel to the polar cell covering its center.  Angles are
+in screen coordinates, increasing clockwise from the positive x axis as
+with ``wx.GraphicsPath.AddArc()``.
+    Args:
+        wd (int): image width in pixels
+        ht (int): image height in pixels
+        origin (sequence): x, y pixel position of the polar origin, which
+            need not be in the image
+        r_edges (sequence): ascending cell radius edges in pixels
+        theta_edges (sequence): ascending cell angle edges in radians in
+            [0,2pi]
+    Returns:
+        np.ndarray: (ht, wd) int32 map of flat cell indexes,
+            ``theta_index * (len( r_edges ) - 1) + r_index``, -1 for pixels
+            not covered
+"""
+    wd = max( 0, int( wd ) )
+    ht = max( 0, int( ht ) )
+    r_edges = np.asarray( r_edges, dtype = np.float64 )
+    theta_edges = np.asarray( theta_edges, dtype = np.float64 )
+    nr = r_edges.size - 1
+    ntheta = theta_edges.size - 1
+
+    index = np.full( ( ht, wd ), -1, dtype = np.int32 )
+    if nr > 0 and ntheta > 0 and index.size > 0:
+      y, x = np.ogrid[ 0 : ht, 0 : wd ]
+      dx = x + (0.5 - origin[ 0 ])
+      dy = y + (0.5 - origin[ 1 ])
+      r_ndx = np.searchsorted( r_edges, np.hypot( dx, dy ), side = 'right' ) - 1
+      theta_ndx = np.searchsorted(
+          theta_edges, np.arctan2( dy, dx ) % (2.0 * math.pi), side = 'right'
+          ) - 1
+
+      covered = \
+          (r_ndx >= 0) & (r_ndx < nr) & (theta_ndx >= 0) & (theta_ndx < ntheta)
+      index[ covered ] = theta_ndx[ covered ] * nr + r_ndx[ covered ]
+    #end if nr > 0 and ntheta > 0 and index.size > 0
+
+    return  index
+  #end CreatePolarMap
+
+
+  #----------------------------------------------------------------------
+  #	METHOD:		CreateShapeMask()				-
+  #----------------------------------------------------------------------
+  @staticmethod
+  def CreateShapeMask( wd, ht, shape = 'rect', outline = True ):
+    """Creates a cell shape for ``PaintCells()``.
+    Args:
+        wd (int): cell width in pixels
+        ht (int): cell height in pixels
+        shape (str): 'rect' or 'ellipse'
+        outline (bool): True to mark the one-pixel shape border
+    Returns:
+        np.ndarray: (ht, wd) uint8 mask with 0 outside the shape, 1 for
+            fill pixels, and 2 for outline pixels
+"""
+    wd = max( 1, int( wd ) )
+    ht = max( 1, int( ht ) )
+    if shape == 'ellipse':
+      y, x = np.ogrid[ 0 : ht, 0 : wd ]
+      dx = (x - (wd - 1) / 2.0) / (wd / 2.0)
+      dy = (y - (ht - 1) / 2.0) / (ht / 2.0)
+      inside = (dx * dx + dy * dy) <= 1.0
+    else:
+      inside = np.ones( ( ht, wd ), dtype = bool )
+
+    mask = inside.astype( np.uint8 )
+    if outline:
+      padded = np.pad( inside, 1, 'constant', constant_values = False )
+      interior = inside & \
+          padded[ : -2, 1 : -1 ] & padded[ 2 :, 1 : -1 ] & \
+          padded[ 1 : -1, : -2 ] & padded[ 1 : -1, 2 : ]
+      mask[ inside & ~interior ] = 2
+
+    return  mask
+  #end CreateShapeMask
+
+
+  #----------------------------------------------------------------------
+  #	METHOD:		DarkenColors()					-
+  #----------------------------------------------------------------------
+  @staticmethod
+  def DarkenColors( colors, alpha = 255, keep_transparent = False ):
+    """Vectorized ``Widget.GetDarkerColor()``.
+    Args:
+        colors (np.ndarray): (..., 4) uint8 RGBA colors
+        alpha (int): alpha for the result colors
+        keep_transparent (bool): True to leave colors with zero alpha
+            transparent
+    Returns:
+        np.ndarray: darker colors
+"""
+    result = colors >> 1
+    result[ ..., 3 ] = alpha
+    if keep_transparent:
+      result[ colors[ ..., 3 ] == 0, 3 ] = 0
+    return  result
+  #end DarkenColors
+
+
+  #----------------------------------------------------------------------
+  #	METHOD:		FillBackground()				-
+  #----------------------------------------------------------------------
+  @staticmethod
+  def FillBackground( image, color ):
+    """Sets fully transparent pixels to a background color in place.
+    Args:
+        image (np.ndarray): (ht, wd, 4) uint8 buffer
+        color (sequence): RGBA background color
+    Returns:
+        np.ndarray: ``image``
+"""
+    image[ image[ ..., 3 ] == 0 ] = np.asarray( color, dtype = np.uint8 )
+    return  image
+  #end FillBackground
+
+
+  #----------------------------------------------------------------------
+  #	METHOD:		GetPolarMap()					-
+  #----------------------------------------------------------------------
+  @staticmethod
+  def GetPolarMap( wd, ht, origin, r_edges, theta_edges ):
+    """Retrieves the cached ``CreatePolarMap()`` result for the geometry,
+creating it on first use.  The returned array is shared and read-only.
+    Args:
+        wd (int): image width in pixels
+        ht (int): image height in pixels
+        origin (sequence): x, y pixel position of the polar origin
+        r_edges (sequence): ascending cell radius edges in pixels
+        theta_edges (sequence): ascending cell angle edges in radians
+    Returns:
+        np.ndarray: (ht, wd) int32 map of flat cell indexes
+"""
+    key = (
+        int( wd ), int( ht ), tuple( origin ),
+        tuple( np.asarray( r_edges, dtype = np.float64 ).tolist() ),
+        tuple( np.asarray( theta_edges, dtype = np.float64 ).tolist() )
+        )
+    result = RgbaRaster.polarCache_.get( key )
+    if result is None:
+      result = RgbaRaster.CreatePolarMap( wd, ht, origin, r_edges, theta_edges )
+      result.flags.writeable = False
+      with RgbaRaster.polarLock_:
+        if len( RgbaRaster.polarCache_ ) >= RgbaRaster.POLAR_CACHE_SIZE:
+          RgbaRaster.polarCache_.clear()
+        RgbaRaster.polarCache_[ key ] = result
+    return  result
+  #end GetPolarMap
+
+
+  #----------------------------------------------------------------------
+  #	METHOD:		MapColors()					-
+  #----------------------------------------------------------------------
+  @staticmethod
+  def MapColors( values, mapper, factors = None ):
+    """Maps values to RGBA colors with a single ``mapper.to_rgba()`` call.
+Values that are NaN, infinite, or have a zero factor are transparent.
+Values are flattened for the call, since ``to_rgba()`` treats 3D arrays as
+images.
+    Args:
+        values (np.ndarray): values to map
+        mapper (matplotlib.cm.ScalarMappable): color mapper
+        factors (np.ndarray): optional factors broadcastable to ``values``
+    Returns:
+        np.ndarray: values.shape + (4,) uint8 colors
+"""
+    values = np.asarray( values )
+    colors = mapper.to_rgba( values.ravel(), bytes = True ).\
+        reshape( values.shape + ( 4, ) )
+
+    invalid = None
+    if values.dtype.kind in 'fc':
+      invalid = ~np.isfinite( values )
+    if factors is not None:
+      zero_factors = np.broadcast_to( np.asarray( factors ) == 0, values.shape )
+      invalid = zero_factors  if invalid is None else  invalid | zero_factors
+    if invalid is not None:
+      colors[ invalid ] = 0
+
+    return  colors
+  #end MapColors
+
+
+  #----------------------------------------------------------------------
+  #	METHOD:		PaintCells()					-
+  #----------------------------------------------------------------------
+  @staticmethod
+  def PaintCells(
+      image, colors, y_map, x_map,
+      shape_mask = None, outline_colors = None
+      ):
+    """Paints a grid of cell colors into an image buffer in place.  Each
+pixel takes the color of the cell the axis maps assign it to, and pixels
+whose color is transparent are left unchanged.
+    Args:
+        image (np.ndarray): (ht, wd, 4) uint8 buffer
+        colors (np.ndarray): (nrows, ncols, 4) uint8 cell colors
+        y_map (tuple): ``CreateAxisMap()`` result for rows
+        x_map (tuple): ``CreateAxisMap()`` result for columns
+        shape_mask (np.ndarray): optional ``CreateShapeMask()`` result
+            applied to each cell, indexed by the axis map offsets
+        outline_colors (np.ndarray): optional (nrows, ncols, 4) or single
+            RGBA color for shape mask outline pixels, where None means
+            outlines take the fill color
+    Returns:
+        np.ndarray: ``image``
+"""
+    y_index, y_offset = y_map
+    x_index, x_offset = x_map
+    rows = np.flatnonzero( y_index >= 0 )
+    cols = np.flatnonzero( x_index >= 0 )
+
+    if rows.size > 0 and cols.size > 0:
+      yi = y_index[ rows ][ :, np.newaxis ]
+      xi = x_index[ cols ][ np.newaxis, : ]
+      block = colors[ yi, xi ]
+
+      if shape_mask is not None:
+        mask_ht, mask_wd = shape_mask.shape
+        kind = shape_mask[
+            y_offset[ rows ].clip( 0, mask_ht - 1 )[ :, np.newaxis ],
+            x_offset[ cols ].clip( 0, mask_wd - 1 )[ np.newaxis, : ]
+            ]
+        if outline_colors is not None:
+          outline_colors = np.asarray( outline_colors, dtype = np.uint8 )
+          outline_block = \
+              outline_colors[ yi, xi ]  if outline_colors.ndim == 3 else \
+              np.broadcast_to( outline_colors, block.shape )
+          block = np.where( (kind == 2)[ ..., np.newaxis ], outline_block, block )
+        paint = (kind > 0) & (block[ ..., 3 ] > 0)
+      else:
+        paint = block[ ..., 3 ] > 0
+
+      region_ndx = np.ix_( rows, cols )
+      region = image[ region_ndx ]
+      region[ paint ] = block[ paint ]
+      image[ region_ndx ] = region
+    #end if rows.size > 0 and cols.size > 0
+
+    return  image
+  #end PaintCells
+
+
+  #----------------------------------------------------------------------
+  #	METHOD:		PaintIndexed()					-
+  #----------------------------------------------------------------------
+  @staticmethod
+  def PaintIndexed( image, colors, index_map ):
+    """Paints cell colors into an image buffer in place through a per-pixel
+cell index map such as from ``GetPolarMap()``.  Pixels whose color is
+transparent are left unchanged.
+    Args:
+        image (np.ndarray): (ht, wd, 4) uint8 buffer or view
+        colors (np.ndarray): (..., 4) uint8 cell colors, indexed flat
+        index_map (np.ndarray): (ht, wd) flat cell indexes, -1 for pixels
+            not painted
+    Returns:
+        np.ndarray: ``image``
+"""
+    flat_colors = np.asarray( colors ).reshape( ( -1, 4 ) )
+    paint = index_map >= 0
+    if paint.any():
+      block = flat_colors[ index_map[ paint ] ]
+      opaque = block[ :, 3 ] > 0
+      paint[ paint ] = opaque
+      image[ paint ] = block[ opaque ]
+
+    return  image
+  #end PaintIndexed
+
+#end RgbaRaster
@@ -3,6 +3,8 @@
 #------------------------------------------------------------------------
 #	NAME:		subpin_view.py					-
 #	HISTORY:							-
+#		2026-10-18						-
+#	  Reading state arrays through DataModelMgr.GetStateArray().
 #		2018-03-02	leerw@ornl.gov				-
 #	  Migrating to _CreateEmptyBitmapAndDC().
 #		2018-02-05	leerw@ornl.gov				-
@@ -638,7 +640,7 @@ If neither are specified, a default 'scale' value of 24 is used.
         dset_array = None
 	dset_shape = ( 0, 0, 0, 0 )
       else:
-        dset_array = np.array( dset )
+        dset_array = self.dmgr.GetStateArray( self.curDataSet, self.timeValue )
         dset_shape = dset.shape
 
       ds_range = config[ 'dataRange' ]
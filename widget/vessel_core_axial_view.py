@@ -3,6 +3,11 @@
 #------------------------------------------------------------------------
 #       NAME:           vessel_core_axial_view.py                       -
 #       HISTORY:                                                        -
+#               2026-10-18                                              -
+#         Painting fluence cells through cached pixel axis maps instead
+#         of stroking a line per cell.
+#         Reading state arrays through DataModelMgr.GetStateArray().
+#         Drawing unweighted until a fast-open model is ready.
 #               2019-01-18      leerw@ornl.gov                          -
 #         Transition from tally to fluence.
 #               2018-03-02      leerw@ornl.gov                          -
@@ -314,6 +319,8 @@ of 1, meaning a forced scale might be necessary.
                 dimension for fluence datasets
             fluenceAxialOffsetPix (int): vertical pixels for the vessel offset,
                 should be 0
+            fluencePixelMap (tuple): ( x, y, y_map, x_map ) from
+                _CreateFluencePixelMap()
             linerRadius (int): pixel at which the liner starts on the
                 top horizontal line
             linerWidth (int): pixel width for drawing the liner
@@ -651,6 +658,7 @@ max( region_y + vessel_ht, legend_size[ 1 ], fluence_legend_size[ 1 ] ) + \
 
       config[ 'thetaStopIndex' ] = theta_stop_ndx
       config[ 'vesselRadius' ] = vessel_r
+      config[ 'fluencePixelMap' ] = self._CreateFluencePixelMap( config )
 
       if self.showLegend:
         config[ 'fluenceLegendBitmap' ] = fluence_legend_bmap
@@ -661,6 +669,58 @@ max( region_y + vessel_ht, legend_size[ 1 ], fluence_legend_size[ 1 ] ) + \
   #end _CreateDrawConfig
 
 
+  #----------------------------------------------------------------------
+  #     METHOD:         VesselCoreAxial2DView._CreateFluencePixelMap()  -
+  #----------------------------------------------------------------------
+  def _CreateFluencePixelMap( self, config ):
+    """Creates the RgbaRaster axis maps from image pixels to the fluence
+cells drawn by _DrawFluenceCells(), with columns for radii and rows for
+axial levels.  Each radius column is centered on its outer edge.
+@param  config          draw configuration dict with the fluence keys
+@return                 ( x, y, y_map, x_map ) for the image region at x, y
+                        bounding the fluence cells, where rows index
+                        fluenceAxialLevelsDy and columns index radii from
+                        radiusStartIndex, or None if there are no cells
+"""
+    fluence_mesh = self.dmgr.GetCore().fluenceMesh
+    im_wd, im_ht = config[ 'imageSize' ]
+    pix_per_cm = config[ 'pixPerCm' ]
+    r_start_ndx = config[ 'radiusStartIndex' ]
+
+    vessel_origin = config[ 'vesselRegion' ][ 0 : 2 ]
+    vessel_origin[ 1 ] += config[ 'fluenceAxialOffsetPix' ]
+    if config.get( 'coreOffsetCm', 0 ) > 0:
+      vessel_origin[ 0 ] += config[ 'assemblyWidth' ] >> 1
+
+    r_edges = np.ceil(
+        np.asarray( fluence_mesh.r[ r_start_ndx : ], dtype = np.float64 ) *
+        pix_per_cm
+        ).astype( np.int64 )
+    x_sizes = np.maximum( 1, np.diff( r_edges ) + 1 )
+    x_starts = vessel_origin[ 0 ] + r_edges[ 1 : ] - (x_sizes >> 1)
+
+#               -- Top level first
+#               --
+    y_sizes = np.asarray( config[ 'fluenceAxialLevelsDy' ], dtype = np.int64 )
+    y_starts = \
+        vessel_origin[ 1 ] + np.cumsum( y_sizes[ :: -1 ] )[ :: -1 ] - y_sizes
+
+    result = None
+    if x_sizes.size > 0 and y_sizes.size > 0:
+      x = max( 0, int( x_starts.min() ) )
+      y = max( 0, int( y_starts.min() ) )
+      wd = max( 0, min( im_wd, int( (x_starts + x_sizes).max() ) ) - x )
+      ht = max( 0, min( im_ht, int( (y_starts + y_sizes).max() ) ) - y )
+      result = (
+          x, y,
+          RgbaRaster.CreateAxisMap( ht, y_starts - y, y_sizes ),
+          RgbaRaster.CreateAxisMap( wd, x_starts - x, x_sizes )
+          )
+
+    return  result
+  #end _CreateFluencePixelMap
+
+
   #----------------------------------------------------------------------
   #     METHOD:         VesselCoreAxial2DView._CreateMenuDef()          -
   #----------------------------------------------------------------------
@@ -736,10 +796,11 @@ max( region_y + vessel_ht, legend_size[ 1 ], fluence_legend_size[ 1 ] ) + \
 
 #               -- "Item" refers to channel or pin
       item_factors = None
-      if self.state.weightsMode == 'on':
+      if self.state.weightsMode == 'on' and \
+          self.dmgr.IsReady( self.curDataSet ):
         item_factors = self.dmgr.GetFactors( self.curDataSet )
 
-      dset_array = np.array( dset )
+      dset_array = self.dmgr.GetStateArray( self.curDataSet, self.timeValue )
       dset_shape = dset.shape
 
 #               -- Total pins, effectively
@@ -1107,8 +1168,9 @@ max( region_y + vessel_ht, legend_size[ 1 ], fluence_legend_size[ 1 ] ) + \
   #     METHOD:         VesselCoreAxial2DView._DrawFluenceCells()       -
   #----------------------------------------------------------------------
   def _DrawFluenceCells( self, gc, config, tuple_in ):
-    """Handles drawing fluence data.
-@param  im_draw         PIL.ImageDraw instance
+    """Handles drawing fluence data.  Cell colors are painted through the
+cached fluencePixelMap into an RGBA buffer drawn as a single bitmap.
+@param  gc              wx.GraphicsContext instance
 @param  config          draw configuration dict
 @param  tuple_in        state tuple ( state_index, theta_ndx )
 """
@@ -1118,98 +1180,32 @@ max( region_y + vessel_ht, legend_size[ 1 ], fluence_legend_size[ 1 ] ) + \
     dset = None
     core = self.dmgr.GetCore()
     ds_range = config.get( 'fluenceDataRange' )
+    pixel_map = config.get( 'fluencePixelMap' )
 
-    if theta_ndx >= 0 and ds_range is not None:
+    if theta_ndx >= 0 and ds_range is not None and pixel_map is not None:
       dset = \
           self.dmgr.GetH5DataSet( self.fluenceAddr.dataSetName, self.timeValue )
 
     if dset is not None and core is not None:
-      amode = gc.GetAntialiasMode()
-      cmode = gc.GetCompositionMode()
-      gc.SetAntialiasMode( wx.ANTIALIAS_NONE )  # _DEFAULT
-      gc.SetCompositionMode( wx.COMPOSITION_SOURCE )  # _OVER
-
-      theta_ndx = min( theta_ndx, dset.shape[ 1 ] - 1 )
-      dset_array = np.array( dset )
-      value_delta = ds_range[ 1 ] - ds_range[ 0 ]
-
-      ax_ranges = self._GetAxialRanges()
-      core_bottom_cm = ax_ranges.get( 'cm_bottom' )
-
-      #core_axial_dy = config[ 'coreAxialDy' ]
-      core_region = config[ 'coreRegion' ]
-      #x liner_r = config[ 'linerRadius' ]
-      pix_per_cm = config[ 'pixPerCm' ]
-      r_start_ndx = config[ 'radiusStartIndex' ]
-      fluence_axials_dy = config[ 'fluenceAxialLevelsDy' ]
-      fluence_axial_offset_pix = config[ 'fluenceAxialOffsetPix' ]
       fluence_mapper = config[ 'fluenceMapper' ]
-      vessel_region = config[ 'vesselRegion' ]
-
-      vessel_origin = vessel_region[ 0 : 2 ]
-      vessel_origin[ 1 ] += fluence_axial_offset_pix
-      if config.get( 'coreOffsetCm', 0 ) > 0:
-        assy_wd = config[ 'assemblyWidth' ]
-        vessel_origin[ 0 ] += assy_wd >> 1
-        #vessel_origin[ 1 ] += assy_wd >> 1
-
-      max_axial_y = vessel_origin[ 1 ] + config[ 'fluenceAxialDy' ]
-      trans_color_arr = np.array([ 0, 0, 0, 0 ], dtype = np.uint8 )
-
-# Can't do this here b/c to_rgba() treats ndim == 3 or 4 as image
-#      cur_array = dset_array[ :, :, : ]
-#      colors = fluence_mapper.to_rgba( cur_array, bytes = True )
-#      colors[ np.isnan( cur_array ) ] = trans_color_arr
-#      colors[ np.isinf( cur_array ) ] = trans_color_arr
-
-#               -- Outer loop is r
-#               --
-      for ri in xrange( r_start_ndx, core.fluenceMesh.nr ):
-        if ri == r_start_ndx:
-          r1_wd = int( math.ceil( core.fluenceMesh.r[ ri ] * pix_per_cm ) )
-        r2_wd = int( math.ceil( core.fluenceMesh.r[ ri + 1 ] * pix_per_cm ) )
-
-        #cur_r = (r1_wd + r2_wd) >> 1
-        cur_r = r2_wd
-        cur_wd = max( 1, r2_wd - r1_wd + 1 )
-
-        cur_array = dset_array[ :, :, ri ]
-        colors = fluence_mapper.to_rgba( cur_array, bytes = True )
-        colors[ np.isnan( cur_array ) ] = trans_color_arr
-        colors[ np.isinf( cur_array ) ] = trans_color_arr
-
-#                       -- Inner loop is z
-#                       --
-        axial_y = vessel_origin[ 1 ]
-        axial_cm = ax_ranges.get( 'cm_top' )
-
-        for ax in xrange( len( fluence_axials_dy ) - 1, -1, -1 ):
-          cur_dy = fluence_axials_dy[ ax ]
-          cur_color = colors[ ax, theta_ndx ]
-          if cur_color[ 3 ] > 0:
-            pen_color = cur_color.tolist()
-            path = gc.CreatePath()
-            path.MoveToPoint( vessel_origin[ 0 ] + cur_r, axial_y )
-            path.AddLineToPoint(
-                vessel_origin[ 0 ] + cur_r,
-                min( axial_y + cur_dy, max_axial_y )
-                )
-            cur_pen = wx.ThePenList.FindOrCreatePen(
-                wx.Colour( *pen_color ), cur_wd, wx.PENSTYLE_SOLID
-                )
-            cur_pen.SetCap( wx.CAP_BUTT )
-            gc.SetPen( gc.CreatePen( cur_pen ) )
-            gc.StrokePath( path )
-          #end if not self.dmgr.IsBadValue( value )
-
-          axial_y += cur_dy
-        #end for ax in xrange( len( fluence_axial_levels_dy ) - 1, -1, -1 )
-
-        r1_wd = r2_wd
-      #end for ri
+      r_start_ndx = config[ 'radiusStartIndex' ]
+      x, y, y_map, x_map = pixel_map
 
-      gc.SetAntialiasMode( amode )
-      gc.SetCompositionMode( cmode )
+      theta_ndx = min( theta_ndx, dset.shape[ 1 ] - 1 )
+      cur_array = np.asarray( dset[ :, theta_ndx, r_start_ndx : ] )
+      colors = RgbaRaster.MapColors( cur_array, fluence_mapper )
+
+      map_ht = y_map[ 0 ].size
+      map_wd = x_map[ 0 ].size
+      if map_wd > 0 and map_ht > 0:
+        image = RgbaRaster.PaintCells(
+            RgbaRaster.CreateImage( map_wd, map_ht ), colors, y_map, x_map
+            )
+        fluence_bmap = wx.EmptyBitmapRGBA( map_wd, map_ht )
+        fluence_bmap.CopyFromBuffer(
+            image.tobytes(), wx.BitmapBufferFormat_RGBA
+            )
+        gc.DrawBitmap( fluence_bmap, x, y, map_wd, map_ht )
     #end if dset
   #end _DrawFluenceCells
 
@@ -3,6 +3,11 @@
 #------------------------------------------------------------------------
 #       NAME:           vessel_core_view.py                             -
 #       HISTORY:                                                        -
+#               2026-10-18                                              -
+#         Painting fluence cells through a cached polar pixel map instead
+#         of drawing an arc per cell.
+#         Reading state arrays through DataModelMgr.GetStateArray().
+#         Drawing unweighted until a fast-open model is ready.
 #               2019-01-30      leerw@ornl.gov                          -
 #         Trying to account for full core on _OnClickImpl(), and trying
 #         to divine a radius as well as a theta.
@@ -281,6 +286,8 @@ of 1, meaning a forced scale might be necessary.
             fluenceLegenSize (tuple(int)): wd, ht
             fluenceMapper (matplotlib.cm.ScalarMappable): used to convert
                 values to colors
+            fluencePixelMap (tuple): ( x, y, np.ndarray ) from
+                _CreateFluencePixelMap()
             linerRadius (int): pixel at which the liner starts on the
                 top horizontal line
             linerWidth (int): pixel width for drawing the liner
@@ -524,6 +531,7 @@ max( region_y + vessel_ht, legend_size[ 1 ], fluence_legend_size[ 1 ] ) + \
 
       config[ 'thetaStopIndex' ] = theta_stop_ndx
       config[ 'vesselRadius' ] = vessel_r
+      config[ 'fluencePixelMap' ] = self._CreateFluencePixelMap( config )
 
       if self.showLegend:
         config[ 'fluenceLegendBitmap' ] = fluence_legend_bmap
@@ -534,6 +542,56 @@ max( region_y + vessel_ht, legend_size[ 1 ], fluence_legend_size[ 1 ] ) + \
   #end _CreateDrawConfig
 
 
+  #----------------------------------------------------------------------
+  #     METHOD:         VesselCore2DView._CreateFluencePixelMap()       -
+  #----------------------------------------------------------------------
+  def _CreateFluencePixelMap( self, config ):
+    """Creates the map from image pixels to the fluence cells drawn by
+_DrawFluenceCells().  The map is retrieved from the RgbaRaster cache
+unless the fluence mesh, vessel geometry, or scale changed.
+    Args:
+        config (dict): draw configuration with the fluence keys
+    Returns:
+        tuple: ( x, y, np.ndarray ), where the (ht, wd) array covers the
+            image region bounding the fluence cells at x, y and holds flat
+            indexes into the ( thetaStopIndex, nr - radiusStartIndex ) cells
+"""
+    fluence_mesh = self.dmgr.GetCore().fluenceMesh
+    im_wd, im_ht = config[ 'imageSize' ]
+    pix_per_cm = config[ 'pixPerCm' ]
+    r_start_ndx = config[ 'radiusStartIndex' ]
+    th_stop_ndx = config[ 'thetaStopIndex' ]
+
+    vessel_origin = config[ 'vesselRegion' ][ 0 : 2 ]
+    if config[ 'coreOffsetCm' ] > 0:
+      assy_wd = config[ 'assemblyWidth' ]
+      vessel_origin[ 0 ] += assy_wd >> 1
+      vessel_origin[ 1 ] += assy_wd >> 1
+
+    r_edges = np.ceil(
+        np.asarray( fluence_mesh.r[ r_start_ndx : ], dtype = np.float64 ) *
+        pix_per_cm
+        )
+    use_stop_ndx = min( th_stop_ndx, fluence_mesh.ntheta - 1 )
+    last_theta = min( fluence_mesh.theta[ use_stop_ndx ], TWO_PI )
+    theta_edges = np.minimum(
+        np.asarray( fluence_mesh.theta[ 0 : th_stop_ndx + 1 ] ), last_theta
+        )
+
+    r_max = int( r_edges[ -1 ] )  if r_edges.size > 0 else  0
+    x = max( 0, vessel_origin[ 0 ] - r_max )
+    y = max( 0, vessel_origin[ 1 ] - r_max )
+    wd = max( 0, min( im_wd, vessel_origin[ 0 ] + r_max + 1 ) - x )
+    ht = max( 0, min( im_ht, vessel_origin[ 1 ] + r_max + 1 ) - y )
+
+    index_map = RgbaRaster.GetPolarMap(
+        wd, ht, ( vessel_origin[ 0 ] - x, vessel_origin[ 1 ] - y ),
+        r_edges, theta_edges
+        )
+    return  x, y, index_map
+  #end _CreateFluencePixelMap
+
+
   #----------------------------------------------------------------------
   #     METHOD:         VesselCore2DView._CreateMenuDef()               -
   #----------------------------------------------------------------------
@@ -605,10 +663,11 @@ max( region_y + vessel_ht, legend_size[ 1 ], fluence_legend_size[ 1 ] ) + \
 
 #               -- "Item" refers to channel or pin
       item_factors = None
-      if self.state.weightsMode == 'on':
+      if self.state.weightsMode == 'on' and \
+          self.dmgr.IsReady( self.curDataSet ):
         item_factors = self.dmgr.GetFactors( self.curDataSet )
 
-      dset_array = np.array( dset )
+      dset_array = self.dmgr.GetStateArray( self.curDataSet, self.timeValue )
       dset_shape = dset.shape
       if self.nodalMode:
         cur_nxpin = cur_nypin = item_col_limit = item_row_limit = 2
@@ -1027,7 +1086,8 @@ It is assumed config[ 'baffleWidth' ] gt 0.
   #     METHOD:         VesselCore2DView._DrawFluenceCells()            -
   #----------------------------------------------------------------------
   def _DrawFluenceCells( self, gc, config ):
-    """Handles drawing fluence data.
+    """Handles drawing fluence data.  Cell colors are gathered through the
+cached fluencePixelMap into an RGBA buffer drawn as a single bitmap.
     Args:
         gc (wx.GraphicsContext): used for rendering
         config (dict): draw configuration
@@ -1036,88 +1096,37 @@ It is assumed config[ 'baffleWidth' ] gt 0.
     dset = None
     core = self.dmgr.GetCore()
     ds_range = config.get( 'fluenceDataRange' )
+    pixel_map = config.get( 'fluencePixelMap' )
     z_ndx = self.axialValue.fluenceIndex
-    if z_ndx >= 0 and ds_range is not None:
+    if z_ndx >= 0 and ds_range is not None and pixel_map is not None:
       dset = self.dmgr.GetH5DataSet( self.fluenceAddr.dataSetName, self.timeValue )
       z_ndx = min( z_ndx, core.fluenceMesh.nz - 1 )
 
-    if dset is not None and core is not None:
-      amode = gc.GetAntialiasMode()
-      cmode = gc.GetCompositionMode()
-      gc.SetAntialiasMode( wx.ANTIALIAS_NONE )  # _DEFAULT
-      gc.SetCompositionMode( wx.COMPOSITION_SOURCE )  # _OVER
-
-      #break_angle = PI_OVER_2  if core.coreSym == 4 else  TWO_PI
-      dset_array = np.array( dset )
-      trans_color_arr = np.array([ 0, 0, 0, 0 ], dtype = np.uint8 )
-
-      pix_per_cm = config[ 'pixPerCm' ]
-      r_start_ndx = config[ 'radiusStartIndex' ]
+    if dset is not None and core is not None and pixel_map[ 2 ].size > 0:
       fluence_mapper = config[ 'fluenceMapper' ]
+      r_start_ndx = config[ 'radiusStartIndex' ]
       th_stop_ndx = config[ 'thetaStopIndex' ]
-      vessel_region = config[ 'vesselRegion' ]
-
-      vessel_origin = vessel_region[ 0 : 2 ]
-      if config[ 'coreOffsetCm' ] > 0:
-        assy_wd = config[ 'assemblyWidth' ]
-        vessel_origin[ 0 ] += assy_wd >> 1
-        vessel_origin[ 1 ] += assy_wd >> 1
+      x, y, index_map = pixel_map
 
 #               -- Map to colors
 #               --
-      cur_array = dset_array[ z_ndx, :, : ]
-      #cur_array[ cur_array <= 0.0 ] = np.nan
-      colors = fluence_mapper.to_rgba( cur_array, bytes = True )
-      colors[ np.isnan( cur_array ) ] = trans_color_arr
-      colors[ np.isinf( cur_array ) ] = trans_color_arr
-      colors[ cur_array < fluence_mapper.norm.vmin ] = trans_color_arr
-      colors[ cur_array > fluence_mapper.norm.vmax ] = trans_color_arr
-
-#               -- Outer loop is r
+      cur_array = np.asarray( dset[ z_ndx, 0 : th_stop_ndx, r_start_ndx : ] )
+      colors = RgbaRaster.MapColors( cur_array, fluence_mapper )
+      with np.errstate( invalid = 'ignore' ):
+        colors[
+            (cur_array < fluence_mapper.norm.vmin) |
+            (cur_array > fluence_mapper.norm.vmax)
+            ] = 0
+
+#               -- Gather into the cell pixels
 #               --
-      for ri in xrange( core.fluenceMesh.nr - 1, r_start_ndx - 1, -1 ):
-        if ri == core.fluenceMesh.nr - 1:
-          r2_wd = int( math.ceil( core.fluenceMesh.r[ ri + 1 ] * pix_per_cm ) )
-        r1_wd = int( math.ceil( core.fluenceMesh.r[ ri ] * pix_per_cm ) )
-
-        cur_r = (r1_wd + r2_wd) >> 1
-        #cur_wd = max( 1, r2_wd - r1_wd + 1 )
-        cur_wd = max( 1, r2_wd - r1_wd )
-
-#                       -- Inner loop is theta
-#                       --
-        use_stop_ndx = min( th_stop_ndx, core.fluenceMesh.ntheta - 1 )
-        last_theta = min( core.fluenceMesh.theta[ use_stop_ndx ], TWO_PI )
-        for ti in xrange( 0, th_stop_ndx ):
-          start = core.fluenceMesh.theta[ ti ]
-          end = min(
-              core.fluenceMesh.theta[ ti + 1 ],
-              last_theta
-              )
-          cur_color = colors[ ti, ri ]
-          if cur_color[ 3 ] > 0:
-            #pen_color = fluence_mapper.to_rgba( value, bytes = True )
-            pen_color = cur_color.tolist()
-            cur_pen = wx.ThePenList.FindOrCreatePen(
-                wx.Colour( *pen_color ), cur_wd + 1, wx.PENSTYLE_SOLID
-                )
-            cur_pen.SetCap( wx.CAP_BUTT )
-            gc.SetPen( gc.CreatePen( cur_pen ) )
-            path = gc.CreatePath()
-            path.AddArc(
-                vessel_origin[ 0 ], vessel_origin[ 1 ], cur_r,
-                start, end
-                )
-            gc.StrokePath( path )
-          #if valid value
-        #end for ti
-
-#        r1_wd = r2_wd
-        r2_wd = r1_wd
-      #end for ri
-
-      gc.SetAntialiasMode( amode )
-      gc.SetCompositionMode( cmode )
+      map_ht, map_wd = index_map.shape
+      image = RgbaRaster.PaintIndexed(
+          RgbaRaster.CreateImage( map_wd, map_ht ), colors, index_map
+          )
+      fluence_bmap = wx.EmptyBitmapRGBA( map_wd, map_ht )
+      fluence_bmap.CopyFromBuffer( image.tobytes(), wx.BitmapBufferFormat_RGBA )
+      gc.DrawBitmap( fluence_bmap, x, y, map_wd, map_ht )
     #end if dset
   #end _DrawFluenceCells
 
@@ -3,6 +3,8 @@
 #------------------------------------------------------------------------
 #	NAME:		widget.py					-
 #	HISTORY:							-
+#		2026-10-18						-
+#	  Coalescing UpdateState() calls with StateChangeScheduler.
 #		2019-01-17	leerw@ornl.gov				-
 #		2019-01-16	leerw@ornl.gov				-
 #         Transition from tally to fluence.
@@ -154,6 +156,7 @@ except Exception:
 
 from data.config import *
 from event.state import *
+from event.state_scheduler import *
 
 from legend3 import *
 from .bean.data_range_bean import *
@@ -442,6 +445,8 @@ Widget Class Hierarchy
 
   logger_ = logging.getLogger( 'widget' )
 
+  stateScheduler_ = None
+
 
 #		-- Class Initialization
 #		--
@@ -1356,7 +1361,10 @@ returns an empty set.
   #	METHOD:		Widget.HandleStateChange()			-
   #----------------------------------------------------------------------
   def HandleStateChange( self, reason ):
-    """Note value difference checks must occur in UpdateState()
+    """Note value difference checks must occur in UpdateState().
+The update is scheduled with the shared StateChangeScheduler, which merges
+reasons until it runs, so a burst of changes results in a single
+UpdateState() call with the latest state values.
 """
  
     load_mask = STATE_CHANGE_init | STATE_CHANGE_dataModelMgr
@@ -1369,7 +1377,9 @@ returns an empty set.
     update_args = self.state.CreateUpdateArgs( reason )
 
     if len( update_args ) > 0:
-      wx.CallAfter( self.UpdateState, **update_args )
+      Widget.GetStateScheduler().Schedule(
+          self, reason, self._UpdateScheduledState, self.IsShownOnScreen
+          )
   #end HandleStateChange
 
 
@@ -2031,6 +2041,20 @@ GetDisplaysMultiDataSets() returns True.
   #end _UpdateMenuItems
 
 
+  #----------------------------------------------------------------------
+  #	METHOD:		Widget._UpdateScheduledState()			-
+  #----------------------------------------------------------------------
+  def _UpdateScheduledState( self, reason ):
+    """Called by the StateChangeScheduler on the UI thread with the reasons
+merged since the last update.
+@param  reason		merged reason mask
+"""
+    update_args = self.state.CreateUpdateArgs( reason )
+    if len( update_args ) > 0:
+      self.UpdateState( **update_args )
+  #end _UpdateScheduledState
+
+
   #----------------------------------------------------------------------
   #	METHOD:		Widget.UpdateState()				-
   #----------------------------------------------------------------------
@@ -2398,6 +2422,21 @@ http://www.particleincell.com/blog/2014/colormap/
   #end GetDarkerColor
 
 
+  #----------------------------------------------------------------------
+  #	METHOD:		Widget.GetStateScheduler()			-
+  #----------------------------------------------------------------------
+  @staticmethod
+  def GetStateScheduler():
+    """Lazily creates the scheduler shared by all widgets, which posts
+flushes with wx.CallAfter().
+@return			StateChangeScheduler instance
+"""
+    if Widget.stateScheduler_ is None:
+      Widget.stateScheduler_ = StateChangeScheduler( wx.CallAfter )
+    return  Widget.stateScheduler_
+  #end GetStateScheduler
+
+
   #----------------------------------------------------------------------
   #	METHOD:		Widget.InvertColor()				-
   #----------------------------------------------------------------------
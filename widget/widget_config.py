@@ -3,6 +3,9 @@
 #------------------------------------------------------------------------
 #	NAME:		widget_config.py				-
 #	HISTORY:							-
+#		2026-10-18						-
+#	  Removed the unused wx import so sessions can be read without a
+#	  display.
 #		2018-08-27	leerw@ornl.gov				-
 #	  Added filter for ASCII chars in Decode().
 #		2017-09-23	leerw@ornl.gov				-
@@ -26,11 +29,6 @@ import json, logging, os, platform, six, sys
 import numpy as np
 import pdb  # set_trace()
 
-try:
-  import wx
-except Exception:
-  raise ImportError( "The wxPython module is required" )
-
 from event.state import *
 
 
@@ -3,6 +3,10 @@
 #------------------------------------------------------------------------
 #	NAME:		widgetcontainer.py				-
 #	HISTORY:							-
+#		2026-10-18						-
+#	  Animated images saved as GIF, APNG, or MP4 without gifsicle.
+#	  Canceling scheduled widget updates in OnClose().  Passing the
+#	  fast frames animation option.
 #		2019-01-16	leerw@ornl.gov				-
 #         Transition from tally to fluence.
 #		2019-01-02	leerw@ornl.gov				-
@@ -113,6 +117,7 @@ except Exception:
 from data.config import Config
 from event.state import *
 
+from .animation_writer import AnimationWriter
 from .animators import *
 from .bean.animate_options_bean import *
 from .bean.datamodel_mgr_tree import *
@@ -268,21 +273,20 @@ Must be called on the UI thread.
 @return			file path if selected, None if canceled or
 			animated images cannot be created
 """
-    if not Config.HaveGifsicle():
-      wx.MessageBox(
-	  'Cannot find "gifsicle" for animated image creation',
-	  'Save Animated Image', wx.OK_DEFAULT, self
-	  )
-      file_path = None
-
-    elif file_path is None:
+    if file_path is None:
+      formats = [
+	  k for k in AnimationWriter.FORMATS
+	  if AnimationWriter.IsFormatAvailable( k )
+	  ]
       dialog = wx.FileDialog(
           self, 'Save Widget Animated Image', '', '',
-	  'GIF files (*.gif)|*.gif',
+	  AnimationWriter.GetWildcard(),
 	  wx.FD_SAVE | wx.FD_OVERWRITE_PROMPT | wx.FD_CHANGE_DIR
 	  )
       if dialog.ShowModal() != wx.ID_CANCEL:
         file_path = dialog.GetPath()
+	if AnimationWriter.GetFormat( file_path ) not in formats:
+	  file_path += '.' + formats[ dialog.GetFilterIndex() ]
 
     return  file_path
   #end _CheckAndPromptForAnimatedImage
@@ -945,8 +949,11 @@ Deprecated.  Call ``wx.CallLater( 1000, self.Destroy )`` instead.
 """
     if self.state is not None and self.widget is not None:
       self.state.RemoveListener( self )
+      widget.Widget.GetStateScheduler().Cancel( self.widget )
       if self.dataSetMenu is not None:
         self.dataSetMenu.Dispose()
+      if hasattr( self.widget, 'ReleaseBitmaps' ):
+        self.widget.ReleaseBitmaps()
 
     # This causes a segv for Anaconda under MacOS after _OnShowInNewWindow().
 #    self.Close()
@@ -1218,7 +1225,8 @@ Must be called from the UI event thread
         animator.Run(
 	    file_path,
 	    self.animateOptionsDialog.frame_delay,
-	    self.animateOptionsDialog.show_selections
+	    self.animateOptionsDialog.show_selections,
+	    self.animateOptionsDialog.fast_frames
 	    )
     #end if dialog not canceled
   #end SaveWidgetAnimatedImage